@@ -0,0 +1,409 @@
+import argparse
+import json
+import math
+import os
+import queue
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import numpy as np
+
+# Without an explicit clear level a rule resolves 5% of its threshold back on the safe side
+HYSTERESIS = 0.05
+SCALES = {"": 1, "%": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+RULE_PATTERN = re.compile(
+    r"^(?P<metric>[A-Za-z_][\w:/. -]*?)\s*(?P<op><=|>=|<|>)\s*(?P<value>-?[\d.]+)(?P<unit>[%KMGT]?)"
+    r"(?:\s+for\s+(?P<duration>[\d.]+)(?P<duration_unit>[smhd]))?"
+    r"(?:\s+clear\s+(?P<clear>-?[\d.]+)(?P<clear_unit>[%KMGT]?))?"
+    r"(?:\s+(?P<severity>warning|error))?$"
+)
+
+DEFAULT_RULES = [
+    "cpu > 90% for 2m",
+    "cpu > 98% for 1m error",
+    "memory > 90% for 1m",
+    "memory > 97% for 30s error",
+    "swap > 50% for 5m",
+    "swap_in_rate > 1000 for 30s",
+    "disk > 95%",
+    "mount_free < 5%",
+    "mount_free < 2% error",
+    "mount_full_in_h < 24",
+    "oom_in_h < 6 error",
+    "psi_memory > 10% for 30s",
+    "psi_io > 25% for 1m",
+    "anomalies >= 3 for 1m",
+]
+# Per-second values; "<name>_rate" in a rule refers to the same value
+RATES = ("swap_in", "swap_out", "major_faults", "pgscan", "net_rx", "net_tx", "net_errors")
+# Families with one value per mount; a rule on one of these may match nothing until a mount is listed
+FAMILIES = ("mount_used", "mount_free", "inode_used", "mount_full_in_h")
+RULES_PATH = os.path.join("state", "alert_rules.txt")
+LOG_PATH = os.path.join("state", "alerts.log")
+
+
+def parse_rule(text):
+    """Parse "metric op value[unit] [for N{s,m,h,d}] [clear value[unit]] [warning|error]"
+
+    A metric without ':' that is not a plain snapshot value is a family:
+    "mount_free < 5%" watches every "mount_free:<mount>" value.
+    """
+    match = RULE_PATTERN.match(text.strip())
+    if match is None:
+        raise ValueError(f"Cannot parse alert rule {text!r}")
+    op = match["op"]
+    threshold = float(match["value"]) * SCALES[match["unit"]]
+    if match["clear"] is not None:
+        clear = float(match["clear"]) * SCALES[match["clear_unit"]]
+    else:
+        margin = abs(threshold) * HYSTERESIS
+        clear = threshold - margin if op.startswith(">") else threshold + margin
+    if (op.startswith(">") and clear > threshold) or (op.startswith("<") and clear < threshold):
+        raise ValueError(f"Clear level of {text!r} is on the alerting side of the threshold")
+    duration = float(match["duration"]) * DURATIONS[match["duration_unit"]] if match["duration"] else 0.0
+    # "swap-in rate", "swap_in_rate" and "swap_in" name the same value; a mount path after ':' is kept as written
+    family, colon, member = match["metric"].strip().partition(":")
+    family = re.sub(r"[\s-]+", "_", family)
+    if family.endswith("_rate") and family[:-5] in RATES:
+        family = family[:-5]
+    return {
+        "text": text.strip(),
+        "metric": family + colon + member,
+        "op": op,
+        "threshold": threshold,
+        "clear": clear,
+        "for": duration,
+        "severity": match["severity"] or "warning",
+    }
+
+
+def load_rules(path):
+    """One rule per line; blank lines and # comments are skipped"""
+    rules = []
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+            try:
+                rules.append(parse_rule(line))
+            except ValueError as e:
+                raise ValueError(f"{path}:{number}: {e}") from None
+    return rules
+
+
+def metric_values(snapshot, active_anomalies=0):
+    """Flatten a collector snapshot into the values alert rules can refer to"""
+    nan = math.nan
+    values = {
+        "cpu": snapshot["cpu_percent"],
+        "memory": snapshot["mem_percent"],
+        "swap": snapshot["swap_percent"],
+        "disk": snapshot["disk_percent"],
+        "anomalies": active_anomalies,
+    }
+    commit, limit = snapshot["commit_charge"], snapshot["commit_limit"]
+    values["commit"] = commit / limit * 100 if commit is not None and limit else nan
+    memory = snapshot["memory"]
+    for name in ("swap_in", "swap_out", "major_faults", "pgscan"):
+        values[name] = memory[f"{name}_s"] if memory is not None else nan
+    network = snapshot["network"]
+    values["net_rx"] = network["rx_bytes_s"]
+    values["net_tx"] = network["tx_bytes_s"]
+    values["net_errors"] = network["errors_s"] + network["drops_s"]
+    pressure = snapshot["pressure"] or {}
+    for resource in ("cpu", "memory", "io"):
+        entry = pressure.get(resource)
+        values[f"psi_{resource}"] = entry["some_avg10"] if entry else nan
+        values[f"psi_{resource}_full"] = entry["full_avg10"] if entry else nan
+    growing = snapshot["leaks"]["growing"]
+    hours = [row[5] for row in growing if row[5] is not None]
+    values["oom_in_h"] = min(hours) if hours else nan
+    for mount in snapshot["mounts"]:
+        name = mount["mount"]
+        ok = mount["state"] == "ok"
+        values[f"mount_used:{name}"] = mount["percent"] if ok else nan
+        values[f"mount_free:{name}"] = 100.0 - mount["percent"] if ok else nan
+        values[f"inode_used:{name}"] = mount["inode_percent"] if ok and mount["inodes"] else nan
+        full_in_h = mount.get("full_in_h")
+        values[f"mount_full_in_h:{name}"] = full_in_h if full_in_h is not None else nan
+    return values
+
+
+def create_engine(rules_path=RULES_PATH, log_path=LOG_PATH, notify=True, webhook=None):
+    """Rules from rules_path when it exists (DEFAULT_RULES otherwise) with the configured sinks"""
+    rules = load_rules(rules_path) if rules_path and os.path.exists(rules_path) else DEFAULT_RULES
+    sinks = []
+    if log_path:
+        sinks.append(LogSink(log_path))
+    if notify:
+        sinks.append(DesktopSink())
+    if webhook:
+        sinks.append(WebhookSink(webhook))
+    return AlertEngine(rules, sinks)
+
+
+class AlertEngine:
+    """Threshold rules with for-durations and hysteresis, evaluated as arrays
+
+    Rules are parsed once. Each (rule, value key) pair becomes one instance
+    and the instances are laid out as flat arrays, rebuilt only when the set
+    of value keys changes (a mount appears or goes away). A tick then gathers
+    the current values, flips '<' rules to '>' by sign and updates every
+    instance's state with a handful of vectorised comparisons:
+
+        ok -> pending when the threshold is crossed, back to ok when it is not
+        pending -> firing once the crossing has lasted the rule's duration
+        firing -> ok only after the value is back past the clear level
+
+    A missing (NaN) value counts as clear. Events go to each sink on the
+    tick a rule starts or stops firing.
+    """
+
+    def __init__(self, rules=DEFAULT_RULES, sinks=()):
+        self.rules = [parse_rule(rule) if isinstance(rule, str) else rule for rule in rules]
+        self.sinks = list(sinks)
+        self.error = ""
+        self.keys = None
+        self.key_names = []
+        self.instances = []
+        self.levels = {}
+
+    def bind(self, values, now):
+        """Expand the rules over the current value keys, keeping the state of surviving instances"""
+        self.error = ""
+        previous = {instance: (self.since[i], self.firing[i], self.value[i])
+                    for i, instance in enumerate(self.instances)} if self.instances else {}
+        self.keys = set(values)
+        self.key_names = list(values)
+        position = {key: i for i, key in enumerate(self.key_names)}
+        instances = []
+        for r, rule in enumerate(self.rules):
+            metric = rule["metric"]
+            if metric in position:
+                instances.append((r, metric))
+            else:
+                prefix = metric + ":"
+                instances.extend((r, key) for key in self.key_names if key.startswith(prefix))
+        rules = [self.rules[r] for r, _ in instances]
+        sign = np.array([1.0 if rule["op"].startswith(">") else -1.0 for rule in rules])
+        self.key_index = np.array([position[key] for _, key in instances], dtype=np.int64)
+        self.sign = sign
+        self.threshold = sign * np.array([rule["threshold"] for rule in rules])
+        self.clear = sign * np.array([rule["clear"] for rule in rules])
+        self.inclusive = np.array([rule["op"] in ("<=", ">=") for rule in rules], dtype=bool)
+        self.duration = np.array([rule["for"] for rule in rules])
+        self.since = np.full(len(instances), np.nan)
+        self.firing = np.zeros(len(instances), dtype=bool)
+        self.value = np.full(len(instances), np.nan)
+        events = []
+        survivors = set(instances)
+        for i, instance in enumerate(instances):
+            if instance in previous:
+                self.since[i], self.firing[i], self.value[i] = previous[instance]
+        for instance, (_, firing, value) in previous.items():
+            if firing and instance not in survivors:
+                events.append(self.event(instance, "resolved", math.nan, now))
+        self.instances = instances
+        matched = {r for r, _ in instances}
+        unmatched = [rule["text"] for r, rule in enumerate(self.rules)
+                     if r not in matched and rule["metric"] not in FAMILIES]
+        if unmatched:
+            self.error = f"Alert rules match no metric: {', '.join(unmatched)}"
+        self.update_levels()
+        return events
+
+    def evaluate(self, values, now):
+        """Advance every rule against this tick's values; returns the firing/resolved events"""
+        events = []
+        if values.keys() != self.keys:
+            events += self.bind(values, now)
+        if not self.instances:
+            return events
+        current = np.fromiter((values[key] for key in self.key_names), dtype=np.float64, count=len(self.key_names))
+        self.value = current[self.key_index]
+        signed = self.sign * self.value
+        breach = (signed > self.threshold) | (self.inclusive & (signed == self.threshold))
+        cleared = ~(signed > self.clear)
+        idle = ~self.firing
+        self.since[idle & ~breach] = np.nan
+        self.since[idle & breach & np.isnan(self.since)] = now
+        fire = idle & breach & (now - self.since >= self.duration)
+        resolve = self.firing & cleared
+        if fire.any() or resolve.any():
+            self.firing[fire] = True
+            self.firing[resolve] = False
+            self.since[resolve] = np.nan
+            for i in np.flatnonzero(fire | resolve):
+                events.append(self.event(self.instances[i], "firing" if fire[i] else "resolved", self.value[i], now))
+            self.update_levels()
+        for event in events:
+            self.dispatch(event)
+        return events
+
+    def event(self, instance, state, value, now):
+        rule, key = self.rules[instance[0]], instance[1]
+        return {"rule": rule["text"], "key": key, "severity": rule["severity"], "state": state,
+                "value": float(value), "threshold": rule["threshold"], "time": now}
+
+    def update_levels(self):
+        """Worst firing severity per value key; keys watched by a rule and not firing are "success" """
+        levels = {key: "success" for _, key in self.instances}
+        for i in np.flatnonzero(self.firing):
+            r, key = self.instances[i]
+            severity = self.rules[r]["severity"]
+            if levels[key] != "error":
+                levels[key] = severity
+        self.levels = levels
+
+    def level(self, key):
+        """"error", "warning", "success" or None for a value key (a family name covers all its members)"""
+        level = self.levels.get(key)
+        if level is not None or ":" in key:
+            return level
+        worst = None
+        for member, member_level in self.levels.items():
+            if member.startswith(key + ":"):
+                if member_level == "error":
+                    return "error"
+                if member_level == "warning" or worst is None:
+                    worst = member_level
+        return worst
+
+    def active(self):
+        """Firing instances as (rule text, key, severity, value, time the threshold was first crossed)"""
+        return [(self.rules[self.instances[i][0]]["text"], self.instances[i][1],
+                 self.rules[self.instances[i][0]]["severity"], float(self.value[i]), float(self.since[i]))
+                for i in np.flatnonzero(self.firing)]
+
+    def dispatch(self, event):
+        for sink in self.sinks:
+            try:
+                sink(event)
+            except (OSError, ValueError) as e:
+                self.error = f"Alert sink {type(sink).__name__} failed: {e}"
+
+
+def format_event(event):
+    when = datetime.fromtimestamp(event["time"]).strftime("%Y-%m-%d %H:%M:%S")
+    return (f"{when} {event['state'].upper()} {event['severity']} [{event['rule']}] "
+            f"{event['key']} = {event['value']:.2f}")
+
+
+class LogSink:
+    """Appends one line per event to a log file"""
+
+    def __init__(self, path=LOG_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    def __call__(self, event):
+        with open(self.path, "a") as f:
+            f.write(format_event(event) + "\n")
+
+
+class DesktopSink:
+    """Desktop notification through notify-send; a no-op where it is not installed"""
+
+    def __init__(self, command="notify-send"):
+        self.command = shutil.which(command)
+
+    def __call__(self, event):
+        if self.command is None:
+            return
+        urgency = "critical" if event["severity"] == "error" and event["state"] == "firing" else "normal"
+        subprocess.Popen([self.command, "-u", urgency, f"System Monitor: {event['rule']}",
+                          f"{event['key']} {event['state']} at {event['value']:.2f}"],
+                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+class WebhookSink(threading.Thread):
+    """POSTs each event as JSON from a background thread so a slow endpoint never holds up a tick
+
+    Events beyond a full queue are dropped and counted.
+    """
+
+    def __init__(self, url, timeout=2.0, queue_size=256):
+        super().__init__(daemon=True, name="alert-webhook")
+        self.url = url
+        self.timeout = timeout
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+        self.error = None
+        self.start()
+
+    def __call__(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def run(self):
+        while True:
+            event = self.queue.get()
+            # A value that vanished (NaN) is sent as null to keep the body strict JSON
+            body = dict(event, value=None if math.isnan(event["value"]) else event["value"])
+            request = urllib.request.Request(self.url, data=json.dumps(body).encode(),
+                                             headers={"Content-Type": "application/json"}, method="POST")
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    response.read()
+                self.error = None
+            except OSError as e:
+                self.error = e
+
+
+class WebhookReceiver(BaseHTTPRequestHandler):
+    """Local stand-in for a webhook endpoint: prints every event it receives"""
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            print(format_event(json.loads(body)), flush=True)
+            self.send_response(204)
+        except (ValueError, KeyError):
+            self.send_response(400)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check alert rules or receive alert webhooks locally")
+    sub = parser.add_subparsers(dest="command", required=True)
+    check = sub.add_parser("check", help="parse a rules file and print the compiled rules")
+    check.add_argument("path", nargs="?", default=RULES_PATH)
+    serve = sub.add_parser("serve", help="listen for webhook events and print them")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args(argv)
+
+    if args.command == "check":
+        try:
+            rules = load_rules(args.path)
+        except (OSError, ValueError) as e:
+            print(e, file=sys.stderr)
+            return 1
+        for rule in rules:
+            print(f"{rule['metric']} {rule['op']} {rule['threshold']:g} clear {rule['clear']:g} "
+                  f"for {rule['for']:g}s {rule['severity']}")
+        return 0
+    server = HTTPServer((args.host, args.port), WebhookReceiver)
+    print(f"Listening for alert webhooks on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+import os
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+# Always evaluated, whatever the rotation; everything else shares the remaining batch
+PRIORITY = ("cpu", "memory", "disk", "net_rx", "net_tx", "major_faults", "swap_out")
+SLOT_SECONDS = 900
+SLOTS = 86400 // SLOT_SECONDS
+SEASONAL_PATH = os.path.join("state", "seasonal_baseline.npz")
+
+
+class AnomalyDetector:
+    """Robust z-score, time-of-day baseline and CUSUM shift detection over the history
+
+    Each tick stacks the last window steps of up to batch_size series into
+    one matrix and scores them together with NumPy: the newest value against
+    the window's median/MAD, against the learned mean and deviation for this
+    15-minute slot of the day, and a two-sided CUSUM on the robust z-score
+    for step changes. Series beyond the batch are scored in rotation, so the
+    tick cost stays fixed however many series the history holds. Series are
+    read through HistoryStore.select() as the value held at every step
+    seconds, so a series the deadband stores only when it changes is scored
+    on its signal, not on its change points.
+
+    The seasonal profile is the only state worth keeping across restarts;
+    load() and save() read and write it as a small .npz file.
+    """
+
+    def __init__(self, history, window=120, step=1.0, batch_size=512, min_points=30, z_threshold=6.0,
+                 seasonal_threshold=5.0, seasonal_alpha=0.05, seasonal_min_count=20,
+                 cusum_k=1.0, cusum_h=20.0, on_anomaly=None):
+        self.history = history
+        self.window = window
+        self.step = step
+        self.batch_size = batch_size
+        self.min_points = min_points
+        self.z_threshold = z_threshold
+        self.seasonal_threshold = seasonal_threshold
+        self.seasonal_alpha = seasonal_alpha
+        self.seasonal_min_count = seasonal_min_count
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.on_anomaly = on_anomaly
+        self.cursor = 0
+        self.index = {}
+        self.names = []
+        self.last_time = np.zeros(0)
+        self.cusum = np.zeros((0, 2))
+        self.hold = np.zeros(0, dtype=np.int64)
+        self.seasonal_mean = np.zeros((0, SLOTS))
+        self.seasonal_dev = np.zeros((0, SLOTS))
+        self.seasonal_count = np.zeros((0, SLOTS), dtype=np.int64)
+        self.active = {}
+        self.regions = {}
+
+    def rows(self, names):
+        """State row for each name, growing the state arrays for new series"""
+        new = [name for name in names if name not in self.index]
+        if new:
+            for name in new:
+                self.index[name] = len(self.names)
+                self.names.append(name)
+            grow = len(new)
+            self.last_time = np.concatenate([self.last_time, np.full(grow, -np.inf)])
+            self.cusum = np.concatenate([self.cusum, np.zeros((grow, 2))])
+            self.hold = np.concatenate([self.hold, np.zeros(grow, dtype=np.int64)])
+            self.seasonal_mean = np.concatenate([self.seasonal_mean, np.zeros((grow, SLOTS))])
+            self.seasonal_dev = np.concatenate([self.seasonal_dev, np.zeros((grow, SLOTS))])
+            self.seasonal_count = np.concatenate([self.seasonal_count, np.zeros((grow, SLOTS), dtype=np.int64)])
+        return np.array([self.index[name] for name in names], dtype=np.int64)
+
+    def prune(self):
+        """Drop the state of series the history no longer holds"""
+        keep = np.array([i for i, name in enumerate(self.names) if name in self.history.series], dtype=np.int64)
+        self.names = [self.names[i] for i in keep]
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.last_time = self.last_time[keep]
+        self.cusum = self.cusum[keep]
+        self.hold = self.hold[keep]
+        self.seasonal_mean = self.seasonal_mean[keep]
+        self.seasonal_dev = self.seasonal_dev[keep]
+        self.seasonal_count = self.seasonal_count[keep]
+        for name in [name for name in self.regions if name not in self.index]:
+            del self.regions[name]
+            self.active.pop(name, None)
+        self.cursor = 0
+
+    def select(self):
+        # Expired and replaced series (see HistoryStore.expire) leave state behind; compact it now and then
+        if len(self.names) > 2 * max(len(self.history.series), 64):
+            self.prune()
+        names = self.history.names()
+        priority = [name for name in PRIORITY if name in self.history.series]
+        rest = [name for name in names if name not in PRIORITY]
+        room = max(0, self.batch_size - len(priority))
+        if len(rest) > room:
+            start = self.cursor % len(rest)
+            rest = (rest[start:] + rest[:start])[:room]
+            self.cursor = start + room
+        return priority + rest
+
+    def detect(self):
+        """Score the newest value of each selected series; returns the anomalies found this tick"""
+        names = self.select()
+        window = self.window
+        newest = np.array([self.newest(name) for name in names], dtype=np.float64)
+        rows = self.rows(names)
+        # Only series sampled since their last evaluation are read at all
+        fresh = newest > self.last_time[rows]
+        names = [name for name, keep in zip(names, fresh) if keep]
+        newest, rows = newest[fresh], rows[fresh]
+        matrix = np.full((len(names), window), np.nan)
+        for i, (name, end) in enumerate(zip(names, newest)):
+            matrix[i] = self.history.select(name, end - window * self.step, end, self.step)[1][-window:]
+        self.last_time[rows] = newest
+        # Enough known steps to judge
+        enough = np.count_nonzero(~np.isnan(matrix), axis=1) >= self.min_points
+        if not enough.any():
+            return []
+        matrix, newest, rows = matrix[enough], newest[enough], rows[enough]
+        names = [name for name, keep in zip(names, enough) if keep]
+
+        latest = matrix[:, -1]
+        history = matrix[:, :-1]
+        median = np.nanmedian(history, axis=1)
+        deviation = np.abs(history - median[:, None])
+        mad = np.nanmedian(deviation, axis=1)
+        # Sparse counters (errors, faults) are mostly zero and have MAD 0; the mean deviation and a
+        # floor relative to the level keep their routine bursts from scoring as infinite
+        scale = np.maximum(np.maximum(1.4826 * mad, 1.2533 * np.nanmean(deviation, axis=1)),
+                           1e-6 + 0.01 * np.abs(median))
+        z = (latest - median) / scale
+
+        offset = datetime.now().astimezone().utcoffset().total_seconds()
+        slots = (((newest + offset) % 86400) // SLOT_SECONDS).astype(np.int64)
+        mean = self.seasonal_mean[rows, slots]
+        dev = self.seasonal_dev[rows, slots]
+        count = self.seasonal_count[rows, slots]
+        learned = count >= self.seasonal_min_count
+        seasonal_z = np.zeros(len(rows))
+        np.divide(latest - mean, np.maximum(1.2533 * dev, 1e-6 + 0.01 * np.abs(mean)), out=seasonal_z, where=learned)
+        alpha = np.where(count == 0, 1.0, self.seasonal_alpha)
+        self.seasonal_mean[rows, slots] = mean + alpha * (latest - mean)
+        self.seasonal_dev[rows, slots] = dev + alpha * (np.abs(latest - mean) - dev)
+        self.seasonal_count[rows, slots] = count + 1
+
+        # Clipped so a lone burst cannot carry the sum over the threshold on its own; a shift has to persist
+        clipped = np.clip(z, -4.0, 4.0)
+        cusum = self.cusum[rows]
+        cusum[:, 0] = np.maximum(0.0, cusum[:, 0] + clipped - self.cusum_k)
+        cusum[:, 1] = np.maximum(0.0, cusum[:, 1] - clipped - self.cusum_k)
+        # After a shift the window median needs half a window to settle on the new level; hold off until then
+        hold = self.hold[rows]
+        cusum[hold > 0] = 0.0
+        shifted = (cusum > self.cusum_h).any(axis=1)
+        cusum[shifted] = 0.0
+        self.cusum[rows] = cusum
+        self.hold[rows] = np.where(shifted, window // 2, np.maximum(hold - 1, 0))
+
+        # A burst no bigger than one already in the window is routine for that series, however far from the median
+        beyond = (latest > np.nanmax(history, axis=1)) | (latest < np.nanmin(history, axis=1))
+        spike = (np.abs(z) > self.z_threshold) & beyond
+        seasonal = (np.abs(seasonal_z) > self.seasonal_threshold) & beyond
+        found = []
+        for i in np.flatnonzero(spike | seasonal | shifted):
+            if spike[i]:
+                kind, score = "spike", z[i]
+            elif shifted[i]:
+                kind, score = "shift", z[i]
+            else:
+                kind, score = "seasonal", seasonal_z[i]
+            found.append({"name": names[i], "kind": kind, "score": float(score), "value": float(latest[i]),
+                          "baseline": float(mean[i] if kind == "seasonal" else median[i]), "time": float(newest[i])})
+        self.track(names, newest, spike | seasonal | shifted, found)
+        return found
+
+    def newest(self, name):
+        buffer = self.history.series.get(name)
+        newest = self.history.newest(buffer) if buffer is not None and len(buffer) else None
+        return -np.inf if newest is None else newest
+
+    def track(self, names, newest, anomalous, found):
+        """Grow or close the highlighted region of each evaluated series"""
+        by_name = {entry["name"]: entry for entry in found}
+        for name, t, flag in zip(names, newest, anomalous):
+            if flag:
+                region = self.active.get(name)
+                if region is None:
+                    regions = self.regions.get(name)
+                    if regions is None:
+                        regions = self.regions[name] = deque(maxlen=20)
+                    region = self.active[name] = [float(t), float(t)]
+                    regions.append(region)
+                    if self.on_anomaly is not None:
+                        self.on_anomaly(by_name[name])
+                region[1] = float(t)
+            elif name in self.active:
+                del self.active[name]
+
+    def load(self, path):
+        if not os.path.exists(path):
+            return False
+        with np.load(path, allow_pickle=False) as data:
+            names = [str(name) for name in data["names"]]
+            rows = self.rows(names)
+            self.seasonal_mean[rows] = data["mean"]
+            self.seasonal_dev[rows] = data["dev"]
+            self.seasonal_count[rows] = data["count"]
+        return True
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        np.savez_compressed(path, names=np.array(self.names, dtype=str), mean=self.seasonal_mean,
+                            dev=self.seasonal_dev, count=self.seasonal_count)
+        return path
@@ -13,6 +13,32 @@ import matplotlib.dates as mdates
 import os
 import platform
 import ctypes
+import sys
+
+from alerts import create_engine, format_event
+from anomaly import SEASONAL_PATH
+from cgroups import CgroupCollector
+from collector import MetricsCollector
+from export import HistoryExporter
+from forecast import format_duration, format_eta
+from history import from_datenums, to_datetimes
+from instrumentation import StageTimer
+from network import NetworkCollector, format_rate
+from numa import format_cpulist
+from pressure import DEFAULT_TRIGGERS, PressureTrigger, format_pressure
+from profiling import ProfileSession
+from replay import SPEEDS, ReplayCollector
+from stats import WINDOWS
+
+GRAPH_POINTS = 60
+GRAPH_SECONDS = 60
+RENDER_INTERVAL = 1.0
+# Graph windows this long or longer are drawn from rollup means per step instead of every point
+ROLLUP_SECONDS = 3600
+ROLLUP_STEP = 10.0
+MOUNT_INTERVAL = 10.0
+# Alert events are also POSTed here when set, e.g. http://127.0.0.1:8765/ for `python alerts.py serve`
+ALERT_WEBHOOK = os.environ.get("SYSMON_ALERT_WEBHOOK")
 
 class ThemeManager:
     def __init__(self):
@@ -145,7 +171,7 @@ class MetricBox(ctk.CTkFrame):
             "CPU": "⚡", "Memory": "💾", "Disk": "💿",
             "Virtual Memory": "📊", "Core Count": "🔢",
             "Thread Count": "🧵", "CPU Usage": "📈",
-            "CPU Frequency": "⚙️"
+            "CPU Frequency": "⚙️", "Network": "🌐"
         }
         
         icon = icons.get(title, "📊")
@@ -178,6 +204,23 @@ class MetricBox(ctk.CTkFrame):
             text_color=colors["text"]
         )
         self.value_label.pack()
+        
+        self.subtitle_label = ctk.CTkLabel(
+            value_frame,
+            text="",
+            font=ctk.CTkFont(size=11),
+            text_color=colors["text_secondary"]
+        )
+        self.subtitle_label.pack()
+        self.level = None
+
+    def set_level(self, level):
+        # Border turns success/warning/error while an alert rule watches or fires on this box's metric
+        if level == self.level:
+            return
+        self.level = level
+        colors = self.winfo_toplevel().colors
+        self.configure(border_color=colors[level] if level else colors["border"])
 
 class GraphFrame(ctk.CTkFrame):
     def __init__(self, master, title, ylabel, **kwargs):
@@ -221,10 +264,12 @@ class GraphFrame(ctk.CTkFrame):
                 text_color=colors["text"],
                 font=ctk.CTkFont(size=12, weight="bold"),
                 border_width=1,
-                border_color=colors["border"]
+                border_color=colors["border"],
+                command=lambda r=r: self.set_window(r)
             )
             btn.pack(side="left", padx=2)
             self.time_buttons[r] = btn
+        self.set_window("1m")
         
         plt.style.use('dark_background')
         self.fig, self.ax = plt.subplots(figsize=(8, 4), dpi=100)
@@ -240,6 +285,58 @@ class GraphFrame(ctk.CTkFrame):
         for spine in self.ax.spines.values():
             spine.set_color(colors["border"])
             spine.set_linewidth(0.5)
+        
+        self.selection = None
+        self.drag_start = None
+    
+    def set_window(self, window):
+        self.window = window
+        colors = self.winfo_toplevel().colors
+        for name, button in self.time_buttons.items():
+            button.configure(fg_color=colors["accent"] if name == window else colors["surface"])
+    
+    def draw_stats(self, summary):
+        """p50/p95/p99 and EWMA of the selected window as horizontal overlays"""
+        if summary is None:
+            return
+        for key, style in (("p50", ":"), ("p95", "--"), ("p99", "-.")):
+            self.ax.axhline(summary[key], linestyle=style, linewidth=1, alpha=0.7, color="silver",
+                            label=f"{key} {summary[key]:.1f}")
+        self.ax.axhline(summary["ewma"], linewidth=1, alpha=0.7, color="gold", label=f"EWMA {summary['ewma']:.1f}")
+    
+    def draw_anomalies(self, regions, since):
+        """Shade anomalous regions (epoch second pairs) that overlap the plotted range"""
+        # list() copies the deque in one step; the collector thread may be appending to it
+        for start, end in list(regions or ()):
+            if end < since:
+                continue
+            start = max(start, since)
+            # A single-sample region still gets a visible sliver
+            start, end = to_datetimes(np.array([start - 0.5, end + 0.5]))
+            self.ax.axvspan(start, end, color="red", alpha=0.15)
+    
+    def enable_selection(self, on_select):
+        """Drag across the plot to pick a time range; on_select gets (start, end) in epoch seconds"""
+        self.on_select = on_select
+        self.canvas.mpl_connect("button_press_event", self.on_press)
+        self.canvas.mpl_connect("button_release_event", self.on_release)
+    
+    def on_press(self, event):
+        if event.inaxes is self.ax and event.xdata is not None:
+            self.drag_start = event.xdata
+    
+    def on_release(self, event):
+        start, self.drag_start = self.drag_start, None
+        if start is None or event.inaxes is not self.ax or event.xdata is None or event.xdata == start:
+            return
+        self.selection = tuple(sorted((start, event.xdata)))
+        epoch = mdates.date2num(np.datetime64("1970-01-01T00:00:00"))
+        self.on_select(*from_datenums(self.selection, epoch))
+    
+    def draw_selection(self):
+        # ax.clear() drops the span every tick, so it is re-added after plotting
+        if self.selection is not None:
+            self.ax.axvspan(*self.selection, color="gold", alpha=0.2)
 
 class PieChartFrame(ctk.CTkFrame):
     def __init__(self, master, title, **kwargs):
@@ -262,11 +359,63 @@ class PieChartFrame(ctk.CTkFrame):
         self.ax.set_title("Usage Distribution")
         self.canvas.draw()
 
+class TableFrame(ctk.CTkFrame):
+    def __init__(self, master, title, height=220, **kwargs):
+        super().__init__(master, **kwargs)
+        
+        colors = self.winfo_toplevel().colors
+        self.configure(
+            fg_color=colors["surface"],
+            corner_radius=15,
+            border_width=1,
+            border_color=colors["border"]
+        )
+        
+        self.title_label = ctk.CTkLabel(
+            self,
+            text=title,
+            font=ctk.CTkFont(size=14, weight="bold"),
+            text_color=colors["accent"]
+        )
+        self.title_label.pack(anchor="w", padx=15, pady=(10, 0))
+        
+        self.textbox = ctk.CTkTextbox(
+            self,
+            height=height,
+            font=ctk.CTkFont(family="Courier", size=12),
+            fg_color=colors["surface"],
+            text_color=colors["text"],
+            wrap="none"
+        )
+        self.textbox.pack(fill="both", expand=True, padx=15, pady=10)
+        self.textbox.configure(state="disabled")
+        self.last_text = None
+
+    def update_rows(self, headers, rows):
+        widths = [len(h) for h in headers]
+        for row in rows:
+            widths = [max(w, len(str(cell))) for w, cell in zip(widths, row)]
+        lines = ["  ".join(str(h).ljust(w) for h, w in zip(headers, widths))]
+        lines += ["  ".join(str(cell).ljust(w) for cell, w in zip(row, widths)) for row in rows]
+        text = "\n".join(lines)
+        # Re-inserting unchanged text still costs a Tk round trip per row
+        if text == self.last_text:
+            return
+        self.last_text = text
+        self.textbox.configure(state="normal")
+        self.textbox.delete("1.0", "end")
+        self.textbox.insert("1.0", text)
+        self.textbox.configure(state="disabled")
+
 class SystemMonitor(ctk.CTk):
-    def __init__(self):
+    def __init__(self, replay=None, notify=False):
         super().__init__()
         
-        self.title("System Monitor Pro")
+        # A history export to play back instead of monitoring this host
+        self.replay_path = replay
+        # Desktop notifications for alert events are opt-in, as in the terminal UI
+        self.notify = notify
+        self.title(f"System Monitor Pro - {os.path.basename(replay)}" if replay else "System Monitor Pro")
         self.geometry("1400x900")
         
         self.theme_manager = ThemeManager()
@@ -275,6 +424,10 @@ class SystemMonitor(ctk.CTk):
         self.configure(fg_color=self.colors["bg"])
         
         self.overview_boxes = {}
+        # Latest event or action result for the status bar; set from any thread, shown by update_clock
+        self.notice = ""
+        self.timer = StageTimer()
+        self.profile_session = ProfileSession()
         
         self.grid_columnconfigure(1, weight=1)
         self.grid_rowconfigure(0, weight=1)
@@ -283,13 +436,30 @@ class SystemMonitor(ctk.CTk):
         self.create_main_area()
         self.create_status_bar()
         
-        self.history = {
-            'time': [],
-            'cpu': [],
-            'memory': [],
-            'virtual': [],
-            'disk': []
-        }
+        try:
+            alerts = create_engine(notify=self.notify, webhook=ALERT_WEBHOOK)
+        except (OSError, ValueError) as e:
+            print(f"Error loading alert rules: {e}")
+            alerts = create_engine(rules_path=None, notify=self.notify, webhook=ALERT_WEBHOOK)
+        if self.replay_path:
+            self.collector = ReplayCollector(self.replay_path, timer=self.timer, alerts=alerts)
+        else:
+            self.collector = MetricsCollector(timer=self.timer, mount_interval=MOUNT_INTERVAL, alerts=alerts)
+        self.history = self.collector.history
+        self.exporter = HistoryExporter(self.history)
+        self.collector.forecaster.on_alert = self.on_forecast_alert
+        self.collector.anomalies.on_anomaly = self.on_anomaly
+        if self.replay_path:
+            # A recording would teach the seasonal baseline someone else's day, and stalls can't be watched
+            self.pressure_alerts = {}
+            self.pressure_triggers = []
+            self.update_replay_status()
+        else:
+            try:
+                self.collector.anomalies.load(SEASONAL_PATH)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Error loading seasonal baseline: {e}")
+            self.start_pressure_triggers()
         
         self.running = True
         self.monitor_thread = Thread(target=self.update_metrics, daemon=True)
@@ -339,7 +509,10 @@ class SystemMonitor(ctk.CTk):
             "CPU": "⚡",
             "Memory": "💾",
             "Virtual Memory": "📊",
-            "Disk": "💿"
+            "Disk": "💿",
+            "Network": "🌐",
+            "Containers": "📦",
+            "NUMA": "🧩"
         }
         
         nav_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
@@ -361,6 +534,234 @@ class SystemMonitor(ctk.CTk):
                 border_color=self.colors["border"]
             )
             btn.pack(fill="x", pady=2)
+        
+        self.create_profiling_controls()
+        if self.replay_path:
+            self.create_replay_controls()
+        else:
+            self.create_flight_recorder_controls()
+
+    def create_profiling_controls(self):
+        profile_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
+        profile_frame.grid(row=3, column=0, sticky="ew", padx=10, pady=(20, 5))
+        
+        title = ctk.CTkLabel(
+            profile_frame,
+            text="Self Profiling",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            text_color=self.colors["accent"]
+        )
+        title.pack(anchor="w", padx=5)
+        
+        self.profile_duration = ctk.CTkOptionMenu(
+            profile_frame,
+            values=["30 s", "60 s", "300 s"],
+            fg_color=self.colors["surface"],
+            button_color=self.colors["accent"],
+            text_color=self.colors["text"],
+            height=30
+        )
+        self.profile_duration.set("60 s")
+        self.profile_duration.pack(fill="x", pady=4)
+        
+        self.profile_button = ctk.CTkButton(
+            profile_frame,
+            text="Start Profiling",
+            command=self.toggle_profiling,
+            fg_color="transparent",
+            hover_color=self.colors["accent"],
+            height=35,
+            font=ctk.CTkFont(size=13),
+            corner_radius=8,
+            text_color=self.colors["text"],
+            border_width=1,
+            border_color=self.colors["border"]
+        )
+        self.profile_button.pack(fill="x", pady=2)
+        
+        self.profile_status = ctk.CTkLabel(
+            profile_frame,
+            text="Idle",
+            font=ctk.CTkFont(size=11),
+            text_color=self.colors["text_secondary"],
+            wraplength=220,
+            justify="left"
+        )
+        self.profile_status.pack(anchor="w", padx=5)
+
+    def create_flight_recorder_controls(self):
+        recorder_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
+        recorder_frame.grid(row=4, column=0, sticky="ew", padx=10, pady=(10, 5))
+        
+        title = ctk.CTkLabel(
+            recorder_frame,
+            text="Flight Recorder",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            text_color=self.colors["accent"]
+        )
+        title.pack(anchor="w", padx=5)
+        
+        self.recorder_switch = ctk.CTkSwitch(
+            recorder_frame,
+            text="Record at 50 Hz",
+            command=self.toggle_flight_recorder,
+            progress_color=self.colors["accent"],
+            button_color=self.colors["accent"],
+            button_hover_color=self.colors["accent"],
+            text_color=self.colors["text"]
+        )
+        self.recorder_switch.pack(anchor="w", pady=4)
+        
+        self.recorder_button = ctk.CTkButton(
+            recorder_frame,
+            text="Save Recording",
+            command=self.save_flight_recording,
+            fg_color="transparent",
+            hover_color=self.colors["accent"],
+            height=35,
+            font=ctk.CTkFont(size=13),
+            corner_radius=8,
+            text_color=self.colors["text"],
+            border_width=1,
+            border_color=self.colors["border"]
+        )
+        self.recorder_button.pack(fill="x", pady=2)
+        
+        self.recorder_status = ctk.CTkLabel(
+            recorder_frame,
+            text="Off",
+            font=ctk.CTkFont(size=11),
+            text_color=self.colors["text_secondary"],
+            wraplength=220,
+            justify="left"
+        )
+        self.recorder_status.pack(anchor="w", padx=5)
+
+    def create_replay_controls(self):
+        replay_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent")
+        replay_frame.grid(row=4, column=0, sticky="ew", padx=10, pady=(10, 5))
+        
+        title = ctk.CTkLabel(
+            replay_frame,
+            text="Replay",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            text_color=self.colors["accent"]
+        )
+        title.pack(anchor="w", padx=5)
+        
+        self.replay_button = ctk.CTkButton(
+            replay_frame,
+            text="Pause",
+            command=self.toggle_replay,
+            fg_color="transparent",
+            hover_color=self.colors["accent"],
+            height=35,
+            font=ctk.CTkFont(size=13),
+            corner_radius=8,
+            text_color=self.colors["text"],
+            border_width=1,
+            border_color=self.colors["border"]
+        )
+        self.replay_button.pack(fill="x", pady=2)
+        
+        self.replay_speed = ctk.CTkOptionMenu(
+            replay_frame,
+            values=[f"{speed}x" for speed in SPEEDS],
+            command=self.set_replay_speed,
+            fg_color=self.colors["surface"],
+            button_color=self.colors["accent"],
+            text_color=self.colors["text"],
+            height=30
+        )
+        self.replay_speed.set(f"{SPEEDS[0]}x")
+        self.replay_speed.pack(fill="x", pady=4)
+        
+        # Positions are seconds from the start of the recording; the range is set once it is loaded
+        self.replay_slider = ctk.CTkSlider(
+            replay_frame,
+            from_=0,
+            to=1,
+            command=self.seek_replay,
+            progress_color=self.colors["accent"],
+            button_color=self.colors["accent"],
+            button_hover_color=self.colors["accent"]
+        )
+        self.replay_slider.set(0)
+        self.replay_slider.pack(fill="x", pady=4)
+        
+        self.replay_status = ctk.CTkLabel(
+            replay_frame,
+            text="Loading...",
+            font=ctk.CTkFont(size=11),
+            text_color=self.colors["text_secondary"],
+            wraplength=220,
+            justify="left"
+        )
+        self.replay_status.pack(anchor="w", padx=5)
+
+    def toggle_replay(self):
+        self.collector.session.toggle()
+        self.update_replay_status()
+
+    def set_replay_speed(self, choice):
+        self.collector.session.set_speed(float(choice.rstrip("x")))
+        self.update_replay_status()
+
+    def seek_replay(self, offset):
+        session = self.collector.session
+        session.seek(session.start + offset)
+        self.update_replay_status()
+
+    def update_replay_status(self):
+        if not hasattr(self, "collector"):
+            return
+        session = self.collector.session
+        self.replay_slider.configure(to=max(session.end - session.start, 1))
+        self.replay_slider.set(session.position - session.start)
+        self.replay_button.configure(text="Pause" if session.playing else "Play")
+        position = datetime.fromtimestamp(session.position)
+        self.replay_status.configure(
+            text=f"{position.strftime('%Y-%m-%d %H:%M:%S')}\n"
+                 f"{datetime.fromtimestamp(session.end).strftime('%Y-%m-%d %H:%M:%S')} end, {session.status()}"
+        )
+
+    def toggle_flight_recorder(self):
+        self.collector.flight_recorder.set_enabled(bool(self.recorder_switch.get()))
+        self.update_flight_recorder_status()
+
+    def save_flight_recording(self):
+        # Alerts trigger the same dump from the collector; this is the manual hotkey
+        self.collector.flight_recorder.trigger("manual")
+        self.update_flight_recorder_status()
+
+    def update_flight_recorder_status(self):
+        if not hasattr(self, "collector") or self.replay_path:
+            return
+        recorder = self.collector.flight_recorder
+        if recorder.error:
+            print(recorder.error)
+            recorder.error = None
+        if recorder.last_dumps:
+            self.last_recording = recorder.last_dumps.pop()
+        text = recorder.status()
+        if getattr(self, "last_recording", None):
+            text += f"\nSaved {self.last_recording}"
+        self.recorder_status.configure(text=text)
+
+    def toggle_profiling(self):
+        duration = int(self.profile_duration.get().split()[0])
+        self.profile_session.toggle(duration)
+        self.update_profiling_status()
+
+    def update_profiling_status(self):
+        session = self.profile_session
+        if session.active:
+            self.profile_button.configure(text="Stop Profiling")
+            self.profile_status.configure(text=f"Profiling... {session.remaining():.0f}s left")
+        else:
+            self.profile_button.configure(text="Start Profiling")
+            if session.last_reports:
+                self.profile_status.configure(text=f"Saved {session.last_reports[0]}")
 
     def create_main_area(self):
         self.canvas = ctk.CTkCanvas(self)
@@ -383,10 +784,28 @@ class SystemMonitor(ctk.CTk):
         self.create_memory_section()
         self.create_virtual_memory_section()
         self.create_disk_section()
+        self.create_network_section()
+        self.create_containers_section()
+        self.create_numa_section()
         
         self.main_frame.bind("<Configure>", self.on_frame_configure)
         self.canvas.bind("<Configure>", self.on_canvas_configure)
         
+        self.pressure_boxes["cpu"].append(self.cpu_boxes["CPU Pressure"])
+        self.pressure_boxes["memory"].append(self.mem_boxes["Memory Pressure"])
+        self.pressure_boxes["io"].append(self.disk_boxes["I/O Pressure"])
+
+        # Alert rule value key each box reflects; a family key covers every mount
+        self.alert_boxes = [
+            (self.overview_boxes["CPU"], "cpu"), (self.cpu_boxes["CPU Usage"], "cpu"),
+            (self.overview_boxes["Memory"], "memory"), (self.mem_boxes["Memory Percentage"], "memory"),
+            (self.overview_boxes["Virtual Memory"], "commit"), (self.vm_boxes["Commit Charge"], "commit"),
+            (self.vm_boxes["Page File Usage"], "swap"), (self.vm_boxes["Swap In / Out"], "swap_in"),
+            (self.overview_boxes["Disk"], "disk"), (self.disk_boxes["Disk Usage Percentage"], "mount_free"),
+            (self.disk_boxes["Disk Full Forecast"], "mount_full_in_h"),
+            (self.net_boxes["Errors per Second"], "net_errors"),
+        ] + [(box, f"psi_{resource}") for resource, boxes in self.pressure_boxes.items() for box in boxes]
+        
         self.show_section("Overview")  
 
     def on_frame_configure(self, event=None):
@@ -411,8 +830,9 @@ class SystemMonitor(ctk.CTk):
             "Page File Usage",
             "Commit Charge",
             "Commit Limit",
-            "Peak Commit",
-            "Page Faults"
+            "Swap In / Out",
+            "Page Faults (minor / major)",
+            "Reclaim Scan / Steal"
         ]
         
         for i, metric in enumerate(metrics):
@@ -437,7 +857,8 @@ class SystemMonitor(ctk.CTk):
             "CPU Usage",
             "CPU Frequency",
             "Core Count",
-            "Thread Count"
+            "Thread Count",
+            "CPU Pressure"
         ]
         
         for i, metric in enumerate(metrics):
@@ -451,6 +872,12 @@ class SystemMonitor(ctk.CTk):
         self.cpu_graph = GraphFrame(section, "CPU Usage", "Percentage (%)")
         self.cpu_graph.grid(row=5, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
         
+        self.cpu_attribution = TableFrame(section, "Top CPU Contributors (drag across the graph to select a range)")
+        self.cpu_attribution.grid(row=6, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        self.cpu_graph.enable_selection(
+            lambda start, end: self.show_attribution("cpu", self.cpu_attribution, start, end)
+        )
+        
         self.sections["CPU"] = section
 
     def create_memory_section(self):
@@ -462,7 +889,14 @@ class SystemMonitor(ctk.CTk):
             "Total Memory",
             "Available Memory",
             "Used Memory",
-            "Memory Percentage"
+            "Memory Percentage",
+            "Memory Pressure",
+            "Cached",
+            "Buffers",
+            "Slab (reclaimable)",
+            "Dirty / Writeback",
+            "Huge Pages (free / total)",
+            "Shared Memory"
         ]
         
         for i, metric in enumerate(metrics):
@@ -476,6 +910,43 @@ class SystemMonitor(ctk.CTk):
         self.mem_graph = GraphFrame(section, "Memory Usage", "Percentage (%)")
         self.mem_graph.grid(row=5, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
         
+        self.mem_attribution = TableFrame(section, "Top Memory Growth (drag across the graph to select a range)")
+        self.mem_attribution.grid(row=6, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        self.mem_graph.enable_selection(
+            lambda start, end: self.show_attribution("rss", self.mem_attribution, start, end)
+        )
+        
+        self.deep_memory_switch = ctk.CTkSwitch(
+            section,
+            text="Deep memory scan (PSS / USS per process)",
+            command=self.toggle_deep_memory,
+            progress_color=self.colors["accent"],
+            button_color=self.colors["accent"],
+            button_hover_color=self.colors["accent"],
+            text_color=self.colors["text"]
+        )
+        self.deep_memory_switch.grid(row=7, column=0, columnspan=2, padx=10, pady=10, sticky="w")
+        
+        self.deep_memory_status = ctk.CTkLabel(
+            section,
+            text="Off",
+            font=ctk.CTkFont(size=12),
+            text_color=self.colors["text_secondary"]
+        )
+        self.deep_memory_status.grid(row=7, column=2, padx=10, pady=10, sticky="e")
+        
+        self.pss_process_table = TableFrame(section, "Processes by PSS")
+        self.pss_process_table.grid(row=8, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
+        self.pss_command_table = TableFrame(section, "Commands by PSS")
+        self.pss_command_table.grid(row=9, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
+        self.leak_table = TableFrame(section, "Fastest Growing Processes")
+        self.leak_table.grid(row=10, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
+        self.leak_graph = GraphFrame(section, "Fastest Growing Processes", "RSS (MB)")
+        self.leak_graph.grid(row=11, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
         self.sections["Memory"] = section
 
     def create_disk_section(self):
@@ -487,7 +958,9 @@ class SystemMonitor(ctk.CTk):
             "Total Disk Space",
             "Used Disk Space",
             "Free Disk Space",
-            "Disk Usage Percentage"
+            "Disk Usage Percentage",
+            "I/O Pressure",
+            "Disk Full Forecast"
         ]
         
         for i, metric in enumerate(metrics):
@@ -501,8 +974,95 @@ class SystemMonitor(ctk.CTk):
         self.disk_graph = GraphFrame(section, "Disk Usage Over Time", "Percentage (%)")
         self.disk_graph.grid(row=5, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
         
+        self.disk_attribution = TableFrame(section, "Top I/O Contributors (drag across the graph to select a range)")
+        self.disk_attribution.grid(row=6, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        self.disk_graph.enable_selection(
+            lambda start, end: self.show_attribution("io", self.disk_attribution, start, end)
+        )
+        
+        self.mount_table = TableFrame(section, "Mounted Filesystems")
+        self.mount_table.grid(row=7, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
+        self.mount_graph = GraphFrame(section, "Mount Usage Over Time", "Percentage (%)")
+        self.mount_graph.grid(row=8, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
         self.sections["Disk"] = section
 
+    def create_network_section(self):
+        section = ctk.CTkFrame(self.main_frame)
+        section.grid_columnconfigure((0, 1, 2), weight=1)
+        
+        self.net_boxes = {}
+        metrics = [
+            "Receive Rate",
+            "Transmit Rate",
+            "Packets per Second",
+            "Errors per Second",
+            "Drops per Second",
+            "TCP Retransmits"
+        ]
+        
+        for i, metric in enumerate(metrics):
+            box = MetricBox(section, metric)
+            box.grid(row=i//3, column=i%3, padx=10, pady=10, sticky="ew")
+            self.net_boxes[metric] = box
+        
+        self.net_table = TableFrame(section, "Busiest Interfaces")
+        self.net_table.grid(row=4, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
+        self.net_graph = GraphFrame(section, "Network Throughput", "MB/s")
+        self.net_graph.grid(row=5, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
+        self.sections["Network"] = section
+
+    def create_containers_section(self):
+        section = ctk.CTkFrame(self.main_frame)
+        section.grid_columnconfigure((0, 1, 2), weight=1)
+        
+        self.cgroup_boxes = {}
+        metrics = [
+            "Cgroups Tracked",
+            "Busiest Cgroup",
+            "Largest Cgroup"
+        ]
+        
+        for i, metric in enumerate(metrics):
+            box = MetricBox(section, metric)
+            box.grid(row=0, column=i, padx=10, pady=10, sticky="ew")
+            self.cgroup_boxes[metric] = box
+        
+        self.cgroup_table = TableFrame(section, "Top Cgroups by CPU", height=320)
+        self.cgroup_table.grid(row=1, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
+        self.cgroup_graph = GraphFrame(section, "Top Cgroups CPU Usage", "CPU %")
+        self.cgroup_graph.grid(row=2, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
+        self.sections["Containers"] = section
+
+    def create_numa_section(self):
+        section = ctk.CTkFrame(self.main_frame)
+        section.grid_columnconfigure((0, 1, 2), weight=1)
+        
+        self.numa_boxes = {}
+        metrics = [
+            "NUMA Nodes",
+            "Free Memory Imbalance",
+            "Remote Allocations"
+        ]
+        
+        for i, metric in enumerate(metrics):
+            box = MetricBox(section, metric)
+            box.grid(row=0, column=i, padx=10, pady=10, sticky="ew")
+            self.numa_boxes[metric] = box
+        
+        self.numa_table = TableFrame(section, "Per-Node Memory and CPU")
+        self.numa_table.grid(row=1, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
+        self.numa_graph = GraphFrame(section, "Per-Node CPU and Free Memory", "Percentage (%)")
+        self.numa_graph.grid(row=2, column=0, columnspan=3, padx=10, pady=10, sticky="ew")
+        
+        self.sections["NUMA"] = section
+
     def create_overview_section(self):
         section = ctk.CTkFrame(self.main_frame, fg_color="transparent")
         section.grid_columnconfigure((0, 1), weight=1)
@@ -540,12 +1100,23 @@ class SystemMonitor(ctk.CTk):
             box.grid(row=row, column=col, padx=10, pady=10, sticky="ew")
             self.overview_boxes[key] = box
         
+        pressure_frame = ctk.CTkFrame(section, fg_color="transparent")
+        pressure_frame.grid(row=3, column=0, columnspan=2, sticky="ew")
+        pressure_frame.grid_columnconfigure((0, 1, 2), weight=1)
+        
+        self.pressure_boxes = {}
+        for i, (resource, title) in enumerate([("cpu", "CPU Pressure"), ("memory", "Memory Pressure"), ("io", "I/O Pressure")]):
+            box = MetricBox(pressure_frame, title)
+            box.grid(row=0, column=i, padx=10, pady=10, sticky="ew")
+            self.pressure_boxes[resource] = [box]
+            self.overview_boxes[title] = box
+        
         perf_graph = GraphFrame(section, "System Performance Overview", "Usage (%)")
-        perf_graph.grid(row=3, column=0, columnspan=2, padx=10, pady=10, sticky="ew")
+        perf_graph.grid(row=4, column=0, columnspan=2, padx=10, pady=10, sticky="ew")
         self.overview_boxes["Performance"] = perf_graph
         
         details_frame = ctk.CTkFrame(section, fg_color=self.colors["surface"])
-        details_frame.grid(row=4, column=0, columnspan=2, padx=10, pady=10, sticky="ew")
+        details_frame.grid(row=5, column=0, columnspan=2, padx=10, pady=10, sticky="ew")
         details_frame.grid_columnconfigure((0, 1), weight=1)
         
         details = {
@@ -582,183 +1153,515 @@ class SystemMonitor(ctk.CTk):
         self.canvas.yview_moveto(0)
 
     def update_metrics(self):
+        next_render = 0.0
         while self.running:
             try:
-                cpu_percent = psutil.cpu_percent()
-                cpu_freq = psutil.cpu_freq().current
-                core_count = psutil.cpu_count(logical=False)
-                thread_count = psutil.cpu_count(logical=True)
-                virtual = psutil.virtual_memory()
-                swap = psutil.swap_memory()
-                current_time = datetime.now()
-                disk = psutil.disk_usage('/')
-                process = psutil.Process()
+                with self.profile_session.tick():
+                    self.timer.begin_tick()
+                    snapshot = self.collector.collect()
+                    # Sampling speeds up to 4 Hz during bursts; the window still redraws once a second,
+                    # or straight away after a replay seek
+                    seeked = "replay" in snapshot and snapshot["replay"]["seeked"]
+                    if time.monotonic() >= next_render or seeked:
+                        self.render(snapshot)
+                        next_render = time.monotonic() + RENDER_INTERVAL
+                    self.timer.end_tick()
+                time.sleep(min(self.collector.scheduler.delay(), RENDER_INTERVAL))
+
+            except Exception as e:
+                print(f"Error updating metrics: {e}")
+                time.sleep(1)
+
+    def render(self, snapshot):
+        cpu_percent = snapshot["cpu_percent"]
+        mem_percent = snapshot["mem_percent"]
+        disk_percent = snapshot["disk_percent"]
+        stage = self.timer.stage
+
+        # Series are sampled at their own adaptive rates, so each is plotted against its own times
+        cpu_times, cpu_history = self.history.window('cpu', GRAPH_SECONDS)
+        memory_times, memory_history = self.history.window('memory', GRAPH_SECONDS)
+        virtual_times, virtual_history = self.history.window('virtual', GRAPH_SECONDS)
+        disk_times, disk_history = self.history.window('disk', GRAPH_SECONDS)
+
+        if hasattr(self, 'overview_boxes'):
+            with stage("widgets.overview"):
+                if "CPU" in self.overview_boxes:
+                    self.overview_boxes["CPU"].value_label.configure(text=f"{cpu_percent:.1f}%")
+                if "Memory" in self.overview_boxes:
+                    self.overview_boxes["Memory"].value_label.configure(text=f"{mem_percent:.1f}%")
+                if "Disk" in self.overview_boxes:
+                    self.overview_boxes["Disk"].value_label.configure(text=f"{disk_percent:.1f}%")
+                if "Virtual Memory" in self.overview_boxes:
+                    self.overview_boxes["Virtual Memory"].value_label.configure(text=f"{mem_percent:.1f}%")
+            
+            
+            if "Performance" in self.overview_boxes:
+                perf_graph = self.overview_boxes["Performance"]
+                with stage("plot.overview"):
+                    perf_graph.ax.clear()
                 
-                self.history['time'].append(current_time)
-                self.history['cpu'].append(cpu_percent)
-                self.history['memory'].append(virtual.percent)
-                self.history['virtual'].append(virtual.percent)
-                self.history['disk'].append(psutil.disk_usage('/').percent)
-
-                if len(self.history['time']) > 60:
-                    for key in self.history:
-                        self.history[key].pop(0)
-
-                if hasattr(self, 'overview_boxes'):
-                    if "CPU" in self.overview_boxes:
-                        self.overview_boxes["CPU"].value_label.configure(text=f"{cpu_percent:.1f}%")
-                    if "Memory" in self.overview_boxes:
-                        self.overview_boxes["Memory"].value_label.configure(text=f"{virtual.percent:.1f}%")
-                    if "Disk" in self.overview_boxes:
-                        self.overview_boxes["Disk"].value_label.configure(text=f"{psutil.disk_usage('/').percent:.1f}%")
-                    if "Virtual Memory" in self.overview_boxes:
-                        self.overview_boxes["Virtual Memory"].value_label.configure(text=f"{virtual.percent:.1f}%")
-                    
-                    
-                    if "Performance" in self.overview_boxes:
-                        perf_graph = self.overview_boxes["Performance"]
-                        perf_graph.ax.clear()
-                        
-                       
-                        perf_graph.ax.set_facecolor("#1E2137")
-                        perf_graph.ax.grid(True, linestyle='--', alpha=0.2, color="#4A5B7A")
-                        perf_graph.ax.tick_params(colors="#B0B9D0", labelsize=9)
-                        
-                        perf_graph.ax.plot(self.history['time'], self.history['cpu'], 
-                                         label="CPU", color="#00A9FF", linewidth=2)
-                        perf_graph.ax.plot(self.history['time'], self.history['memory'], 
-                                         label="Memory", color="#FF6B6B", linewidth=2)
-                        perf_graph.ax.plot(self.history['time'], self.history['disk'], 
-                                         label="Disk", color="#32CD32", linewidth=2)
-                        
-                        perf_graph.ax.legend(loc='upper right', facecolor="#1E2137", 
-                                           edgecolor="#4A5B7A", labelcolor="#B0B9D0")
-                        
-                        perf_graph.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-                        perf_graph.ax.set_xlabel("Time", color="#B0B9D0", labelpad=10)
-                        perf_graph.ax.set_ylabel("Usage (%)", color="#B0B9D0", labelpad=10)
-                        
-                        perf_graph.canvas.draw()
-
-                self.cpu_boxes["CPU Usage"].value_label.configure(text=f"{cpu_percent:.1f}%")
-                self.cpu_boxes["CPU Frequency"].value_label.configure(text=f"{cpu_freq} MHz")
-                self.cpu_boxes["Core Count"].value_label.configure(text=f"{core_count} Cores")
-                self.cpu_boxes["Thread Count"].value_label.configure(text=f"{thread_count} Threads")
+                    perf_graph.ax.set_facecolor("#1E2137")
+                    perf_graph.ax.grid(True, linestyle='--', alpha=0.2, color="#4A5B7A")
+                    perf_graph.ax.tick_params(colors="#B0B9D0", labelsize=9)
                 
-                self.cpu_pie.update_chart(
-                    ["Used", "Idle"], [cpu_percent, 100 - cpu_percent], ["#FF6347", "#32CD32"]
-                )
+                    perf_graph.ax.plot(to_datetimes(cpu_times), cpu_history, 
+                                     label="CPU", color="#00A9FF", linewidth=2, drawstyle="steps-post")
+                    perf_graph.ax.plot(to_datetimes(memory_times), memory_history, 
+                                     label="Memory", color="#FF6B6B", linewidth=2, drawstyle="steps-post")
+                    perf_graph.ax.plot(to_datetimes(disk_times), disk_history, 
+                                     label="Disk", color="#32CD32", linewidth=2, drawstyle="steps-post")
                 
-                self.cpu_graph.ax.clear()
-                self.cpu_graph.ax.plot(self.history['time'], self.history['cpu'], label="CPU Usage", color="tomato")
-                self.cpu_graph.ax.legend()
-                self.cpu_graph.ax.set_xlabel("Time (s)", labelpad=10, color='white')
-                self.cpu_graph.ax.set_ylabel("CPU Usage (%)", labelpad=10, color='white')
-                self.cpu_graph.canvas.draw()
-
-                self.vm_boxes["Total Virtual Memory"].value_label.configure(
-                    text=f"{(virtual.total + swap.total) / (1024**3):.2f} GB"
-                )
-                self.vm_boxes["Used Virtual Memory"].value_label.configure(
-                    text=f"{swap.used / (1024**3):.2f} GB"
-                )
-                self.vm_boxes["Available Virtual Memory"].value_label.configure(
-                    text=f"{(virtual.available + swap.free) / (1024**3):.2f} GB"
-                )
-                self.vm_boxes["Page File Usage"].value_label.configure(
-                    text=f"{swap.percent:.1f}%"
-                )
+                    perf_graph.ax.legend(loc='upper right', facecolor="#1E2137", 
+                                       edgecolor="#4A5B7A", labelcolor="#B0B9D0")
+                
+                    perf_graph.ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
+                    perf_graph.ax.set_xlabel("Time", color="#B0B9D0", labelpad=10)
+                    perf_graph.ax.set_ylabel("Usage (%)", color="#B0B9D0", labelpad=10)
+                
+                with stage("draw.overview"):
+                    perf_graph.canvas.draw()
+
+        with stage("widgets.cpu"):
+            self.cpu_boxes["CPU Usage"].value_label.configure(text=f"{cpu_percent:.1f}%")
+            self.cpu_boxes["CPU Frequency"].value_label.configure(text=f"{snapshot['cpu_freq']} MHz")
+            self.cpu_boxes["Core Count"].value_label.configure(text=f"{snapshot['core_count']} Cores")
+            self.cpu_boxes["Thread Count"].value_label.configure(text=f"{snapshot['thread_count']} Threads")
+        
+        with stage("draw.cpu_pie"):
+            self.cpu_pie.update_chart(
+                ["Used", "Idle"], [cpu_percent, 100 - cpu_percent], ["#FF6347", "#32CD32"]
+            )
+        
+        with stage("plot.cpu_graph"):
+            cpu_times, cpu_window = self.graph_window("cpu", self.cpu_graph.window)
+            cpu_stats = self.history.stats.summary("cpu", self.cpu_graph.window)
+            self.cpu_boxes["CPU Usage"].subtitle_label.configure(text=self.stats_subtitle(self.cpu_graph.window, cpu_stats))
+            self.cpu_graph.ax.clear()
+            self.cpu_graph.ax.plot(to_datetimes(cpu_times), cpu_window, label="CPU Usage", color="tomato",
+                                   drawstyle="steps-post")
+            self.cpu_graph.draw_stats(cpu_stats)
+            if len(cpu_times):
+                self.cpu_graph.draw_anomalies(self.collector.anomalies.regions.get("cpu"), cpu_times[0])
+            self.cpu_graph.ax.legend()
+            self.cpu_graph.ax.set_xlabel("Time (s)", labelpad=10, color='white')
+            self.cpu_graph.ax.set_ylabel("CPU Usage (%)", labelpad=10, color='white')
+            self.cpu_graph.draw_selection()
+        with stage("draw.cpu_graph"):
+            self.cpu_graph.canvas.draw()
+
+        with stage("widgets.virtual"):
+            self.vm_boxes["Total Virtual Memory"].value_label.configure(
+                text=f"{(snapshot['mem_total'] + snapshot['swap_total']) / (1024**3):.2f} GB"
+            )
+            self.vm_boxes["Used Virtual Memory"].value_label.configure(
+                text=f"{snapshot['swap_used'] / (1024**3):.2f} GB"
+            )
+            self.vm_boxes["Available Virtual Memory"].value_label.configure(
+                text=f"{(snapshot['mem_available'] + snapshot['swap_free']) / (1024**3):.2f} GB"
+            )
+            self.vm_boxes["Page File Usage"].value_label.configure(
+                text=f"{snapshot['swap_percent']:.1f}%"
+            )
+            self.vm_boxes["Commit Limit"].value_label.configure(
+                text=f"{snapshot['commit_limit'] / (1024**3):.2f} GB"
+            )
+            if snapshot["commit_charge"] is not None:
                 self.vm_boxes["Commit Charge"].value_label.configure(
-                    text=f"{process.memory_info().private / (1024**3):.2f} GB"
+                    text=f"{snapshot['commit_charge'] / (1024**3):.2f} GB"
                 )
-                self.vm_boxes["Commit Limit"].value_label.configure(
-                    text=f"{(virtual.total + swap.total) / (1024**3):.2f} GB"
+            memory = snapshot["memory"]
+            if memory is not None:
+                self.vm_boxes["Swap In / Out"].value_label.configure(
+                    text=f"{memory['swap_in_s']:,.0f} / {memory['swap_out_s']:,.0f} pages/s"
                 )
-                self.vm_boxes["Peak Commit"].value_label.configure(
-                    text=f"{process.memory_info().peak_wset / (1024**3):.2f} GB"
+                self.vm_boxes["Page Faults (minor / major)"].value_label.configure(
+                    text=f"{memory['minor_faults_s']:,.0f} / {memory['major_faults_s']:,.0f} /s"
                 )
-                self.vm_boxes["Page Faults"].value_label.configure(
-                    text=f"{process.memory_info().num_page_faults:,}"
+                efficiency = memory["reclaim_efficiency"]
+                self.vm_boxes["Reclaim Scan / Steal"].value_label.configure(
+                    text=f"{memory['pgscan_s']:,.0f} / {memory['pgsteal_s']:,.0f} /s"
+                         + (f" ({efficiency:.0f}%)" if efficiency is not None else "")
                 )
+        with stage("draw.vm_pie"):
+            self.vm_pie.update_chart(
+                ["Used", "Free"], [mem_percent, 100 - mem_percent], ["#FF6347", "#32CD32"]
+            )
+        with stage("plot.vm_graph"):
+            self.vm_graph.ax.clear()
+            self.vm_graph.ax.plot(to_datetimes(virtual_times), virtual_history, label="Virtual Memory Usage", color="yellowgreen",
+                                  drawstyle="steps-post")
+            self.vm_graph.ax.legend()
+            self.vm_graph.ax.set_xlabel("Time (s)", labelpad=10, color='white')
+            self.vm_graph.ax.set_ylabel("Memory Usage (%)", labelpad=10, color='white')
+        with stage("draw.vm_graph"):
+            self.vm_graph.canvas.draw()
 
-                self.vm_pie.update_chart(
-                    ["Used", "Free"], [virtual.percent, 100 - virtual.percent], ["#FF6347", "#32CD32"]
-                )
-
-                self.vm_graph.ax.clear()
-                self.vm_graph.ax.plot(self.history['time'], self.history['virtual'], label="Virtual Memory Usage", color="yellowgreen")
-                self.vm_graph.ax.legend()
-                self.vm_graph.ax.set_xlabel("Time (s)", labelpad=10, color='white')
-                self.vm_graph.ax.set_ylabel("Memory Usage (%)", labelpad=10, color='white')
-                self.vm_graph.canvas.draw()
-
-                self.mem_boxes["Total Memory"].value_label.configure(
-                    text=f"{virtual.total / (1024**3):.2f} GB"
-                )
-                self.mem_boxes["Used Memory"].value_label.configure(
-                    text=f"{virtual.used / (1024**3):.2f} GB"
+        with stage("widgets.memory"):
+            self.mem_boxes["Total Memory"].value_label.configure(
+                text=f"{snapshot['mem_total'] / (1024**3):.2f} GB"
+            )
+            self.mem_boxes["Used Memory"].value_label.configure(
+                text=f"{snapshot['mem_used'] / (1024**3):.2f} GB"
+            )
+            self.mem_boxes["Available Memory"].value_label.configure(
+                text=f"{snapshot['mem_available'] / (1024**3):.2f} GB"
+            )
+            self.mem_boxes["Memory Percentage"].value_label.configure(
+                text=f"{mem_percent:.1f}%"
+            )
+            memory = snapshot["memory"]
+            if memory is not None:
+                self.mem_boxes["Cached"].value_label.configure(text=f"{memory['cached'] / (1024**3):.2f} GB")
+                self.mem_boxes["Buffers"].value_label.configure(text=f"{memory['buffers'] / (1024**3):.2f} GB")
+                self.mem_boxes["Slab (reclaimable)"].value_label.configure(
+                    text=f"{memory['slab'] / (1024**3):.2f} GB ({memory['slab_reclaimable'] / (1024**3):.2f})"
                 )
-                self.mem_boxes["Available Memory"].value_label.configure(
-                    text=f"{virtual.available / (1024**3):.2f} GB"
+                self.mem_boxes["Dirty / Writeback"].value_label.configure(
+                    text=f"{memory['dirty'] / (1024**2):,.0f} / {memory['writeback'] / (1024**2):,.0f} MB"
                 )
-                self.mem_boxes["Memory Percentage"].value_label.configure(
-                    text=f"{virtual.percent:.1f}%"
+                self.mem_boxes["Huge Pages (free / total)"].value_label.configure(
+                    text=f"{memory['hugepages_free'] / (1024**3):.2f} / {memory['hugepages_total'] / (1024**3):.2f} GB"
                 )
+                self.mem_boxes["Shared Memory"].value_label.configure(text=f"{memory['shmem'] / (1024**3):.2f} GB")
+        with stage("draw.mem_pie"):
+            self.mem_pie.update_chart(
+                ["Used", "Free"],
+                [mem_percent, 100 - mem_percent],
+                ["#FF6347", "#32CD32"]
+            )
+        with stage("plot.mem_graph"):
+            mem_times, mem_window = self.graph_window("memory", self.mem_graph.window)
+            mem_stats = self.history.stats.summary("memory", self.mem_graph.window)
+            self.mem_boxes["Memory Percentage"].subtitle_label.configure(
+                text=self.stats_subtitle(self.mem_graph.window, mem_stats)
+            )
+            self.mem_graph.ax.clear()
+            self.mem_graph.ax.plot(to_datetimes(mem_times), mem_window, 
+                                 label="Memory Usage", color="coral", drawstyle="steps-post")
+            self.mem_graph.draw_stats(mem_stats)
+            if len(mem_times):
+                self.mem_graph.draw_anomalies(self.collector.anomalies.regions.get("memory"), mem_times[0])
+            self.mem_graph.ax.legend()
+            self.mem_graph.ax.set_xlabel("Time", labelpad=10, color='white')
+            self.mem_graph.ax.set_ylabel("Memory Usage (%)", labelpad=10, color='white')
+            self.mem_graph.draw_selection()
+        with stage("draw.mem_graph"):
+            self.mem_graph.canvas.draw()
 
-                self.mem_pie.update_chart(
-                    ["Used", "Free"],
-                    [virtual.percent, 100 - virtual.percent],
-                    ["#FF6347", "#32CD32"]
-                )
-               
-                current_value = virtual.percent
-                y_min = max(0, current_value - 5)
-                y_max = min(100, current_value + 5)
-
-           
-                self.mem_graph.ax.clear()
-                self.mem_graph.ax.plot(self.history['time'], self.history['memory'], 
-                                     label="Memory Usage", color="coral")
-                self.mem_graph.ax.legend()
-                self.mem_graph.ax.set_xlabel("Time", labelpad=10, color='white')
-                self.mem_graph.ax.set_ylabel("Memory Usage (%)", labelpad=10, color='white')
-                self.mem_graph.canvas.draw()
-
-                try:
-                    self.disk_boxes["Total Disk Space"].value_label.configure(
-                        text=f"{disk.total / (1024**3):.2f} GB"
-                    )
-                    self.disk_boxes["Used Disk Space"].value_label.configure(
-                        text=f"{disk.used / (1024**3):.2f} GB"
-                    )
-                    self.disk_boxes["Free Disk Space"].value_label.configure(
-                        text=f"{disk.free / (1024**3):.2f} GB"
-                    )
-                    self.disk_boxes["Disk Usage Percentage"].value_label.configure(
-                        text=f"{disk.percent:.1f}%"
+        with stage("widgets.disk"):
+            self.disk_boxes["Total Disk Space"].value_label.configure(
+                text=f"{snapshot['disk_total'] / (1024**3):.2f} GB"
+            )
+            self.disk_boxes["Used Disk Space"].value_label.configure(
+                text=f"{snapshot['disk_used'] / (1024**3):.2f} GB"
+            )
+            self.disk_boxes["Free Disk Space"].value_label.configure(
+                text=f"{snapshot['disk_free'] / (1024**3):.2f} GB"
+            )
+            self.disk_boxes["Disk Usage Percentage"].value_label.configure(
+                text=f"{disk_percent:.1f}%"
+            )
+        with stage("draw.disk_pie"):
+            self.disk_pie.update_chart(
+                ["Used", "Free"], [disk_percent, 100 - disk_percent], ["#FF6347", "#32CD32"]
+            )
+        with stage("plot.disk_graph"):
+            disk_times, disk_window = self.graph_window("disk", self.disk_graph.window)
+            disk_stats = self.history.stats.summary("disk", self.disk_graph.window)
+            self.disk_boxes["Disk Usage Percentage"].subtitle_label.configure(
+                text=self.stats_subtitle(self.disk_graph.window, disk_stats)
+            )
+            self.disk_graph.ax.clear()
+            self.disk_graph.ax.plot(to_datetimes(disk_times), disk_window, label="Disk Usage", color="dodgerblue",
+                                    drawstyle="steps-post")
+            self.disk_graph.draw_stats(disk_stats)
+            if len(disk_times):
+                self.disk_graph.draw_anomalies(self.collector.anomalies.regions.get("disk"), disk_times[0])
+            self.disk_graph.ax.legend()
+            self.disk_graph.ax.set_xlabel("Time (s)", labelpad=10, color='white')
+            self.disk_graph.ax.set_ylabel("Disk Usage (%)", labelpad=10, color='white')
+            self.disk_graph.draw_selection()
+        with stage("draw.disk_graph"):
+            self.disk_graph.canvas.draw()
+
+        mounts = snapshot["mounts"]
+        with stage("widgets.mounts"):
+            rows = [
+                (m["mount"], m["fstype"], f"{m['total'] / (1024**3):,.1f} GB", f"{m['used'] / (1024**3):,.1f} GB",
+                 f"{m['avail'] / (1024**3):,.1f} GB", f"{m['percent']:.1f}%",
+                 f"{m['inode_percent']:.1f}%" if m["inodes"] else "--", format_eta(m["full_in_h"]), m["state"])
+                for m in mounts
+            ]
+            self.mount_table.update_rows(
+                ["Mount", "Type", "Size", "Used", "Avail", "Use", "Inodes", "Forecast", "State"], rows
+            )
+            forecasts = [m for m in mounts if m["full_in_h"] is not None]
+            soonest = min(forecasts, key=lambda m: m["full_in_h"]) if forecasts else None
+            self.disk_boxes["Disk Full Forecast"].value_label.configure(
+                text=f"{soonest['mount']} {format_eta(soonest['full_in_h'])}" if soonest else "No growth",
+                text_color=self.colors["warning"] if soonest and soonest["forecast_alert"] else self.colors["text"]
+            )
+        with stage("plot.mount_graph"):
+            self.mount_graph.ax.clear()
+            for m in sorted(mounts, key=lambda m: m["percent"], reverse=True)[:5]:
+                mount_times, mount_history = self.history.window(f"mount:{m['mount']}", GRAPH_POINTS * MOUNT_INTERVAL)
+                self.mount_graph.ax.plot(to_datetimes(mount_times), mount_history, label=m["mount"],
+                                         drawstyle="steps-post")
+            if mounts:
+                self.mount_graph.ax.legend()
+            self.mount_graph.ax.set_xlabel("Time (s)", labelpad=10, color='white')
+            self.mount_graph.ax.set_ylabel("Used (%)", labelpad=10, color='white')
+        with stage("draw.mount_graph"):
+            self.mount_graph.canvas.draw()
+
+        pressure = snapshot["pressure"]
+        with stage("widgets.pressure"):
+            now = time.monotonic()
+            for resource, boxes in self.pressure_boxes.items():
+                entry = pressure.get(resource) if pressure else None
+                stalled = self.pressure_alerts.get(resource, 0) > now
+                for box in boxes:
+                    box.value_label.configure(
+                        text=format_pressure(entry),
+                        text_color=self.colors["warning"] if stalled else self.colors["text"]
                     )
-                except AttributeError as e:
-                    print(f"Disk metrics error: {e}")
 
-                self.disk_pie.update_chart(
-                    ["Used", "Free"], [disk.percent, 100 - disk.percent], ["#FF6347", "#32CD32"]
+        with stage("widgets.alerts"):
+            alerts = self.collector.alerts
+            for box, key in self.alert_boxes:
+                box.set_level(alerts.level(key))
+            for event in snapshot["alerts"]:
+                print(format_event(event))
+            if alerts.error:
+                print(alerts.error)
+                alerts.error = ""
+
+        network = snapshot["network"]
+        with stage("widgets.network"):
+            self.net_boxes["Receive Rate"].value_label.configure(text=format_rate(network["rx_bytes_s"]))
+            self.net_boxes["Transmit Rate"].value_label.configure(text=format_rate(network["tx_bytes_s"]))
+            self.net_boxes["Packets per Second"].value_label.configure(
+                text=f"{network['rx_packets_s'] + network['tx_packets_s']:,.0f}"
+            )
+            self.net_boxes["Errors per Second"].value_label.configure(text=f"{network['errors_s']:,.1f}")
+            self.net_boxes["Drops per Second"].value_label.configure(text=f"{network['drops_s']:,.1f}")
+            self.net_boxes["TCP Retransmits"].value_label.configure(
+                text=f"{network['tcp_retrans_s']:,.1f}/s ({network['tcp_retrans_pct']:.2f}%)"
+            )
+            rates = network["rates"]
+            rows = [
+                (network["names"][i], format_rate(rates[i, 0]), format_rate(rates[i, 1]),
+                 f"{rates[i, 2] + rates[i, 3]:,.0f}", f"{rates[i, 4] + rates[i, 5]:,.1f}",
+                 f"{rates[i, 6] + rates[i, 7]:,.1f}")
+                for i in NetworkCollector.top_interfaces(network)
+            ]
+            self.net_table.update_rows(["Interface", "RX", "TX", "Packets/s", "Errors/s", "Drops/s"], rows)
+        with stage("plot.net_graph"):
+            rx_times, rx_history = self.history.window('net_rx', GRAPH_SECONDS)
+            tx_times, tx_history = self.history.window('net_tx', GRAPH_SECONDS)
+            self.net_graph.ax.clear()
+            self.net_graph.ax.plot(to_datetimes(rx_times), rx_history / (1024**2), label="Receive", color="deepskyblue",
+                                   drawstyle="steps-post")
+            self.net_graph.ax.plot(to_datetimes(tx_times), tx_history / (1024**2), label="Transmit", color="orange",
+                                   drawstyle="steps-post")
+            self.net_graph.ax.legend()
+            self.net_graph.ax.set_xlabel("Time (s)", labelpad=10, color='white')
+            self.net_graph.ax.set_ylabel("Throughput (MB/s)", labelpad=10, color='white')
+        with stage("draw.net_graph"):
+            self.net_graph.canvas.draw()
+
+        self.render_cgroups(snapshot["cgroups"])
+        self.render_numa(snapshot["numa"])
+        self.render_deep_memory(snapshot["deep_memory"])
+        self.render_leaks(snapshot["leaks"])
+
+    def render_leaks(self, leaks):
+        stage = self.timer.stage
+        growing = leaks["growing"]
+        with stage("widgets.leaks"):
+            rows = [
+                (pid, comm, f"{rss / 1024**2:,.0f} MB", f"{pss / 1024**2:,.0f} MB" if pss is not None else "--",
+                 f"+{per_hour / 1024**2:,.1f} MB/h", format_duration(oom_hours))
+                for pid, comm, rss, pss, per_hour, oom_hours in growing
+            ]
+            self.leak_table.update_rows(["PID", "Command", "RSS", "PSS", "Growth", "Time to OOM"], rows)
+        with stage("plot.leak_graph"):
+            self.leak_graph.ax.clear()
+            for pid, comm, *_ in growing[:5]:
+                times, rss = self.collector.leaks.series(pid)
+                self.leak_graph.ax.plot(to_datetimes(times), rss / 1024**2, label=f"{comm} ({pid})")
+            if growing:
+                self.leak_graph.ax.legend()
+            self.leak_graph.ax.set_xlabel("Time (s)", labelpad=10, color='white')
+            self.leak_graph.ax.set_ylabel("RSS (MB)", labelpad=10, color='white')
+        with stage("draw.leak_graph"):
+            self.leak_graph.canvas.draw()
+
+    def graph_window(self, name, window):
+        seconds = WINDOWS[window]
+        if seconds < ROLLUP_SECONDS:
+            return self.history.window(name, seconds)
+        now = self.history.until if self.history.until is not None else time.time()
+        end = now - now % ROLLUP_STEP + ROLLUP_STEP
+        return self.history.select(name, end - seconds, end, ROLLUP_STEP, "mean")
+
+    def stats_subtitle(self, window, summary):
+        if summary is None:
+            return ""
+        return (f"{window}: p50 {summary['p50']:.1f}  p95 {summary['p95']:.1f}  p99 {summary['p99']:.1f}\n"
+                f"min {summary['min']:.1f}  max {summary['max']:.1f}  EWMA {summary['ewma']:.1f}")
+
+    def show_attribution(self, metric, table, start, end):
+        rows, total = self.collector.history.contributors.aggregate(metric, start, end)
+        if metric == "cpu":
+            amount = lambda value: f"{value:,.1f} CPU-s"
+        else:
+            amount = lambda value: f"{value / 1024**2:,.1f} MB"
+        span = f"{datetime.fromtimestamp(start).strftime('%H:%M:%S')} - {datetime.fromtimestamp(end).strftime('%H:%M:%S')}"
+        table.update_rows(
+            ["PID", "Command", "Amount", "Share", "Ticks in top 10"],
+            [(pid, comm, amount(value), f"{share:.1f}%", ticks) for pid, comm, value, share, ticks in rows]
+            + [("", f"{span}, total", amount(total), "", "")]
+        )
+
+    def toggle_deep_memory(self):
+        if self.replay_path:
+            return
+        enabled = self.collector.deep_memory.toggle()
+        self.deep_memory_status.configure(text="Scanning..." if enabled else "Off")
+
+    def render_deep_memory(self, deep_memory):
+        if deep_memory is None:
+            return
+        mb = 1024**2
+        with self.timer.stage("widgets.deep_memory"):
+            self.deep_memory_status.configure(
+                text=f"{deep_memory['tracked']:,} processes, PSS {deep_memory['pss_total'] / 1024**3:.2f} GB, "
+                     f"last pass {deep_memory['scanned']:,} in {deep_memory['pass_ms']:.0f} ms"
+                     + (f", {deep_memory['denied']:,} denied" if deep_memory["denied"] else "")
+            )
+            self.pss_process_table.update_rows(
+                ["PID", "Command", "RSS", "PSS", "USS", "Swap"],
+                [(pid, comm, f"{rss / mb:,.0f} MB", f"{pss / mb:,.0f} MB", f"{uss / mb:,.0f} MB", f"{swap / mb:,.0f} MB")
+                 for pid, comm, rss, pss, uss, swap in deep_memory["processes"]]
+            )
+            self.pss_command_table.update_rows(
+                ["Command", "Processes", "RSS", "PSS", "USS", "Swap"],
+                [(comm, count, f"{rss / mb:,.0f} MB", f"{pss / mb:,.0f} MB", f"{uss / mb:,.0f} MB", f"{swap / mb:,.0f} MB")
+                 for comm, count, rss, pss, uss, swap in deep_memory["commands"]]
+            )
+
+    def render_numa(self, numa):
+        stage = self.timer.stage
+        if numa is None:
+            self.numa_boxes["NUMA Nodes"].value_label.configure(text="Not available")
+            return
+        with stage("widgets.numa"):
+            self.numa_boxes["NUMA Nodes"].value_label.configure(text=str(len(numa["nodes"])))
+            self.numa_boxes["Free Memory Imbalance"].value_label.configure(text=f"{numa['imbalance']:.1f} pts")
+            allocated = numa["local_s"].sum() + numa["remote_s"].sum()
+            remote = 100.0 * numa["remote_s"].sum() / allocated if allocated else 0.0
+            self.numa_boxes["Remote Allocations"].value_label.configure(text=f"{remote:.1f}%")
+            rows = [
+                (f"node{node}", format_cpulist(numa["cpus"][i]), f"{numa['cpu_percent'][i]:.1f}%",
+                 f"{numa['mem_total'][i] / (1024**3):.2f} GB", f"{numa['mem_free'][i] / (1024**3):.2f} GB",
+                 f"{numa['free_percent'][i]:.1f}%",
+                 f"{numa['local_percent'][i]:.1f}%" if not np.isnan(numa["local_percent"][i]) else "--",
+                 f"{numa['miss_s'][i]:,.0f}")
+                for i, node in enumerate(numa["nodes"])
+            ]
+            self.numa_table.update_rows(
+                ["Node", "CPUs", "CPU", "Memory", "Free", "Free %", "Local Allocs", "Misses/s"], rows
+            )
+        with stage("plot.numa_graph"):
+            self.numa_graph.ax.clear()
+            for node in numa["nodes"]:
+                cpu_times, node_cpu = self.history.window(f"numa_cpu:{node}", GRAPH_SECONDS)
+                free_times, node_free = self.history.window(f"numa_free:{node}", GRAPH_SECONDS)
+                self.numa_graph.ax.plot(to_datetimes(cpu_times), node_cpu, label=f"node{node} CPU",
+                                        drawstyle="steps-post")
+                self.numa_graph.ax.plot(to_datetimes(free_times), node_free, label=f"node{node} free", linestyle="--",
+                                        drawstyle="steps-post")
+            self.numa_graph.ax.legend()
+            self.numa_graph.ax.set_xlabel("Time (s)", labelpad=10, color='white')
+            self.numa_graph.ax.set_ylabel("Percentage (%)", labelpad=10, color='white')
+        with stage("draw.numa_graph"):
+            self.numa_graph.canvas.draw()
+
+    def render_cgroups(self, cgroups):
+        stage = self.timer.stage
+        if cgroups is None:
+            self.cgroup_boxes["Cgroups Tracked"].value_label.configure(text="cgroup v2 unavailable")
+            return
+        names = cgroups["names"]
+        top_rows = cgroups["top_rows"]
+        with stage("widgets.cgroups"):
+            self.cgroup_boxes["Cgroups Tracked"].value_label.configure(text=f"{cgroups['count']:,}")
+            if top_rows:
+                busiest = top_rows[0]
+                largest = CgroupCollector.top(cgroups, "memory", count=1)[0]
+                self.cgroup_boxes["Busiest Cgroup"].value_label.configure(
+                    text=f"{os.path.basename(names[busiest])} {cgroups['cpu_percent'][busiest]:.1f}%"
                 )
+                self.cgroup_boxes["Largest Cgroup"].value_label.configure(
+                    text=f"{os.path.basename(names[largest])} {cgroups['memory'][largest] / 1024**3:.2f} GB"
+                )
+            rows = [
+                (names[i], f"{cgroups['cpu_percent'][i]:.1f}%", f"{cgroups['memory'][i] / 1024**2:,.0f} MB",
+                 f"{cgroups['anon'][i] / 1024**2:,.0f} MB", f"{cgroups['file'][i] / 1024**2:,.0f} MB",
+                 format_rate(cgroups["io_read_s"][i]), format_rate(cgroups["io_write_s"][i]))
+                for i in top_rows
+            ]
+            self.cgroup_table.update_rows(["Cgroup", "CPU", "Memory", "Anon", "File", "Read", "Write"], rows)
+        with stage("plot.cgroup_graph"):
+            self.cgroup_graph.ax.clear()
+            for row in top_rows[:5]:
+                cgroup_times, cgroup_history = self.history.window(f"cgroup_cpu:{names[row]}", GRAPH_SECONDS)
+                self.cgroup_graph.ax.plot(to_datetimes(cgroup_times), cgroup_history,
+                                          label=os.path.basename(names[row]), drawstyle="steps-post")
+            if top_rows:
+                self.cgroup_graph.ax.legend()
+            self.cgroup_graph.ax.set_xlabel("Time (s)", labelpad=10, color='white')
+            self.cgroup_graph.ax.set_ylabel("CPU (% of one core)", labelpad=10, color='white')
+        with stage("draw.cgroup_graph"):
+            self.cgroup_graph.canvas.draw()
 
-                self.disk_graph.ax.clear()
-                self.disk_graph.ax.plot(self.history['time'], self.history['disk'], label="Disk Usage", color="dodgerblue")
-                self.disk_graph.ax.legend()
-                self.disk_graph.ax.set_xlabel("Time (s)", labelpad=10, color='white')
-                self.disk_graph.ax.set_ylabel("Disk Usage (%)", labelpad=10, color='white')
-                self.disk_graph.canvas.draw()
+    def start_pressure_triggers(self):
+        self.pressure_alerts = {}
+        self.pressure_triggers = []
+        if not self.collector.pressure.available:
+            return
+        for resource, kind, threshold_us, window_us in DEFAULT_TRIGGERS:
+            trigger = PressureTrigger(resource, kind, threshold_us, window_us, self.on_pressure_event,
+                                      proc_root=self.collector.backend.proc_root)
+            trigger.start()
+            self.pressure_triggers.append(trigger)
 
-                time.sleep(1)
+    def on_pressure_event(self, resource, kind):
+        # Called from the trigger thread; the box stays highlighted for 10 s
+        self.pressure_alerts[resource] = time.monotonic() + 10
+        self.notice = f"Pressure stall on {resource} ({kind}) at {datetime.now().strftime('%H:%M:%S')}"
 
-            except Exception as e:
-                print(f"Error updating metrics: {e}")
-                time.sleep(1)
+    def on_forecast_alert(self, mount, hours):
+        self.notice = f"{mount} is forecast to be {format_eta(hours)} at {datetime.now().strftime('%H:%M:%S')}"
+
+    def on_anomaly(self, anomaly):
+        self.notice = (f"Anomaly ({anomaly['kind']}) in {anomaly['name']}: {anomaly['value']:.2f} against "
+                       f"{anomaly['baseline']:.2f} at {datetime.now().strftime('%H:%M:%S')}")
 
     def on_closing(self):
         self.running = False
+        for trigger in self.pressure_triggers:
+            trigger.stop()
+        if not self.replay_path:
+            self.collector.deep_memory.set_enabled(False)
+            self.collector.flight_recorder.set_enabled(False)
+            try:
+                self.collector.anomalies.save(SEASONAL_PATH)
+            except OSError as e:
+                print(f"Error saving seasonal baseline: {e}")
+            self.collector.close()
         self.destroy()
 
     def create_status_bar(self):
@@ -776,6 +1679,14 @@ class SystemMonitor(ctk.CTk):
             text_color=self.colors["text_secondary"]
         )
         sys_info.pack(side="left", padx=15)
+
+        self.status_label = ctk.CTkLabel(
+            self.status_bar,
+            text="",
+            font=ctk.CTkFont(size=12),
+            text_color=self.colors["text_secondary"]
+        )
+        self.status_label.pack(side="left", padx=15)
         
         self.clock_label = ctk.CTkLabel(
             self.status_bar,
@@ -784,13 +1695,87 @@ class SystemMonitor(ctk.CTk):
             text_color=self.colors["text_secondary"]
         )
         self.clock_label.pack(side="right", padx=15)
+        
+        trace_button = ctk.CTkButton(
+            self.status_bar,
+            text="Dump Trace",
+            command=self.dump_trace,
+            width=90,
+            height=22,
+            corner_radius=6,
+            fg_color="transparent",
+            hover_color=self.colors["accent"],
+            text_color=self.colors["text_secondary"],
+            border_width=1,
+            border_color=self.colors["border"],
+            font=ctk.CTkFont(size=11)
+        )
+        trace_button.pack(side="right", padx=5)
+
+        export_button = ctk.CTkButton(
+            self.status_bar,
+            text="Export History",
+            command=self.export_history,
+            width=100,
+            height=22,
+            corner_radius=6,
+            fg_color="transparent",
+            hover_color=self.colors["accent"],
+            text_color=self.colors["text_secondary"],
+            border_width=1,
+            border_color=self.colors["border"],
+            font=ctk.CTkFont(size=11)
+        )
+        export_button.pack(side="right", padx=5)
+        
+        self.overhead_label = ctk.CTkLabel(
+            self.status_bar,
+            text="Monitor: --",
+            font=ctk.CTkFont(size=12),
+            text_color=self.colors["text_secondary"]
+        )
+        self.overhead_label.pack(side="right", padx=15)
+
+        self.history_label = ctk.CTkLabel(
+            self.status_bar,
+            text="History: --",
+            font=ctk.CTkFont(size=12),
+            text_color=self.colors["text_secondary"]
+        )
+        self.history_label.pack(side="right", padx=15)
         self.update_clock()
 
     def update_clock(self):
         current_time = datetime.now().strftime("%H:%M:%S")
         self.clock_label.configure(text=current_time)
+        self.overhead_label.configure(text=self.timer.status_text())
+        if hasattr(self, 'history'):
+            self.history_label.configure(text=f"History: {self.history.bytes_per_sample():.1f} B/sample")
+            while self.exporter.last_exports:
+                self.notice = f"History exported to {self.exporter.last_exports.pop()}"
+            if self.exporter.error:
+                self.notice = self.exporter.error
+                self.exporter.error = None
+        self.status_label.configure(text=self.notice)
+        self.update_profiling_status()
+        if self.replay_path:
+            self.update_replay_status()
+        else:
+            self.update_flight_recorder_status()
         self.after(1000, self.update_clock)
 
+    def dump_trace(self):
+        try:
+            self.notice = f"Trace written to {self.timer.dump_trace()}"
+        except OSError as e:
+            self.notice = f"Error writing trace: {e}"
+        self.status_label.configure(text=self.notice)
+
+    def export_history(self):
+        path = self.exporter.start()
+        self.notice = f"Exporting history to {path}" if path else "An export is already running"
+        self.status_label.configure(text=self.notice)
+
     def toggle_theme(self):
         self.colors = self.theme_manager.toggle_theme()
         ctk.set_appearance_mode("dark" if self.theme_manager.is_dark else "light")
@@ -845,11 +1830,21 @@ class SystemMonitor(ctk.CTk):
                     self.status_label.configure(text_color=self.colors["text_secondary"])
                 if hasattr(self, 'time_label'):
                     self.time_label.configure(text_color=self.colors["text_secondary"])
+                if hasattr(self, 'overhead_label'):
+                    self.overhead_label.configure(text_color=self.colors["text_secondary"])
         
         except Exception as e:
             print(f"Error updating theme: {e}")
 
 if __name__ == "__main__":
-    app = SystemMonitor()
+    if "--tui" in sys.argv:
+        from terminal_ui import main
+        main([arg for arg in sys.argv[1:] if arg != "--tui"])
+        sys.exit()
+    replay = None
+    if "--replay" in sys.argv:
+        # python app.py --replay exports/history-....parquet
+        replay = sys.argv[sys.argv.index("--replay") + 1]
+    app = SystemMonitor(replay, notify="--notify" in sys.argv)
     app.protocol("WM_DELETE_WINDOW", app.on_closing)
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,90 @@
+import numpy as np
+
+METRICS = ("cpu", "rss", "io")
+
+
+class ContributorStore:
+    """Top-K processes per tick for each metric, in columnar arrays
+
+    Each tick adds one row: its time, the total over every sampled process,
+    and (pid, amount) for the k largest contributors. Rows are kept in
+    order in a double-length buffer like history.SeriesBuffer, so a time
+    range maps to a contiguous row slice with two binary searches and only
+    the rows inside it are aggregated.
+    """
+
+    def __init__(self, capacity=3600, k=10):
+        self.capacity = capacity
+        self.k = k
+        self.times = np.empty(capacity * 2, dtype=np.float64)
+        self.totals = np.zeros((capacity * 2, len(METRICS)), dtype=np.float64)
+        self.pids = np.zeros((len(METRICS), capacity * 2, k), dtype=np.int32)
+        self.amounts = np.zeros((len(METRICS), capacity * 2, k), dtype=np.float32)
+        self.start = 0
+        self.end = 0
+        self.comms = {}
+
+    def __len__(self):
+        return self.end - self.start
+
+    def compact(self):
+        keep = self.end - self.start
+        for array in (self.times, self.totals):
+            array[:keep] = array[self.start:self.end]
+        self.pids[:, :keep] = self.pids[:, self.start:self.end]
+        self.amounts[:, :keep] = self.amounts[:, self.start:self.end]
+        self.start, self.end = 0, keep
+        # Forget names no remaining row refers to
+        live = set(np.unique(self.pids[:, :keep]).tolist())
+        self.comms = {pid: comm for pid, comm in self.comms.items() if pid in live}
+
+    def record(self, timestamp, pids, columns, comms):
+        """columns: {"cpu": cpu seconds, "rss": RSS change in bytes, "io": bytes}, aligned with pids"""
+        if self.end == len(self.times):
+            self.compact()
+        row = self.end
+        self.times[row] = timestamp
+        k = min(self.k, len(pids))
+        for m, metric in enumerate(METRICS):
+            values = columns[metric]
+            self.totals[row, m] = values[values > 0].sum()
+            self.pids[m, row] = 0
+            self.amounts[m, row] = 0
+            if not k:
+                continue
+            top = np.argpartition(values, len(values) - k)[-k:]
+            self.pids[m, row, :k] = pids[top]
+            self.amounts[m, row, :k] = values[top]
+            for pid in pids[top].tolist():
+                if pid not in self.comms:
+                    self.comms[pid] = comms.get(pid, "?")
+        self.end += 1
+        if self.end - self.start > self.capacity:
+            self.start += 1
+
+    def rows(self, start_time, end_time):
+        """Row slice covering [start_time, end_time]"""
+        times = self.times[self.start:self.end]
+        first = self.start + int(np.searchsorted(times, start_time, side="left"))
+        last = self.start + int(np.searchsorted(times, end_time, side="right"))
+        return first, last
+
+    def aggregate(self, metric, start_time, end_time, count=15):
+        """Top contributors over the range as (pid, comm, amount, share of total %, ticks in top-K)"""
+        m = METRICS.index(metric)
+        first, last = self.rows(start_time, end_time)
+        if first >= last:
+            return [], 0.0
+        pids = self.pids[m, first:last].ravel()
+        amounts = self.amounts[m, first:last].ravel().astype(np.float64)
+        positive = amounts > 0
+        pids, amounts = pids[positive], amounts[positive]
+        total = float(self.totals[first:last, m].sum())
+        unique, inverse = np.unique(pids, return_inverse=True)
+        sums = np.bincount(inverse, amounts, minlength=len(unique))
+        ticks = np.bincount(inverse, minlength=len(unique))
+        order = np.argsort(sums)[::-1][:count]
+        rows = [(int(unique[i]), self.comms.get(int(unique[i]), "?"), float(sums[i]),
+                 float(100.0 * sums[i] / total) if total > 0 else 0.0, int(ticks[i]))
+                for i in order]
+        return rows, total
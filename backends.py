@@ -0,0 +1,57 @@
+import os
+import time
+
+import psutil
+
+
+class SystemClock:
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+class PsutilBackend:
+    """Live host data source; collectors that parse /proc and /sys use the roots below"""
+
+    proc_root = "/proc"
+    sys_root = "/sys"
+
+    def __init__(self, clock=None):
+        self.clock = clock or SystemClock()
+        self.process = psutil.Process()
+
+    def cpu_percent(self):
+        return psutil.cpu_percent()
+
+    def cpu_freq(self):
+        freq = psutil.cpu_freq()
+        return freq.current if freq else 0.0
+
+    def cpu_count(self, logical=True):
+        return psutil.cpu_count(logical=logical)
+
+    def virtual_memory(self):
+        return psutil.virtual_memory()
+
+    def swap_memory(self):
+        return psutil.swap_memory()
+
+    def disk_usage(self, path):
+        return psutil.disk_usage(path)
+
+    def statvfs(self, path):
+        """Capacity and inode counts in the same shape as a fixture's statvfs.json entry"""
+        if not hasattr(os, "statvfs"):
+            usage = psutil.disk_usage(path)
+            return {"total": usage.total, "free": usage.free, "avail": usage.free, "files": 0, "files_free": 0}
+        st = os.statvfs(path)
+        return {"total": st.f_blocks * st.f_frsize, "free": st.f_bfree * st.f_frsize,
+                "avail": st.f_bavail * st.f_frsize, "files": st.f_files, "files_free": st.f_ffree}
+
+    def process_memory(self):
+        return self.process.memory_info()
@@ -0,0 +1,294 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from alerts import AlertEngine, metric_values
+from collector import MetricsCollector
+from fakeproc import SCENARIOS, synthetic_backend
+from gorilla import decode
+from history import HistoryStore, to_datetimes
+from procmem import DeepMemoryScanner
+
+HISTORY_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RENDER_LENGTHS = [60, 300, 900, 3600]
+GRAPH_POINTS = 60
+
+
+def timings(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples = np.array(samples)
+    return {
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "max_ms": float(samples.max()),
+        "mean_ms": float(samples.mean()),
+    }
+
+
+def bench_collection(ticks, scenario=None, adaptive=False):
+    """Cost of one collect(); with adaptive only the groups the scheduler has due are sampled"""
+    if scenario is None:
+        collector = MetricsCollector(adaptive=adaptive)
+        collector.collect()
+        result = timings(collector.collect, ticks)
+        collector.close()
+        return result
+
+    with tempfile.TemporaryDirectory(prefix=f"bench-{scenario}-") as root:
+        backend, replayer = synthetic_backend(root, scenario)
+        collector = MetricsCollector(backend=backend, adaptive=adaptive)
+        collector.collect()
+        samples = []
+        for _ in range(ticks):
+            # Only the collector is timed; writing the next fixture frame is not
+            replayer.step()
+            start = time.perf_counter()
+            collector.collect()
+            samples.append((time.perf_counter() - start) * 1000)
+        collector.close()
+    samples = np.array(samples)
+    return {
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "max_ms": float(samples.max()),
+        "mean_ms": float(samples.mean()),
+    }
+
+
+def bench_deep_memory(repeat, scenario="container-host"):
+    """Wall time of a full smaps_rollup pass over every process in the fixture"""
+    with tempfile.TemporaryDirectory(prefix=f"bench-smaps-{scenario}-") as root:
+        backend, _ = synthetic_backend(root, scenario)
+        scanner = DeepMemoryScanner(backend)
+        scanner.set_enabled(True)
+
+        def full_pass():
+            scanner.due.clear()
+            scanner.collect()
+            for future in scanner.futures:
+                future.result()
+            scanner.collect()
+
+        result = timings(full_pass, repeat)
+        result["processes"] = scanner.summary["scanned"]
+        scanner.set_enabled(False)
+    return result
+
+
+def bench_alerts(repeat, rule_count=1000, scenario="small"):
+    """Evaluation time per tick of rule_count rules spread over every value of a fixture snapshot"""
+    with tempfile.TemporaryDirectory(prefix=f"bench-alerts-{scenario}-") as root:
+        backend, replayer = synthetic_backend(root, scenario)
+        collector = MetricsCollector(backend=backend)
+        for _ in range(3):
+            replayer.step()
+            snapshot = collector.collect()
+        collector.close()
+    values = metric_values(snapshot)
+    keys = sorted(values)
+    rng = np.random.default_rng(0)
+    rules = [f"{keys[i % len(keys)]} {'><'[i % 2]} {rng.uniform(0, 100):.1f} for {rng.integers(0, 120)}s"
+             for i in range(rule_count)]
+    engine = AlertEngine(rules)
+    tick = [snapshot["time"]]
+
+    def evaluate():
+        # New values every tick so rules keep moving between states
+        tick[0] += 1.0
+        values["cpu"] = rng.uniform(0, 100)
+        values["memory"] = rng.uniform(0, 100)
+        engine.evaluate(values, tick[0])
+
+    evaluate()
+    result = timings(evaluate, repeat)
+    result["instances"] = len(engine.instances)
+    return result
+
+
+def bench_history(sizes):
+    results = {}
+    for size in sizes:
+        store = HistoryStore(capacity=size)
+        values = np.random.default_rng(0).uniform(0, 100, size)
+        start = time.perf_counter()
+        for i in range(size):
+            store.append("cpu", float(i), values[i])
+        append_s = time.perf_counter() - start
+
+        slice_stats = timings(lambda: store.get("cpu", last=GRAPH_POINTS), 1000)
+        # An hour is the widest graph window; older points come from compressed blocks
+        window_stats = timings(lambda: to_datetimes(store.window("cpu", 3600)[0]), 20)
+        # The same hour through select(): held at 1 s steps from the points, and 10 s means from a rollup tier.
+        # Cold runs clear the decoded block cache first; the newest hour should not need it, a day back does.
+        # The sub-millisecond select thresholds cover the newest hour only: an hour a day back decodes its
+        # 4-5 blocks in Python at about 1.5 ms each, so its threshold is a regression ceiling, not a target.
+        now = float(size - 1)
+        select_stats = timings(lambda: store.select("cpu", now - 3600, now, 1.0), 200)
+        cold_stats = timings(lambda: (decode.cache_clear(), store.select("cpu", now - 3600, now, 1.0)), 50)
+        old = max(0.0, now - 86400)
+        old_stats = timings(lambda: (decode.cache_clear(), store.select("cpu", old - 3600, old, 1.0)), 20)
+        rollup_stats = timings(lambda: store.select("cpu", now - now % 10 - 3600, now - now % 10, 10.0, "mean"), 200)
+        results[str(size)] = {
+            "append_per_s": size / append_s,
+            "append_us": append_s / size * 1e6,
+            "slice_last_us": slice_stats["p50_ms"] * 1000,
+            "window_1h_ms": window_stats["p50_ms"],
+            "select_1h_1s_us": select_stats["p50_ms"] * 1000,
+            "select_1h_1s_cold_us": cold_stats["p50_ms"] * 1000,
+            "select_1h_1s_day_old_cold_us": old_stats["p50_ms"] * 1000,
+            "select_1h_10s_mean_us": rollup_stats["p50_ms"] * 1000,
+            "bytes_per_sample": store.bytes_per_sample(),
+        }
+    return results
+
+
+def bench_render(lengths, repeat):
+    plt.style.use("dark_background")
+    results = {}
+    for length in lengths:
+        fig, ax = plt.subplots(figsize=(8, 4), dpi=100)
+        times = to_datetimes(time.time() - np.arange(length)[::-1].astype(np.float64))
+        values = np.random.default_rng(0).uniform(0, 100, length)
+
+        def render():
+            ax.clear()
+            ax.plot(times, values, label="CPU Usage", color="tomato")
+            ax.legend()
+            ax.set_xlabel("Time (s)", labelpad=10, color="white")
+            ax.set_ylabel("CPU Usage (%)", labelpad=10, color="white")
+            fig.canvas.draw()
+
+        render()
+        results[str(length)] = timings(render, repeat)
+        plt.close(fig)
+    return results
+
+
+def bench_startup(repeat, gui=False, xvfb=False):
+    if gui:
+        code = (
+            "import app; a = app.SystemMonitor(); a.update(); "
+            "a.running = False; a.destroy()"
+        )
+    else:
+        code = "from collector import MetricsCollector; MetricsCollector().collect()"
+    command = [sys.executable, "-c", code]
+    if xvfb:
+        command = ["xvfb-run", "-a"] + command
+
+    def run():
+        subprocess.run(command, cwd=ROOT, check=True, capture_output=True)
+
+    return timings(run, repeat)
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)):
+            flat[name] = value
+    return flat
+
+
+def check(results, thresholds, baseline=None, max_regression=None):
+    """Return a list of failure messages for exceeded thresholds and regressions"""
+    flat = flatten(results)
+    failures = []
+    for name, limit in thresholds.items():
+        if name in flat and flat[name] > limit:
+            failures.append(f"{name} = {flat[name]:.3f} exceeds threshold {limit}")
+    if baseline is not None and max_regression is not None:
+        for name, previous in flatten(baseline).items():
+            # Tail latencies are too noisy to compare run against run
+            if name not in flat or previous <= 0 or name.endswith(("p95_ms", "max_ms")):
+                continue
+            # Throughput numbers regress downwards, everything else upwards
+            if name.endswith("_per_s"):
+                change = (previous - flat[name]) / previous
+            else:
+                change = (flat[name] - previous) / previous
+            if change > max_regression:
+                failures.append(f"{name} regressed {change:.0%} ({previous:.3f} -> {flat[name]:.3f})")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark collectors, history storage and rendering")
+    parser.add_argument("--output",
+                        default=os.path.join(os.path.dirname(__file__), "results", "benchmark_results.json"))
+    parser.add_argument("--thresholds", default=os.path.join(os.path.dirname(__file__), "thresholds.json"))
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="allowed relative slowdown against --baseline")
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS),
+                        help="collect from a synthetic /proc fixture instead of the live host")
+    parser.add_argument("--quick", action="store_true", help="skip the 1M point history run")
+    parser.add_argument("--gui", action="store_true", help="time SystemMonitor start-up (needs a display)")
+    parser.add_argument("--xvfb", action="store_true", help="run the start-up benchmark under xvfb-run")
+    args = parser.parse_args(argv)
+
+    if args.xvfb and not shutil.which("xvfb-run"):
+        parser.error("xvfb-run not found")
+
+    sizes = HISTORY_SIZES[:-1] if args.quick else HISTORY_SIZES
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "scenario": args.scenario or "live",
+        },
+        "collection": bench_collection(args.ticks, args.scenario),
+        # On a fixture's virtual clock, so idle groups really back off between one-second frames
+        "collection_adaptive": bench_collection(max(args.ticks, 200), args.scenario or "small", adaptive=True),
+        "deep_memory": bench_deep_memory(5),
+        "alerts": bench_alerts(1000),
+        "history": bench_history(sizes),
+        "render": bench_render(RENDER_LENGTHS, 10),
+        "startup": bench_startup(3, gui=args.gui, xvfb=args.xvfb),
+    }
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    thresholds = {}
+    if args.thresholds and os.path.exists(args.thresholds):
+        with open(args.thresholds) as f:
+            thresholds = json.load(f)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failures = check(results, thresholds, baseline, args.max_regression)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+from run_benchmarks import check, flatten
+
+
+def test_flatten_keeps_only_numbers():
+    results = {"meta": {"python": "3.12"}, "history": {"1000": {"append_per_s": 5.0, "select_us": 2}}}
+    assert flatten(results) == {"history.1000.append_per_s": 5.0, "history.1000.select_us": 2}
+
+
+def test_thresholds():
+    results = {"collection": {"p50_ms": 12.0, "p95_ms": 30.0}}
+    thresholds = {"collection.p50_ms": 10.0, "collection.p95_ms": 50.0, "not.measured": 1.0}
+    # Thresholds for metrics this run did not measure (--quick) are skipped
+    assert check(results, thresholds) == ["collection.p50_ms = 12.000 exceeds threshold 10.0"]
+    assert check(results, {"collection.p50_ms": 12.0}) == []
+
+
+def test_regressions_against_a_baseline():
+    baseline = {"collection": {"p50_ms": 10.0, "p95_ms": 10.0}, "history": {"append_per_s": 1000.0, "gone_us": 5.0}}
+    results = {"collection": {"p50_ms": 13.0, "p95_ms": 99.0}, "history": {"append_per_s": 700.0}}
+    # Slower latency and lower throughput both regress; tail latencies are not compared
+    assert check(results, {}, baseline, 0.25) == [
+        "collection.p50_ms regressed 30% (10.000 -> 13.000)",
+        "history.append_per_s regressed 30% (1000.000 -> 700.000)",
+    ]
+    assert check(results, {}, baseline, 0.5) == []
+    assert check(results, {}, baseline) == []
@@ -0,0 +1,249 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+
+import numpy as np
+
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = os.O_NONBLOCK if hasattr(os, "O_NONBLOCK") else 0
+IN_CLOEXEC = 0o2000000
+
+# Column order of the per-cgroup counter matrix
+USAGE_USEC, MEMORY_CURRENT, ANON, FILE, IO_RBYTES, IO_WBYTES = range(6)
+
+
+class Inotify:
+    """Minimal ctypes inotify wrapper watching directories for mkdir/rmdir"""
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True) if libc_name else None
+        if self.libc is None or not hasattr(self.libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self.fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def watch(self, path):
+        mask = IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def pending(self):
+        """Drain queued events; True when anything was created or removed
+
+        A queue overflow (IN_Q_OVERFLOW) arrives as an event too, so lost
+        events also end in a full rescan.
+        """
+        changed = False
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return changed
+            if not data:
+                return changed
+            changed = True
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def find_cgroup2_root(sys_root):
+    base = os.path.join(sys_root, "fs", "cgroup")
+    for candidate in (base, os.path.join(base, "unified")):
+        if os.path.exists(os.path.join(candidate, "cgroup.controllers")):
+            return candidate
+    return None
+
+
+def read_flat_keyed(path, keys):
+    values = dict.fromkeys(keys, 0)
+    try:
+        with open(path) as f:
+            for line in f:
+                key, _, value = line.partition(" ")
+                if key in values:
+                    values[key] = int(value)
+    except (OSError, ValueError):
+        pass
+    return values
+
+
+def read_io_stat(path):
+    rbytes = wbytes = 0
+    try:
+        with open(path) as f:
+            for line in f:
+                for field in line.split()[1:]:
+                    key, _, value = field.partition("=")
+                    if key == "rbytes":
+                        rbytes += int(value)
+                    elif key == "wbytes":
+                        wbytes += int(value)
+    except (OSError, ValueError):
+        pass
+    return rbytes, wbytes
+
+
+def read_int(path):
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+        return int(value) if value != "max" else 0
+    except (OSError, ValueError):
+        return 0
+
+
+class CgroupCollector:
+    """Walks the cgroup v2 tree once, then rescans only when inotify reports mkdir/rmdir
+
+    Without inotify (or if the watch limit is hit) the tree is rescanned every
+    rescan_interval seconds instead.
+    """
+
+    def __init__(self, backend, max_depth=4, rescan_interval=30.0, top_count=15):
+        self.backend = backend
+        self.sys_root = backend.sys_root
+        self.root = find_cgroup2_root(self.sys_root)
+        self.available = self.root is not None
+        self.max_depth = max_depth
+        self.rescan_interval = rescan_interval
+        self.top_count = top_count
+        self.inotify = None
+        self.paths = []
+        self.names = []
+        self.counters = None
+        self.last_time = None
+        self.last_scan = None
+        self.rescans = 0
+        if self.available:
+            try:
+                self.inotify = Inotify()
+            except OSError:
+                self.inotify = None
+            self.scan()
+
+    def scan(self):
+        paths = []
+        stack = [(self.root, 0)]
+        while stack:
+            path, depth = stack.pop()
+            paths.append(path)
+            if depth >= self.max_depth:
+                continue
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append((entry.path, depth + 1))
+            except OSError:
+                continue
+        paths.sort()
+
+        if self.inotify is not None:
+            # Re-adding a watch to a known directory is a no-op in the kernel
+            try:
+                for path in paths:
+                    self.inotify.watch(path)
+            except OSError:
+                self.inotify.close()
+                self.inotify = None
+
+        self.paths = paths
+        self.names = [os.path.relpath(path, self.root) if path != self.root else "/" for path in paths]
+        self.last_scan = self.backend.clock.monotonic()
+        self.rescans += 1
+
+    def needs_rescan(self):
+        if self.backend.sys_root != self.sys_root:
+            # Recorded fixtures move the backend to a new frame directory each tick
+            self.sys_root = self.backend.sys_root
+            self.root = find_cgroup2_root(self.sys_root) or self.root
+            return True
+        if self.inotify is not None:
+            return self.inotify.pending()
+        return self.backend.clock.monotonic() - self.last_scan >= self.rescan_interval
+
+    def close(self):
+        """Release the inotify descriptor; later ticks fall back to timed rescans"""
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+
+    def read_counters(self):
+        counters = np.zeros((len(self.paths), 6), dtype=np.int64)
+        for i, path in enumerate(self.paths):
+            counters[i, USAGE_USEC] = read_flat_keyed(os.path.join(path, "cpu.stat"), ("usage_usec",))["usage_usec"]
+            counters[i, MEMORY_CURRENT] = read_int(os.path.join(path, "memory.current"))
+            memory = read_flat_keyed(os.path.join(path, "memory.stat"), ("anon", "file"))
+            counters[i, ANON] = memory["anon"]
+            counters[i, FILE] = memory["file"]
+            counters[i, IO_RBYTES], counters[i, IO_WBYTES] = read_io_stat(os.path.join(path, "io.stat"))
+        return counters
+
+    def top_level(self):
+        """Direct children of the root, e.g. system.slice and machine.slice"""
+        return [path for path, name in zip(self.paths, self.names) if name != "/" and os.sep not in name]
+
+    def collect(self):
+        if not self.available:
+            return None
+        previous_names = self.names
+        if self.needs_rescan():
+            self.scan()
+
+        now = self.backend.clock.time()
+        counters = self.read_counters()
+        previous = self.counters
+        if previous is not None and self.names != previous_names:
+            index = {name: i for i, name in enumerate(previous_names)}
+            rows = np.array([index.get(name, -1) for name in self.names], dtype=np.int64)
+            aligned = counters.copy()
+            known = rows >= 0
+            aligned[known] = previous[rows[known]]
+            previous = aligned
+
+        elapsed = now - self.last_time if self.last_time is not None else 0.0
+        if previous is None or elapsed <= 0:
+            cpu_percent = np.zeros(len(self.names))
+            io_rates = np.zeros((len(self.names), 2))
+        else:
+            cpu_percent = np.maximum(counters[:, USAGE_USEC] - previous[:, USAGE_USEC], 0) / (elapsed * 1e4)
+            io_rates = np.maximum(counters[:, IO_RBYTES:] - previous[:, IO_RBYTES:], 0) / elapsed
+        self.counters = counters
+        self.last_time = now
+
+        result = {
+            "names": self.names,
+            "cpu_percent": cpu_percent,
+            "memory": counters[:, MEMORY_CURRENT],
+            "anon": counters[:, ANON],
+            "file": counters[:, FILE],
+            "io_read_s": io_rates[:, 0],
+            "io_write_s": io_rates[:, 1],
+            "count": len(self.names),
+            "rescans": self.rescans,
+        }
+        result["top_rows"] = self.top(result, count=self.top_count)
+        return result
+
+    @staticmethod
+    def top(cgroups, key="cpu_percent", count=15):
+        """Indices of the top cgroups by key, skipping the root which sums everything"""
+        values = np.asarray(cgroups[key], dtype=np.float64)
+        rows = np.array([i for i, name in enumerate(cgroups["names"]) if name != "/"], dtype=np.int64)
+        if not len(rows):
+            return []
+        values = values[rows]
+        count = min(count, len(values))
+        top = np.argpartition(-values, count - 1)[:count]
+        return rows[top[np.argsort(-values[top])]].tolist()
@@ -0,0 +1,252 @@
+import os
+
+import numpy as np
+
+from alerts import AlertEngine, metric_values
+from anomaly import AnomalyDetector
+from backends import PsutilBackend
+from cgroups import CgroupCollector
+from flight_recorder import FlightRecorder
+from forecast import DiskForecaster
+from history import HistoryStore
+from instrumentation import NullTimer
+from leaks import LeakDetector
+from meminfo import MemoryCollector
+from mounts import MountCollector
+from network import NetworkCollector
+from numa import NumaCollector
+from pressure import RESOURCES, PressureCollector
+from processes import ProcessSampler
+from procmem import DeepMemoryScanner
+from scheduler import GROUPS, AdaptiveScheduler
+
+
+class MetricsCollector:
+    """Samples the host into a flat snapshot and the shared history
+
+    Stages are grouped and each group runs at the interval the adaptive
+    scheduler has for it; collect() should be called again after
+    scheduler.delay() seconds. Groups that are not due keep their previous
+    values in the snapshot and add nothing to the history.
+    """
+
+    def __init__(self, history=None, disk_path=None, timer=None, backend=None, mount_interval=10.0,
+                 deep_memory=False, alerts=None, flight_recorder=False, interval=1.0, adaptive=True):
+        self.history = history if history is not None else HistoryStore()
+        self.timer = timer or NullTimer()
+        self.backend = backend or PsutilBackend()
+        self.clock = self.backend.clock
+        self.disk_path = disk_path or ("C:\\" if os.name == "nt" else "/")
+        self.core_count = self.backend.cpu_count(logical=False)
+        self.thread_count = self.backend.cpu_count(logical=True)
+        self.memory = MemoryCollector(self.backend)
+        self.numa = NumaCollector(self.backend)
+        self.network = NetworkCollector(self.backend)
+        self.pressure = PressureCollector(self.backend)
+        self.cgroups = CgroupCollector(self.backend)
+        self.mounts = MountCollector(self.backend, interval=mount_interval)
+        self.mount_recorded = {}
+        self.forecaster = DiskForecaster()
+        self.deep_memory = DeepMemoryScanner(self.backend)
+        self.processes = ProcessSampler(self.backend)
+        self.leaks = LeakDetector()
+        self.anomalies = AnomalyDetector(self.history)
+        self.alerts = alerts if alerts is not None else AlertEngine()
+        self.flight_recorder = FlightRecorder(self.backend, self.history)
+        self.scheduler = AdaptiveScheduler(self.clock, base_interval=interval, adaptive=adaptive)
+        self.latest = {}
+        if deep_memory:
+            self.deep_memory.set_enabled(True)
+        if flight_recorder:
+            self.flight_recorder.set_enabled(True)
+
+    def close(self):
+        self.cgroups.close()
+
+    def collect(self):
+        """Sample the groups the scheduler has due and reuse the previous results of the rest"""
+        timer = self.timer
+        backend = self.backend
+        current_time = self.clock.time()
+        due = self.scheduler.due()
+        latest = self.latest
+        # Every group runs on the first tick so the snapshot is always complete
+        due |= set(GROUPS) - set(latest)
+        if "cpu" in due:
+            with timer.stage("collect.cpu"):
+                cpu_percent = backend.cpu_percent()
+            with timer.stage("collect.cpu_freq"):
+                latest["cpu"] = (cpu_percent, backend.cpu_freq())
+        cpu_percent, cpu_freq = latest["cpu"]
+        if "memory" in due:
+            with timer.stage("collect.memory"):
+                memory = self.memory.collect()
+                if memory is None:
+                    virtual = backend.virtual_memory()
+                    swap = backend.swap_memory()
+                    # Without /proc only psutil's per-process private bytes approximate commit (Windows)
+                    commit_charge = getattr(backend.process_memory(), "private", None)
+                    memory_summary = {
+                        "total": virtual.total, "available": virtual.available, "used": virtual.used,
+                        "percent": virtual.percent, "swap_total": swap.total, "swap_used": swap.used,
+                        "swap_free": swap.free, "swap_percent": swap.percent,
+                        "committed_as": commit_charge, "commit_limit": virtual.total + swap.total,
+                    }
+                else:
+                    memory_summary = memory
+                latest["memory"] = (memory, memory_summary)
+        memory, memory_summary = latest["memory"]
+        with timer.stage("collect.deep_memory"):
+            deep_memory = self.deep_memory.collect()
+        if "processes" in due:
+            with timer.stage("collect.processes"):
+                processes = self.processes.sample()
+                pids, rss = processes["pids"], processes["rss"]
+                self.leaks.forget(processes["exited"])
+                pss = None
+                if self.deep_memory.enabled:
+                    scanned = self.deep_memory.samples
+                    pss = np.array([scanned[pid][2] if pid in scanned else np.nan for pid in pids.tolist()])
+                self.leaks.update(current_time, pids, rss, pss)
+                comms = self.processes.comms
+                latest["processes"] = {
+                    "growing": [(pid, comms.get(pid, "?"), *row) for pid, *row in
+                                self.leaks.growing(memory_summary["available"])],
+                    "tracked": len(self.leaks.slots),
+                    "capacity": self.leaks.capacity,
+                    "nbytes": self.leaks.nbytes(),
+                }
+        leaks = latest["processes"]
+        if "numa" in due:
+            with timer.stage("collect.numa"):
+                latest["numa"] = self.numa.collect()
+        numa = latest["numa"]
+        if "disk" in due:
+            with timer.stage("collect.disk"):
+                disk = backend.disk_usage(self.disk_path)
+            with timer.stage("collect.mounts"):
+                latest["disk"] = (disk, self.mounts.collect())
+        disk, mounts = latest["disk"]
+        if "network" in due:
+            with timer.stage("collect.network"):
+                latest["network"] = self.network.collect()
+        network = latest["network"]
+        if "cgroups" in due:
+            with timer.stage("collect.cgroups"):
+                latest["cgroups"] = self.cgroups.collect()
+        cgroups = latest["cgroups"]
+        if "pressure" in due:
+            with timer.stage("collect.pressure"):
+                latest["pressure"] = self.pressure.collect(self.cgroups.top_level())
+        pressure = latest["pressure"]
+
+        snapshot = {
+            "time": current_time,
+            "cpu_percent": cpu_percent,
+            "cpu_freq": cpu_freq,
+            "core_count": self.core_count,
+            "thread_count": self.thread_count,
+            "mem_total": memory_summary["total"],
+            "mem_available": memory_summary["available"],
+            "mem_used": memory_summary["used"],
+            "mem_percent": memory_summary["percent"],
+            "swap_total": memory_summary["swap_total"],
+            "swap_used": memory_summary["swap_used"],
+            "swap_free": memory_summary["swap_free"],
+            "swap_percent": memory_summary["swap_percent"],
+            "disk_total": disk.total,
+            "disk_used": disk.used,
+            "disk_free": disk.free,
+            "disk_percent": disk.percent,
+            "commit_charge": memory_summary["committed_as"],
+            "commit_limit": memory_summary["commit_limit"],
+            # Full /proc/meminfo and /proc/vmstat breakdown; None without /proc
+            "memory": memory,
+            # PSS/USS per process and command from smaps_rollup; None unless enabled
+            "deep_memory": deep_memory,
+            # Fastest-growing processes as (pid, comm, rss, pss, bytes/h, hours to OOM)
+            "leaks": leaks,
+            "numa": numa,
+            "mounts": mounts,
+            "network": network,
+            "pressure": pressure,
+            "cgroups": cgroups,
+        }
+
+        with timer.stage("history.record"):
+            # Only groups sampled this tick get a point, so each series carries its own spacing
+            if "processes" in due:
+                self.history.contributors.record(current_time, processes["pids"], {
+                    "cpu": processes["cpu_s"],
+                    "rss": processes["rss_delta"],
+                    "io": processes["io_bytes"],
+                }, self.processes.comms)
+            if "cpu" in due:
+                self.history.append("cpu", current_time, cpu_percent)
+            if "memory" in due:
+                self.history.record(current_time, {
+                    "memory": memory_summary["percent"],
+                    "virtual": memory_summary["percent"],
+                    "swap": memory_summary["swap_percent"],
+                    # Constant between reboots and nearly free through the deadband; replays derive sizes from them
+                    "mem_total": memory_summary["total"],
+                    "swap_total": memory_summary["swap_total"],
+                })
+                if memory is not None:
+                    self.history.record(current_time, {
+                        "major_faults": memory["major_faults_s"],
+                        "swap_in": memory["swap_in_s"],
+                        "swap_out": memory["swap_out_s"],
+                        "pgscan": memory["pgscan_s"],
+                    })
+            if "disk" in due:
+                self.history.append("disk", current_time, disk.percent)
+                self.history.append("disk_total", current_time, disk.total)
+            if "network" in due:
+                self.history.record(current_time, {
+                    "net_rx": network["rx_bytes_s"],
+                    "net_tx": network["tx_bytes_s"],
+                    "net_errors": network["errors_s"] + network["drops_s"],
+                    "net_retrans": network["tcp_retrans_s"],
+                })
+                rates = network["rates"]
+                for row in network["tracked_rows"]:
+                    name = network["names"][row]
+                    self.history.append(f"net_rx:{name}", current_time, rates[row, 0])
+                    self.history.append(f"net_tx:{name}", current_time, rates[row, 1])
+            if numa is not None and "numa" in due:
+                for i, node in enumerate(numa["nodes"]):
+                    self.history.append(f"numa_cpu:{node}", current_time, numa["cpu_percent"][i])
+                    self.history.append(f"numa_free:{node}", current_time, numa["free_percent"][i])
+            for mount in mounts:
+                # Recorded once per statvfs result, so mount series are spaced by the mount cadence
+                updated = mount["updated"]
+                if mount["state"] == "ok" and updated != self.mount_recorded.get(mount["mount"]):
+                    self.mount_recorded[mount["mount"]] = updated
+                    self.history.append(f"mount:{mount['mount']}", updated, mount["percent"])
+                    self.history.append(f"inodes:{mount['mount']}", updated, mount["inode_percent"])
+                    self.forecaster.update(mount["mount"], updated, mount["percent"])
+            if pressure is not None and "pressure" in due:
+                for resource in RESOURCES:
+                    if resource in pressure:
+                        self.history.append(f"psi_{resource}", current_time, pressure[resource]["some_rate"])
+                        self.history.append(f"psi_{resource}_full", current_time, pressure[resource]["full_rate"])
+            if cgroups is not None and "cgroups" in due:
+                for row in cgroups["top_rows"][:5]:
+                    self.history.append(f"cgroup_cpu:{cgroups['names'][row]}", current_time,
+                                        cgroups["cpu_percent"][row])
+        with timer.stage("forecast.mounts"):
+            self.forecaster.annotate(mounts)
+        with timer.stage("anomaly.detect"):
+            # Anomalies whose region started or continued this tick
+            snapshot["anomalies"] = self.anomalies.detect()
+        with timer.stage("alerts.evaluate"):
+            # Rules that started or stopped firing this tick
+            snapshot["alerts"] = self.alerts.evaluate(metric_values(snapshot, len(self.anomalies.active)), current_time)
+            for event in snapshot["alerts"]:
+                if event["state"] == "firing":
+                    self.flight_recorder.trigger(f"alert: {event['rule']} ({event['key']})")
+        self.scheduler.observe(snapshot, due)
+        # Groups refreshed this tick, for front ends that skip unchanged widgets
+        snapshot["sampled"] = due
+        return snapshot
@@ -0,0 +1,76 @@
+import numpy as np
+
+# Absolute tolerance per series name or name prefix (ending in ':'); anything else is change-only.
+# Percentages that only matter to a hundredth of a point, or drift by a fraction of one.
+TOLERANCES = {
+    "disk": 0.01,
+    "mount:": 0.01,
+    "inodes:": 0.01,
+    "memory": 0.05,
+    "virtual": 0.05,
+    "numa_free:": 0.05,
+}
+
+
+class DeadbandFilter:
+    """Decides per series whether a sample is worth storing
+
+    A sample is kept when it differs from the last kept value by more than
+    the series' tolerance, or when heartbeat seconds have passed since the
+    last kept one; otherwise it is dropped. Read back with sample-and-hold
+    (each kept value holds until the next), a dropped sample is never more
+    than the tolerance away from what is reconstructed, and with the
+    default tolerance of 0 the reconstruction is exact. Storage then grows
+    with how often a series changes rather than with wall time.
+    """
+
+    def __init__(self, tolerances=TOLERANCES, default=0.0, heartbeat=60.0):
+        self.tolerances = tolerances
+        self.default = default
+        self.heartbeat = heartbeat
+        self.resolved = {}
+        self.last = {}
+        self.observed = 0
+        self.kept = 0
+
+    def tolerance(self, name):
+        tolerance = self.resolved.get(name)
+        if tolerance is None:
+            family, colon, _ = name.partition(":")
+            tolerance = self.tolerances.get(name, self.tolerances.get(family + colon, self.default))
+            self.resolved[name] = tolerance
+        return tolerance
+
+    def keep(self, name, timestamp, value):
+        self.observed += 1
+        last = self.last.get(name)
+        if last is not None and timestamp - last[0] < self.heartbeat:
+            previous = last[1]
+            # NaN never compares equal, but a run of NaNs is as flat as any other run
+            if abs(value - previous) <= self.tolerance(name) or (value != value and previous != previous):
+                return False
+        self.last[name] = (timestamp, value)
+        self.kept += 1
+        return True
+
+    def mask(self, name, times, values):
+        """keep() over a run of samples of one series, as a boolean array"""
+        return np.fromiter((self.keep(name, t, v) for t, v in zip(times.tolist(), values.tolist())),
+                           dtype=bool, count=len(times))
+
+    def forget(self, name):
+        self.last.pop(name, None)
+        self.resolved.pop(name, None)
+
+    def ratio(self):
+        """Kept samples as a share of those offered"""
+        return self.kept / self.observed if self.observed else 1.0
+
+
+def hold(times, values, grid):
+    """Sample-and-hold reconstruction of (times, values) at each grid time; NaN before the first point"""
+    index = np.searchsorted(times, grid, side="right") - 1
+    result = np.full(len(grid), np.nan)
+    valid = index >= 0
+    result[valid] = values[index[valid]]
+    return result
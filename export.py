@@ -0,0 +1,349 @@
+import argparse
+import csv
+import json
+import math
+import os
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from deadband import DeadbandFilter
+
+FORMATS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".smh": "binary",
+}
+EXTENSIONS = {"csv": ".csv", "ndjson": ".ndjson", "parquet": ".parquet", "arrow": ".arrow", "binary": ".smh"}
+# Rows per Parquet row group / Arrow record batch and per chunk read back
+BATCH_ROWS = 65536
+# Dependency-free format: this line, then per chunk a little-endian uint32 name length, the UTF-8
+# name, a uint32 point count, count float64 times and count float64 values
+BINARY_MAGIC = b"SYSMON-HISTORY 1\n"
+
+
+def default_format():
+    return "parquet" if pa is not None else "binary"
+
+
+def format_of(path, format=None):
+    if format is None:
+        format = FORMATS.get(os.path.splitext(path)[1].lower())
+        if format is None:
+            raise ValueError(f"Can't tell the export format of {path}; use one of {', '.join(FORMATS)}")
+    if format in ("parquet", "arrow") and pa is None:
+        raise ValueError(f"{format} needs pyarrow; use csv, ndjson or binary instead")
+    return format
+
+
+class CsvWriter:
+    def __init__(self, f):
+        self.f = f
+        self.writer = csv.writer(f)
+        self.writer.writerow(("metric", "time", "value"))
+
+    def write(self, name, times, values):
+        # str() of a float round-trips exactly; NaN is written as "nan"
+        self.writer.writerows(zip([name] * len(times), times.tolist(), values.tolist()))
+
+    def close(self):
+        pass
+
+
+class NdjsonWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, name, times, values):
+        # Formatted by hand: json.dumps per row is several times slower, and NaN must become null
+        name = json.dumps(name)
+        self.f.writelines(f'{{"metric": {name}, "time": {t!r}, "value": {v!r}}}\n' if math.isfinite(v) else
+                          f'{{"metric": {name}, "time": {t!r}, "value": null}}\n'
+                          for t, v in zip(times.tolist(), values.tolist()))
+
+    def close(self):
+        pass
+
+
+class BinaryWriter:
+    def __init__(self, f):
+        self.f = f
+        f.write(BINARY_MAGIC)
+
+    def write(self, name, times, values):
+        encoded = name.encode()
+        self.f.write(struct.pack("<I", len(encoded)) + encoded + struct.pack("<I", len(times)))
+        self.f.write(np.ascontiguousarray(times, dtype="<f8").tobytes())
+        self.f.write(np.ascontiguousarray(values, dtype="<f8").tobytes())
+
+    def close(self):
+        pass
+
+
+class ArrowWriter:
+    """Parquet or Arrow IPC file, buffering chunks into BATCH_ROWS-row batches"""
+
+    def __init__(self, f, format):
+        self.schema = pa.schema([("metric", pa.dictionary(pa.int32(), pa.string())), ("time", pa.float64()),
+                                 ("value", pa.float64())])
+        if format == "parquet":
+            self.writer = pq.ParquetWriter(f, self.schema, compression="zstd")
+        else:
+            self.writer = ipc.new_file(f, self.schema)
+        self.pending = []
+        self.rows = 0
+
+    def write(self, name, times, values):
+        self.pending.append((name, times, values))
+        self.rows += len(times)
+        if self.rows >= BATCH_ROWS:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+        names = pa.array([name for name, times, _ in self.pending for _ in range(len(times))]).dictionary_encode()
+        batch = pa.record_batch([names, pa.array(np.concatenate([chunk[1] for chunk in self.pending])),
+                                 pa.array(np.concatenate([chunk[2] for chunk in self.pending]))],
+                                schema=self.schema)
+        if isinstance(self.writer, pq.ParquetWriter):
+            self.writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self.writer.write_batch(batch)
+        self.pending = []
+        self.rows = 0
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+def open_writer(f, format):
+    if format == "csv":
+        return CsvWriter(f)
+    if format == "ndjson":
+        return NdjsonWriter(f)
+    if format == "binary":
+        return BinaryWriter(f)
+    return ArrowWriter(f, format)
+
+
+def write_chunks(chunks, path, format=None, deadband=None):
+    """Stream (name, times, values) chunks to path; returns the number of points written
+
+    With a DeadbandFilter, points within its tolerance of the last written
+    one are left out, for a smaller export that still reconstructs with
+    sample-and-hold.
+    """
+    format = format_of(path, format)
+    text = format in ("csv", "ndjson")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    written = 0
+    # Write next to the target and rename, so a failed export never leaves a truncated file behind
+    partial = path + ".partial"
+    try:
+        with open(partial, "w", newline="", encoding="utf-8") if text else open(partial, "wb") as f:
+            writer = open_writer(f, format)
+            for name, times, values in chunks:
+                if deadband is not None:
+                    keep = deadband.mask(name, times, values)
+                    times, values = times[keep], values[keep]
+                if len(times):
+                    writer.write(name, times, values)
+                    written += len(times)
+            writer.close()
+        os.replace(partial, path)
+    finally:
+        if os.path.exists(partial):
+            os.remove(partial)
+    return written
+
+
+def export_history(history, path, names=None, start=-np.inf, end=np.inf, format=None, deadband=None):
+    """Write the stored points of names (all series by default) between start and end to path"""
+    return write_chunks(history.chunks(names, start, end), path, format, deadband)
+
+
+def read_chunks(path, format=None, chunk_rows=BATCH_ROWS):
+    """(name, times, values) chunks of an export, each one series in time order, at most chunk_rows long"""
+    format = format_of(path, format)
+    if format == "binary":
+        yield from read_binary(path)
+    elif format in ("parquet", "arrow"):
+        yield from read_arrow(path, format, chunk_rows)
+    else:
+        yield from read_rows(path, format, chunk_rows)
+
+
+def read_binary(path):
+    with open(path, "rb") as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{path} is not a history export")
+        while True:
+            header = f.read(4)
+            if not header:
+                return
+            (length,) = struct.unpack("<I", header.ljust(4, b"\0"))
+            name = f.read(length)
+            counts = f.read(4)
+            count = struct.unpack("<I", counts)[0] if len(counts) == 4 else 0
+            data = f.read(16 * count)
+            if len(header) < 4 or len(name) < length or len(counts) < 4 or len(data) != 16 * count:
+                raise ValueError(f"{path} is truncated")
+            data = np.frombuffer(data, dtype="<f8")
+            name = name.decode()
+            yield name, data[:count].astype(np.float64), data[count:].astype(np.float64)
+
+
+def read_rows(path, format, chunk_rows):
+    """Group CSV or NDJSON rows into per-series chunks"""
+    name = None
+    times, values = [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        if format == "csv":
+            reader = csv.reader(f)
+            if next(reader, None) != ["metric", "time", "value"]:
+                raise ValueError(f"{path} does not have a metric,time,value header")
+            rows = ((row[0], float(row[1]), float(row[2]) if row[2] else math.nan) for row in reader if row)
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+            rows = ((record["metric"], float(record["time"]),
+                     math.nan if record["value"] is None else float(record["value"])) for record in records)
+        for row_name, t, v in rows:
+            if row_name != name or len(times) >= chunk_rows:
+                if times:
+                    yield name, np.array(times), np.array(values)
+                name, times, values = row_name, [], []
+            times.append(t)
+            values.append(v)
+    if times:
+        yield name, np.array(times), np.array(values)
+
+
+def read_arrow(path, format, chunk_rows):
+    if format == "parquet":
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_rows)
+    else:
+        reader = ipc.open_file(pa.memory_map(path))
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    for batch in batches:
+        names = batch.column("metric")
+        if isinstance(names.type, pa.DictionaryType):
+            names = names.dictionary_decode()
+        names = np.asarray(names.to_pylist(), dtype=object)
+        times = batch.column("time").to_numpy(zero_copy_only=False).astype(np.float64)
+        values = batch.column("value").to_numpy(zero_copy_only=False).astype(np.float64)
+        bounds = np.concatenate([[0], np.flatnonzero(names[1:] != names[:-1]) + 1, [len(names)]])
+        for first, last in zip(bounds[:-1], bounds[1:]):
+            yield names[first], times[first:last], values[first:last]
+
+
+def import_history(history, path, format=None):
+    """Append every point of an export to history; returns the number of points read
+
+    Series are appended in file order, so import into a store before it
+    holds newer points of the same series.
+    """
+    count = 0
+    for name, times, values in read_chunks(path, format):
+        for t, v in zip(times.tolist(), values.tolist()):
+            history.append(name, t, v)
+        count += len(times)
+    return count
+
+
+class HistoryExporter:
+    """Writes history exports on a background thread so the UI keeps ticking
+
+    start() fixes the points to export there and then; the thread only
+    decompresses and writes. Finished paths collect in last_exports and a
+    failure in error, for the front end to show.
+    """
+
+    def __init__(self, history, output_dir="exports", format=None):
+        self.history = history
+        self.output_dir = output_dir
+        self.format = format or default_format()
+        self.thread = None
+        self.last_exports = []
+        self.error = None
+
+    @property
+    def busy(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, names=None, start=-np.inf, end=np.inf, deadband=None):
+        """Begin exporting; returns the path being written, or None while another export runs"""
+        if self.busy:
+            return None
+        path = os.path.join(self.output_dir, time.strftime("history-%Y%m%d-%H%M%S") + EXTENSIONS[self.format])
+        chunks = self.history.chunks(names, start, end)
+        self.thread = threading.Thread(target=self.run, args=(chunks, path, deadband), daemon=True,
+                                       name="history-export")
+        self.thread.start()
+        return path
+
+    def run(self, chunks, path, deadband):
+        try:
+            write_chunks(chunks, path, self.format, deadband)
+        except (OSError, ValueError) as e:
+            self.error = f"Error exporting history: {e}"
+            return
+        self.last_exports.append(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert or summarise history exports")
+    sub = parser.add_subparsers(dest="command", required=True)
+    summary = sub.add_parser("summary", help="print the series, points and time span of an export")
+    summary.add_argument("path")
+    convert = sub.add_parser("convert", help="rewrite an export in another format, optionally filtered")
+    convert.add_argument("source")
+    convert.add_argument("target")
+    convert.add_argument("--metrics", help="comma-separated series names to keep")
+    convert.add_argument("--start", type=float, default=-np.inf, help="epoch seconds")
+    convert.add_argument("--end", type=float, default=np.inf, help="epoch seconds")
+    convert.add_argument("--tolerance", type=float,
+                         help="drop points within this absolute change of the last one written")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "summary":
+            series = {}
+            for name, times, values in read_chunks(args.path):
+                count, first, last = series.get(name, (0, times[0], times[0]))
+                series[name] = (count + len(times), min(first, times[0]), max(last, times[-1]))
+            print(f"{args.path}: {len(series)} series, {sum(row[0] for row in series.values())} points")
+            for name, (count, first, last) in sorted(series.items()):
+                print(f"  {name:<40}{count:>10}  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(first))}"
+                      f" - {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(last))}")
+            return 0
+        metrics = set(args.metrics.split(",")) if args.metrics else None
+        chunks = ((name, times[(times >= args.start) & (times <= args.end)],
+                   values[(times >= args.start) & (times <= args.end)])
+                  for name, times, values in read_chunks(args.source) if metrics is None or name in metrics)
+        deadband = DeadbandFilter({}, default=args.tolerance) if args.tolerance is not None else None
+        written = write_chunks(chunks, args.target, deadband=deadband)
+    except (OSError, ValueError) as e:
+        print(e, file=sys.stderr)
+        return 1
+    print(f"Wrote {written} points to {args.target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
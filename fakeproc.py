@@ -0,0 +1,569 @@
+import argparse
+import glob
+import json
+import os
+import shutil
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+
+svmem = namedtuple("svmem", "total available percent used free buffers cached")
+sswap = namedtuple("sswap", "total used free percent")
+sdiskusage = namedtuple("sdiskusage", "total used free percent")
+pmem = namedtuple("pmem", "rss vms")
+
+USER_HZ = 100
+PAGE_SIZE = 4096
+
+SCENARIOS = {
+    "small": dict(cores=4, processes=200, disks=1, cgroups=8),
+    "256-core": dict(cores=256, processes=2_000, disks=4),
+    "50k-processes": dict(cores=32, processes=50_000, disks=2),
+    "saturated-disks": dict(cores=16, processes=500, disks=16, disk_busy=1.0),
+    "container-host": dict(cores=64, processes=5_000, disks=4, cgroups=2_000),
+}
+
+RECORD_PATHS = [
+    "proc/stat", "proc/meminfo", "proc/vmstat", "proc/loadavg", "proc/uptime",
+    "proc/cpuinfo", "proc/diskstats", "proc/net/dev", "proc/net/snmp",
+    "proc/pressure/cpu", "proc/pressure/memory", "proc/pressure/io",
+    "proc/self/mountinfo",
+]
+
+
+class VirtualClock:
+    """Deterministic stand-in for SystemClock; time only moves when advanced"""
+
+    def __init__(self, start=1_700_000_000.0):
+        self.start = start
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now - self.start
+
+    def advance(self, seconds):
+        self.now += seconds
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+
+class FixtureBackend:
+    """Backend that reads a recorded or synthetic /proc and /sys tree instead of the host"""
+
+    def __init__(self, root, clock=None):
+        self.clock = clock or VirtualClock()
+        self.last_cpu = None
+        self.set_root(root)
+
+    def set_root(self, root):
+        self.root = root
+        self.proc_root = os.path.join(root, "proc")
+        self.sys_root = os.path.join(root, "sys")
+
+    def read(self, relative):
+        with open(os.path.join(self.root, relative)) as f:
+            return f.read()
+
+    def meminfo(self):
+        values = {}
+        for line in self.read("proc/meminfo").splitlines():
+            key, _, rest = line.partition(":")
+            values[key] = int(rest.split()[0]) * (1024 if rest.strip().endswith("kB") else 1)
+        return values
+
+    def cpu_percent(self):
+        fields = self.read("proc/stat").split("\n", 1)[0].split()[1:9]
+        counters = np.array(fields, dtype=np.int64)
+        total, idle = counters.sum(), counters[3] + counters[4]
+        previous, self.last_cpu = self.last_cpu, (total, idle)
+        if previous is None or total <= previous[0]:
+            return 0.0
+        return round(100.0 * (1 - float(idle - previous[1]) / float(total - previous[0])), 1)
+
+    def cpu_freq(self):
+        for line in self.read("proc/cpuinfo").splitlines():
+            if line.startswith("cpu MHz"):
+                return float(line.split(":")[1])
+        return 0.0
+
+    def cpu_count(self, logical=True):
+        if logical:
+            return sum(1 for line in self.read("proc/stat").splitlines()
+                       if line.startswith("cpu") and line[3].isdigit())
+        cores = set()
+        physical_id = None
+        for line in self.read("proc/cpuinfo").splitlines():
+            if line.startswith("physical id"):
+                physical_id = line.split(":")[1].strip()
+            elif line.startswith("core id"):
+                cores.add((physical_id, line.split(":")[1].strip()))
+        return len(cores) or None
+
+    def virtual_memory(self):
+        info = self.meminfo()
+        total = info["MemTotal"]
+        free = info["MemFree"]
+        buffers = info.get("Buffers", 0)
+        cached = info.get("Cached", 0) + info.get("SReclaimable", 0)
+        available = info.get("MemAvailable", free + buffers + cached)
+        used = max(0, total - free - buffers - cached)
+        percent = round((total - available) / total * 100, 1) if total else 0.0
+        return svmem(total, available, percent, used, free, buffers, cached)
+
+    def swap_memory(self):
+        info = self.meminfo()
+        total = info.get("SwapTotal", 0)
+        free = info.get("SwapFree", 0)
+        used = total - free
+        return sswap(total, used, free, round(used / total * 100, 1) if total else 0.0)
+
+    def statvfs_table(self):
+        with open(os.path.join(self.root, "statvfs.json")) as f:
+            return json.load(f)
+
+    def statvfs(self, path):
+        return self.statvfs_table()[path]
+
+    def disk_usage(self, path):
+        entry = self.statvfs(path)
+        used = entry["total"] - entry["free"]
+        percent = round(used / entry["total"] * 100, 1) if entry["total"] else 0.0
+        return sdiskusage(entry["total"], used, entry["free"], percent)
+
+    def process_memory(self):
+        return pmem(0, 0)
+
+
+class SyntheticScenario:
+    """Generates a deterministic host one frame at a time into a fixture directory"""
+
+    def __init__(self, root, cores=4, processes=200, disks=1, interfaces=4, cgroups=0, numa_nodes=None,
+                 disk_busy=0.3, mem_total_gb=64, interval=1.0, seed=0):
+        self.root = root
+        self.cores = cores
+        self.processes = processes
+        self.disks = disks
+        self.interfaces = interfaces
+        self.cgroups = cgroups
+        self.numa_nodes = numa_nodes or (2 if cores >= 16 else 1)
+        self.disk_busy = disk_busy
+        self.mem_total = mem_total_gb * 1024**3
+        self.interval = interval
+        self.rng = np.random.default_rng(seed)
+        self.pids = np.arange(1000, 1000 + processes)
+        self.cpu_counters = np.zeros((cores, 10), dtype=np.int64)
+        self.disk_counters = np.zeros((disks, 11), dtype=np.int64)
+        self.net_counters = np.zeros((interfaces, 16), dtype=np.int64)
+        self.vm_counters = {"pgfault": 0, "pgmajfault": 0, "pswpin": 0, "pswpout": 0,
+                            "pgscan_kswapd": 0, "pgscan_direct": 0,
+                            "pgsteal_kswapd": 0, "pgsteal_direct": 0,
+                            "numa_hit": 0, "numa_miss": 0, "numa_foreign": 0,
+                            "numa_local": 0, "numa_other": 0}
+        self.psi_totals = np.zeros((3, 2), dtype=np.int64)
+        self.proc_rss = self.rng.integers(1_000, 200_000, processes)
+        self.proc_cpu = np.zeros((processes, 2), dtype=np.int64)
+        self.proc_io = np.zeros((processes, 2), dtype=np.int64)
+        # A handful of steady leakers (~15 MB/min) for the growth detector
+        self.leaking = np.arange(7, processes, max(1, processes // 4))[:4]
+        self.tcp = {"OutSegs": 0, "RetransSegs": 0, "InSegs": 0}
+        self.numastat = np.zeros((self.numa_nodes, 6), dtype=np.int64)
+        self.cgroup_names = [self.cgroup_name(i) for i in range(cgroups)]
+        self.cgroup_counters = np.zeros((cgroups, 4), dtype=np.int64)
+        self.cgroup_memory = self.rng.integers(1 << 20, 1 << 30, cgroups)
+
+    def path(self, relative):
+        full = os.path.join(self.root, relative)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        return full
+
+    def write(self, relative, text, makedirs=True):
+        full = self.path(relative) if makedirs else os.path.join(self.root, relative)
+        with open(full, "w") as f:
+            f.write(text)
+
+    def load(self, tick):
+        # Slow sine wave plus noise so graphs and detectors have something to chew on
+        phase = np.sin(2 * np.pi * tick / 300.0)
+        return np.clip(0.35 + 0.25 * phase + self.rng.normal(0, 0.1, self.cores), 0.0, 1.0)
+
+    def apply(self, tick, backend):
+        if backend.root != self.root:
+            backend.set_root(self.root)
+        self.write_frame(tick, backend.clock.time())
+
+    def write_frame(self, tick, now):
+        jiffies = int(USER_HZ * self.interval)
+        busy = (self.load(tick) * jiffies).astype(np.int64)
+        iowait = np.minimum(jiffies - busy, int(self.disk_busy * jiffies * 0.1))
+        self.cpu_counters[:, 0] += busy * 7 // 10
+        self.cpu_counters[:, 2] += busy - busy * 7 // 10
+        self.cpu_counters[:, 3] += jiffies - busy - iowait
+        self.cpu_counters[:, 4] += iowait
+        total = self.cpu_counters.sum(axis=0)
+        lines = ["cpu  " + " ".join(map(str, total))]
+        lines += [f"cpu{i} " + " ".join(map(str, row)) for i, row in enumerate(self.cpu_counters)]
+        lines += [f"ctxt {tick * 10_000}", f"btime {int(now - tick * self.interval - 3600)}",
+                  f"processes {self.processes + tick}", "procs_running 2", "procs_blocked 0"]
+        self.write("proc/stat", "\n".join(lines) + "\n")
+        self.write("proc/uptime", f"{3600 + tick * self.interval:.2f} 0.00\n")
+        self.write("proc/loadavg", f"{busy.sum() / jiffies:.2f} 1.00 1.00 2/{self.processes} {self.pids[-1]}\n")
+
+        if tick == 0:
+            self.write_static()
+
+        self.write_statvfs(tick)
+        self.write_meminfo(tick)
+        self.write_numa(tick)
+        self.write_vmstat()
+        self.write_diskstats()
+        self.write_network()
+        self.write_pressure(busy.mean() / jiffies)
+        self.write_processes(tick)
+        if self.cgroups:
+            self.write_cgroups(tick)
+
+    def write_static(self):
+        lines = []
+        threads_per_core = 2 if self.cores > 1 else 1
+        for i in range(self.cores):
+            lines += [f"processor\t: {i}", "model name\t: Synthetic CPU", "cpu MHz\t\t: 2400.000",
+                      f"physical id\t: {i // max(1, self.cores // 2)}",
+                      f"siblings\t: {max(1, self.cores // 2)}",
+                      f"core id\t\t: {(i % max(1, self.cores // 2)) // threads_per_core}",
+                      f"cpu cores\t: {max(1, self.cores // 2 // threads_per_core)}", ""]
+        self.write("proc/cpuinfo", "\n".join(lines))
+
+        mounts = ["25 1 0:1 / / rw,relatime - ext4 /dev/root rw",
+                  "26 25 0:22 / /proc rw,relatime - proc proc rw",
+                  "27 25 0:23 / /run rw,relatime - tmpfs tmpfs rw"]
+        for i in range(self.disks):
+            mounts.append(f"{30 + i} 25 8:{16 * (i + 1)} / /data{i} rw,relatime - xfs /dev/sd{chr(98 + i)} rw")
+        self.write("proc/self/mountinfo", "\n".join(mounts) + "\n")
+
+    def write_statvfs(self, tick):
+        # Data volumes fill at different steady rates so capacity forecasts have a trend
+        statvfs = {"/": self.statvfs_entry(0.5), "/run": self.statvfs_entry(0.01, size=4 * 1024**3)}
+        base = 0.98 if self.disk_busy >= 1.0 else 0.4
+        for i in range(self.disks):
+            used = min(1.0, base + tick * self.interval * 2e-5 * (i + 1))
+            statvfs[f"/data{i}"] = self.statvfs_entry(used)
+        with open(self.path("statvfs.json"), "w") as f:
+            json.dump(statvfs, f)
+
+    def statvfs_entry(self, used_fraction, size=2 * 1024**4):
+        free = int(size * (1 - used_fraction))
+        return {"total": size, "free": free, "avail": free, "files": 1 << 26,
+                "files_free": int((1 << 26) * (1 - used_fraction / 2))}
+
+    def write_meminfo(self, tick):
+        kb = self.mem_total // 1024
+        used = int(kb * (0.6 + 0.1 * np.sin(2 * np.pi * tick / 600.0)))
+        cached = kb // 8
+        values = {
+            "MemTotal": kb, "MemFree": kb - used - cached, "MemAvailable": kb - used,
+            "Buffers": kb // 64, "Cached": cached, "SwapCached": 0,
+            "Active": used // 2, "Inactive": used // 4, "Dirty": 4096 + tick % 1024,
+            "Writeback": 0, "Shmem": kb // 128, "Slab": kb // 32, "SReclaimable": kb // 48,
+            "SUnreclaim": kb // 96, "CommitLimit": kb // 2 + 8 * 1024**2,
+            "Committed_AS": used + kb // 4, "SwapTotal": 8 * 1024**2,
+            "SwapFree": 8 * 1024**2 - tick % 1024,
+            "HugePages_Total": 0, "HugePages_Free": 0, "Hugepagesize": 2048,
+        }
+        lines = []
+        for key, value in values.items():
+            unit = "" if key.startswith("HugePages_") else " kB"
+            lines.append(f"{key + ':':<16}{value:>8}{unit}")
+        self.write("proc/meminfo", "\n".join(lines) + "\n")
+
+    def write_numa(self, tick):
+        base = "sys/devices/system/node"
+        per_node = self.cores // self.numa_nodes
+        kb = self.mem_total // 1024 // self.numa_nodes
+        if tick == 0:
+            for node in range(self.numa_nodes):
+                first = node * per_node
+                self.write(f"{base}/node{node}/cpulist", f"{first}-{first + per_node - 1}\n")
+        # Node 0 carries most of the load, so it runs fuller and allocates remotely more often
+        step = (self.rng.integers(20_000, 40_000, (self.numa_nodes, 6)) * self.interval).astype(np.int64)
+        step[:, 1:3] //= 40
+        step[0, 5] = step[0, 4] // 5
+        step[1:, 5] = step[1:, 4] // 50
+        self.numastat += step
+        for node in range(self.numa_nodes):
+            used = int(kb * (0.8 if node == 0 and self.numa_nodes > 1 else 0.5)
+                       * (1 + 0.05 * np.sin(2 * np.pi * tick / 600.0)))
+            lines = [f"Node {node} MemTotal:       {kb} kB", f"Node {node} MemFree:        {kb - used} kB",
+                     f"Node {node} MemUsed:        {used} kB", f"Node {node} FilePages:      {kb // 8} kB"]
+            self.write(f"{base}/node{node}/meminfo", "\n".join(lines) + "\n", makedirs=tick == 0)
+            self.write(f"{base}/node{node}/numastat",
+                       "".join(f"{key} {value}\n" for key, value in zip(
+                           ("numa_hit", "numa_miss", "numa_foreign", "interleave_hit", "local_node", "other_node"),
+                           self.numastat[node])), makedirs=False)
+
+    def write_vmstat(self):
+        increments = {"pgfault": 50_000, "pgmajfault": 20, "pswpin": 5, "pswpout": 8,
+                      "pgscan_kswapd": 300, "pgscan_direct": 10, "pgsteal_kswapd": 250,
+                      "pgsteal_direct": 8, "numa_hit": 40_000, "numa_miss": 500,
+                      "numa_foreign": 500, "numa_local": 39_000, "numa_other": 1_500}
+        for key, step in increments.items():
+            self.vm_counters[key] += int(step * self.interval * self.rng.uniform(0.5, 1.5))
+        self.write("proc/vmstat", "".join(f"{k} {v}\n" for k, v in self.vm_counters.items()))
+
+    def write_diskstats(self):
+        ms = int(1000 * self.interval)
+        ios = self.rng.integers(100, 2_000, (self.disks, 2))
+        self.disk_counters[:, 0] += ios[:, 0]
+        self.disk_counters[:, 2] += ios[:, 0] * 256
+        self.disk_counters[:, 3] += ios[:, 0] * 2
+        self.disk_counters[:, 4] += ios[:, 1]
+        self.disk_counters[:, 6] += ios[:, 1] * 256
+        self.disk_counters[:, 7] += ios[:, 1] * 3
+        self.disk_counters[:, 8] = 32 if self.disk_busy >= 1.0 else 1
+        self.disk_counters[:, 9] += int(ms * self.disk_busy)
+        self.disk_counters[:, 10] += int(ms * self.disk_busy * 8)
+        lines = [f"   8 {16 * (i + 1)} sd{chr(98 + i)} " + " ".join(map(str, row))
+                 for i, row in enumerate(self.disk_counters)]
+        self.write("proc/diskstats", "\n".join(lines) + "\n")
+
+    def write_network(self):
+        names = ["lo", "eth0"] + [f"veth{i:05d}" for i in range(self.interfaces - 2)]
+        traffic = self.rng.integers(1_000, 10_000_000, (self.interfaces, 2))
+        self.net_counters[:, 0] += traffic[:, 0]
+        self.net_counters[:, 1] += traffic[:, 0] // 1_000
+        self.net_counters[:, 8] += traffic[:, 1]
+        self.net_counters[:, 9] += traffic[:, 1] // 1_000
+        self.net_counters[:, 3] += self.rng.integers(0, 2, self.interfaces)
+        lines = ["Inter-|   Receive                                                |  Transmit",
+                 " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed"]
+        lines += [f"{name:>6}: " + " ".join(map(str, row)) for name, row in zip(names, self.net_counters)]
+        self.write("proc/net/dev", "\n".join(lines) + "\n")
+        self.tcp["OutSegs"] += int(traffic[:, 1].sum() // 1_400)
+        self.tcp["InSegs"] += int(traffic[:, 0].sum() // 1_400)
+        self.tcp["RetransSegs"] += int(self.rng.integers(0, 20))
+        keys = ["RtoAlgorithm", "RtoMin", "RtoMax", "MaxConn", "ActiveOpens", "PassiveOpens",
+                "AttemptFails", "EstabResets", "CurrEstab", "InSegs", "OutSegs", "RetransSegs",
+                "InErrs", "OutRsts", "InCsumErrors"]
+        values = [1, 200, 120000, -1, 0, 0, 0, 0, 10, self.tcp["InSegs"], self.tcp["OutSegs"],
+                  self.tcp["RetransSegs"], 0, 0, 0]
+        self.write("proc/net/snmp", "Tcp: " + " ".join(keys) + "\nTcp: " + " ".join(map(str, values)) + "\n")
+
+    def write_pressure(self, load):
+        stall = np.array([load, load * 0.3, self.disk_busy * 0.8])
+        self.psi_totals[:, 0] += (stall * 1e6 * self.interval * 0.2).astype(np.int64)
+        self.psi_totals[:, 1] += (stall * 1e6 * self.interval * 0.05).astype(np.int64)
+        for i, resource in enumerate(["cpu", "memory", "io"]):
+            some = stall[i] * 20
+            full = stall[i] * 5
+            self.write(f"proc/pressure/{resource}",
+                       f"some avg10={some:.2f} avg60={some:.2f} avg300={some:.2f} total={self.psi_totals[i, 0]}\n"
+                       f"full avg10={full:.2f} avg60={full:.2f} avg300={full:.2f} total={self.psi_totals[i, 1]}\n")
+
+    def write_processes(self, tick):
+        if tick == 0:
+            changed = np.arange(self.processes)
+        else:
+            # Churn a rotating 1% slice plus the busiest few so rewrites stay cheap
+            step = max(1, self.processes // 100)
+            start = (tick * step) % self.processes
+            changed = np.union1d(np.arange(start, min(start + step, self.processes)),
+                                 np.union1d(np.arange(min(20, self.processes)), self.leaking))
+        jiffies = int(USER_HZ * self.interval)
+        self.proc_cpu[changed] += self.rng.integers(0, jiffies, (len(changed), 2)) // 4
+        self.proc_rss[changed] += self.rng.integers(-50, 80, len(changed))
+        self.proc_rss[changed] = np.maximum(self.proc_rss[changed], 100)
+        self.proc_rss[self.leaking] += int(64 * self.interval)
+        self.proc_io[changed] += self.rng.integers(0, 1 << 20, (len(changed), 2))
+        for index in changed:
+            self.write_process(int(index), created=tick == 0)
+
+    def write_process(self, index, created=False):
+        pid = int(self.pids[index])
+        comm = f"worker-{index % 50}"
+        utime, stime = self.proc_cpu[index]
+        rss = int(self.proc_rss[index])
+        base = os.path.join("proc", str(pid))
+        if created:
+            os.makedirs(os.path.join(self.root, base), exist_ok=True)
+            self.write(os.path.join(base, "cmdline"), f"/usr/bin/{comm}\0", makedirs=False)
+            self.write(os.path.join(base, "comm"), f"{comm}\n", makedirs=False)
+        write = lambda name, text: self.write(os.path.join(base, name), text, makedirs=False)
+        write("stat",
+              f"{pid} ({comm}) S 1 {pid} {pid} 0 -1 4194560 0 0 0 0 {utime} {stime} 0 0 20 0 1 0 "
+              f"100 {rss * PAGE_SIZE * 2} {rss} 18446744073709551615 0 0 0 0 0 0 0 0 0 0 0 0 17 "
+              f"{index % self.cores} 0 0 0 0 0\n")
+        write("statm", f"{rss * 2} {rss} {rss // 4} 1 0 {rss} 0\n")
+        write("status",
+              f"Name:\t{comm}\nState:\tS (sleeping)\nPid:\t{pid}\nPPid:\t1\n"
+              f"VmRSS:\t{rss * PAGE_SIZE // 1024} kB\nThreads:\t1\n")
+        write("io",
+              f"rchar: {self.proc_io[index, 0]}\nwchar: {self.proc_io[index, 1]}\n"
+              f"read_bytes: {self.proc_io[index, 0]}\nwrite_bytes: {self.proc_io[index, 1]}\n")
+        rss_kb = rss * PAGE_SIZE // 1024
+        shared_kb = rss_kb // 4
+        write("smaps_rollup",
+              f"00400000-7fff00000000 ---p 00000000 00:00 0                          [rollup]\n"
+              f"Rss:{rss_kb:>19} kB\nPss:{rss_kb - shared_kb // 2:>19} kB\n"
+              f"Shared_Clean:{shared_kb:>10} kB\nShared_Dirty:{0:>10} kB\n"
+              f"Private_Clean:{rss_kb // 8:>9} kB\nPrivate_Dirty:{rss_kb - shared_kb - rss_kb // 8:>9} kB\n"
+              f"Swap:{rss_kb // 20:>18} kB\nSwapPss:{rss_kb // 20:>15} kB\n")
+
+
+    @staticmethod
+    def cgroup_name(index):
+        if index % 2:
+            return f"machine.slice/container-{index}.scope"
+        return f"system.slice/unit-{index}.service"
+
+    def write_cgroups(self, tick):
+        base = "sys/fs/cgroup"
+        if tick == 0:
+            self.write(f"{base}/cgroup.controllers", "cpuset cpu io memory pids\n")
+            changed = np.arange(self.cgroups)
+        else:
+            step = max(1, self.cgroups // 100)
+            start = (tick * step) % self.cgroups
+            changed = np.union1d(np.arange(start, min(start + step, self.cgroups)),
+                                 np.arange(min(10, self.cgroups)))
+            if tick % 30 == 0:
+                # A container exits and another starts in its place
+                index = int(self.rng.integers(0, self.cgroups))
+                shutil.rmtree(os.path.join(self.root, base, self.cgroup_names[index]), ignore_errors=True)
+                self.cgroup_names[index] = self.cgroup_name(index).replace(".scope", f"-{tick}.scope")
+                self.cgroup_counters[index] = 0
+                changed = np.union1d(changed, [index])
+        usec = int(1e6 * self.interval)
+        self.cgroup_counters[changed, 0] += self.rng.integers(0, usec, len(changed))
+        self.cgroup_counters[changed, 1:3] += self.rng.integers(0, 1 << 22, (len(changed), 2))
+        self.cgroup_memory[changed] = np.maximum(
+            self.cgroup_memory[changed] + self.rng.integers(-1 << 20, 1 << 20, len(changed)), 1 << 20)
+        for index in changed:
+            self.write_cgroup(f"{base}/{self.cgroup_names[index]}", self.cgroup_counters[index],
+                              int(self.cgroup_memory[index]))
+        total = self.cgroup_counters.sum(axis=0)
+        self.write_cgroup(base, total, int(self.cgroup_memory.sum()))
+
+    def write_cgroup(self, relative, counters, memory):
+        usage, rbytes, wbytes = map(int, counters[:3])
+        self.write(f"{relative}/cpu.stat", f"usage_usec {usage}\nuser_usec {usage * 7 // 10}\n"
+                                           f"system_usec {usage - usage * 7 // 10}\n")
+        self.write(f"{relative}/memory.current", f"{memory}\n", makedirs=False)
+        self.write(f"{relative}/memory.stat", f"anon {memory * 3 // 4}\nfile {memory // 4}\n",
+                   makedirs=False)
+        self.write(f"{relative}/io.stat", f"8:0 rbytes={rbytes} wbytes={wbytes} rios=0 wios=0\n",
+                   makedirs=False)
+
+
+class RecordedScenario:
+    """Frames captured by record(), replayed one directory per tick"""
+
+    def __init__(self, root, loop=False):
+        self.frames = sorted(glob.glob(os.path.join(root, "frames", "*")))
+        if not self.frames:
+            raise ValueError(f"No frames found under {root}")
+        self.loop = loop
+
+    def __len__(self):
+        return len(self.frames)
+
+    def apply(self, tick, backend):
+        if tick >= len(self.frames) and not self.loop:
+            raise IndexError("Recording exhausted")
+        backend.set_root(self.frames[tick % len(self.frames)])
+
+
+class LoadReplayer:
+    """Steps a scenario and the backend's virtual clock together, one tick at a time"""
+
+    def __init__(self, backend, scenario, interval=1.0):
+        self.backend = backend
+        self.scenario = scenario
+        self.interval = interval
+        self.tick = 0
+
+    def step(self):
+        if self.tick:
+            self.backend.clock.advance(self.interval)
+        self.scenario.apply(self.tick, self.backend)
+        self.tick += 1
+
+    def run(self, collector, ticks):
+        for _ in range(ticks):
+            self.step()
+            yield collector.collect()
+
+
+def synthetic_backend(root, scenario="small", **overrides):
+    """Build a FixtureBackend and LoadReplayer for one of the SCENARIOS presets"""
+    options = dict(SCENARIOS[scenario], **overrides)
+    backend = FixtureBackend(root)
+    replayer = LoadReplayer(backend, SyntheticScenario(root, **options),
+                            interval=options.get("interval", 1.0))
+    replayer.step()
+    return backend, replayer
+
+
+def record(out_dir, frames, interval=1.0, include_processes=False):
+    """Copy the live files collectors read into out_dir/frames/NNNNNN once per interval"""
+    import psutil
+
+    for frame in range(frames):
+        started = time.monotonic()
+        frame_dir = os.path.join(out_dir, "frames", f"{frame:06d}")
+        paths = list(RECORD_PATHS)
+        if include_processes:
+            for pid in psutil.pids():
+                paths += [f"proc/{pid}/{name}" for name in ("stat", "statm", "status", "io")]
+        for relative in paths:
+            target = os.path.join(frame_dir, relative)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                shutil.copyfile("/" + relative, target)
+            except OSError:
+                pass
+
+        statvfs = {}
+        for partition in psutil.disk_partitions():
+            try:
+                st = os.statvfs(partition.mountpoint)
+            except OSError:
+                continue
+            statvfs[partition.mountpoint] = {
+                "total": st.f_blocks * st.f_frsize, "free": st.f_bfree * st.f_frsize,
+                "avail": st.f_bavail * st.f_frsize, "files": st.f_files, "files_free": st.f_ffree,
+            }
+        with open(os.path.join(frame_dir, "statvfs.json"), "w") as f:
+            json.dump(statvfs, f)
+        time.sleep(max(0.0, interval - (time.monotonic() - started)))
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump({"frames": frames, "interval": interval}, f)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record or synthesise /proc fixtures")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="capture live /proc and /sys frames")
+    rec.add_argument("out_dir")
+    rec.add_argument("--frames", type=int, default=60)
+    rec.add_argument("--interval", type=float, default=1.0)
+    rec.add_argument("--processes", action="store_true", help="include per-process files")
+    syn = sub.add_parser("synth", help="write the first frame of a synthetic scenario")
+    syn.add_argument("out_dir")
+    syn.add_argument("--scenario", choices=sorted(SCENARIOS), default="small")
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        record(args.out_dir, args.frames, args.interval, args.processes)
+    else:
+        started = time.perf_counter()
+        synthetic_backend(args.out_dir, args.scenario)
+        print(f"Wrote {args.scenario} fixture to {args.out_dir} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,310 @@
+import argparse
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from attribution import METRICS as CONTRIBUTOR_METRICS
+
+# Everything the recorder can sample and the /proc file each one comes from; a recorder
+# only reads the files its chosen metrics need
+SOURCES = {
+    "cpu": "stat",
+    "iowait": "stat",
+    "procs_running": "stat",
+    "procs_blocked": "stat",
+    "ctxt": "stat",
+    "psi_cpu": "pressure/cpu",
+    "psi_memory": "pressure/memory",
+    "psi_io": "pressure/io",
+    "major_faults": "vmstat",
+    "swap_in": "vmstat",
+    "swap_out": "vmstat",
+    "mem_available": "meminfo",
+}
+DEFAULT_METRICS = ("cpu", "iowait", "procs_running", "procs_blocked", "psi_cpu", "psi_memory", "psi_io",
+                   "major_faults", "mem_available")
+VMSTAT_FIELDS = {"major_faults": b"pgmajfault", "swap_in": b"pswpin", "swap_out": b"pswpout"}
+
+
+def read_file(path):
+    # /proc/stat on a large host and /proc/vmstat run past the single 4 KB read procmem.read_bytes does
+    with open(path, "rb", buffering=0) as f:
+        return f.read()
+
+
+def parse_stat(data):
+    """(busy jiffies, iowait jiffies, total jiffies, procs_running, procs_blocked, ctxt) from /proc/stat"""
+    fields = {}
+    for line in data.splitlines():
+        name, _, rest = line.partition(b" ")
+        if name in (b"cpu", b"ctxt", b"procs_running", b"procs_blocked"):
+            fields[name] = rest.split()
+    cpu = [int(value) for value in fields[b"cpu"][:8]]
+    total = sum(cpu)
+    idle = cpu[3] + cpu[4]
+    return (total - idle, cpu[4], total, int(fields[b"procs_running"][0]), int(fields[b"procs_blocked"][0]),
+            int(fields[b"ctxt"][0]))
+
+
+def parse_keyed(data, keys):
+    """Integer values for keys from a "name value" file such as /proc/vmstat"""
+    values = {}
+    for line in data.splitlines():
+        fields = line.split()
+        if fields and fields[0] in keys:
+            values[fields[0]] = int(fields[1])
+    return values
+
+
+class FlightRecorder:
+    """High-rate pre-trigger capture of a few /proc counters
+
+    While enabled, a thread samples the chosen metrics rate_hz times a
+    second into a fixed ring of (seconds_before + seconds_after) * rate_hz
+    rows, turning counters into per-interval rates (CPU and PSI as percent
+    of the interval) so a 200 ms stall shows up at full height instead of
+    being averaged into a one-second tick. trigger() marks the current row;
+    seconds_after later the thread writes the preceding seconds_before and
+    following seconds_after to a compressed .npz in output_dir, together
+    with the top processes from the history's contributors over that span.
+
+    Sampling and writing stay on the recorder thread, started on first
+    enable, so the UI tick rate is unaffected.
+    """
+
+    def __init__(self, backend, history=None, metrics=DEFAULT_METRICS, rate_hz=50.0, seconds_before=120.0,
+                 seconds_after=10.0, output_dir="recordings", top=10):
+        unknown = set(metrics) - set(SOURCES)
+        if unknown:
+            raise ValueError(f"Unknown flight recorder metrics: {', '.join(sorted(unknown))}")
+        self.backend = backend
+        self.history = history
+        self.metrics = tuple(metrics)
+        self.rate_hz = rate_hz
+        self.seconds_before = seconds_before
+        self.seconds_after = seconds_after
+        self.output_dir = output_dir
+        self.top = top
+        # Kernels without PSI have no pressure files; those columns stay NaN
+        self.files = sorted(name for name in {SOURCES[metric] for metric in self.metrics}
+                            if os.path.exists(os.path.join(backend.proc_root, name)))
+        self.available = os.path.exists(os.path.join(backend.proc_root, "stat"))
+        self.capacity = int(np.ceil((seconds_before + seconds_after) * rate_hz))
+        self.times = np.zeros(self.capacity, dtype=np.float64)
+        self.values = np.full((self.capacity, len(self.metrics)), np.nan, dtype=np.float32)
+        self.count = 0
+        self.previous = None
+        self.lock = threading.Lock()
+        self.enabled = threading.Event()
+        self.thread = None
+        self.pending = None
+        self.last_dumps = []
+        self.error = None
+        self.overruns = 0
+
+    def set_enabled(self, enabled):
+        if enabled and not self.available:
+            return False
+        if enabled:
+            self.enabled.set()
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, daemon=True, name="flight-recorder")
+                self.thread.start()
+        else:
+            self.enabled.clear()
+            with self.lock:
+                self.pending = None
+                self.count = 0
+                self.previous = None
+        return enabled
+
+    def toggle(self):
+        return self.set_enabled(not self.enabled.is_set())
+
+    def trigger(self, reason):
+        """Dump the window around now once seconds_after have passed; False if off or a dump is already due"""
+        if not self.enabled.is_set():
+            return False
+        with self.lock:
+            if self.pending is not None:
+                return False
+            self.pending = (self.count, time.monotonic() + self.seconds_after, self.backend.clock.time(), reason)
+        return True
+
+    def status(self):
+        if not self.enabled.is_set():
+            return "Off" if self.available else "Unavailable (no /proc)"
+        if self.pending is not None:
+            return f"Capturing {max(0.0, self.pending[1] - time.monotonic()):.0f}s after trigger"
+        buffered = min(self.count, self.capacity) / self.rate_hz
+        return f"Recording {self.rate_hz:.0f} Hz, {buffered:.0f}s buffered"
+
+    def read(self):
+        """Raw counters for this sample as {file: parsed}"""
+        proc_root = self.backend.proc_root
+        raw = {}
+        for name in self.files:
+            data = read_file(os.path.join(proc_root, name))
+            if name == "stat":
+                raw[name] = parse_stat(data)
+            elif name.startswith("pressure/"):
+                # "some avg10=.. avg60=.. avg300=.. total=N": the microsecond total is the last field
+                raw[name] = int(data.split(b"\n", 1)[0].rsplit(b"=", 1)[1])
+            elif name == "vmstat":
+                raw[name] = parse_keyed(data, set(VMSTAT_FIELDS.values()))
+            else:
+                raw[name] = parse_keyed(data, {b"MemAvailable:"})
+        return raw
+
+    def row(self, raw, previous, elapsed):
+        row = np.full(len(self.metrics), np.nan, dtype=np.float32)
+        for i, metric in enumerate(self.metrics):
+            source = SOURCES[metric]
+            current = raw.get(source)
+            if current is None:
+                continue
+            if metric == "procs_running":
+                row[i] = current[3]
+            elif metric == "procs_blocked":
+                row[i] = current[4]
+            elif metric == "mem_available":
+                row[i] = current.get(b"MemAvailable:", 0) * 1024
+            elif previous is None or elapsed <= 0:
+                continue
+            elif metric in ("cpu", "iowait"):
+                jiffies = current[2] - previous[source][2]
+                part = 0 if metric == "cpu" else 1
+                row[i] = 100.0 * (current[part] - previous[source][part]) / jiffies if jiffies > 0 else 0.0
+            elif metric == "ctxt":
+                row[i] = (current[5] - previous[source][5]) / elapsed
+            elif metric.startswith("psi_"):
+                row[i] = min(100.0, (current - previous[source]) / (elapsed * 1e6) * 100)
+            else:
+                field = VMSTAT_FIELDS[metric]
+                row[i] = (current.get(field, 0) - previous[source].get(field, 0)) / elapsed
+        return row
+
+    def sample(self, now):
+        raw = self.read()
+        elapsed = now - self.previous[0] if self.previous is not None else 0.0
+        row = self.row(raw, self.previous[1] if self.previous is not None else None, elapsed)
+        self.previous = (now, raw)
+        with self.lock:
+            slot = self.count % self.capacity
+            self.times[slot] = self.backend.clock.time()
+            self.values[slot] = row
+            self.count += 1
+
+    def run(self):
+        period = 1.0 / self.rate_hz
+        next_sample = time.monotonic()
+        while self.enabled.is_set():
+            now = time.monotonic()
+            try:
+                self.sample(now)
+            except (OSError, ValueError, IndexError, KeyError) as e:
+                self.error = f"Flight recorder sample failed: {e}"
+            pending = self.pending
+            if pending is not None and now >= pending[1]:
+                self.dump()
+            next_sample += period
+            delay = next_sample - time.monotonic()
+            if delay < -period:
+                # Fell more than a sample behind (suspend, heavy load): skip ahead rather than burst
+                self.overruns += 1
+                next_sample = time.monotonic()
+            elif delay > 0:
+                time.sleep(delay)
+
+    def window(self, trigger_count):
+        """Rows from seconds_before ahead of trigger_count to now, oldest first"""
+        with self.lock:
+            end = self.count
+            start = max(trigger_count - int(self.seconds_before * self.rate_hz), end - self.capacity, 0)
+            slots = np.arange(start, end) % self.capacity
+            return self.times[slots], self.values[slots].copy()
+
+    def dump(self):
+        with self.lock:
+            if self.pending is None:
+                return None
+            trigger_count, _, trigger_time, reason = self.pending
+            self.pending = None
+        times, values = self.window(trigger_count)
+        arrays = {
+            "times": times,
+            "values": values,
+            "metrics": np.array(self.metrics, dtype=str),
+            "rate_hz": np.float64(self.rate_hz),
+            "trigger_time": np.float64(trigger_time),
+            "reason": np.array(reason, dtype=str),
+        }
+        if self.history is not None and len(times):
+            for metric in CONTRIBUTOR_METRICS:
+                rows, _ = self.history.contributors.aggregate(metric, times[0], times[-1], count=self.top)
+                arrays[f"top_{metric}_pids"] = np.array([row[0] for row in rows], dtype=np.int64)
+                arrays[f"top_{metric}_comms"] = np.array([row[1] for row in rows], dtype=str)
+                arrays[f"top_{metric}_amounts"] = np.array([row[2] for row in rows], dtype=np.float64)
+        path = os.path.join(self.output_dir, time.strftime("flight-%Y%m%d-%H%M%S.npz",
+                                                           time.localtime(trigger_time)))
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            np.savez_compressed(path, **arrays)
+        except OSError as e:
+            self.error = f"Error writing flight recording: {e}"
+            return None
+        self.last_dumps.append(path)
+        return path
+
+
+def load_recording(path):
+    """A saved recording as a dict of arrays; top processes as {metric: [(pid, comm, amount)]}"""
+    with np.load(path, allow_pickle=False) as data:
+        recording = {
+            "times": data["times"],
+            "values": data["values"],
+            "metrics": [str(metric) for metric in data["metrics"]],
+            "rate_hz": float(data["rate_hz"]),
+            "trigger_time": float(data["trigger_time"]),
+            "reason": str(data["reason"]),
+            "top": {},
+        }
+        for metric in CONTRIBUTOR_METRICS:
+            if f"top_{metric}_pids" in data:
+                recording["top"][metric] = list(zip(data[f"top_{metric}_pids"].tolist(),
+                                                    [str(comm) for comm in data[f"top_{metric}_comms"]],
+                                                    data[f"top_{metric}_amounts"].tolist()))
+    return recording
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise a flight recording")
+    parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    recording = load_recording(args.path)
+    times, values = recording["times"], recording["values"]
+    print(f"{args.path}: {len(times)} samples at {recording['rate_hz']:.0f} Hz, trigger: {recording['reason']}")
+    if not len(times):
+        return 0
+    trigger = recording["trigger_time"]
+    print(f"  {times[0] - trigger:+.1f}s to {times[-1] - trigger:+.1f}s around the trigger")
+    print(f"  {'Metric':<16}{'Mean':>14}{'p99':>14}{'Max':>14}{'Max at':>10}")
+    for i, metric in enumerate(recording["metrics"]):
+        column = values[:, i]
+        if np.isnan(column).all():
+            continue
+        peak = int(np.nanargmax(column))
+        print(f"  {metric:<16}{np.nanmean(column):>14.2f}{np.nanpercentile(column, 99):>14.2f}"
+              f"{column[peak]:>14.2f}{times[peak] - trigger:>+9.2f}s")
+    for metric, rows in recording["top"].items():
+        if rows:
+            print(f"  Top {metric}: " + ", ".join(f"{comm} ({pid})" for pid, comm, _ in rows[:5]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+class IncrementalTrend:
+    """Exponentially weighted least-squares line, updated in O(1) per sample
+
+    Keeps decayed sums of w, t, y, t*t and t*y with t measured from the newest
+    sample, so old samples fade with the given half-life and no history is
+    ever rescanned. A fall of more than drop points (files deleted, logs
+    rotated) starts a new segment; until it has min_samples the previous
+    slope is kept so the forecast does not flap.
+    """
+
+    def __init__(self, halflife=6 * 3600.0, drop=1.0, min_samples=6, min_span=60.0):
+        self.halflife = halflife
+        self.drop = drop
+        self.min_samples = min_samples
+        self.min_span = min_span
+        self.prior_slope = None
+        self.reset()
+
+    def reset(self):
+        self.s0 = self.st = self.sy = self.stt = self.sty = 0.0
+        self.count = 0
+        self.first_time = None
+        self.last_time = None
+        self.last_value = None
+
+    def update(self, t, y):
+        if self.last_value is not None and y < self.last_value - self.drop:
+            slope = self.slope()
+            if slope is not None:
+                self.prior_slope = slope
+            self.reset()
+        if self.last_time is not None:
+            d = t - self.last_time
+            if d <= 0:
+                return
+            # Move the origin to the new sample, then fade everything older
+            self.stt = self.stt - 2 * d * self.st + d * d * self.s0
+            self.sty = self.sty - d * self.sy
+            self.st = self.st - d * self.s0
+            decay = 0.5 ** (d / self.halflife)
+            self.s0 *= decay
+            self.st *= decay
+            self.sy *= decay
+            self.stt *= decay
+            self.sty *= decay
+        else:
+            self.first_time = t
+        self.s0 += 1.0
+        self.sy += y
+        self.count += 1
+        self.last_time = t
+        self.last_value = y
+
+    def slope(self):
+        """Units per second, or None until the segment has enough samples and span"""
+        if self.count < self.min_samples or self.last_time - self.first_time < self.min_span:
+            return None
+        denominator = self.s0 * self.stt - self.st * self.st
+        if denominator <= 0:
+            return None
+        return (self.s0 * self.sty - self.st * self.sy) / denominator
+
+    def current_slope(self):
+        slope = self.slope()
+        return slope if slope is not None else self.prior_slope
+
+    def fitted(self):
+        """Trend value at the newest sample"""
+        slope = self.slope()
+        if slope is None:
+            return self.last_value
+        return (self.sy - slope * self.st) / self.s0
+
+    def seconds_until(self, limit):
+        """Seconds until the trend reaches limit, or None if it is flat or falling"""
+        slope = self.current_slope()
+        # Anything slower than ~0.1 points a day is rounding noise on a static volume
+        if slope is None or slope < 1e-6 or self.last_value is None:
+            return None
+        return max(0.0, (limit - self.fitted()) / slope)
+
+
+class DiskForecaster:
+    """One IncrementalTrend per mount over its use percentage
+
+    alert_hours marks mounts expected to fill sooner than that; on_alert is
+    called once when a mount enters that state and again only after it leaves.
+    """
+
+    def __init__(self, halflife=6 * 3600.0, alert_hours=24.0, on_alert=None):
+        self.halflife = halflife
+        self.alert_hours = alert_hours
+        self.on_alert = on_alert
+        self.trends = {}
+        self.alerting = set()
+
+    def update(self, mount, t, percent):
+        trend = self.trends.get(mount)
+        if trend is None:
+            trend = self.trends[mount] = IncrementalTrend(self.halflife)
+        trend.update(t, percent)
+
+    def annotate(self, mounts):
+        """Add fill_rate_h (points per hour) and full_in_h to each mount row; forget vanished mounts"""
+        present = set()
+        for row in mounts:
+            mount = row["mount"]
+            present.add(mount)
+            trend = self.trends.get(mount)
+            slope = trend.current_slope() if trend is not None else None
+            seconds = trend.seconds_until(100.0) if trend is not None else None
+            row["fill_rate_h"] = slope * 3600 if slope is not None else None
+            row["full_in_h"] = seconds / 3600 if seconds is not None else None
+            alert = row["full_in_h"] is not None and row["full_in_h"] < self.alert_hours
+            row["forecast_alert"] = alert
+            if alert and mount not in self.alerting:
+                self.alerting.add(mount)
+                if self.on_alert is not None:
+                    self.on_alert(mount, row["full_in_h"])
+            elif not alert:
+                self.alerting.discard(mount)
+        for mount in set(self.trends) - present:
+            del self.trends[mount]
+            self.alerting.discard(mount)
+        return mounts
+
+
+def format_duration(hours):
+    if hours is None:
+        return "--"
+    if hours < 1:
+        return f"{hours * 60:.0f} min"
+    if hours < 48:
+        return f"{hours:.1f} h"
+    if hours < 24 * 365:
+        return f"{hours / 24:.0f} d"
+    return "> 1 year"
+
+
+def format_eta(hours):
+    if hours is None or hours >= 24 * 365:
+        return format_duration(hours)
+    return f"full in {format_duration(hours)}"
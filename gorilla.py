@@ -0,0 +1,171 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Delta-of-delta buckets for millisecond timestamps: (control bits, control length, payload bits);
+# anything wider is "1111" and the full 64 bits
+TIME_BUCKETS = ((0b10, 2, 7), (0b110, 3, 12), (0b1110, 4, 20))
+
+
+class Block:
+    """A sealed, compressed run of points with the index used to skip it"""
+
+    def __init__(self, times, values):
+        self.count = len(times)
+        self.start = float(times[0])
+        self.end = float(times[-1])
+        self.last = float(values[-1])
+        # NaN samples (a missing reading) are stored but left out of the extremes
+        finite = values[~np.isnan(values)]
+        self.min = float(finite.min()) if len(finite) else np.nan
+        self.max = float(finite.max()) if len(finite) else np.nan
+        self.data = encode(times, values)
+        # Read-only (times, values) while the block is recent enough to keep uncompressed as well
+        self.raw = None
+
+    def __len__(self):
+        return self.count
+
+    def points(self):
+        raw = self.raw
+        return raw if raw is not None else decode(self.data, self.count)
+
+
+def bit_length(x):
+    """Bit length of each uint64, exact where a float64 conversion of the whole value is not"""
+    high = (x >> np.uint64(32)).astype(np.float64)
+    low = (x & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    return np.where(high > 0, np.frexp(high)[1] + 32, np.frexp(low)[1])
+
+
+def pack(fields, widths):
+    """Concatenate each field's low widths[i] bits, most significant first, into bytes"""
+    widths = np.asarray(widths, dtype=np.int64)
+    fields = np.asarray(fields, dtype=np.uint64)
+    owner = np.repeat(np.arange(len(widths)), widths)
+    position = np.arange(int(widths.sum())) - np.repeat(np.cumsum(widths) - widths, widths)
+    shift = (widths[owner] - 1 - position).astype(np.uint64)
+    bits = ((fields[owner] >> shift) & np.uint64(1)).astype(np.uint8)
+    return np.packbits(bits).tobytes()
+
+
+def encode(times, values):
+    """Gorilla-compress points: delta-of-delta millisecond timestamps and XOR-ed float64 values
+
+    Timestamps are kept to the millisecond; values are bit-exact. A block
+    starts with the raw first timestamp and value. Each later timestamp is
+    the change in spacing, one bit when the spacing is unchanged. Each later
+    value is XOR-ed with the previous one: one bit when equal, otherwise only
+    the meaningful bits between the leading and trailing zeros, reusing the
+    previous zero counts when they still fit.
+    """
+    stamps = np.round(np.asarray(times, dtype=np.float64) * 1000).astype(np.int64)
+    bits = np.ascontiguousarray(values, dtype=np.float64).view(np.uint64)
+    n = len(stamps)
+    dod = np.diff(np.diff(stamps, prepend=stamps[0]))
+    xor = bits[1:] ^ bits[:-1]
+    lead = np.minimum(64 - bit_length(xor), 31).astype(np.int64)
+    trail = (bit_length(xor & (~xor + np.uint64(1))) - 1).astype(np.int64)
+
+    # Four fields per later point: timestamp control with payload, a wide timestamp payload,
+    # value control with window, value payload; zero-width fields cost nothing
+    fields = np.zeros((n - 1, 4), dtype=np.uint64)
+    widths = np.zeros((n - 1, 4), dtype=np.int64)
+    widths[:, 0] = 1
+    remaining = dod != 0
+    for control, control_bits, payload_bits in TIME_BUCKETS:
+        limit = 1 << (payload_bits - 1)
+        fits = remaining & (dod > -limit) & (dod <= limit)
+        fields[fits, 0] = (np.uint64(control) << np.uint64(payload_bits)) | (dod[fits] + limit - 1).astype(np.uint64)
+        widths[fits, 0] = control_bits + payload_bits
+        remaining &= ~fits
+    fields[remaining, 0] = 0b1111
+    widths[remaining, 0] = 4
+    fields[remaining, 1] = dod[remaining].astype(np.uint64)
+    widths[remaining, 1] = 64
+
+    # Whether the previous window still fits depends on the last window written, so this runs in order
+    window_lead = np.zeros(n - 1, dtype=np.int64)
+    window_trail = np.zeros(n - 1, dtype=np.int64)
+    reused = np.zeros(n - 1, dtype=bool)
+    previous_lead = previous_trail = -1
+    for i, (zero, point_lead, point_trail) in enumerate(zip((xor == 0).tolist(), lead.tolist(), trail.tolist())):
+        if zero:
+            continue
+        if previous_lead >= 0 and point_lead >= previous_lead and point_trail >= previous_trail:
+            reused[i] = True
+        else:
+            previous_lead, previous_trail = point_lead, point_trail
+        window_lead[i], window_trail[i] = previous_lead, previous_trail
+    changed = xor != 0
+    meaningful = 64 - window_lead - window_trail
+    widths[:, 2] = np.where(reused, 2, np.where(changed, 13, 1))
+    fields[reused, 2] = 0b10
+    fresh = changed & ~reused
+    fields[fresh, 2] = ((np.uint64(0b11) << np.uint64(11)) | (window_lead[fresh].astype(np.uint64) << np.uint64(6))
+                        | (meaningful[fresh] - 1).astype(np.uint64))
+    fields[changed, 3] = xor[changed] >> window_trail[changed].astype(np.uint64)
+    widths[changed, 3] = meaningful[changed]
+
+    header = np.array([stamps[0].view(np.uint64), bits[0]], dtype=np.uint64)
+    return pack(np.concatenate([header, fields.ravel()]), np.concatenate([[64, 64], widths.ravel()]))
+
+
+@lru_cache(maxsize=256)
+def decode(data, count):
+    """(times, values) of an encoded block; cached, so the arrays are read-only"""
+    buffer = data + bytes(9)
+
+    def read(position, width):
+        byte = position >> 3
+        window = int.from_bytes(buffer[byte:byte + 9], "big")
+        return (window >> (72 - (position & 7) - width)) & ((1 << width) - 1)
+
+    stamp = read(0, 64)
+    if stamp >> 63:
+        stamp -= 1 << 64
+    bits = read(64, 64)
+    position = 128
+    stamps = [stamp]
+    words = [bits]
+    delta = 0
+    lead = trail = 0
+    for _ in range(count - 1):
+        head = read(position, 4)
+        if not head >> 3:
+            position += 1
+        else:
+            for control, control_bits, payload_bits in TIME_BUCKETS:
+                if head >> (4 - control_bits) == control:
+                    position += control_bits
+                    delta += read(position, payload_bits) - (1 << (payload_bits - 1)) + 1
+                    position += payload_bits
+                    break
+            else:
+                dod = read(position + 4, 64)
+                delta += dod - (1 << 64) if dod >> 63 else dod
+                position += 68
+        stamp += delta
+        stamps.append(stamp)
+
+        head = read(position, 2)
+        if not head >> 1:
+            position += 1
+        else:
+            if head == 0b11:
+                window = read(position + 2, 11)
+                lead, meaningful = window >> 6, (window & 0x3F) + 1
+                trail = 64 - lead - meaningful
+                position += 13
+            else:
+                position += 2
+            width = 64 - lead - trail
+            bits ^= read(position, width) << trail
+            position += width
+        words.append(bits)
+
+    times = np.array(stamps, dtype=np.float64) / 1000.0
+    values = np.array(words, dtype=np.uint64).view(np.float64)
+    times.flags.writeable = False
+    values.flags.writeable = False
+    return times, values
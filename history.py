@@ -0,0 +1,662 @@
+from bisect import bisect_left
+from datetime import datetime
+from threading import Lock
+
+import numpy as np
+
+from attribution import ContributorStore
+from deadband import DeadbandFilter, hold
+from gorilla import Block
+from stats import StreamingStats
+
+# Most series per name family ("cgroup_cpu:", "net_rx:", ...); a new name past this replaces the stalest one
+FAMILY_LIMIT = 256
+# How often, in sample time, series with nothing newer than the retention are dropped
+EXPIRE_INTERVAL = 600.0
+# Sealed blocks ending this close to a series' newest point keep their raw arrays too, so reads of the
+# last hour (graph windows, 1 s selects) never wait on decompression
+HOT_SECONDS = 3600.0
+# Rollup tiers as (bucket seconds, seconds kept); each tier is filled from the buckets the finer one closes
+ROLLUPS = ((10.0, 6 * 3600.0), (60.0, 2 * 86400.0), (600.0, 7 * 86400.0))
+AGGREGATES = ("last", "mean", "min", "max")
+
+
+class Rollup:
+    """Seconds with a known value, time-weighted sum, min and max per width-second bucket, for at least span seconds
+
+    Each sample's value counts for the time until the next sample, as with
+    the held points, so sum / seconds is the same time-weighted mean that
+    aggregate_points() computes from the stored points.
+
+    The bucket being filled is a plain list, written to the arrays when a
+    later one opens. As with the SeriesBuffer head, the arrays hold up to
+    twice span and drop their older half when full, so the kept buckets
+    are always one contiguous, time-ordered slice. since is the start of
+    the oldest bucket known to hold every sample from then on.
+    """
+
+    def __init__(self, width, span):
+        self.width = width
+        self.size = int(span // width)
+        # Rows: bucket start, known seconds, sum of value * seconds, min, max
+        self.columns = np.empty((5, 16), dtype=np.float64)
+        self.end = 0
+        self.open = None
+        self.since = None
+
+    def add(self, start, known, total, low, high):
+        """Fold aggregates into the bucket holding start; returns the bucket this closed, if any"""
+        start -= start % self.width
+        bucket = self.open
+        if bucket is not None and start <= bucket[0]:
+            bucket[1] += known
+            bucket[2] += total
+            if low < bucket[3]:
+                bucket[3] = low
+            if high > bucket[4]:
+                bucket[4] = high
+            return None
+        self.open = [start, known, total, low, high]
+        if self.since is None:
+            self.since = start
+        if bucket is not None:
+            self.store(bucket)
+        return bucket
+
+    def store(self, bucket):
+        if self.end == self.columns.shape[1]:
+            if self.end < 2 * self.size:
+                grown = np.empty((5, min(2 * self.end, 2 * self.size)), dtype=np.float64)
+                grown[:, :self.end] = self.columns
+                self.columns = grown
+            else:
+                self.columns[:, :self.end - self.size] = self.columns[:, self.size:self.end]
+                self.end -= self.size
+                self.since = self.columns[0, 0]
+        self.columns[:, self.end] = bucket
+        self.end += 1
+
+    def covers(self, start, first):
+        """Whether every sample from start on is here, given the series' first stored time"""
+        return self.since is not None and (start >= self.since or first >= self.since)
+
+    def aggregate(self, edges, pending):
+        """Known seconds, time-weighted sum, min and max between consecutive edges
+
+        pending are the open buckets of this tier and the finer ones, which
+        the kept buckets do not include yet.
+        """
+        bins = len(edges) - 1
+        starts = self.columns[0, :self.end]
+        first, last = np.searchsorted(starts, (edges[0], edges[-1]))
+        rows = self.columns[:, first:last]
+        if pending:
+            rows = np.concatenate([rows, np.array(pending, dtype=np.float64).T], axis=1)
+            rows = rows[:, (rows[0] >= edges[0]) & (rows[0] < edges[-1])]
+        index = np.searchsorted(edges, rows[0], side="right") - 1
+        known = np.bincount(index, rows[1], minlength=bins)
+        total = np.bincount(index, rows[2], minlength=bins)
+        low = np.full(bins, np.inf)
+        high = np.full(bins, -np.inf)
+        np.minimum.at(low, index, rows[3])
+        np.maximum.at(high, index, rows[4])
+        return known, total, low, high
+
+
+def aggregate_points(times, values, edges, agg, newest=None):
+    """agg of held points between consecutive edges: the value in effect at each end, or the time-weighted
+    mean, min or max of the values in effect over each step; NaN where nothing is known
+
+    The last point holds until newest, the series' newest time, which is
+    later than times[-1] when the points were read only up to the last edge.
+    """
+    bins = len(edges) - 1
+    result = np.full(bins, np.nan)
+    if not len(times):
+        return result
+    if agg == "last":
+        return hold(times, values, edges[1:])
+    if agg == "mean":
+        # Integral of the step function at each edge; NaN values count as gaps
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+        spans = np.diff(times)
+        area = np.concatenate([[0.0], np.cumsum(filled[:-1] * spans)])
+        known = np.concatenate([[0.0], np.cumsum(valid[:-1] * spans)])
+        at = np.minimum(edges, times[-1] if newest is None else newest)
+        index = np.searchsorted(times, at, side="right") - 1
+        inside = index >= 0
+        index = np.maximum(index, 0)
+        offset = np.where(inside, at - times[index], 0.0)
+        area = np.where(inside, area[index] + filled[index] * offset, 0.0)
+        known = np.where(inside, known[index] + valid[index] * offset, 0.0)
+        duration = np.diff(known)
+        covered = duration > 0
+        result[covered] = np.diff(area)[covered] / duration[covered]
+        return result
+    # The point in effect at each bin start, then every point before the next edge
+    first = np.maximum(np.searchsorted(times, edges[:-1], side="right") - 1, 0)
+    stop = np.searchsorted(times, edges[1:], side="left")
+    known = stop > first
+    padded = np.append(values, np.nan)
+    reduce = np.fmin if agg == "min" else np.fmax
+    segments = reduce.reduceat(padded, np.column_stack([first, np.maximum(stop, first + 1)]).ravel())[::2]
+    result[known] = segments[known]
+    return result
+
+
+class SeriesBuffer:
+    """One series: compressed sealed blocks, oldest first, then an uncompressed hot head
+
+    The head holds up to twice block_size of the newest points, so live
+    graphs read plain arrays; it starts small and grows as points arrive.
+    When it is full its older half is sealed into a gorilla.Block; blocks that
+    end more than retention seconds before the newest point are dropped.
+    Each block's start/end times and min/max let a range read decompress
+    only the blocks it overlaps, and blocks from the last HOT_SECONDS are
+    not decompressed at all.
+    """
+
+    def __init__(self, block_size=1024, retention=7 * 86400.0):
+        self.block_size = block_size
+        self.retention = retention
+        # Up to twice the block size so the head is always one contiguous slice;
+        # the newer half is moved back to the front when the older one is sealed.
+        self.times = np.empty(min(64, block_size * 2), dtype=np.float64)
+        self.values = np.empty(min(64, block_size * 2), dtype=np.float64)
+        self.end = 0
+        self.blocks = []
+        self.block_ends = []
+        self.sealed = 0
+        self.sealed_bytes = 0
+        # Blocks from hot on still hold raw arrays, hot_bytes of them
+        self.hot = 0
+        self.hot_bytes = 0
+        # Newest sample when the deadband dropped it; views end with it so they reach the present
+        self.held = None
+        self.rollups = [Rollup(width, span) for width, span in ROLLUPS]
+        # Last sample given to rollup(); its value is credited once the next one shows how long it held
+        self.previous = None
+
+    def __len__(self):
+        return self.sealed + self.end
+
+    def nbytes(self):
+        """Bytes held for the stored points: compressed blocks plus 16 per raw (head or hot) point"""
+        return self.sealed_bytes + self.hot_bytes + self.end * 16
+
+    def append(self, timestamp, value):
+        if self.end == len(self.times):
+            self.make_room()
+        self.times[self.end] = timestamp
+        self.values[self.end] = value
+        self.end += 1
+        self.held = None
+
+    def extend(self, times, values):
+        """Append a run of points in time order, a head's worth at a time"""
+        done = 0
+        while done < len(times):
+            if self.end == len(self.times):
+                self.make_room()
+            count = min(len(times) - done, len(self.times) - self.end)
+            self.times[self.end:self.end + count] = times[done:done + count]
+            self.values[self.end:self.end + count] = values[done:done + count]
+            self.end += count
+            done += count
+        self.held = None
+        # These points never went through rollup(), so ranges reaching them are aggregated from the points
+        for rollup in self.rollups:
+            rollup.since = np.inf
+
+    def rollup(self, timestamp, value):
+        """Count a sample into the rollup tiers, whether or not the deadband stores it
+
+        The previous sample's value is credited for the time up to this one,
+        split at bucket edges; this one's value counts towards its bucket's
+        min and max straight away, as the newest stored point does.
+        """
+        previous = self.previous
+        if previous is not None and timestamp > previous[0]:
+            start, held = previous
+            width = self.rollups[0].width
+            while start < timestamp:
+                stop = min(timestamp, start - start % width + width)
+                if held == held:
+                    self.fold(start, stop - start, held * (stop - start), held, held)
+                else:
+                    self.fold(start, 0.0, 0.0, np.inf, -np.inf)
+                start = stop
+        if value == value:
+            self.fold(timestamp, 0.0, 0.0, value, value)
+        self.previous = (timestamp, value)
+
+    def fold(self, start, known, total, low, high):
+        closed = self.rollups[0].add(start, known, total, low, high)
+        for rollup in self.rollups[1:]:
+            if closed is None:
+                break
+            closed = rollup.add(*closed)
+
+    def make_room(self):
+        """Grow the head, or seal its older half once it is twice block_size"""
+        if len(self.times) < self.block_size * 2:
+            size = min(len(self.times) * 2, self.block_size * 2)
+            self.times = np.concatenate([self.times, np.empty(size - len(self.times))])
+            self.values = np.concatenate([self.values, np.empty(size - len(self.values))])
+        else:
+            self.seal()
+
+    def last_time(self):
+        """Time of the newest sample, held or stored"""
+        return self.held[0] if self.held is not None else self.times[self.end - 1]
+
+    def first(self):
+        """Time of the oldest stored point"""
+        return self.blocks[0].start if self.blocks else self.times[0]
+
+    def seal(self):
+        size = self.block_size
+        block = Block(self.times[:size], self.values[:size])
+        times, values = self.times[:size].copy(), self.values[:size].copy()
+        times.flags.writeable = False
+        values.flags.writeable = False
+        block.raw = (times, values)
+        self.hot_bytes += 16 * size
+        self.blocks.append(block)
+        self.block_ends.append(block.end)
+        self.sealed += block.count
+        self.sealed_bytes += len(block.data)
+        self.times[:self.end - size] = self.times[size:self.end]
+        self.values[:self.end - size] = self.values[size:self.end]
+        self.end -= size
+        newest = self.times[self.end - 1]
+        while self.hot < len(self.blocks) and self.blocks[self.hot].end < newest - HOT_SECONDS:
+            self.hot_bytes -= 16 * self.blocks[self.hot].count
+            self.blocks[self.hot].raw = None
+            self.hot += 1
+        expired = bisect_left(self.block_ends, newest - self.retention)
+        for block in self.blocks[:expired]:
+            self.sealed -= block.count
+            self.sealed_bytes -= len(block.data)
+            if block.raw is not None:
+                self.hot_bytes -= 16 * block.count
+                block.raw = None
+        del self.blocks[:expired]
+        del self.block_ends[:expired]
+        self.hot = max(0, self.hot - expired)
+
+    def points(self, blocks, head=True):
+        """Concatenated points of some sealed blocks, followed by the head unless head is False"""
+        parts = [block.points() for block in blocks]
+        if head:
+            parts.append((self.times[:self.end], self.values[:self.end]))
+        if not parts:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty
+        return np.concatenate([part[0] for part in parts]), np.concatenate([part[1] for part in parts])
+
+    def with_held(self, times, values):
+        held = self.held
+        if held is None:
+            return times, values
+        return np.append(times, held[0]), np.append(values, held[1])
+
+    def view(self, last=None, end=None):
+        """The newest last points (all by default), or with end the newest ones at or before end"""
+        if end is not None:
+            return self.before(end, last)
+        if last is not None and self.held is not None:
+            last -= 1
+        if last is not None and last <= self.end:
+            start = max(0, self.end - last)
+            return self.with_held(self.times[start:self.end], self.values[start:self.end])
+        first = 0
+        if last is not None:
+            # Newest blocks back to the first one needed for last points
+            needed = last - self.end
+            first = len(self.blocks)
+            while first > 0 and needed > 0:
+                first -= 1
+                needed -= self.blocks[first].count
+        times, values = self.points(self.blocks[first:])
+        if last is not None:
+            times, values = times[-last:], values[-last:]
+        return self.with_held(times, values)
+
+    def before(self, end, last=None):
+        stop = int(np.searchsorted(self.times[:self.end], end, side="right"))
+        if stop:
+            times, values = self.times[:stop], self.values[:stop]
+            blocks = self.blocks
+        else:
+            # The block that holds end, if any, is the first one ending at or after it
+            times = values = np.empty(0, dtype=np.float64)
+            blocks = self.blocks[:bisect_left(self.block_ends, end) + 1]
+        parts = [(times, values)]
+        count = len(times)
+        for block in reversed(blocks):
+            if last is not None and count >= last:
+                break
+            times, values = block.points()
+            if block.end > end:
+                inside = times <= end
+                times, values = times[inside], values[inside]
+            parts.append((times, values))
+            count += len(times)
+        parts.reverse()
+        times, values = np.concatenate([part[0] for part in parts]), np.concatenate([part[1] for part in parts])
+        if last is not None:
+            times, values = times[-last:], values[-last:]
+        return times, values
+
+    def since(self, begin, end=None):
+        """Points after begin (up to end), preceded by the last point at or before begin when there is one"""
+        limit = np.inf if end is None else end
+        if self.end and self.times[0] <= begin:
+            start = int(np.searchsorted(self.times[:self.end], begin, side="right")) - 1
+            stop = int(np.searchsorted(self.times[:self.end], limit, side="right"))
+            times, values = self.times[start:stop], self.values[start:stop]
+        else:
+            blocks = []
+            for block in self.blocks[bisect_left(self.block_ends, begin):]:
+                if block.start > limit:
+                    break
+                blocks.append(block)
+            times, values = self.points(blocks, head=self.end > 0 and self.times[0] <= limit)
+            if end is not None:
+                inside = times <= end
+                times, values = times[inside], values[inside]
+            first = bisect_left(self.block_ends, begin)
+            if first > 0:
+                previous = self.blocks[first - 1]
+                times, values = np.append(previous.end, times), np.append(previous.last, values)
+            start = max(0, int(np.searchsorted(times, begin, side="right")) - 1)
+            times, values = times[start:], values[start:]
+        return self.with_held(times, values) if end is None else (times, values)
+
+    def parts(self, begin, end):
+        """Sealed blocks overlapping begin..end and a copy of the head, for reading on another thread"""
+        blocks = []
+        for block in self.blocks[bisect_left(self.block_ends, begin):]:
+            if block.start > end:
+                break
+            blocks.append(block)
+        times, values = self.with_held(self.times[:self.end].copy(), self.values[:self.end].copy())
+        return blocks, times, values
+
+    def extremes(self, begin, end):
+        """(min, max) of the stored points between begin and end, NaN when there are none
+
+        Blocks wholly inside the range answer from their index; only the
+        blocks at its edges are decompressed.
+        """
+        low, high = [], []
+        first = bisect_left(self.block_ends, begin)
+        for block in self.blocks[first:]:
+            if block.start > end:
+                break
+            if begin <= block.start and block.end <= end:
+                if block.min == block.min:
+                    low.append(block.min)
+                    high.append(block.max)
+                continue
+            low, high = self.extend_extremes(low, high, *block.points(), begin, end)
+        times, values = self.with_held(self.times[:self.end], self.values[:self.end])
+        low, high = self.extend_extremes(low, high, times, values, begin, end)
+        if not low:
+            return np.nan, np.nan
+        return min(low), max(high)
+
+    @staticmethod
+    def extend_extremes(low, high, times, values, begin, end):
+        values = values[(times >= begin) & (times <= end)]
+        values = values[~np.isnan(values)]
+        if len(values):
+            low.append(float(values.min()))
+            high.append(float(values.max()))
+        return low, high
+
+
+class HistoryStore:
+    """Time-stamped metric history shared by the GUI and terminal front ends
+
+    contributors holds the per-tick top processes behind the cpu, memory and
+    disk series, for attributing a selected range to processes; stats keeps
+    streaming percentiles, min/max and EWMA of every series per time window.
+
+    Points pass through a deadband before they are stored, so a series that
+    holds still costs almost nothing; stats still see every sample. Stored
+    points are meant to be read with sample-and-hold (steps), which resample()
+    does for a regular grid. Older points are kept Gorilla-compressed for
+    retention seconds (a week by default); see SeriesBuffer. Every sample
+    also feeds 10 s, 1 min and 10 min rollup tiers, which select() answers
+    aligned mean/min/max queries from.
+
+    Setting until makes every read see the store as it was at that time,
+    which is how a replay scrubs through a recording.
+    """
+
+    def __init__(self, capacity=3600, deadband=None, block_size=1024, retention=7 * 86400.0):
+        self.capacity = capacity
+        self.block_size = block_size
+        self.retention = retention
+        self.series = {}
+        self.contributors = ContributorStore(capacity)
+        self.stats = StreamingStats()
+        self.deadband = deadband if deadband is not None else DeadbandFilter()
+        self.until = None
+        self.next_expiry = -np.inf
+        # Held while appending, so chunks() on another thread never sees a block sealed but still in the head
+        self.lock = Lock()
+
+    def append(self, name, timestamp, value):
+        with self.lock:
+            if timestamp >= self.next_expiry:
+                self.next_expiry = timestamp + EXPIRE_INTERVAL
+                self.expire(timestamp)
+            buffer = self.series.get(name)
+            if buffer is None:
+                self.make_room(name)
+                buffer = self.series[name] = SeriesBuffer(self.block_size, self.retention)
+            buffer.rollup(timestamp, value)
+            if self.deadband.keep(name, timestamp, value):
+                buffer.append(timestamp, value)
+            else:
+                buffer.held = (timestamp, value)
+            self.stats.add(name, timestamp, value)
+
+    def make_room(self, name):
+        """Drop the stalest series of name's family if it already has FAMILY_LIMIT of them"""
+        family, colon, _ = name.partition(":")
+        if not colon:
+            return
+        prefix = family + colon
+        members = [other for other in self.series if other.startswith(prefix)]
+        if len(members) >= FAMILY_LIMIT:
+            self.drop(min(members, key=lambda other: self.series[other].last_time()
+                          if len(self.series[other]) else -np.inf))
+
+    def expire(self, now):
+        """Drop series whose newest sample is more than retention before now"""
+        for name in [name for name, buffer in self.series.items()
+                     if not len(buffer) or buffer.last_time() < now - self.retention]:
+            self.drop(name)
+
+    def drop(self, name):
+        """Forget a series with its deadband and statistics state"""
+        del self.series[name]
+        self.deadband.forget(name)
+        self.stats.forget(name)
+
+    def record(self, timestamp, values):
+        for name, value in values.items():
+            self.append(name, timestamp, value)
+
+    def get(self, name, last=None):
+        buffer = self.series.get(name)
+        if buffer is None:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty
+        return buffer.view(last, self.until)
+
+    def window(self, name, seconds):
+        """Points from the last seconds of a series, as select() returns them"""
+        buffer = self.series.get(name)
+        newest = self.newest(buffer) if buffer is not None and len(buffer) else None
+        if newest is None:
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty
+        return self.select(name, newest - seconds, newest)
+
+    def select(self, metrics, start, end, step=None, agg="last"):
+        """Points or per-step aggregates of one series name or a list of them between start and end
+
+        Without step: (times, values) of the stored points, the value in
+        effect at start (which the deadband may have left far back) carried
+        to start; views of the stored arrays where they are one slice. A
+        list of names gives {name: (times, values)}.
+
+        With step: (bin starts, values) for steps from start, values one row
+        per name for a list. agg is "last" (the value in effect at the end
+        of each step), or the "mean", "min" or "max" over the step, each
+        value holding until the next and the mean time-weighted. Steps that
+        are whole buckets of a rollup tier are answered from it, otherwise
+        from the stored points; the two differ only by the deadband's
+        tolerance.
+        Steps after a series' newest point are NaN. Either way the range is
+        located by binary search over block and point times.
+        """
+        if agg not in AGGREGATES:
+            raise ValueError(f"Unknown aggregate {agg!r}; use one of {', '.join(AGGREGATES)}")
+        names = [metrics] if isinstance(metrics, str) else list(metrics)
+        if self.until is not None:
+            end = min(end, self.until)
+        if step is None:
+            selected = {name: self.points_between(name, start, end) for name in names}
+            return selected[metrics] if isinstance(metrics, str) else selected
+        count = max(0, int(np.ceil((end - start) / step - 1e-9)))
+        edges = start + step * np.arange(count + 1)
+        result = np.full((len(names), count), np.nan)
+        for row, name in enumerate(names):
+            buffer = self.series.get(name)
+            if buffer is not None and len(buffer) and count:
+                result[row] = self.aggregate(buffer, edges, step, agg)
+        return edges[:-1], result[0] if isinstance(metrics, str) else result
+
+    def points_between(self, name, start, end):
+        buffer = self.series.get(name)
+        newest = self.newest(buffer) if buffer is not None and len(buffer) else None
+        if newest is None:
+            # No points at all, or none yet as of until
+            empty = np.empty(0, dtype=np.float64)
+            return empty, empty
+        # Only a bounded read leaves out the held sample, which is always the newest
+        times, values = buffer.since(start, end if end < newest else self.until)
+        if len(times) and times[0] < start:
+            times = np.append(start, times[1:])
+        return times, values
+
+    def aggregate(self, buffer, edges, step, agg):
+        start = edges[0]
+        newest = self.newest(buffer)
+        if newest is None:
+            # A replay position before the series' first point
+            return np.full(len(edges) - 1, np.nan)
+        if agg != "last" and self.until is None:
+            # The coarsest tier whose buckets tile the steps exactly
+            for tier, rollup in reversed(list(enumerate(buffer.rollups))):
+                width = rollup.width
+                if (abs(step / width - round(step / width)) < 1e-9 and abs(start / width - round(start / width)) < 1e-9
+                        and rollup.covers(start, buffer.first())):
+                    known, total, low, high = rollup.aggregate(
+                        edges, [finer.open for finer in buffer.rollups[:tier + 1] if finer.open is not None])
+                    if agg == "mean":
+                        values = np.divide(total, known, out=np.full(len(known), np.nan), where=known > 0)
+                    else:
+                        values = np.where(low <= high, low if agg == "min" else high, np.nan)
+                    values[edges[:-1] > newest] = np.nan
+                    return values
+        # Bounded by the last edge so a range in the past decompresses only its own blocks
+        times, values = buffer.since(start, edges[-1] if edges[-1] < newest else self.until)
+        values = aggregate_points(times, values, edges, agg, newest)
+        values[edges[:-1] > newest] = np.nan
+        return values
+
+    def extremes(self, name, start, end):
+        """(min, max) of a series between start and end, decompressing only the blocks at the edges"""
+        buffer = self.series.get(name)
+        if buffer is None:
+            return np.nan, np.nan
+        return buffer.extremes(start, end if self.until is None else min(end, self.until))
+
+    def chunks(self, names=None, start=-np.inf, end=np.inf):
+        """Stored points of names between start and end, one (name, times, values) chunk at a time
+
+        What is read is fixed when this is called, under the lock append()
+        holds, so the generator can be consumed on another thread while
+        collection goes on; sealed blocks are decompressed one at a time as
+        it is consumed.
+        """
+        with self.lock:
+            parts = [(name, self.series[name].parts(start, end)) for name in (names or self.names())
+                     if name in self.series]
+
+        def generate():
+            for name, (blocks, head_times, head_values) in parts:
+                for block in blocks:
+                    times, values = block.points()
+                    inside = (times >= start) & (times <= end)
+                    if inside.any():
+                        yield name, times[inside], values[inside]
+                inside = (head_times >= start) & (head_times <= end)
+                if inside.any():
+                    yield name, head_times[inside], head_values[inside]
+
+        return generate()
+
+    def resample(self, name, seconds, step=1.0):
+        """Values every step seconds over the last seconds of a series, held from the stored points"""
+        buffer = self.series.get(name)
+        newest = self.newest(buffer) if buffer is not None and len(buffer) else None
+        if newest is None:
+            return np.empty(0, dtype=np.float64)
+        return self.select(name, newest - seconds, newest, step)[1]
+
+    def latest(self, name, default=None):
+        buffer = self.series.get(name)
+        if buffer is None or not len(buffer):
+            return default
+        if self.until is not None:
+            _, values = buffer.before(self.until, 1)
+            return values[0] if len(values) else default
+        if buffer.held is not None:
+            return buffer.held[1]
+        return buffer.values[buffer.end - 1]
+
+    def newest(self, buffer):
+        """Time of a series' newest point, as of until when it is set"""
+        if self.until is not None:
+            times, _ = buffer.before(self.until, 1)
+            return times[0] if len(times) else None
+        return buffer.held[0] if buffer.held is not None else buffer.times[buffer.end - 1]
+
+    def names(self):
+        return list(self.series)
+
+    def bytes_per_sample(self):
+        """Storage per stored point across all series"""
+        points = sum(len(buffer) for buffer in self.series.values())
+        return sum(buffer.nbytes() for buffer in self.series.values()) / points if points else 0.0
+
+
+def to_datetimes(times):
+    """Convert epoch seconds to local datetime64 values for matplotlib axes"""
+    offset = datetime.now().astimezone().utcoffset().total_seconds()
+    return ((times + offset) * 1000).astype(np.int64).astype("datetime64[ms]")
+
+
+def from_datenums(values, epoch=0.0):
+    """Inverse of to_datetimes for matplotlib date numbers (days since epoch, the mdates epoch's number)"""
+    offset = datetime.now().astimezone().utcoffset().total_seconds()
+    return (np.asarray(values, dtype=np.float64) - epoch) * 86400.0 - offset
@@ -0,0 +1,101 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+
+
+class StageTimer:
+    """Times named stages of each monitor tick and keeps rolling percentiles"""
+
+    def __init__(self, window=300, trace_ticks=600):
+        self.window = window
+        self.samples = {}
+        self.trace = deque(maxlen=trace_ticks)
+        self.current = None
+        self.tick_count = 0
+        self.lock = threading.Lock()
+
+    def begin_tick(self):
+        self.current = {"tick": self.tick_count, "start": time.time(), "stages": []}
+        self.tick_start = time.perf_counter()
+
+    def end_tick(self):
+        if self.current is None:
+            return
+        elapsed = (time.perf_counter() - self.tick_start) * 1000
+        self.current["total_ms"] = elapsed
+        with self.lock:
+            self._add("tick", elapsed)
+            self.trace.append(self.current)
+        self.current = None
+        self.tick_count += 1
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            with self.lock:
+                self._add(name, elapsed)
+            if self.current is not None:
+                self.current["stages"].append((name, elapsed))
+
+    def _add(self, name, elapsed):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(elapsed)
+
+    def summary(self):
+        with self.lock:
+            snapshot = {name: np.fromiter(values, dtype=np.float64) for name, values in self.samples.items()}
+        result = {}
+        for name, values in snapshot.items():
+            if len(values):
+                p50, p95 = np.percentile(values, [50, 95])
+                result[name] = {"p50": p50, "p95": p95, "max": values.max(), "count": len(values)}
+        return result
+
+    def status_text(self):
+        summary = self.summary()
+        tick = summary.get("tick")
+        if tick is None:
+            return "Monitor: --"
+        stages = {name: stats for name, stats in summary.items() if name != "tick"}
+        text = f"Monitor: p50 {tick['p50']:.1f} ms | p95 {tick['p95']:.1f} ms | max {tick['max']:.1f} ms"
+        if stages:
+            slowest = max(stages, key=lambda name: stages[name]["p95"])
+            text += f" | slowest {slowest} p95 {stages[slowest]['p95']:.1f} ms"
+        return text
+
+    def dump_trace(self, path=None):
+        """Write the per-tick trace as JSON lines followed by a per-stage summary line"""
+        path = path or f"monitor_trace_{datetime_stamp()}.jsonl"
+        with self.lock:
+            ticks = list(self.trace)
+        with open(path, "w") as f:
+            for tick in ticks:
+                f.write(json.dumps(tick) + "\n")
+            summary = {name: {k: float(v) for k, v in stats.items()} for name, stats in self.summary().items()}
+            f.write(json.dumps({"summary": summary}) + "\n")
+        return path
+
+
+class NullTimer:
+    def begin_tick(self):
+        pass
+
+    def end_tick(self):
+        pass
+
+    def stage(self, name):
+        return nullcontext()
+
+
+def datetime_stamp():
+    return time.strftime("%Y%m%d_%H%M%S")
@@ -0,0 +1,213 @@
+import numpy as np
+
+SLOT_OVERHEAD = 96  # trend sums, bookkeeping and the pid map entry per slot
+
+
+class LeakDetector:
+    """Bounded per-PID memory series with an incremental growth trend
+
+    Every tracked pid owns one slot in (slots, points) arrays of time, RSS
+    and PSS. The arrays double as new processes are seen, up to the
+    capacity budget_bytes allows, so memory follows the process count and
+    stays bounded however many come and go. When a slot fills, its older half is averaged
+    pairwise, leaving recent points at full resolution and older ones ever
+    coarser. Exited pids free their slot; when none is free, the smallest
+    tracked process gives way to a larger newcomer.
+
+    The trend is the decayed least-squares fit of forecast.IncrementalTrend,
+    kept as arrays over slots so one tick updates every sampled pid at once.
+    A fall of more than drop (as a fraction) restarts a slot's fit.
+    """
+
+    def __init__(self, budget_bytes=8 * 1024**2, points=64, halflife=3600.0, drop=0.1,
+                 min_samples=6, min_span=300.0, min_growth=1024**2 / 3600):
+        self.points = points - points % 4
+        self.capacity = max(1, budget_bytes // (self.points * 3 * 4 + SLOT_OVERHEAD))
+        self.halflife = halflife
+        self.drop = drop
+        self.min_samples = min_samples
+        self.min_span = min_span
+        self.min_growth = min_growth
+        self.origin = None
+
+        # No slots until processes are seen; grow() adds them
+        self.times = np.zeros((0, self.points), dtype=np.float32)
+        self.rss = np.zeros((0, self.points), dtype=np.float32)
+        self.pss = np.full((0, self.points), np.nan, dtype=np.float32)
+        self.count = np.zeros(0, dtype=np.int32)
+        self.slot_pid = np.full(0, -1, dtype=np.int64)
+        self.slots = {}
+        self.free = []
+
+        self.s0 = np.zeros(0)
+        self.st = np.zeros(0)
+        self.sy = np.zeros(0)
+        self.stt = np.zeros(0)
+        self.sty = np.zeros(0)
+        self.samples = np.zeros(0, dtype=np.int32)
+        self.first_time = np.zeros(0)
+        self.last_time = np.zeros(0)
+        self.last_value = np.zeros(0)
+        self.prior_slope = np.full(0, np.nan)
+
+    def nbytes(self):
+        return sum(array.nbytes for array in (
+            self.times, self.rss, self.pss, self.count, self.slot_pid, self.s0, self.st, self.sy, self.stt,
+            self.sty, self.samples, self.first_time, self.last_time, self.last_value, self.prior_slope))
+
+    def grow(self, needed):
+        """At least needed more free slots where the capacity allows, doubling the arrays"""
+        old = len(self.count)
+        size = min(self.capacity, max(2 * old, old + needed))
+        if size <= old:
+            return
+
+        def extend(array, fill):
+            return np.concatenate([array, np.full((size - old,) + array.shape[1:], fill, dtype=array.dtype)])
+
+        self.times, self.rss, self.pss = extend(self.times, 0), extend(self.rss, 0), extend(self.pss, np.nan)
+        self.count, self.slot_pid = extend(self.count, 0), extend(self.slot_pid, -1)
+        self.s0, self.st, self.sy = extend(self.s0, 0), extend(self.st, 0), extend(self.sy, 0)
+        self.stt, self.sty, self.samples = extend(self.stt, 0), extend(self.sty, 0), extend(self.samples, 0)
+        self.first_time, self.last_time = extend(self.first_time, 0), extend(self.last_time, 0)
+        self.last_value, self.prior_slope = extend(self.last_value, 0), extend(self.prior_slope, np.nan)
+        # Lowest slots are handed out first
+        self.free = list(range(size - 1, old - 1, -1)) + self.free
+
+    def release(self, slots):
+        for slot in slots:
+            del self.slots[int(self.slot_pid[slot])]
+            self.slot_pid[slot] = -1
+            self.free.append(int(slot))
+        self.count[slots] = 0
+        self.pss[slots] = np.nan
+        self.reset(np.asarray(slots, dtype=np.int64), keep_prior=False)
+
+    def reset(self, slots, keep_prior=True):
+        if keep_prior:
+            slope = self.slope(slots)
+            self.prior_slope[slots] = np.where(np.isnan(slope), self.prior_slope[slots], slope)
+        else:
+            self.prior_slope[slots] = np.nan
+        for array in (self.s0, self.st, self.sy, self.stt, self.sty):
+            array[slots] = 0.0
+        self.samples[slots] = 0
+
+    def forget(self, pids):
+        self.release([self.slots[pid] for pid in pids if pid in self.slots])
+
+    def assign(self, pids, rss):
+        """Slot for each pid, allocating (or evicting) for new ones; -1 where it did not fit"""
+        slots = np.fromiter((self.slots.get(pid, -1) for pid in pids.tolist()), dtype=np.int64, count=len(pids))
+        new = np.flatnonzero(slots < 0)
+        if not len(new):
+            return slots
+        # Largest newcomers first, so an overflow keeps the processes that matter
+        new = new[np.argsort(rss[new])[::-1]]
+        shortfall = len(new) - len(self.free)
+        if shortfall > 0:
+            self.grow(shortfall)
+            shortfall = len(new) - len(self.free)
+        if shortfall > 0:
+            used = np.flatnonzero(self.slot_pid >= 0)
+            latest = self.rss[used, np.maximum(self.count[used] - 1, 0)]
+            order = np.argsort(latest)[:shortfall]
+            # Of the smallest tracked and the smallest newcomers, the smallest overall give way
+            combined = np.concatenate([latest[order], rss[new[-shortfall:]]])
+            losers = np.argsort(combined, kind="stable")[:shortfall]
+            self.release(used[order[losers[losers < len(order)]]])
+        for index in new[:len(self.free)]:
+            slot = self.free.pop()
+            pid = int(pids[index])
+            self.slots[pid] = slot
+            self.slot_pid[slot] = pid
+            slots[index] = slot
+        return slots
+
+    def downsample(self, slots):
+        half = self.points // 2
+        quarter = half // 2
+        self.times[slots, :quarter] = self.times[slots, :half].reshape(len(slots), quarter, 2).mean(axis=2)
+        self.rss[slots, :quarter] = self.rss[slots, :half].reshape(len(slots), quarter, 2).mean(axis=2)
+        self.pss[slots, :quarter] = self.pss[slots, :half].reshape(len(slots), quarter, 2).mean(axis=2)
+        for array in (self.times, self.rss, self.pss):
+            array[slots, quarter:quarter + half] = array[slots, half:]
+        self.count[slots] = quarter + half
+
+    def update(self, t, pids, rss, pss=None):
+        if not len(pids):
+            return
+        if self.origin is None:
+            self.origin = t
+        slots = self.assign(pids, rss)
+        kept = slots >= 0
+        slots, rss = slots[kept], rss[kept]
+        pss = pss[kept] if pss is not None else np.full(len(slots), np.nan)
+        t = t - self.origin
+
+        full = slots[self.count[slots] >= self.points]
+        if len(full):
+            self.downsample(full)
+        position = self.count[slots]
+        self.times[slots, position] = t
+        self.rss[slots, position] = rss
+        self.pss[slots, position] = pss
+        self.count[slots] += 1
+
+        started = self.samples[slots] > 0
+        dropped = slots[started & (rss < self.last_value[slots] * (1 - self.drop))]
+        if len(dropped):
+            self.reset(dropped)
+        started = self.samples[slots] > 0
+        old, fresh = slots[started], slots[~started]
+        d = t - self.last_time[old]
+        # Move the origin to the new sample, then fade everything older
+        self.stt[old] = self.stt[old] - 2 * d * self.st[old] + d * d * self.s0[old]
+        self.sty[old] = self.sty[old] - d * self.sy[old]
+        self.st[old] = self.st[old] - d * self.s0[old]
+        decay = 0.5 ** (d / self.halflife)
+        for array in (self.s0, self.st, self.sy, self.stt, self.sty):
+            array[old] *= decay
+        self.first_time[fresh] = t
+        self.s0[slots] += 1.0
+        self.sy[slots] += rss
+        self.samples[slots] += 1
+        self.last_time[slots] = t
+        self.last_value[slots] = rss
+
+    def slope(self, slots):
+        """Bytes per second, NaN until a slot has enough samples and span"""
+        denominator = self.s0[slots] * self.stt[slots] - self.st[slots] ** 2
+        valid = ((self.samples[slots] >= self.min_samples)
+                 & (self.last_time[slots] - self.first_time[slots] >= self.min_span) & (denominator > 0))
+        slope = np.full(len(slots), np.nan)
+        np.divide(self.s0[slots] * self.sty[slots] - self.st[slots] * self.sy[slots], denominator,
+                  out=slope, where=valid)
+        return slope
+
+    def growing(self, available, count=15):
+        """Fastest-growing processes as (pid, rss, pss, bytes per hour, hours until available memory runs out)"""
+        slots = np.flatnonzero(self.slot_pid >= 0)
+        slope = self.slope(slots)
+        slope = np.where(np.isnan(slope), self.prior_slope[slots], slope)
+        candidates = np.flatnonzero(slope > self.min_growth)
+        order = candidates[np.argsort(slope[candidates])[::-1][:count]]
+        rows = []
+        for index in order:
+            slot = slots[index]
+            latest = self.count[slot] - 1
+            pss = self.pss[slot, :latest + 1]
+            pss = pss[~np.isnan(pss)]
+            rows.append((int(self.slot_pid[slot]), float(self.rss[slot, latest]),
+                         float(pss[-1]) if len(pss) else None, float(slope[index] * 3600),
+                         float(max(0.0, available) / slope[index] / 3600)))
+        return rows
+
+    def series(self, pid):
+        """(times since the first sample, rss) for one tracked pid"""
+        slot = self.slots.get(pid)
+        if slot is None:
+            return np.zeros(0), np.zeros(0)
+        count = self.count[slot]
+        return self.times[slot, :count].astype(np.float64) + self.origin, self.rss[slot, :count].astype(np.float64)
+
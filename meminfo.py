@@ -0,0 +1,105 @@
+import os
+
+# /proc/vmstat counters turned into per-second rates; pgscan_*/pgsteal_* are summed
+RATE_COUNTERS = ("pgfault", "pgmajfault", "pswpin", "pswpout", "pgscan", "pgsteal")
+
+
+def parse_meminfo(text):
+    """Values in bytes, except the HugePages_ counts which have no unit"""
+    values = {}
+    for line in text.splitlines():
+        key, _, rest = line.partition(":")
+        fields = rest.split()
+        if fields:
+            values[key] = int(fields[0]) * (1024 if len(fields) > 1 else 1)
+    return values
+
+
+def parse_vmstat(text):
+    counters = dict.fromkeys(RATE_COUNTERS, 0)
+    for line in text.splitlines():
+        key, _, value = line.partition(" ")
+        if key.startswith(("pgscan_", "pgsteal_")) and not key.endswith(("_anon", "_file", "_throttle")):
+            # By reclaimer (kswapd, direct, khugepaged, ...); the anon/file split counts the same pages
+            counters[key.split("_", 1)[0]] += int(value)
+        elif key in counters:
+            counters[key] = int(value)
+    return counters
+
+
+class MemoryCollector:
+    """One read of /proc/meminfo and /proc/vmstat per tick
+
+    Returns None where there is no /proc (Windows), so callers fall back to psutil.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.available = os.path.exists(os.path.join(backend.proc_root, "meminfo"))
+        self.counters = None
+        self.last_time = None
+
+    def read(self, name):
+        with open(os.path.join(self.backend.proc_root, name)) as f:
+            return f.read()
+
+    def collect(self):
+        if not self.available:
+            return None
+        now = self.backend.clock.time()
+        info = parse_meminfo(self.read("meminfo"))
+        try:
+            counters = parse_vmstat(self.read("vmstat"))
+        except OSError:
+            counters = dict.fromkeys(RATE_COUNTERS, 0)
+
+        elapsed = now - self.last_time if self.last_time is not None else 0.0
+        rates = dict.fromkeys(RATE_COUNTERS, 0.0)
+        if self.counters is not None and elapsed > 0:
+            for key in RATE_COUNTERS:
+                rates[key] = max(0, counters[key] - self.counters[key]) / elapsed
+        self.counters = counters
+        self.last_time = now
+
+        total = info.get("MemTotal", 0)
+        free = info.get("MemFree", 0)
+        buffers = info.get("Buffers", 0)
+        cached = info.get("Cached", 0)
+        reclaimable = info.get("SReclaimable", 0)
+        available = info.get("MemAvailable", free + buffers + cached + reclaimable)
+        swap_total = info.get("SwapTotal", 0)
+        swap_free = info.get("SwapFree", 0)
+        hugepage_size = info.get("Hugepagesize", 0)
+        return {
+            # Same definitions as psutil.virtual_memory() so the existing numbers do not shift
+            "total": total,
+            "available": available,
+            "used": total - available,
+            "percent": round((total - available) / total * 100, 1) if total else 0.0,
+            "free": free,
+            "buffers": buffers,
+            "cached": cached + reclaimable,
+            "shmem": info.get("Shmem", 0),
+            "slab": info.get("Slab", 0),
+            "slab_reclaimable": reclaimable,
+            "dirty": info.get("Dirty", 0),
+            "writeback": info.get("Writeback", 0),
+            "hugepages_total": info.get("HugePages_Total", 0) * hugepage_size,
+            "hugepages_free": info.get("HugePages_Free", 0) * hugepage_size,
+            "hugepage_size": hugepage_size,
+            "commit_limit": info.get("CommitLimit", 0),
+            "committed_as": info.get("Committed_AS", 0),
+            "swap_total": swap_total,
+            "swap_free": swap_free,
+            "swap_used": swap_total - swap_free,
+            "swap_percent": round((swap_total - swap_free) / swap_total * 100, 1) if swap_total else 0.0,
+            "swap_cached": info.get("SwapCached", 0),
+            "minor_faults_s": max(0.0, rates["pgfault"] - rates["pgmajfault"]),
+            "major_faults_s": rates["pgmajfault"],
+            "swap_in_s": rates["pswpin"],
+            "swap_out_s": rates["pswpout"],
+            "pgscan_s": rates["pgscan"],
+            "pgsteal_s": rates["pgsteal"],
+            # Share of scanned pages actually reclaimed; low values mean reclaim is thrashing
+            "reclaim_efficiency": min(100.0, 100.0 * rates["pgsteal"] / rates["pgscan"]) if rates["pgscan"] else None,
+        }
@@ -0,0 +1,163 @@
+import os
+import threading
+
+# Kernel and virtual filesystems that have no capacity worth watching
+PSEUDO_FILESYSTEMS = {
+    "autofs", "binfmt_misc", "bpf", "cgroup", "cgroup2", "configfs", "debugfs", "devpts",
+    "devtmpfs", "efivarfs", "fusectl", "hugetlbfs", "mqueue", "nsfs", "proc", "pstore",
+    "ramfs", "rpc_pipefs", "securityfs", "selinuxfs", "sysfs", "tracefs",
+}
+# Read-only images (snaps, ISOs) are always 100% full
+IMAGE_FILESYSTEMS = {"squashfs", "iso9660"}
+SKIPPED_FILESYSTEMS = PSEUDO_FILESYSTEMS | IMAGE_FILESYSTEMS
+# statvfs on these can hang for minutes when the server goes away
+REMOTE_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "ceph", "glusterfs", "9p", "afs", "lustre"}
+
+
+def unescape(field):
+    """mountinfo escapes space, tab, newline and backslash as octal"""
+    return (field.replace("\\040", " ").replace("\\011", "\t")
+                 .replace("\\012", "\n").replace("\\134", "\\"))
+
+
+def parse_mountinfo(text):
+    """Return (mount_point, fstype, source, device) per line of /proc/self/mountinfo"""
+    mounts = []
+    for line in text.splitlines():
+        fields = line.split()
+        try:
+            separator = fields.index("-")
+        except ValueError:
+            continue
+        mounts.append((unescape(fields[4]), fields[separator + 1], unescape(fields[separator + 2]), fields[2]))
+    return mounts
+
+
+def is_remote(fstype):
+    return fstype in REMOTE_FILESYSTEMS or fstype.startswith("fuse")
+
+
+def real_mounts(mounts, skip=SKIPPED_FILESYSTEMS):
+    """Drop filesystems in skip and bind mounts of a device that is already listed"""
+    seen = {}
+    for mount_point, fstype, source, device in mounts:
+        if fstype in skip or mount_point.startswith(("/proc/", "/sys/")):
+            continue
+        key = device if not is_remote(fstype) else source
+        if key in seen and len(seen[key][0]) <= len(mount_point):
+            continue
+        seen[key] = (mount_point, fstype, source)
+    return sorted(seen.values())
+
+
+def usage_row(mount_point, fstype, source, usage):
+    total = usage["total"]
+    used = total - usage["free"]
+    files = usage.get("files", 0)
+    files_used = files - usage.get("files_free", 0)
+    # Like df, percent is of the space available to unprivileged users
+    usable = used + usage["avail"]
+    return {
+        "mount": mount_point,
+        "fstype": fstype,
+        "source": source,
+        "total": total,
+        "used": used,
+        "avail": usage["avail"],
+        "percent": used / usable * 100 if usable else 0.0,
+        "inodes": files,
+        "inodes_used": files_used,
+        "inode_percent": files_used / files * 100 if files else 0.0,
+    }
+
+
+def placeholder_row(mount_point, fstype, source):
+    row = usage_row(mount_point, fstype, source, {"total": 0, "free": 0, "avail": 0})
+    row["state"] = "pending"
+    row["updated"] = None
+    return row
+
+
+class MountCollector:
+    """Capacity and inode usage of every real mount, refreshed every interval seconds
+
+    Local mounts are queried inline. Remote and FUSE mounts are queried on a
+    daemon thread per mount; a mount whose query has not come back within
+    timeout keeps its last values and is flagged, and is not queried again
+    until the hung call returns, so a dead server never blocks the tick.
+
+    Filesystem types in skip are left out. tmpfs and overlay are not skipped
+    by default since /dev/shm or a container's writable layer can fill up
+    like any disk; add them to skip on hosts with many of them.
+    """
+
+    def __init__(self, backend, interval=10.0, timeout=2.0, skip=SKIPPED_FILESYSTEMS):
+        self.backend = backend
+        self.interval = interval
+        self.timeout = timeout
+        self.skip = skip
+        self.lock = threading.Lock()
+        self.rows = {}
+        self.pending = {}
+        self.last_refresh = None
+
+    def read_mounts(self):
+        try:
+            with open(os.path.join(self.backend.proc_root, "self", "mountinfo")) as f:
+                return real_mounts(parse_mountinfo(f.read()), self.skip)
+        except OSError:
+            import psutil
+
+            return sorted((p.mountpoint, p.fstype, p.device) for p in psutil.disk_partitions()
+                          if p.fstype not in self.skip)
+
+    def query_remote(self, mount_point, fstype, source):
+        try:
+            row = usage_row(mount_point, fstype, source, self.backend.statvfs(mount_point))
+            row["state"] = "ok"
+        except (OSError, KeyError) as e:
+            row = dict(self.rows.get(mount_point) or placeholder_row(mount_point, fstype, source))
+            row["state"] = f"error: {getattr(e, 'strerror', None) or e}"
+        row["updated"] = self.backend.clock.time()
+        with self.lock:
+            self.rows[mount_point] = row
+            self.pending.pop(mount_point, None)
+
+    def refresh(self):
+        now = self.backend.clock.time()
+        rows = {}
+        remote = []
+        for mount_point, fstype, source in self.read_mounts():
+            if is_remote(fstype):
+                remote.append((mount_point, fstype, source))
+                continue
+            try:
+                row = usage_row(mount_point, fstype, source, self.backend.statvfs(mount_point))
+            except (OSError, KeyError):
+                continue
+            row["state"] = "ok"
+            row["updated"] = now
+            rows[mount_point] = row
+        with self.lock:
+            for mount_point, fstype, source in remote:
+                rows[mount_point] = self.rows.get(mount_point) or placeholder_row(mount_point, fstype, source)
+                if mount_point not in self.pending:
+                    self.pending[mount_point] = now
+                    threading.Thread(target=self.query_remote, args=(mount_point, fstype, source),
+                                     daemon=True, name=f"statvfs {mount_point}").start()
+            self.rows = rows
+        self.last_refresh = self.backend.clock.monotonic()
+
+    def collect(self):
+        """Per-mount dicts sorted by mount point, refreshing first if the interval has passed"""
+        if self.last_refresh is None or self.backend.clock.monotonic() - self.last_refresh >= self.interval:
+            self.refresh()
+        now = self.backend.clock.time()
+        with self.lock:
+            rows = [dict(row) for _, row in sorted(self.rows.items())]
+            pending = dict(self.pending)
+        for row in rows:
+            started = pending.get(row["mount"])
+            if started is not None and now - started > self.timeout:
+                row["state"] = f"not responding ({now - started:.0f}s)"
+        return rows
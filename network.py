@@ -0,0 +1,148 @@
+import os
+
+import numpy as np
+
+# Column order of the 16 counters in /proc/net/dev
+RX_BYTES, RX_PACKETS, RX_ERRS, RX_DROP = 0, 1, 2, 3
+TX_BYTES, TX_PACKETS, TX_ERRS, TX_DROP = 8, 9, 10, 11
+RATE_COLUMNS = [RX_BYTES, TX_BYTES, RX_PACKETS, TX_PACKETS, RX_ERRS, TX_ERRS, RX_DROP, TX_DROP]
+RATE_NAMES = ["rx_bytes", "tx_bytes", "rx_packets", "tx_packets",
+              "rx_errs", "tx_errs", "rx_drop", "tx_drop"]
+VIRTUAL_PREFIXES = ("lo", "veth", "docker", "br-", "virbr", "cali", "flannel", "cni", "tun", "tap")
+
+
+def parse_net_dev(text):
+    """Return interface names and an (n, 16) int64 counter matrix"""
+    names = []
+    numbers = []
+    for line in text.splitlines()[2:]:
+        name, _, rest = line.partition(":")
+        names.append(name.strip())
+        numbers.append(rest)
+    if not names:
+        return names, np.zeros((0, 16), dtype=np.int64)
+    counters = np.array(" ".join(numbers).split(), dtype=np.int64).reshape(len(names), -1)
+    return names, counters[:, :16]
+
+
+def parse_snmp(text, protocol="Tcp"):
+    header = None
+    for line in text.splitlines():
+        if not line.startswith(protocol + ":"):
+            continue
+        fields = line.split()[1:]
+        if header is None:
+            header = fields
+        else:
+            return dict(zip(header, map(int, fields)))
+    return {}
+
+
+def psutil_net_dev():
+    import psutil
+
+    counters = psutil.net_io_counters(pernic=True)
+    names = list(counters)
+    matrix = np.zeros((len(names), 16), dtype=np.int64)
+    for i, name in enumerate(names):
+        c = counters[name]
+        matrix[i, [RX_BYTES, RX_PACKETS, RX_ERRS, RX_DROP]] = c.bytes_recv, c.packets_recv, c.errin, c.dropin
+        matrix[i, [TX_BYTES, TX_PACKETS, TX_ERRS, TX_DROP]] = c.bytes_sent, c.packets_sent, c.errout, c.dropout
+    return names, matrix
+
+
+def format_rate(bytes_per_second):
+    for unit in ("B/s", "KB/s", "MB/s", "GB/s"):
+        if abs(bytes_per_second) < 1024 or unit == "GB/s":
+            return f"{bytes_per_second:.1f} {unit}"
+        bytes_per_second /= 1024
+
+
+class NetworkCollector:
+    """Per-interface rates from one read of /proc/net/dev and /proc/net/snmp per tick"""
+
+    def __init__(self, backend, tracked_limit=8):
+        self.backend = backend
+        self.tracked_limit = tracked_limit
+        self.names = None
+        self.counters = None
+        self.tcp = None
+        self.last_time = None
+        self.physical = None
+        self.tracked_rows = []
+
+    def read_counters(self):
+        try:
+            with open(os.path.join(self.backend.proc_root, "net", "dev")) as f:
+                return parse_net_dev(f.read())
+        except OSError:
+            return psutil_net_dev()
+
+    def read_tcp(self):
+        try:
+            with open(os.path.join(self.backend.proc_root, "net", "snmp")) as f:
+                return parse_snmp(f.read())
+        except OSError:
+            return {}
+
+    def collect(self):
+        now = self.backend.clock.time()
+        names, counters = self.read_counters()
+        tcp = self.read_tcp()
+
+        previous = self.counters
+        changed = names != self.names
+        if changed:
+            # Totals skip loopback and container/bridge ends, which would double count host traffic
+            self.physical = np.array([not name.startswith(VIRTUAL_PREFIXES) for name in names], dtype=bool)
+            self.tracked_rows = np.flatnonzero(self.physical)[:self.tracked_limit].tolist()
+        if previous is not None and changed:
+            # Interfaces came or went; line the old rows up with the new names
+            index = {name: i for i, name in enumerate(self.names)}
+            rows = np.array([index.get(name, -1) for name in names], dtype=np.int64)
+            aligned = counters.copy()
+            known = rows >= 0
+            aligned[known] = previous[rows[known]]
+            previous = aligned
+
+        elapsed = now - self.last_time if self.last_time is not None else 0.0
+        if previous is None or elapsed <= 0:
+            rates = np.zeros((len(names), len(RATE_COLUMNS)))
+        else:
+            delta = counters[:, RATE_COLUMNS] - previous[:, RATE_COLUMNS]
+            # Counter resets (driver reload, 32-bit wrap) show up as negative deltas
+            rates = np.maximum(delta, 0) / elapsed
+
+        retrans_s = out_segs_s = 0.0
+        if tcp and self.tcp and elapsed > 0:
+            retrans_s = max(0, tcp.get("RetransSegs", 0) - self.tcp.get("RetransSegs", 0)) / elapsed
+            out_segs_s = max(0, tcp.get("OutSegs", 0) - self.tcp.get("OutSegs", 0)) / elapsed
+
+        self.names, self.counters, self.tcp, self.last_time = names, counters, tcp, now
+
+        totals = rates[self.physical].sum(axis=0) if len(names) else np.zeros(len(RATE_COLUMNS))
+        totals = totals.tolist()
+        return {
+            "names": names,
+            "rates": rates,
+            "tracked_rows": self.tracked_rows,
+            "rx_bytes_s": totals[0],
+            "tx_bytes_s": totals[1],
+            "rx_packets_s": totals[2],
+            "tx_packets_s": totals[3],
+            "errors_s": totals[4] + totals[5],
+            "drops_s": totals[6] + totals[7],
+            "tcp_retrans_s": retrans_s,
+            "tcp_retrans_pct": 100.0 * retrans_s / out_segs_s if out_segs_s else 0.0,
+        }
+
+    @staticmethod
+    def top_interfaces(network, count=10):
+        """Indices of the busiest interfaces by total throughput, busiest first"""
+        rates = network["rates"]
+        if not len(rates):
+            return []
+        throughput = rates[:, 0] + rates[:, 1]
+        count = min(count, len(throughput))
+        top = np.argpartition(-throughput, count - 1)[:count]
+        return top[np.argsort(-throughput[top])]
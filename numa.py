@@ -0,0 +1,165 @@
+import glob
+import os
+
+import numpy as np
+
+NUMASTAT_COUNTERS = ("numa_hit", "numa_miss", "numa_foreign", "interleave_hit", "local_node", "other_node")
+
+
+def parse_cpulist(text):
+    """'0-3,8-11' -> [0, 1, 2, 3, 8, 9, 10, 11]"""
+    cpus = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def parse_node_meminfo(text):
+    """'Node 0 MemFree: 123 kB' lines -> {"MemFree": bytes, ...}"""
+    values = {}
+    for line in text.splitlines():
+        fields = line.split()
+        if len(fields) >= 4:
+            values[fields[2].rstrip(":")] = int(fields[3]) * (1024 if len(fields) > 4 else 1)
+    return values
+
+
+def parse_per_cpu_stat(text):
+    """Per-CPU lines of /proc/stat -> (cpu ids, (n, 8) jiffy counters)"""
+    start = text.find("\ncpu") + 1
+    end = text.find("\n", text.rfind("\ncpu") + 1)
+    if not start:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, 8), dtype=np.int64)
+    block = text[start:end if end >= 0 else len(text)]
+    # Text-mode fromstring parses the whole block in C, several times faster than str -> int64 per field
+    numbers = np.fromstring(block.replace("cpu", " "), dtype=np.int64, sep=" ")
+    numbers = numbers.reshape(block.count("\n") + 1, -1)
+    return numbers[:, 0], numbers[:, 1:9]
+
+
+class NumaCollector:
+    """Per-node memory, allocation locality and CPU utilisation
+
+    Node topology and the CPU-to-node map are read once; each tick costs one
+    meminfo and one numastat read per node plus a single /proc/stat read,
+    folded to nodes with np.bincount.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.nodes = []
+        self.node_cpus = {}
+        root = os.path.join(backend.sys_root, "devices", "system", "node")
+        for path in sorted(glob.glob(os.path.join(root, "node[0-9]*")), key=lambda p: int(p.rsplit("node", 1)[1])):
+            node = int(path.rsplit("node", 1)[1])
+            try:
+                with open(os.path.join(path, "cpulist")) as f:
+                    self.node_cpus[node] = parse_cpulist(f.read())
+            except OSError:
+                self.node_cpus[node] = []
+            self.nodes.append(node)
+        self.root = root
+        self.available = bool(self.nodes)
+        self.cpu_ids = None
+        self.cpu_nodes = None
+        self.cpu_counters = None
+        self.numastat = None
+        self.last_time = None
+
+    def read(self, *parts):
+        with open(os.path.join(*parts)) as f:
+            return f.read()
+
+    def map_cpus(self, ids):
+        node_of = np.full(int(ids.max()) + 1 if len(ids) else 0, -1, dtype=np.int64)
+        for index, node in enumerate(self.nodes):
+            cpus = [cpu for cpu in self.node_cpus[node] if cpu < len(node_of)]
+            node_of[cpus] = index
+        return node_of[ids]
+
+    def collect(self):
+        if not self.available:
+            return None
+        now = self.backend.clock.time()
+        elapsed = now - self.last_time if self.last_time is not None else 0.0
+
+        meminfo = []
+        numastat = np.zeros((len(self.nodes), len(NUMASTAT_COUNTERS)), dtype=np.int64)
+        for i, node in enumerate(self.nodes):
+            path = os.path.join(self.root, f"node{node}")
+            try:
+                meminfo.append(parse_node_meminfo(self.read(path, "meminfo")))
+            except OSError:
+                meminfo.append({})
+            try:
+                values = dict(line.split() for line in self.read(path, "numastat").splitlines())
+                numastat[i] = [int(values.get(key, 0)) for key in NUMASTAT_COUNTERS]
+            except (OSError, ValueError):
+                pass
+
+        ids, counters = parse_per_cpu_stat(self.read(self.backend.proc_root, "stat"))
+        if self.cpu_ids is None or not np.array_equal(ids, self.cpu_ids):
+            # CPU hotplug changes the rows; start the deltas over
+            self.cpu_ids = ids
+            self.cpu_nodes = self.map_cpus(ids)
+            self.cpu_counters = None
+
+        node_count = len(self.nodes)
+        cpu_percent = np.zeros(node_count)
+        if self.cpu_counters is not None:
+            delta = counters - self.cpu_counters
+            total = delta.sum(axis=1)
+            idle = delta[:, 3] + delta[:, 4]
+            known = self.cpu_nodes >= 0
+            busy_by_node = np.bincount(self.cpu_nodes[known], (total - idle)[known], minlength=node_count)
+            total_by_node = np.bincount(self.cpu_nodes[known], total[known], minlength=node_count)
+            np.divide(100.0 * busy_by_node, total_by_node, out=cpu_percent, where=total_by_node > 0)
+        self.cpu_counters = counters
+
+        if self.numastat is not None and elapsed > 0:
+            rates = np.maximum(numastat - self.numastat, 0) / elapsed
+        else:
+            rates = np.zeros(numastat.shape)
+        self.numastat = numastat
+        self.last_time = now
+
+        mem_total = np.array([info.get("MemTotal", 0) for info in meminfo], dtype=np.float64)
+        mem_free = np.array([info.get("MemFree", 0) for info in meminfo], dtype=np.float64)
+        file_pages = np.array([info.get("FilePages", 0) for info in meminfo], dtype=np.float64)
+        local, other = rates[:, 4], rates[:, 5]
+        allocated = local + other
+        local_percent = np.full(node_count, np.nan)
+        np.divide(100.0 * local, allocated, out=local_percent, where=allocated > 0)
+        free_percent = np.zeros(node_count)
+        np.divide(100.0 * mem_free, mem_total, out=free_percent, where=mem_total > 0)
+        return {
+            "nodes": self.nodes,
+            "cpus": [self.node_cpus[node] for node in self.nodes],
+            "cpu_percent": cpu_percent,
+            "mem_total": mem_total,
+            "mem_free": mem_free,
+            "free_percent": free_percent,
+            "file_pages": file_pages,
+            "local_percent": local_percent,
+            "hit_s": rates[:, 0],
+            "miss_s": rates[:, 1],
+            "foreign_s": rates[:, 2],
+            "local_s": local,
+            "remote_s": other,
+            # Spread of free memory between the emptiest and fullest node
+            "imbalance": float(free_percent.max() - free_percent.min()) if node_count else 0.0,
+        }
+
+
+def format_cpulist(cpus):
+    """Inverse of parse_cpulist for display"""
+    ranges = []
+    for cpu in cpus:
+        if ranges and cpu == ranges[-1][1] + 1:
+            ranges[-1][1] = cpu
+        else:
+            ranges.append([cpu, cpu])
+    return ",".join(f"{a}-{b}" if a != b else str(a) for a, b in ranges) or "-"
@@ -0,0 +1,141 @@
+import os
+import select
+import threading
+
+RESOURCES = ("cpu", "memory", "io")
+
+
+def parse_pressure(text):
+    """Parse a PSI file into {"some": {...}, "full": {...}} with float averages and int totals"""
+    result = {}
+    for line in text.splitlines():
+        kind, *fields = line.split()
+        values = {}
+        for field in fields:
+            key, _, value = field.partition("=")
+            values[key] = int(value) if key == "total" else float(value)
+        result[kind] = values
+    return result
+
+
+class PressureCollector:
+    """Reads /proc/pressure/{cpu,memory,io} (and cgroup *.pressure files) each tick
+
+    Besides the kernel's avg10/avg60 it reports the stall share of the last
+    tick, derived from the microsecond 'total' counters.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.root = os.path.join(backend.proc_root, "pressure")
+        self.available = os.path.isdir(self.root)
+        self.last_totals = {}
+        self.last_time = None
+
+    def read(self, path):
+        try:
+            with open(path) as f:
+                return parse_pressure(f.read())
+        except OSError:
+            return None
+
+    def summarize(self, key, parsed, elapsed):
+        summary = {}
+        for kind in ("some", "full"):
+            values = parsed.get(kind, {})
+            total = values.get("total", 0)
+            previous = self.last_totals.get((key, kind))
+            self.last_totals[(key, kind)] = total
+            rate = 0.0
+            if previous is not None and elapsed > 0:
+                rate = min(100.0, max(0, total - previous) / (elapsed * 1e6) * 100)
+            summary[f"{kind}_avg10"] = values.get("avg10", 0.0)
+            summary[f"{kind}_avg60"] = values.get("avg60", 0.0)
+            summary[f"{kind}_total"] = total
+            summary[f"{kind}_rate"] = rate
+        return summary
+
+    def collect(self, cgroups=()):
+        """System PSI plus the same for each cgroup directory in cgroups"""
+        if not self.available:
+            return None
+        now = self.backend.clock.time()
+        elapsed = now - self.last_time if self.last_time is not None else 0.0
+        self.last_time = now
+
+        result = {}
+        for resource in RESOURCES:
+            parsed = self.read(os.path.join(self.root, resource))
+            if parsed is not None:
+                result[resource] = self.summarize(resource, parsed, elapsed)
+
+        per_cgroup = {}
+        for path in cgroups:
+            entry = {}
+            for resource in RESOURCES:
+                parsed = self.read(os.path.join(path, f"{resource}.pressure"))
+                if parsed is not None:
+                    entry[resource] = self.summarize((path, resource), parsed, elapsed)
+            if entry:
+                per_cgroup[path] = entry
+        result["cgroups"] = per_cgroup
+        return result
+
+
+DEFAULT_TRIGGERS = [
+    ("cpu", "some", 500_000, 2_000_000),
+    ("memory", "some", 150_000, 2_000_000),
+    ("io", "full", 200_000, 2_000_000),
+]
+
+
+def format_pressure(entry):
+    if entry is None:
+        return "--"
+    return f"{entry['some_avg10']:.1f}% / {entry['full_avg10']:.1f}%"
+
+
+class PressureTrigger(threading.Thread):
+    """Kernel PSI trigger: wakes on POLLPRI when stall time crosses a threshold
+
+    For example PressureTrigger("memory", "some", 150_000, 2_000_000, callback)
+    fires when tasks stall on memory for 150 ms within any 2 s window, with no
+    polling from our side. Unprivileged processes need windows that are a
+    multiple of 2 s.
+    """
+
+    def __init__(self, resource, kind, threshold_us, window_us, callback, proc_root="/proc"):
+        super().__init__(daemon=True, name=f"psi-{resource}")
+        self.resource = resource
+        self.kind = kind
+        self.threshold_us = threshold_us
+        self.window_us = window_us
+        self.callback = callback
+        self.path = os.path.join(proc_root, "pressure", resource)
+        self.stopped = threading.Event()
+        self.error = None
+
+    def run(self):
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_NONBLOCK)
+        except OSError as e:
+            self.error = e
+            return
+        try:
+            os.write(fd, f"{self.kind} {self.threshold_us} {self.window_us}\0".encode())
+            poller = select.poll()
+            poller.register(fd, select.POLLPRI)
+            while not self.stopped.is_set():
+                for _, events in poller.poll(500):
+                    if events & select.POLLERR:
+                        self.error = OSError(f"PSI trigger on {self.path} was removed")
+                        return
+                    if events & select.POLLPRI:
+                        self.callback(self.resource, self.kind)
+        except OSError as e:
+            self.error = e
+        finally:
+            os.close(fd)
+
+    def stop(self):
+        self.stopped.set()
@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+import psutil
+
+from procmem import list_pids, read_bytes
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+USER_HZ = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+class ProcessSampler:
+    """CPU time, resident memory and I/O of every process from /proc/[pid]/stat and io
+
+    A pass lists /proc once and then reads at most slice_size processes per
+    call, so 50k processes are spread over several ticks instead of landing on
+    one; smaller hosts get a full pass every pass_interval seconds. Deltas are
+    taken against each pid's previous reading, whenever that was. Without
+    /proc (Windows) the same numbers come from psutil.
+    """
+
+    def __init__(self, backend, pass_interval=1.0, slice_size=1024):
+        self.backend = backend
+        self.pass_interval = pass_interval
+        self.slice_size = slice_size
+        self.available = os.path.isdir(backend.proc_root)
+        self.pending = []
+        self.next_pass = None
+        self.comms = {}
+        self.previous = {}
+        self.io_denied = set()
+
+    def start_pass(self, now):
+        """Queue every live pid; returns the pids that exited since the last pass"""
+        if self.available:
+            pids = list_pids(self.backend.proc_root)
+        else:
+            pids = psutil.pids()
+        alive = set(pids)
+        exited = [pid for pid in self.comms if pid not in alive]
+        for pid in exited:
+            del self.comms[pid]
+            self.previous.pop(pid, None)
+            self.io_denied.discard(pid)
+        self.pending = pids
+        self.next_pass = now + self.pass_interval
+        return exited
+
+    def read_process(self, pid):
+        """(cpu ticks, rss bytes, io bytes); io is 0 where /proc/[pid]/io is not readable"""
+        if not self.available:
+            process = psutil.Process(pid)
+            with process.oneshot():
+                self.comms.setdefault(pid, process.name())
+                times = process.cpu_times()
+                rss = process.memory_info().rss
+                try:
+                    io = process.io_counters()
+                    io_bytes = io.read_bytes + io.write_bytes
+                except (psutil.AccessDenied, AttributeError):
+                    io_bytes = 0
+            return (times.user + times.system) * USER_HZ, rss, io_bytes
+        base = os.path.join(self.backend.proc_root, str(pid))
+        stat = read_bytes(os.path.join(base, "stat"))
+        # comm may contain spaces or parentheses, so split after the last ')'
+        close = stat.rfind(b")")
+        fields = stat[close + 2:].split()
+        if pid not in self.comms:
+            self.comms[pid] = stat[stat.find(b"(") + 1:close].decode(errors="replace")
+        io_bytes = 0
+        if pid not in self.io_denied:
+            try:
+                fields_io = read_bytes(os.path.join(base, "io")).split()
+                io = dict(zip(fields_io[::2], fields_io[1::2]))
+                io_bytes = int(io[b"read_bytes:"]) + int(io[b"write_bytes:"])
+            except PermissionError:
+                self.io_denied.add(pid)
+            except (OSError, KeyError, ValueError):
+                pass
+        return int(fields[11]) + int(fields[12]), int(fields[21]) * PAGE_SIZE, io_bytes
+
+    def sample(self):
+        """Readings for the next slice of the current pass
+
+        cpu_s, rss_delta and io_bytes are amounts since the pid's previous
+        reading (0 for pids seen for the first time).
+        """
+        now = self.backend.clock.monotonic()
+        exited = []
+        if not self.pending and (self.next_pass is None or now >= self.next_pass):
+            exited = self.start_pass(now)
+        batch, self.pending = self.pending[:self.slice_size], self.pending[self.slice_size:]
+        pids = []
+        readings = []
+        for pid in batch:
+            try:
+                readings.append(self.read_process(pid))
+            except (OSError, IndexError, ValueError, psutil.Error):
+                # Exited mid-pass; dropped with the next listing
+                continue
+            pids.append(pid)
+        current = np.array(readings, dtype=np.float64).reshape(-1, 3)
+        previous = np.array([self.previous.get(pid, reading) for pid, reading in zip(pids, readings)],
+                            dtype=np.float64).reshape(-1, 3)
+        self.previous.update(zip(pids, readings))
+        delta = current - previous
+        return {
+            "exited": exited,
+            "pids": np.array(pids, dtype=np.int64),
+            "rss": current[:, 1],
+            "cpu_s": np.maximum(delta[:, 0], 0) / USER_HZ,
+            "rss_delta": delta[:, 1],
+            "io_bytes": np.maximum(delta[:, 2], 0),
+        }
@@ -0,0 +1,179 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Field -> column in the sample row; values are kB in the file
+SMAPS_FIELDS = {b"Rss:": 0, b"Pss:": 1, b"Private_Clean:": 2, b"Private_Dirty:": 3, b"Swap:": 4}
+
+
+def read_bytes(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 4096)
+    finally:
+        os.close(fd)
+
+
+def parse_smaps_rollup(data):
+    """Return [rss, pss, private_clean, private_dirty, swap] in bytes"""
+    values = [0, 0, 0, 0, 0]
+    for line in data.split(b"\n")[1:]:
+        fields = line.split()
+        if len(fields) >= 2:
+            index = SMAPS_FIELDS.get(fields[0])
+            if index is not None:
+                values[index] = int(fields[1]) * 1024
+    return values
+
+
+def list_pids(proc_root):
+    with os.scandir(proc_root) as entries:
+        return [int(entry.name) for entry in entries if entry.name.isdigit()]
+
+
+class DeepMemoryScanner:
+    """PSS/USS/swap per process from /proc/[pid]/smaps_rollup, off the tick thread
+
+    smaps_rollup makes the kernel walk each process's page tables, so a pass
+    is split into chunks on a thread pool (the reads release the GIL) and
+    collect() only submits work and merges finished passes. Processes that
+    are large or growing quickly come due every fast_interval seconds, the
+    rest every interval.
+    """
+
+    def __init__(self, backend, workers=8, interval=30.0, fast_interval=3.0, chunk=64,
+                 large_bytes=256 * 1024**2, growth_bytes_s=1024**2, top=15):
+        self.backend = backend
+        self.workers = workers
+        self.interval = interval
+        self.fast_interval = fast_interval
+        self.chunk = chunk
+        self.large_bytes = large_bytes
+        self.growth_bytes_s = growth_bytes_s
+        self.top = top
+        self.enabled = False
+        self.pool = None
+        self.futures = []
+        self.pass_started = None
+        self.samples = {}
+        self.due = {}
+        self.comms = {}
+        self.summary = None
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        if enabled and self.pool is None:
+            self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="smaps")
+        elif not enabled and self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+            self.futures = []
+            self.samples.clear()
+            self.due.clear()
+            self.summary = None
+
+    def toggle(self):
+        self.set_enabled(not self.enabled)
+        return self.enabled
+
+    def scan_chunk(self, pids):
+        proc_root = self.backend.proc_root
+        results = []
+        for pid in pids:
+            base = os.path.join(proc_root, str(pid))
+            try:
+                values = parse_smaps_rollup(read_bytes(os.path.join(base, "smaps_rollup")))
+                comm = self.comms.get(pid)
+                if comm is None:
+                    comm = self.comms[pid] = read_bytes(os.path.join(base, "comm")).decode(errors="replace").strip()
+            except PermissionError:
+                results.append((pid, "denied"))
+                continue
+            except OSError:
+                # Exited since the listing, or a kernel thread without an mm
+                results.append((pid, None))
+                continue
+            results.append((pid, (comm, values)))
+        return time.perf_counter(), results
+
+    def merge(self, now):
+        denied = scanned = 0
+        finished = self.pass_started
+        for future in self.futures:
+            chunk_finished, results = future.result()
+            finished = max(finished, chunk_finished)
+            for pid, result in results:
+                scanned += 1
+                if result == "denied":
+                    denied += 1
+                    self.due[pid] = now + self.interval * 10
+                    continue
+                if result is None:
+                    # Gone since the listing; do not report its last sample in this pass
+                    self.samples.pop(pid, None)
+                    self.comms.pop(pid, None)
+                    self.due[pid] = now + self.interval
+                    continue
+                comm, (rss, pss, private_clean, private_dirty, swap) = result
+                previous = self.samples.get(pid)
+                growth = 0.0
+                if previous is not None and now > previous[5]:
+                    growth = (rss - previous[1]) / (now - previous[5])
+                self.samples[pid] = (comm, rss, pss, private_clean + private_dirty, swap, now)
+                fast = pss >= self.large_bytes or growth >= self.growth_bytes_s
+                self.due[pid] = now + (self.fast_interval if fast else self.interval)
+        self.futures = []
+        return (finished - self.pass_started) * 1000, denied, scanned
+
+    def summarize(self, pass_ms, scanned, denied):
+        samples = self.samples
+        by_pss = sorted(samples.items(), key=lambda item: item[1][2], reverse=True)
+        commands = {}
+        for comm, rss, pss, uss, swap, _ in samples.values():
+            entry = commands.get(comm)
+            if entry is None:
+                commands[comm] = [1, rss, pss, uss, swap]
+            else:
+                entry[0] += 1
+                entry[1] += rss
+                entry[2] += pss
+                entry[3] += uss
+                entry[4] += swap
+        by_command = sorted(commands.items(), key=lambda item: item[1][2], reverse=True)
+        return {
+            "processes": [(pid, *sample[:5]) for pid, sample in by_pss[:self.top]],
+            "commands": [(comm, *entry) for comm, entry in by_command[:self.top]],
+            "tracked": len(samples),
+            "pss_total": sum(sample[2] for sample in samples.values()),
+            "uss_total": sum(sample[3] for sample in samples.values()),
+            "swap_total": sum(sample[4] for sample in samples.values()),
+            "pass_ms": pass_ms,
+            "scanned": scanned,
+            "denied": denied,
+        }
+
+    def collect(self):
+        """Latest summary (None until the first pass finishes, or when disabled)"""
+        if not self.enabled:
+            return None
+        now = self.backend.clock.monotonic()
+        if self.futures and all(future.done() for future in self.futures):
+            pass_ms, denied, scanned = self.merge(now)
+            self.summary = self.summarize(pass_ms, scanned, denied)
+
+        if not self.futures:
+            try:
+                pids = list_pids(self.backend.proc_root)
+            except OSError:
+                return self.summary
+            alive = set(pids)
+            for pid in [pid for pid in self.due if pid not in alive]:
+                self.due.pop(pid, None)
+                self.samples.pop(pid, None)
+                self.comms.pop(pid, None)
+            due = [pid for pid in pids if self.due.get(pid, 0) <= now]
+            if due:
+                self.pass_started = time.perf_counter()
+                self.futures = [self.pool.submit(self.scan_chunk, due[i:i + self.chunk])
+                                for i in range(0, len(due), self.chunk)]
+        return self.summary
@@ -0,0 +1,143 @@
+import cProfile
+import io
+import os
+import pstats
+import signal
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+
+class ProfileSession:
+    """Bounded cProfile + tracemalloc capture around the monitor's own ticks
+
+    The profiler is enabled only inside tick(), i.e. in the thread that runs
+    update_metrics, so reports show where the monitor spends its time rather
+    than its sleeps. tracemalloc is process wide.
+    """
+
+    def __init__(self, output_dir="profiles", max_duration=300, top=40, frames=25):
+        self.output_dir = output_dir
+        self.max_duration = max_duration
+        self.top = top
+        self.frames = frames
+        self.lock = threading.Lock()
+        self.profiler = None
+        self.deadline = None
+        self.baseline = None
+        self.started_tracemalloc = False
+        self.stop_requested = False
+        self.in_tick = False
+        self.pending_toggle = None
+        self.last_reports = []
+
+    @property
+    def active(self):
+        return self.profiler is not None
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic()) if self.active else 0.0
+
+    def start(self, duration=60):
+        with self.lock:
+            if self.active:
+                return False
+            self.profiler = cProfile.Profile()
+            self.deadline = time.monotonic() + min(duration, self.max_duration)
+            self.stop_requested = False
+            self.started_tracemalloc = not tracemalloc.is_tracing()
+            if self.started_tracemalloc:
+                tracemalloc.start(self.frames)
+            self.baseline = tracemalloc.take_snapshot()
+            return True
+
+    def stop(self):
+        """Finish the session; deferred to the end of the current tick if one is running"""
+        with self.lock:
+            if not self.active:
+                return []
+            if self.in_tick:
+                self.stop_requested = True
+                return []
+            return self._finish()
+
+    def toggle(self, duration=60):
+        if self.active:
+            return self.stop()
+        self.start(duration)
+        return []
+
+    @contextmanager
+    def tick(self):
+        if self.pending_toggle is not None:
+            duration, self.pending_toggle = self.pending_toggle, None
+            self.toggle(duration)
+        with self.lock:
+            profiler = self.profiler
+            self.in_tick = profiler is not None
+        if profiler is None:
+            yield
+            return
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            with self.lock:
+                self.in_tick = False
+                if self.stop_requested or time.monotonic() >= self.deadline:
+                    self._finish()
+
+    def _finish(self):
+        profiler, self.profiler = self.profiler, None
+        baseline, self.baseline = self.baseline, None
+        self.stop_requested = False
+        snapshot = tracemalloc.take_snapshot()
+        if self.started_tracemalloc:
+            tracemalloc.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        base = os.path.join(self.output_dir, stamp)
+
+        profiler.dump_stats(f"{base}_cpu.prof")
+        with open(f"{base}_cpu.txt", "w") as f:
+            for sort in ("cumulative", "tottime"):
+                stream = io.StringIO()
+                pstats.Stats(profiler, stream=stream).sort_stats(sort).print_stats(self.top)
+                f.write(f"=== sorted by {sort} ===\n{stream.getvalue()}\n")
+
+        snapshot = snapshot.filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ])
+        snapshot.dump(f"{base}_memory.snapshot")
+        with open(f"{base}_memory.txt", "w") as f:
+            f.write("=== top allocations ===\n")
+            for stat in snapshot.statistics("lineno")[:self.top]:
+                f.write(f"{stat}\n")
+            f.write("\n=== growth since start ===\n")
+            for stat in snapshot.compare_to(baseline, "lineno")[:self.top]:
+                f.write(f"{stat}\n")
+
+        self.last_reports = [f"{base}_cpu.txt", f"{base}_cpu.prof",
+                             f"{base}_memory.txt", f"{base}_memory.snapshot"]
+        return self.last_reports
+
+
+def install_signal_handler(session, duration=60, signum=None):
+    """Toggle a profiling session on SIGUSR1 (POSIX only) for headless runs
+
+    The handler only flags the request; the next tick starts or stops the
+    session so the handler never contends for the session lock.
+    """
+    signum = signum or getattr(signal, "SIGUSR1", None)
+    if signum is None:
+        return False
+
+    def handler(*_):
+        session.pending_toggle = duration
+
+    signal.signal(signum, handler)
+    return True
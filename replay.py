@@ -0,0 +1,328 @@
+import math
+import time
+
+import numpy as np
+
+from alerts import DEFAULT_RULES, AlertEngine, metric_values
+from anomaly import AnomalyDetector
+from cgroups import CgroupCollector
+from export import read_chunks
+from forecast import DiskForecaster
+from history import HistoryStore, SeriesBuffer
+from instrumentation import NullTimer
+from leaks import LeakDetector
+from pressure import RESOURCES
+from scheduler import GROUPS
+from stats import WINDOWS
+
+SPEEDS = (1, 2, 5, 10, 25, 50, 100)
+# Series that stop getting points (a cgroup out of the top 5, an unmounted disk) drop out of the
+# snapshot after this long; it has to outlast the deadband's 60 s heartbeat
+STALE_SECONDS = 90.0
+
+
+def load_history(path, format=None):
+    """A HistoryStore holding every point of a history export, without a retention limit
+
+    Points go straight into the series buffers: no deadband, no streaming
+    statistics, and the compressed blocks' time index is what seeks use.
+    """
+    history = HistoryStore(retention=math.inf)
+    for name, times, values in read_chunks(path, format):
+        buffer = history.series.get(name)
+        if buffer is None:
+            buffer = history.series[name] = SeriesBuffer(history.block_size, history.retention)
+        buffer.extend(times, values)
+    return history
+
+
+class RecordingStats:
+    """StreamingStats.summary() computed from the history as of the replay position"""
+
+    def __init__(self, history):
+        self.history = history
+
+    def summary(self, name, window="1m"):
+        seconds = WINDOWS[window]
+        values = self.history.resample(name, seconds)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return None
+        p50, p95, p99 = np.percentile(values, (50, 95, 99))
+        # The live EWMA over one-second samples: weight a(1 - a)^age, bias-corrected, the oldest
+        # sample only counting while it is the only one
+        alpha = 1 - math.exp(-1.0 / seconds)
+        weights = alpha * (1 - alpha) ** np.arange(len(values) - 1, -1, -1)
+        if len(values) > 1:
+            weights[0] = 0.0
+        return {
+            "count": len(values),
+            "mean": float(values.mean()),
+            "p50": float(p50),
+            "p95": float(p95),
+            "p99": float(p99),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "ewma": float(weights @ values / weights.sum()),
+        }
+
+
+class ReplaySession:
+    """Play position through a recording: play, pause, seek and 1-100x speed
+
+    Stands in for the collector's scheduler in replay mode, so delay() is
+    how long the front end waits before the next snapshot. Controls may be
+    called from the UI thread; collect() picks changes up on its next call.
+    """
+
+    def __init__(self, start, end, speed=1.0, clock=time.monotonic):
+        self.start = float(start)
+        self.end = float(end)
+        self.clock = clock
+        self.position = start
+        self.speed = speed
+        self.playing = True
+        self.seeked = True
+        self.last_advance = clock()
+
+    def advance(self):
+        """Move the position on by the wall time since the last call times the speed"""
+        now = self.clock()
+        if self.playing:
+            self.position = min(self.end, self.position + (now - self.last_advance) * self.speed)
+            if self.position >= self.end:
+                self.playing = False
+        self.last_advance = now
+        return self.position
+
+    def play(self):
+        if self.position >= self.end:
+            self.seek(self.start)
+        self.last_advance = self.clock()
+        self.playing = True
+
+    def pause(self):
+        self.advance()
+        self.playing = False
+
+    def toggle(self):
+        if self.playing:
+            self.pause()
+        else:
+            self.play()
+        return self.playing
+
+    def seek(self, position):
+        self.position = min(self.end, max(self.start, position))
+        self.last_advance = self.clock()
+        self.seeked = True
+
+    def set_speed(self, speed):
+        self.advance()
+        self.speed = min(SPEEDS[-1], max(SPEEDS[0], speed))
+
+    def faster(self, step=1):
+        """Next (or with a negative step, previous) speed in SPEEDS"""
+        index = min(range(len(SPEEDS)), key=lambda i: abs(SPEEDS[i] - self.speed))
+        self.set_speed(SPEEDS[min(len(SPEEDS) - 1, max(0, index + step))])
+
+    def delay(self):
+        # Faster playback is worth sampling more often; rendering is throttled by the front end anyway
+        return 0.1 if self.playing and self.speed > 1 else 0.25
+
+    def status(self):
+        state = "playing" if self.playing else "paused"
+        return f"replay {self.speed:g}x {state}"
+
+
+class ReplayCollector:
+    """Drives a front end from a recorded history export instead of the live host
+
+    collect() returns the same snapshot shape as MetricsCollector.collect(),
+    built from the recording as of the session position: the history reads
+    through HistoryStore.until, so graphs and windows end at the position.
+    Values a recording does not hold (process tables, per-cgroup memory,
+    packet counts) are NaN or empty. Anomalies, alert rules and disk
+    forecasts are evaluated again as the replay plays and start over after
+    a seek; alerts take the rules of the alerts engine given, not its sinks,
+    so a replay never notifies anyone.
+    """
+
+    def __init__(self, path, timer=None, alerts=None, speed=1.0, format=None):
+        self.history = load_history(path, format)
+        self.history.stats = RecordingStats(self.history)
+        self.timer = timer or NullTimer()
+        buffers = [buffer for buffer in self.history.series.values() if len(buffer)]
+        if not buffers:
+            raise ValueError(f"{path} holds no points")
+        start = min(buffer.blocks[0].start if buffer.blocks else buffer.times[0] for buffer in buffers)
+        end = max(buffer.times[buffer.end - 1] for buffer in buffers)
+        self.session = self.scheduler = ReplaySession(start, end, speed)
+        self.rules = alerts.rules if alerts is not None else DEFAULT_RULES
+        self.leaks = LeakDetector()
+        self.forecaster = DiskForecaster()
+        self.anomalies = AnomalyDetector(self.history)
+        self.alerts = AlertEngine(self.rules)
+        self.mount_updated = {}
+
+    def restart(self):
+        """Fresh anomaly, alert and forecast state for a new position, keeping the front end's callbacks"""
+        on_anomaly, on_alert = self.anomalies.on_anomaly, self.forecaster.on_alert
+        self.anomalies = AnomalyDetector(self.history, on_anomaly=on_anomaly)
+        self.forecaster = DiskForecaster(on_alert=on_alert)
+        self.alerts = AlertEngine(self.rules)
+        self.mount_updated = {}
+
+    def families(self, prefix, now):
+        """Names after prefix of the series in that family with a recent enough point"""
+        names = []
+        for name, buffer in self.history.series.items():
+            if name.startswith(prefix):
+                newest = self.history.newest(buffer) if len(buffer) else None
+                if newest is not None and now - newest <= STALE_SECONDS:
+                    names.append(name[len(prefix):])
+        return sorted(names)
+
+    def collect(self):
+        session = self.session
+        seeked = session.seeked
+        session.seeked = False
+        now = session.advance()
+        if seeked:
+            self.restart()
+        history = self.history
+        history.until = now
+        nan = math.nan
+
+        def latest(name):
+            value = history.latest(name)
+            return float(value) if value is not None else nan
+
+        with self.timer.stage("replay.snapshot"):
+            mem_total, swap_total, disk_total = latest("mem_total"), latest("swap_total"), latest("disk_total")
+            mem_percent, swap_percent, disk_percent = latest("memory"), latest("swap"), latest("disk")
+            mem_used = mem_total * mem_percent / 100
+            swap_used = swap_total * swap_percent / 100
+            disk_used = disk_total * disk_percent / 100
+
+            interfaces = self.families("net_rx:", now)
+            rates = np.full((len(interfaces), 8), nan)
+            for i, name in enumerate(interfaces):
+                rates[i, 0] = latest(f"net_rx:{name}")
+                rates[i, 1] = latest(f"net_tx:{name}")
+            network = {
+                "names": interfaces,
+                "rates": rates,
+                "tracked_rows": list(range(len(interfaces))),
+                "rx_bytes_s": latest("net_rx"),
+                "tx_bytes_s": latest("net_tx"),
+                "rx_packets_s": nan,
+                "tx_packets_s": nan,
+                # Recorded as one series of errors plus drops
+                "errors_s": latest("net_errors"),
+                "drops_s": 0.0,
+                "tcp_retrans_s": latest("net_retrans"),
+                "tcp_retrans_pct": nan,
+            }
+
+            pressure = None
+            if any(f"psi_{resource}" in history.series for resource in RESOURCES):
+                # Only the per-interval stall rate is recorded; it stands in for the kernel's averages
+                pressure = {"cgroups": {}}
+                for resource in RESOURCES:
+                    some, full = latest(f"psi_{resource}"), latest(f"psi_{resource}_full")
+                    if not math.isnan(some):
+                        pressure[resource] = {"some_avg10": some, "some_avg60": some, "some_rate": some,
+                                              "full_avg10": full, "full_avg60": full, "full_rate": full}
+
+            mounts = []
+            for mount in self.families("mount:", now):
+                updated = float(history.newest(history.series[f"mount:{mount}"]))
+                percent = latest(f"mount:{mount}")
+                inodes = latest(f"inodes:{mount}")
+                if self.mount_updated.get(mount) != updated:
+                    self.mount_updated[mount] = updated
+                    self.forecaster.update(mount, updated, percent)
+                mounts.append({"mount": mount, "fstype": "?", "source": "?", "total": nan, "used": nan,
+                               "free": nan, "avail": nan, "percent": percent, "inodes": not math.isnan(inodes),
+                               "inode_percent": inodes, "state": "ok", "updated": updated})
+            self.forecaster.annotate(mounts)
+
+            nodes = [int(node) for node in self.families("numa_cpu:", now) if node.isdigit()]
+            numa = None
+            if nodes:
+                nodes.sort()
+                count = len(nodes)
+                free_percent = np.array([latest(f"numa_free:{node}") for node in nodes])
+                numa = {
+                    "nodes": nodes,
+                    "cpus": [[] for _ in nodes],
+                    "cpu_percent": np.array([latest(f"numa_cpu:{node}") for node in nodes]),
+                    "mem_total": np.full(count, nan),
+                    "mem_free": np.full(count, nan),
+                    "free_percent": free_percent,
+                    "file_pages": np.full(count, nan),
+                    "local_percent": np.full(count, nan),
+                    "hit_s": np.full(count, nan),
+                    "miss_s": np.full(count, nan),
+                    "foreign_s": np.full(count, nan),
+                    "local_s": np.zeros(count),
+                    "remote_s": np.zeros(count),
+                    "imbalance": float(np.nanmax(free_percent) - np.nanmin(free_percent))
+                    if not np.isnan(free_percent).all() else 0.0,
+                }
+
+            names = self.families("cgroup_cpu:", now)
+            cgroups = None
+            if names:
+                count = len(names)
+                cgroups = {
+                    "names": names,
+                    "cpu_percent": np.array([latest(f"cgroup_cpu:{name}") for name in names]),
+                    "memory": np.full(count, nan),
+                    "anon": np.full(count, nan),
+                    "file": np.full(count, nan),
+                    "io_read_s": np.full(count, nan),
+                    "io_write_s": np.full(count, nan),
+                    "count": count,
+                    "rescans": 0,
+                }
+                cgroups["top_rows"] = CgroupCollector.top(cgroups)
+
+            snapshot = {
+                "time": now,
+                "cpu_percent": latest("cpu"),
+                "cpu_freq": 0.0,
+                "core_count": "--",
+                "thread_count": "--",
+                "mem_total": mem_total,
+                "mem_available": mem_total - mem_used,
+                "mem_used": mem_used,
+                "mem_percent": mem_percent,
+                "swap_total": swap_total,
+                "swap_used": swap_used,
+                "swap_free": swap_total - swap_used,
+                "swap_percent": swap_percent,
+                "disk_total": disk_total,
+                "disk_used": disk_used,
+                "disk_free": disk_total - disk_used,
+                "disk_percent": disk_percent,
+                "commit_charge": None,
+                "commit_limit": mem_total + swap_total,
+                "memory": None,
+                "deep_memory": None,
+                "leaks": {"growing": [], "tracked": 0, "capacity": 0, "nbytes": 0},
+                "numa": numa,
+                "mounts": mounts,
+                "network": network,
+                "pressure": pressure,
+                "cgroups": cgroups,
+            }
+        with self.timer.stage("anomaly.detect"):
+            snapshot["anomalies"] = self.anomalies.detect()
+        with self.timer.stage("alerts.evaluate"):
+            snapshot["alerts"] = self.alerts.evaluate(metric_values(snapshot, len(self.anomalies.active)), now)
+        snapshot["sampled"] = set(GROUPS)
+        snapshot["replay"] = {"position": now, "start": session.start, "end": session.end,
+                              "speed": session.speed, "playing": session.playing, "seeked": seeked}
+        return snapshot
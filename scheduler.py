@@ -0,0 +1,102 @@
+import math
+
+
+def pressure_signal(snapshot):
+    pressure = snapshot["pressure"]
+    if not pressure:
+        return 0.0
+    return max(pressure[resource]["some_rate"] for resource in ("cpu", "memory", "io") if resource in pressure)
+
+
+def network_signal(snapshot):
+    # Log scale: a doubling of traffic is one unit whatever the link speed
+    network = snapshot["network"]
+    return math.log1p(network["rx_bytes_s"] + network["tx_bytes_s"] + network["errors_s"] + network["drops_s"])
+
+
+# Collector stage groups and the activity signal of each: (signal, change that counts as
+# activity, level above which the group always runs fast)
+GROUPS = {
+    "cpu": (lambda snapshot: snapshot["cpu_percent"], 10.0, 80.0),
+    "memory": (lambda snapshot: snapshot["mem_percent"], 2.0, 90.0),
+    "processes": (lambda snapshot: snapshot["cpu_percent"], 10.0, 80.0),
+    "numa": (lambda snapshot: snapshot["cpu_percent"], 10.0, 80.0),
+    "disk": (lambda snapshot: snapshot["disk_percent"], 0.5, 95.0),
+    "network": (network_signal, 0.7, None),
+    "cgroups": (lambda snapshot: snapshot["cpu_percent"], 10.0, 80.0),
+    "pressure": (pressure_signal, 5.0, 10.0),
+}
+
+
+class AdaptiveScheduler:
+    """Per-group sampling intervals that shrink on activity and grow in steady state
+
+    After each sample a group's signal is compared with its previous value:
+    a change of at least the group's step, or a level above its high mark,
+    divides the interval by speedup (down to min_interval); steady_samples
+    quiet samples in a row multiply it by backoff (up to max_interval). So a
+    burst is followed within a sample or two, and an idle box settles at one
+    sample per max_interval. With adaptive=False every group runs every
+    base_interval.
+
+    Collectors derive rates from the time between their own samples and the
+    history stores real timestamps, so uneven spacing is handled downstream.
+    """
+
+    def __init__(self, clock, base_interval=1.0, min_interval=0.25, max_interval=5.0, speedup=2.0,
+                 backoff=1.25, steady_samples=3, adaptive=True, groups=GROUPS):
+        self.clock = clock
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.speedup = speedup
+        self.backoff = backoff
+        self.steady_samples = steady_samples
+        self.adaptive = adaptive
+        self.groups = groups
+        self.intervals = {group: base_interval for group in groups}
+        self.next_due = {group: -math.inf for group in groups}
+        self.last_signal = {}
+        self.quiet = {group: 0 for group in groups}
+        self.samples = {group: 0 for group in groups}
+
+    def due(self):
+        """Groups to sample now; a group due within a quarter of min_interval is taken early rather than skipped"""
+        if not self.adaptive:
+            return set(self.groups)
+        now = self.clock.monotonic() + self.min_interval / 4
+        return {group for group, due in self.next_due.items() if now >= due}
+
+    def observe(self, snapshot, sampled):
+        """Adapt the interval of each group sampled this tick from its new signal"""
+        now = self.clock.monotonic()
+        for group in sampled:
+            self.samples[group] += 1
+            signal_fn, step, high = self.groups[group]
+            signal = signal_fn(snapshot)
+            previous = self.last_signal.get(group)
+            self.last_signal[group] = signal
+            interval = self.intervals[group]
+            if self.adaptive and previous is not None:
+                if abs(signal - previous) >= step or (high is not None and signal >= high):
+                    interval = max(self.min_interval, interval / self.speedup)
+                    self.quiet[group] = 0
+                else:
+                    self.quiet[group] += 1
+                    if self.quiet[group] >= self.steady_samples:
+                        interval = min(self.max_interval, interval * self.backoff)
+                self.intervals[group] = interval
+            self.next_due[group] = now + interval
+
+    def delay(self):
+        """Seconds until the next group is due"""
+        if not self.adaptive:
+            return self.base_interval
+        return max(0.0, min(self.next_due.values()) - self.clock.monotonic())
+
+    def status(self):
+        fastest = min(self.intervals.values())
+        slowest = max(self.intervals.values())
+        if not self.adaptive:
+            return f"fixed {self.base_interval:g}s"
+        return f"{fastest:.2g}-{slowest:.2g}s"
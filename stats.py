@@ -0,0 +1,227 @@
+import math
+from collections import deque
+
+# Quantiles are within 1% of the true value; fixed so every sketch can be merged with every other
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+MIN_VALUE = 1e-9
+# Keys sort in value order: negatives (largest magnitude first), then zero, then positive log indices
+ZERO = -1_000_000
+NEGATIVE = -2_000_000
+
+WINDOWS = {"1m": 60, "5m": 300, "15m": 900, "1h": 3600}
+
+
+def sketch_key(value):
+    if value > MIN_VALUE:
+        return math.ceil(math.log(value) / LOG_GAMMA)
+    if value < -MIN_VALUE:
+        return NEGATIVE - math.ceil(math.log(-value) / LOG_GAMMA)
+    return ZERO
+
+
+def key_value(key):
+    if key == ZERO:
+        return 0.0
+    if key < ZERO:
+        return -2 * GAMMA ** (NEGATIVE - key) / (GAMMA + 1)
+    return 2 * GAMMA ** key / (GAMMA + 1)
+
+
+class LogSketch:
+    """Mergeable quantile sketch over log-spaced buckets (DDSketch-style)
+
+    Adding a value is one dict increment; merge and subtract add or remove
+    another sketch's counts, so windows can be built from bucket sketches.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+
+    def add(self, value, weight=1):
+        self.add_key(sketch_key(value), weight)
+
+    def add_key(self, key, weight=1):
+        self.counts[key] = self.counts.get(key, 0) + weight
+        self.count += weight
+
+    def merge(self, other):
+        counts = self.counts
+        for key, weight in other.counts.items():
+            counts[key] = counts.get(key, 0) + weight
+        self.count += other.count
+
+    def subtract(self, other):
+        counts = self.counts
+        for key, weight in other.counts.items():
+            remaining = counts[key] - weight
+            if remaining:
+                counts[key] = remaining
+            else:
+                del counts[key]
+        self.count -= other.count
+
+    def quantiles(self, qs):
+        """Values at each quantile in qs (ascending); None when empty"""
+        if not self.count:
+            return [None] * len(qs)
+        ranks = [q * (self.count - 1) for q in qs]
+        results = []
+        seen = 0
+        i = 0
+        for key in sorted(self.counts):
+            seen += self.counts[key]
+            while i < len(ranks) and seen > ranks[i]:
+                results.append(key_value(key))
+                i += 1
+            if i == len(ranks):
+                break
+        return results
+
+
+class Bucket:
+    __slots__ = ("start", "sketch", "minimum", "maximum", "total")
+
+    def __init__(self, start):
+        self.start = start
+        self.sketch = LogSketch()
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.total = 0.0
+
+
+class Window:
+    __slots__ = ("seconds", "sketch", "buckets", "ewma", "weight", "total")
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.sketch = LogSketch()
+        self.buckets = deque()
+        self.ewma = 0.0
+        self.weight = 0.0
+        self.total = 0.0
+
+    def average(self, last_value):
+        # Divided by the weight gathered so far, so the early average is not pulled towards 0
+        return self.ewma / self.weight if self.weight else last_value
+
+
+class MetricStats:
+    """Rollup buckets of bucket_seconds for one metric, plus a running sketch per window
+
+    Each sample goes into the current bucket and every window's running
+    sketch; when a bucket falls out of a window its counts are subtracted
+    again, so no window is ever rebuilt. Min and max come from the bucket
+    extremes, and each window keeps an EWMA with its length as time constant.
+    Samples are weighted by the time since the previous one, so the first
+    (a meaningless 0 for rates) drops out once a second arrives, and the
+    EWMA is divided by the weight gathered so far. Quantiles are clamped to
+    the window's extremes, which the sketch's bucket midpoints can overshoot.
+    """
+
+    def __init__(self, bucket_seconds=10.0, windows=WINDOWS):
+        self.bucket_seconds = bucket_seconds
+        self.buckets = deque(maxlen=int(max(windows.values()) // bucket_seconds) + 1)
+        self.windows = {name: Window(seconds) for name, seconds in windows.items()}
+        self.last_time = None
+        self.last_value = None
+
+    def add(self, timestamp, value):
+        if value != value:
+            return
+        bucket = self.buckets[-1] if self.buckets else None
+        if bucket is None or timestamp >= bucket.start + self.bucket_seconds:
+            bucket = Bucket(timestamp - timestamp % self.bucket_seconds)
+            self.buckets.append(bucket)
+            for window in self.windows.values():
+                window.buckets.append(bucket)
+            self.expire(timestamp)
+        # The log is taken once and the key shared by the bucket and every window
+        key = sketch_key(value)
+        bucket.sketch.add_key(key)
+        if value < bucket.minimum:
+            bucket.minimum = value
+        if value > bucket.maximum:
+            bucket.maximum = value
+        bucket.total += value
+
+        elapsed = timestamp - self.last_time if self.last_time is not None else 0.0
+        for window in self.windows.values():
+            window.sketch.add_key(key)
+            window.total += value
+            if elapsed > 0:
+                alpha = 1 - math.exp(-elapsed / window.seconds)
+                window.ewma += alpha * (value - window.ewma)
+                window.weight += alpha * (1 - window.weight)
+        self.last_time = timestamp
+        self.last_value = value
+
+    def expire(self, now):
+        """Subtract the buckets that have fallen out of each window as of now"""
+        for window in self.windows.values():
+            # Whole buckets only: a bucket leaves once it ends before the window starts
+            while window.buckets and window.buckets[0].start + self.bucket_seconds <= now - window.seconds:
+                expired = window.buckets.popleft()
+                window.sketch.subtract(expired.sketch)
+                window.total -= expired.total
+
+    def summary(self, window_name, now=None):
+        """None when the window holds no samples; with now, buckets older than the window are dropped first"""
+        if now is not None:
+            self.expire(now)
+        window = self.windows[window_name]
+        count = window.sketch.count
+        if not count:
+            return None
+        minimum = min(bucket.minimum for bucket in window.buckets)
+        maximum = max(bucket.maximum for bucket in window.buckets)
+        p50, p95, p99 = (min(max(q, minimum), maximum) for q in window.sketch.quantiles((0.5, 0.95, 0.99)))
+        return {
+            "count": count,
+            "mean": window.total / count,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99,
+            "min": minimum,
+            "max": maximum,
+            "ewma": window.average(self.last_value),
+        }
+
+
+class StreamingStats:
+    """MetricStats for every series appended to a HistoryStore
+
+    Windows end at the newest timestamp added to any series, so a series
+    that stopped reporting empties out instead of showing its last minute
+    forever.
+    """
+
+    def __init__(self, bucket_seconds=10.0, windows=WINDOWS):
+        self.bucket_seconds = bucket_seconds
+        self.window_lengths = windows
+        self.metrics = {}
+        self.last_time = None
+
+    def add(self, name, timestamp, value):
+        metric = self.metrics.get(name)
+        if metric is None:
+            metric = self.metrics[name] = MetricStats(self.bucket_seconds, self.window_lengths)
+        metric.add(timestamp, value)
+        if self.last_time is None or timestamp > self.last_time:
+            self.last_time = timestamp
+
+    def summary(self, name, window="1m"):
+        metric = self.metrics.get(name)
+        return metric.summary(window, self.last_time) if metric is not None else None
+
+    def forget(self, name):
+        self.metrics.pop(name, None)
+
+
+def format_summary(summary, fmt="{:.1f}"):
+    if summary is None:
+        return "--"
+    return (f"p50 {fmt.format(summary['p50'])}  p95 {fmt.format(summary['p95'])}  p99 {fmt.format(summary['p99'])}"
+            f"  min {fmt.format(summary['min'])}  max {fmt.format(summary['max'])}  ewma {fmt.format(summary['ewma'])}")
@@ -0,0 +1,493 @@
+import argparse
+import curses
+import locale
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from alerts import LOG_PATH, RULES_PATH, create_engine
+from anomaly import SEASONAL_PATH
+from collector import MetricsCollector
+from export import EXTENSIONS, HistoryExporter, default_format, import_history
+from forecast import format_duration, format_eta
+from instrumentation import StageTimer
+from network import NetworkCollector, format_rate
+from numa import format_cpulist
+from pressure import format_pressure
+from profiling import ProfileSession, install_signal_handler
+from stats import WINDOWS, format_summary
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+SECTIONS = ["Overview", "CPU", "Memory", "Virtual Memory", "Disk", "Network", "Containers", "NUMA"]
+
+
+def sparkline(values, width, low=0.0, high=100.0):
+    values = np.asarray(values[-width:], dtype=np.float64)
+    if not len(values):
+        return ""
+    scaled = (np.clip(values, low, high) - low) / ((high - low) or 1.0)
+    index = np.minimum((scaled * len(SPARK_CHARS)).astype(int), len(SPARK_CHARS) - 1)
+    return "".join(SPARK_CHARS[i] for i in index)
+
+
+def gb(value):
+    return f"{value / (1024**3):.2f} GB" if value is not None else "--"
+
+
+def changed_spans(old, new):
+    """Yield (column, text) runs where new differs from old"""
+    width = max(len(old), len(new))
+    old = old.ljust(width)
+    new = new.ljust(width)
+    start = None
+    for col in range(width):
+        if old[col] != new[col]:
+            if start is None:
+                start = col
+        elif start is not None:
+            yield start, new[start:col]
+            start = None
+    if start is not None:
+        yield start, new[start:]
+
+
+class TerminalMonitor:
+    def __init__(self, stdscr, collector=None, interval=1.0, on_tick=None):
+        self.stdscr = stdscr
+        self.timer = StageTimer()
+        self.profile_session = ProfileSession()
+        self.collector = collector or MetricsCollector(timer=self.timer)
+        self.history = self.collector.history
+        self.exporter = HistoryExporter(self.history)
+        self.collector.forecaster.on_alert = self.on_forecast_alert
+        self.collector.anomalies.on_anomaly = self.on_anomaly
+        self.interval = interval
+        self.on_tick = on_tick
+        self.section = "Overview"
+        self.stats_window = "5m"
+        self.drawn = {}
+        self.clock = ""
+        self.snapshot = None
+        self.error = ""
+        self.notice = ""
+
+    def on_forecast_alert(self, mount, hours):
+        self.notice = f"{mount} is forecast to be {format_eta(hours)}"
+
+    def on_anomaly(self, anomaly):
+        self.notice = f"Anomaly ({anomaly['kind']}) in {anomaly['name']}: {anomaly['value']:.2f} vs {anomaly['baseline']:.2f}"
+
+    def section_lines(self, snapshot, width):
+        graph_width = max(10, width - 16)
+        lines = []
+
+        def row(label, value):
+            lines.append(f"  {label:<34}{value}")
+
+        def pressure(label, resource):
+            entry = snapshot["pressure"].get(resource) if snapshot["pressure"] else None
+            row(label + " (some/full)", format_pressure(entry))
+
+        def graph(label, name, high=100.0):
+            # One column per second however sparsely the deadband stored the series
+            values = self.history.resample(name, graph_width)
+            values = values[~np.isnan(values)]
+            if high is None:
+                high = float(values.max()) if len(values) else 1.0
+                current = format_rate(values[-1]).rjust(12) if len(values) else "--".rjust(12)
+                lines.append(f"  {label:<7}{current} {sparkline(values, graph_width - 7, high=high)}")
+                return
+            current = f"{values[-1]:5.1f}%" if len(values) else "   --"
+            lines.append(f"  {label:<7}{current} {sparkline(values, graph_width)}")
+
+        def stats(name):
+            row(f"Stats ({self.stats_window})", format_summary(self.history.stats.summary(name, self.stats_window)))
+
+        def contributors(metric, label, amount, seconds=60):
+            now = snapshot["time"]
+            rows, _ = self.history.contributors.aggregate(metric, now - seconds, now, count=5)
+            if rows:
+                lines.append("")
+                lines.append(f"  {'PID':>7} {label + f' (last {seconds} s)':<30}{'Amount':>14}{'Share':>8}")
+                for pid, comm, value, share, _ in rows:
+                    lines.append(f"  {pid:>7} {comm[:29]:<30}{amount(value):>14}{share:>7.1f}%")
+
+        if self.section == "Overview":
+            row("CPU Usage", f"{snapshot['cpu_percent']:.1f}%")
+            row("Memory Usage", f"{snapshot['mem_percent']:.1f}%")
+            row("Disk Usage", f"{snapshot['disk_percent']:.1f}%")
+            row("Virtual Memory", f"{snapshot['mem_percent']:.1f}%")
+            pressure("CPU Pressure", "cpu")
+            pressure("Memory Pressure", "memory")
+            pressure("I/O Pressure", "io")
+            row("Active Anomalies", ", ".join(sorted(self.collector.anomalies.active)) or "none")
+            firing = self.collector.alerts.active()
+            row("Sampling Interval", self.collector.scheduler.status())
+            row("History Stored", f"{self.history.deadband.ratio():.0%} of samples")
+            row("Flight Recorder", self.collector.flight_recorder.status())
+            row("Firing Alerts", f"{len(firing)}" if firing else "none")
+            for text, key, severity, value, _ in firing[:5]:
+                lines.append(f"    {severity.upper():<8}{text} ({key} = {value:.2f})")
+            lines.append("")
+            graph("CPU", "cpu")
+            graph("Memory", "memory")
+            graph("Disk", "disk")
+        elif self.section == "CPU":
+            row("CPU Usage", f"{snapshot['cpu_percent']:.1f}%")
+            row("CPU Frequency", f"{snapshot['cpu_freq']:.0f} MHz")
+            row("Core Count", f"{snapshot['core_count']} Cores")
+            row("Thread Count", f"{snapshot['thread_count']} Threads")
+            pressure("CPU Pressure", "cpu")
+            lines.append("")
+            graph("CPU", "cpu")
+            stats("cpu")
+            contributors("cpu", "Top CPU", lambda value: f"{value:,.1f} CPU-s")
+        elif self.section == "Memory":
+            row("Total Memory", gb(snapshot["mem_total"]))
+            row("Available Memory", gb(snapshot["mem_available"]))
+            row("Used Memory", gb(snapshot["mem_used"]))
+            row("Memory Percentage", f"{snapshot['mem_percent']:.1f}%")
+            pressure("Memory Pressure", "memory")
+            memory = snapshot["memory"]
+            if memory is not None:
+                row("Cached / Buffers", f"{gb(memory['cached'])} / {gb(memory['buffers'])}")
+                row("Slab (reclaimable)", f"{gb(memory['slab'])} ({gb(memory['slab_reclaimable'])})")
+                row("Dirty / Writeback", f"{memory['dirty'] / 1024**2:,.0f} / {memory['writeback'] / 1024**2:,.0f} MB")
+                row("Huge Pages (free / total)", f"{gb(memory['hugepages_free'])} / {gb(memory['hugepages_total'])}")
+                row("Shared Memory", gb(memory["shmem"]))
+            lines.append("")
+            graph("Memory", "memory")
+            stats("memory")
+            growing = snapshot["leaks"]["growing"]
+            if growing:
+                lines.append("")
+                lines.append(f"  {'PID':>7} {'Fastest growing':<20}{'RSS MB':>10}{'MB/h':>10}  Time to OOM")
+                for pid, comm, rss, _, per_hour, oom_hours in growing[:5]:
+                    lines.append(f"  {pid:>7} {comm[:19]:<20}{rss / 1024**2:>10,.0f}{per_hour / 1024**2:>+10,.1f}"
+                                 f"  {format_duration(oom_hours)}")
+            deep_memory = snapshot["deep_memory"]
+            if deep_memory is not None:
+                lines.append("")
+                lines.append(f"  {'PID':>7} {'Command':<20}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}{'Swap MB':>10}")
+                for pid, comm, rss, pss, uss, swap in deep_memory["processes"][:8]:
+                    lines.append(f"  {pid:>7} {comm[:19]:<20}{rss / 1024**2:>10,.0f}{pss / 1024**2:>10,.0f}"
+                                 f"{uss / 1024**2:>10,.0f}{swap / 1024**2:>10,.0f}")
+                lines.append("")
+                lines.append(f"  {'Count':>7} {'Command':<20}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}{'Swap MB':>10}")
+                for comm, count, rss, pss, uss, swap in deep_memory["commands"][:8]:
+                    lines.append(f"  {count:>7} {comm[:19]:<20}{rss / 1024**2:>10,.0f}{pss / 1024**2:>10,.0f}"
+                                 f"{uss / 1024**2:>10,.0f}{swap / 1024**2:>10,.0f}")
+                lines.append(f"  {deep_memory['tracked']:,} processes scanned, last pass {deep_memory['scanned']:,}"
+                             f" in {deep_memory['pass_ms']:.0f} ms, {deep_memory['denied']:,} denied")
+            elif self.collector.deep_memory.enabled:
+                lines.append("")
+                lines.append("  Deep memory scan running...")
+        elif self.section == "Virtual Memory":
+            row("Total Virtual Memory", gb(snapshot["mem_total"] + snapshot["swap_total"]))
+            row("Available Virtual Memory", gb(snapshot["mem_available"] + snapshot["swap_free"]))
+            row("Used Virtual Memory", gb(snapshot["swap_used"]))
+            row("Page File Usage", f"{snapshot['swap_percent']:.1f}%")
+            row("Commit Charge", gb(snapshot["commit_charge"]))
+            row("Commit Limit", gb(snapshot["commit_limit"]))
+            memory = snapshot["memory"]
+            if memory is not None:
+                row("Swap In / Out", f"{memory['swap_in_s']:,.0f} / {memory['swap_out_s']:,.0f} pages/s")
+                row("Page Faults (minor / major)", f"{memory['minor_faults_s']:,.0f} / {memory['major_faults_s']:,.0f} /s")
+                efficiency = memory["reclaim_efficiency"]
+                row("Reclaim Scan / Steal", f"{memory['pgscan_s']:,.0f} / {memory['pgsteal_s']:,.0f} /s"
+                    + (f" ({efficiency:.0f}%)" if efficiency is not None else ""))
+            lines.append("")
+            graph("Virtual", "virtual")
+        elif self.section == "Disk":
+            row("Total Disk Space", gb(snapshot["disk_total"]))
+            row("Used Disk Space", gb(snapshot["disk_used"]))
+            row("Free Disk Space", gb(snapshot["disk_free"]))
+            row("Disk Usage Percentage", f"{snapshot['disk_percent']:.1f}%")
+            pressure("I/O Pressure", "io")
+            lines.append("")
+            graph("Disk", "disk")
+            stats("disk")
+            contributors("io", "Top I/O", lambda value: f"{value / 1024**2:,.1f} MB")
+            lines.append("")
+            mount_width = max(12, width - 80)
+            lines.append(f"  {'Mount':<{mount_width}}{'Type':<8}{'Size':>12}{'Avail':>12}{'Use':>7}{'Inodes':>8}"
+                         f"  {'Forecast':<16}State")
+            for m in snapshot["mounts"]:
+                inodes = f"{m['inode_percent']:.1f}%" if m["inodes"] else "--"
+                lines.append(f"  {m['mount'][-mount_width:]:<{mount_width}}{m['fstype'][:7]:<8}{gb(m['total']):>12}"
+                             f"{gb(m['avail']):>12}{m['percent']:>6.1f}%{inodes:>8}"
+                             f"  {format_eta(m['full_in_h']):<16}{m['state']}")
+        elif self.section == "Network":
+            network = snapshot["network"]
+            row("Receive Rate", format_rate(network["rx_bytes_s"]))
+            row("Transmit Rate", format_rate(network["tx_bytes_s"]))
+            row("Packets per Second", f"{network['rx_packets_s'] + network['tx_packets_s']:,.0f}")
+            row("Errors per Second", f"{network['errors_s']:,.1f}")
+            row("Drops per Second", f"{network['drops_s']:,.1f}")
+            row("TCP Retransmits", f"{network['tcp_retrans_s']:,.1f}/s ({network['tcp_retrans_pct']:.2f}%)")
+            lines.append("")
+            graph("RX", "net_rx", high=None)
+            graph("TX", "net_tx", high=None)
+            lines.append("")
+            lines.append(f"  {'Interface':<16}{'RX':>14}{'TX':>14}{'Errors/s':>10}{'Drops/s':>10}")
+            rates = network["rates"]
+            for i in NetworkCollector.top_interfaces(network):
+                lines.append(f"  {network['names'][i]:<16}{format_rate(rates[i, 0]):>14}"
+                             f"{format_rate(rates[i, 1]):>14}{rates[i, 4] + rates[i, 5]:>10.1f}"
+                             f"{rates[i, 6] + rates[i, 7]:>10.1f}")
+        elif self.section == "Containers":
+            cgroups = snapshot["cgroups"]
+            if cgroups is None:
+                row("Cgroups Tracked", "cgroup v2 unavailable")
+                return lines
+            row("Cgroups Tracked", f"{cgroups['count']:,}")
+            lines.append("")
+            for i in cgroups["top_rows"][:3]:
+                graph(os.path.basename(cgroups["names"][i])[:6], f"cgroup_cpu:{cgroups['names'][i]}")
+            lines.append("")
+            name_width = max(16, width - 56)
+            lines.append(f"  {'Cgroup':<{name_width}}{'CPU':>8}{'Memory':>12}{'Read':>14}{'Write':>14}")
+            for i in cgroups["top_rows"]:
+                lines.append(f"  {cgroups['names'][i][-name_width:]:<{name_width}}"
+                             f"{cgroups['cpu_percent'][i]:>7.1f}%{gb(cgroups['memory'][i]):>12}"
+                             f"{format_rate(cgroups['io_read_s'][i]):>14}{format_rate(cgroups['io_write_s'][i]):>14}")
+        elif self.section == "NUMA":
+            numa = snapshot["numa"]
+            if numa is None:
+                row("NUMA Nodes", "not available")
+                return lines
+            allocated = numa["local_s"].sum() + numa["remote_s"].sum()
+            row("NUMA Nodes", str(len(numa["nodes"])))
+            row("Free Memory Imbalance", f"{numa['imbalance']:.1f} pts")
+            row("Remote Allocations", f"{100.0 * numa['remote_s'].sum() / allocated:.1f}%" if allocated else "--")
+            lines.append("")
+            for node in numa["nodes"][:4]:
+                graph(f"n{node} cpu", f"numa_cpu:{node}")
+            lines.append("")
+            lines.append(f"  {'Node':<7}{'CPUs':<14}{'CPU':>7}{'Memory':>12}{'Free':>12}{'Local':>8}{'Misses/s':>10}")
+            for i, node in enumerate(numa["nodes"]):
+                local = numa["local_percent"][i]
+                local = f"{local:.1f}%" if not np.isnan(local) else "--"
+                lines.append(f"  {'node' + str(node):<7}{format_cpulist(numa['cpus'][i])[:13]:<14}"
+                             f"{numa['cpu_percent'][i]:>6.1f}%{gb(numa['mem_total'][i]):>12}{gb(numa['mem_free'][i]):>12}"
+                             f"{local:>8}{numa['miss_s'][i]:>10,.0f}")
+        return lines
+
+    def frame(self, height, width):
+        tabs = "  ".join(
+            f"[{i + 1} {name}]" if name == self.section else f" {i + 1} {name} "
+            for i, name in enumerate(SECTIONS)
+        )
+        lines = [" SYSTEM MONITOR", " " + tabs, ""]
+        if self.snapshot is not None:
+            lines += self.section_lines(self.snapshot, width)
+        lines += [""] * max(0, height - len(lines) - 1)
+        lines.append(self.footer(width))
+        return [line[:width - 1] for line in lines[:height]]
+
+    def footer(self, width):
+        self.clock = time.strftime("%H:%M:%S")
+        status = self.error or self.notice or (f"History: {self.history.bytes_per_sample():.1f} B/sample | "
+                                               f"{self.timer.status_text()}")
+        if self.profile_session.active:
+            status = f"profiling {self.profile_session.remaining():.0f}s left | {status}"
+        footer = (f" q quit  tab/1-{len(SECTIONS)}  d trace  p profile  m deep mem  w window"
+                  f"  r recorder  f save  x export  {status}")
+        return footer[:width - len(self.clock) - 2].ljust(width - len(self.clock) - 2) + self.clock
+
+    def write(self, y, line):
+        # Only the cells that changed since the last draw are written
+        for x, text in changed_spans(self.drawn.get(y, ""), line):
+            try:
+                self.stdscr.addstr(y, x, text)
+            except curses.error:
+                pass
+        self.drawn[y] = line
+
+    def draw(self):
+        height, width = self.stdscr.getmaxyx()
+        for y, line in enumerate(self.frame(height, width)):
+            self.write(y, line)
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def draw_status(self):
+        """Only the footer, for the clock between ticks"""
+        height, width = self.stdscr.getmaxyx()
+        if height > 0:
+            self.write(height - 1, self.footer(width)[:width - 1])
+            self.stdscr.noutrefresh()
+            curses.doupdate()
+
+    def handle_key(self, key):
+        if key in (ord("q"), ord("Q")):
+            return False
+        if key == ord("\t"):
+            self.section = SECTIONS[(SECTIONS.index(self.section) + 1) % len(SECTIONS)]
+        elif ord("1") <= key < ord("1") + len(SECTIONS):
+            self.section = SECTIONS[key - ord("1")]
+        elif key in (ord("d"), ord("D")):
+            try:
+                self.notice = f"Trace written to {self.timer.dump_trace()}"
+            except OSError as e:
+                self.error = f"Error writing trace: {e}"
+        elif key in (ord("p"), ord("P")):
+            self.profile_session.pending_toggle = 60
+        elif key in (ord("w"), ord("W")):
+            windows = list(WINDOWS)
+            self.stats_window = windows[(windows.index(self.stats_window) + 1) % len(windows)]
+        elif key in (ord("r"), ord("R")):
+            recorder = self.collector.flight_recorder
+            if recorder.toggle():
+                self.notice = f"Flight recorder on at {recorder.rate_hz:.0f} Hz"
+            else:
+                self.notice = "Flight recorder off" if recorder.available else "Flight recorder needs /proc"
+        elif key in (ord("f"), ord("F")):
+            recorder = self.collector.flight_recorder
+            if recorder.trigger("hotkey"):
+                self.notice = f"Saving flight recording in {recorder.seconds_after:.0f}s"
+            elif not recorder.enabled.is_set():
+                self.notice = "Flight recorder is off; press r to start it"
+        elif key in (ord("x"), ord("X")):
+            path = self.exporter.start()
+            self.notice = f"Exporting history to {path}" if path else "An export is already running"
+        elif key in (ord("m"), ord("M")):
+            enabled = self.collector.deep_memory.toggle()
+            self.notice = f"Deep memory scan {'on' if enabled else 'off'}"
+        elif key == curses.KEY_RESIZE:
+            self.stdscr.clear()
+            self.drawn = {}
+        return True
+
+    def run(self):
+        curses.curs_set(0)
+        self.stdscr.timeout(100)
+        next_tick = 0.0
+        # Set by a key press: the section, window or notice may have changed
+        dirty = False
+        while True:
+            if time.monotonic() >= next_tick:
+                with self.profile_session.tick():
+                    self.timer.begin_tick()
+                    try:
+                        if self.on_tick is not None:
+                            self.on_tick()
+                        self.snapshot = self.collector.collect()
+                        self.error = self.collector.alerts.error
+                        for event in self.snapshot["alerts"]:
+                            self.notice = f"Alert {event['state']}: {event['rule']} ({event['key']} = {event['value']:.2f})"
+                    except Exception as e:
+                        self.error = f"Error updating metrics: {e}"
+                    with self.timer.stage("draw.terminal"):
+                        self.draw()
+                    self.timer.end_tick()
+                recorder = self.collector.flight_recorder
+                if recorder.last_dumps:
+                    self.notice = f"Flight recording saved to {recorder.last_dumps.pop()}"
+                if recorder.error:
+                    self.error, recorder.error = recorder.error, None
+                if self.exporter.last_exports:
+                    self.notice = f"History exported to {self.exporter.last_exports.pop()}"
+                if self.exporter.error:
+                    self.error, self.exporter.error = self.exporter.error, None
+                if self.profile_session.last_reports and not self.profile_session.active:
+                    self.notice = f"Profile saved to {self.profile_session.last_reports[0]}"
+                    self.profile_session.last_reports = []
+                # Replays advance the virtual clock a fixed step per tick; live sampling follows the scheduler
+                delay = self.interval if self.on_tick is not None else self.collector.scheduler.delay()
+                next_tick = time.monotonic() + delay
+                dirty = False
+            elif dirty:
+                self.draw()
+                dirty = False
+            elif time.strftime("%H:%M:%S") != self.clock:
+                self.draw_status()
+            key = self.stdscr.getch()
+            if key != -1:
+                if not self.handle_key(key):
+                    break
+                dirty = True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Terminal system monitor")
+    parser.add_argument("--interval", type=float, default=1.0, help="base sampling interval in seconds")
+    parser.add_argument("--fixed-interval", action="store_true",
+                        help="sample everything every --interval instead of adapting per metric group")
+    parser.add_argument("--scenario", help="replay a synthetic fixture scenario instead of the live host")
+    parser.add_argument("--fixture", help="replay frames recorded with fakeproc.py record")
+    parser.add_argument("--mount-interval", type=float, default=10.0, help="seconds between statvfs sweeps")
+    parser.add_argument("--deep-memory", action="store_true", help="scan smaps_rollup for PSS/USS per process")
+    parser.add_argument("--flight-recorder", action="store_true",
+                        help="sample key counters at 50 Hz and save the window around each alert")
+    parser.add_argument("--rules", default=RULES_PATH, help="alert rules file, one rule per line")
+    parser.add_argument("--alert-log", default=LOG_PATH, help="file alert events are appended to")
+    parser.add_argument("--notify", action="store_true", help="send alert events as desktop notifications")
+    parser.add_argument("--webhook", help="POST alert events as JSON to this URL")
+    parser.add_argument("--export-format", choices=sorted(EXTENSIONS),
+                        help=f"format of history exports (default {default_format()})")
+    parser.add_argument("--import", dest="import_path", help="load an exported history before sampling starts")
+    args = parser.parse_args(argv)
+    try:
+        alerts = create_engine(args.rules, args.alert_log, args.notify, args.webhook)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    backend = None
+    on_tick = None
+    fixture_root = None
+    if args.scenario or args.fixture:
+        from fakeproc import FixtureBackend, LoadReplayer, RecordedScenario, synthetic_backend
+
+        if args.scenario:
+            fixture_root = tempfile.mkdtemp(prefix="sysmon-")
+            backend, replayer = synthetic_backend(fixture_root, args.scenario)
+        else:
+            scenario = RecordedScenario(args.fixture, loop=True)
+            backend = FixtureBackend(scenario.frames[0])
+            replayer = LoadReplayer(backend, scenario)
+        on_tick = replayer.step
+    collector = MetricsCollector(timer=StageTimer(), backend=backend, mount_interval=args.mount_interval,
+                                 deep_memory=args.deep_memory, alerts=alerts,
+                                 flight_recorder=args.flight_recorder, interval=args.interval,
+                                 adaptive=not args.fixed_interval)
+    if args.import_path:
+        try:
+            print(f"Imported {import_history(collector.history, args.import_path)} points")
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"Error importing history: {e}")
+
+    def run(stdscr):
+        monitor = TerminalMonitor(stdscr, collector, args.interval, on_tick)
+        monitor.timer = collector.timer
+        if args.export_format:
+            monitor.exporter.format = args.export_format
+        install_signal_handler(monitor.profile_session)
+        monitor.run()
+
+    locale.setlocale(locale.LC_ALL, "")
+    # Fixture replays run on a virtual clock and would teach the baseline a fake day
+    seasonal_path = None if backend is not None else SEASONAL_PATH
+    if seasonal_path is not None:
+        try:
+            collector.anomalies.load(seasonal_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading seasonal baseline: {e}")
+    try:
+        curses.wrapper(run)
+    finally:
+        collector.close()
+        if seasonal_path is not None:
+            try:
+                collector.anomalies.save(seasonal_path)
+            except OSError as e:
+                print(f"Error saving seasonal baseline: {e}")
+        if fixture_root is not None:
+            shutil.rmtree(fixture_root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
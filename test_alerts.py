@@ -0,0 +1,113 @@
+import math
+
+import pytest
+
+from alerts import DEFAULT_RULES, AlertEngine, LogSink, metric_values, parse_rule
+from collector import MetricsCollector
+from fakeproc import synthetic_backend
+
+
+def states(events):
+    return [(event["key"], event["state"]) for event in events]
+
+
+def test_parse_rule():
+    rule = parse_rule("mount_free:/var/lib < 5% for 2m clear 8% error")
+    assert rule["metric"] == "mount_free:/var/lib" and rule["op"] == "<"
+    assert (rule["threshold"], rule["clear"], rule["for"], rule["severity"]) == (5.0, 8.0, 120.0, "error")
+    rule = parse_rule("net_rx > 10M")
+    assert (rule["threshold"], rule["for"], rule["severity"]) == (10 * 1024**2, 0.0, "warning")
+    # The default clear level is 5% of the threshold back on the safe side
+    assert rule["clear"] == pytest.approx(0.95 * 10 * 1024**2)
+
+
+@pytest.mark.parametrize("text", ["swap_in_rate > 1000", "swap-in rate > 1000", "swap_in > 1000"])
+def test_rate_names_share_the_per_second_value(text):
+    assert parse_rule(text)["metric"] == "swap_in"
+
+
+@pytest.mark.parametrize("text", ["cpu >> 5", "cpu > 90% for 2w", "cpu > 90 clear 95", "mount_free < 5% clear 2%"])
+def test_parse_rule_rejects(text):
+    with pytest.raises(ValueError):
+        parse_rule(text)
+
+
+def test_for_duration_and_hysteresis():
+    engine = AlertEngine(["cpu > 90% for 30s clear 80%"])
+    assert engine.evaluate({"cpu": 95.0}, 0.0) == []
+    assert engine.evaluate({"cpu": 95.0}, 20.0) == []
+    # Dipping below the threshold before the duration is up starts the wait over
+    assert engine.evaluate({"cpu": 85.0}, 25.0) == []
+    assert engine.evaluate({"cpu": 95.0}, 30.0) == []
+    assert engine.evaluate({"cpu": 95.0}, 59.0) == []
+    assert states(engine.evaluate({"cpu": 95.0}, 60.0)) == [("cpu", "firing")]
+    assert engine.level("cpu") == "warning"
+    # Between the clear level and the threshold it keeps firing
+    assert engine.evaluate({"cpu": 85.0}, 61.0) == []
+    assert [row[:3] for row in engine.active()] == [("cpu > 90% for 30s clear 80%", "cpu", "warning")]
+    assert states(engine.evaluate({"cpu": 79.0}, 62.0)) == [("cpu", "resolved")]
+    assert engine.level("cpu") == "success" and engine.active() == []
+
+
+def test_below_rules_inclusive_ops_and_missing_values():
+    engine = AlertEngine(["free < 10 error", "count >= 3"])
+    assert states(engine.evaluate({"free": 10.0, "count": 3.0}, 0.0)) == [("count", "firing")]
+    assert states(engine.evaluate({"free": 9.0, "count": 3.0}, 1.0)) == [("free", "firing")]
+    assert engine.level("free") == "error"
+    assert engine.evaluate({"free": 10.2, "count": 3.0}, 2.0) == []
+    # A missing (NaN) value counts as clear
+    assert sorted(states(engine.evaluate({"free": math.nan, "count": math.nan}, 3.0))) == [
+        ("count", "resolved"), ("free", "resolved")]
+
+
+def test_families_follow_their_members():
+    engine = AlertEngine(["mount_free < 5%"])
+    values = {"cpu": 1.0, "mount_free:/": 50.0, "mount_free:/data": 3.0}
+    assert states(engine.evaluate(values, 0.0)) == [("mount_free:/data", "firing")]
+    assert engine.level("mount_free") == "warning" and engine.level("mount_free:/") == "success"
+    # A firing member that goes away resolves
+    assert states(engine.evaluate({"cpu": 1.0, "mount_free:/": 50.0}, 1.0)) == [("mount_free:/data", "resolved")]
+    assert engine.error == ""
+
+
+def test_unmatched_rules_are_reported():
+    engine = AlertEngine(["cpu > 90%", "no_such_metric > 1"])
+    engine.evaluate({"cpu": 1.0}, 0.0)
+    assert "no_such_metric" in engine.error
+
+
+def test_rebinding_clears_the_unmatched_error():
+    engine = AlertEngine(["cpu > 90%", "gpu > 90%"])
+    engine.evaluate({"cpu": 1.0}, 0.0)
+    assert "gpu" in engine.error
+    # The metric turns up later (a GPU collector starts, a mount appears)
+    engine.evaluate({"cpu": 1.0, "gpu": 95.0}, 1.0)
+    assert engine.error == "" and engine.level("gpu") == "warning"
+
+
+def test_sinks_get_each_event_and_failures_are_reported(tmp_path):
+    log = tmp_path / "alerts.log"
+    received = []
+
+    def broken(event):
+        raise OSError("unreachable")
+
+    engine = AlertEngine(["cpu > 90%"], [LogSink(str(log)), received.append, broken])
+    engine.evaluate({"cpu": 95.0}, 0.0)
+    engine.evaluate({"cpu": 50.0}, 1.0)
+    assert [event["state"] for event in received] == ["firing", "resolved"]
+    assert len(log.read_text().splitlines()) == 2
+    assert "unreachable" in engine.error
+
+
+def test_default_rules_match_a_collected_snapshot(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    collector = MetricsCollector(backend=backend)
+    engine = AlertEngine(DEFAULT_RULES)
+    for _ in range(3):
+        replayer.step()
+        snapshot = collector.collect()
+        engine.evaluate(metric_values(snapshot), snapshot["time"])
+    # Every default rule binds to a value the collector publishes
+    assert engine.error == ""
+    assert "swap_in" in {key for _, key in engine.instances}
@@ -0,0 +1,51 @@
+import numpy as np
+
+from anomaly import AnomalyDetector
+from history import HistoryStore
+
+
+def run(levels, seed=0):
+    """Feed one noisy series (unit noise around levels) a second at a time; anomalies per tick"""
+    history = HistoryStore()
+    events = []
+    detector = AnomalyDetector(history, on_anomaly=events.append)
+    rng = np.random.default_rng(seed)
+    found = []
+    for i, level in enumerate(levels):
+        history.append("load", 1.7e9 + i, level + rng.normal())
+        found.append(detector.detect())
+    return detector, found, events
+
+
+def test_noise_raises_nothing():
+    detector, found, events = run(np.full(400, 10.0))
+    assert not any(found) and events == [] and detector.regions == {}
+
+
+def test_cusum_step_is_raised_then_cleared():
+    # A shift of three deviations is too small to be a spike but persists
+    detector, found, events = run(np.where(np.arange(400) < 200, 10.0, 13.0))
+    ticks = [i for i, anomalies in enumerate(found) if anomalies]
+    assert len(ticks) == 1 and 200 < ticks[0] < 230
+    assert found[ticks[0]][0]["kind"] == "shift" and found[ticks[0]][0]["baseline"] < 11.0
+    assert [event["kind"] for event in events] == ["shift"]
+    # The region is closed and the new level has become normal
+    assert "load" not in detector.active
+    assert [list(region) for region in detector.regions["load"]] == [[1.7e9 + ticks[0]] * 2]
+
+
+def test_single_burst_is_a_spike_not_a_shift():
+    levels = np.full(300, 10.0)
+    levels[200] = 40.0
+    detector, found, events = run(levels)
+    assert [(i, anomalies[0]["kind"]) for i, anomalies in enumerate(found) if anomalies] == [(200, "spike")]
+    assert "load" not in detector.active
+
+
+def test_seasonal_baseline_round_trip(tmp_path):
+    detector, _, _ = run(np.full(100, 10.0))
+    path = detector.save(str(tmp_path / "state" / "baseline.npz"))
+    restored = AnomalyDetector(HistoryStore())
+    assert restored.load(path) and restored.names == ["load"]
+    assert np.array_equal(restored.seasonal_mean, detector.seasonal_mean)
+    assert not AnomalyDetector(HistoryStore()).load(str(tmp_path / "missing.npz"))
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from attribution import ContributorStore
+
+
+def record(store, t, amounts, pids=None):
+    amounts = np.asarray(amounts, dtype=np.float64)
+    pids = np.arange(1, len(amounts) + 1, dtype=np.int32) if pids is None else np.asarray(pids, dtype=np.int32)
+    store.record(t, pids, {"cpu": amounts, "rss": -amounts, "io": amounts * 10},
+                 {int(pid): f"proc-{pid}" for pid in pids})
+
+
+def test_only_the_top_k_are_kept_per_tick():
+    store = ContributorStore(capacity=10, k=2)
+    record(store, 0.0, [5.0, 1.0, 3.0, 2.0])
+    rows, total = store.aggregate("cpu", 0.0, 0.0)
+    # pids 2 and 4 are not among the two largest, but still count towards the total
+    assert [(pid, amount) for pid, _, amount, _, _ in rows] == [(1, 5.0), (3, 3.0)] and total == 11.0
+    assert rows[0][1] == "proc-1" and rows[0][3] == pytest.approx(100 * 5 / 11)
+    # Falling RSS is not growth
+    assert store.aggregate("rss", 0.0, 0.0) == ([], 0.0)
+
+
+def test_ranges_sum_over_ticks():
+    store = ContributorStore(capacity=10, k=2)
+    record(store, 0.0, [5.0, 1.0, 3.0])
+    record(store, 1.0, [0.0, 4.0, 3.0])
+    record(store, 2.0, [0.0, 9.0, 0.0])
+    rows, total = store.aggregate("io", 0.0, 1.0)
+    assert [(pid, amount, ticks) for pid, _, amount, _, ticks in rows] == [(3, 60.0, 2), (1, 50.0, 1), (2, 40.0, 1)]
+    assert total == 160.0
+    assert [row[0] for row in store.aggregate("cpu", 1.5, 5.0)[0]] == [2]
+    assert store.aggregate("cpu", 3.0, 4.0) == ([], 0.0)
+
+
+def test_oldest_rows_are_evicted_first():
+    store = ContributorStore(capacity=3, k=1)
+    for t in range(8):
+        # Each tick has a different single top contributor
+        record(store, float(t), [1.0, 2.0], pids=[100, 200 + t])
+    assert len(store) == 3
+    rows, _ = store.aggregate("cpu", 0.0, 10.0)
+    assert sorted(row[0] for row in rows) == [205, 206, 207]
+    # Names of pids that fell out with their rows are dropped when the buffer compacts
+    assert not {200, 201, 202} & set(store.comms) and {205, 206, 207} <= set(store.comms)
@@ -0,0 +1,85 @@
+import os
+
+import numpy as np
+import pytest
+
+from cgroups import MEMORY_CURRENT, USAGE_USEC, CgroupCollector, read_flat_keyed, read_int, read_io_stat
+from fakeproc import synthetic_backend
+
+
+def write(path, text):
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_readers(tmp_path):
+    write(tmp_path / "cpu.stat", "usage_usec 100\nuser_usec 70\nsystem_usec 30\n")
+    assert read_flat_keyed(str(tmp_path / "cpu.stat"), ("usage_usec", "nr_throttled")) == {
+        "usage_usec": 100, "nr_throttled": 0}
+    # io.stat has one line per device; bytes add up across them
+    write(tmp_path / "io.stat", "8:0 rbytes=10 wbytes=20 rios=1 wios=2\n259:0 rbytes=5 wbytes=0 rios=1 wios=0\n")
+    assert read_io_stat(str(tmp_path / "io.stat")) == (15, 20)
+    write(tmp_path / "memory.max", "max\n")
+    assert read_int(str(tmp_path / "memory.max")) == 0
+    # A cgroup removed between scan and read leaves zeros rather than an error
+    assert read_io_stat(str(tmp_path / "gone")) == (0, 0) and read_int(str(tmp_path / "gone")) == 0
+
+
+def test_collect_matches_the_fixture_tree(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    collector = CgroupCollector(backend)
+    first = collector.collect()
+    # The root, two slices and eight leaves
+    assert first["count"] == 11 and first["names"][0] == "/" and not first["cpu_percent"].any()
+    assert sorted(os.path.basename(path) for path in collector.top_level()) == ["machine.slice", "system.slice"]
+    leaf = first["names"].index("system.slice/unit-0.service")
+    assert first["memory"][leaf] == int(backend.read("sys/fs/cgroup/system.slice/unit-0.service/memory.current"))
+    before = collector.counters.copy()
+    replayer.step()
+    second = collector.collect()
+    used = collector.counters[leaf, USAGE_USEC] - before[leaf, USAGE_USEC]
+    assert second["cpu_percent"][leaf] == pytest.approx(used / 1e4)
+    assert "/" not in [second["names"][row] for row in second["top_rows"]]
+    assert np.all(np.diff(second["cpu_percent"][second["top_rows"]]) <= 0)
+    collector.close()
+
+
+def test_new_cgroups_are_found_and_aligned(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    collector = CgroupCollector(backend, rescan_interval=0.0)
+    collector.collect()
+    new = os.path.join(collector.root, "machine.slice", "container-99.scope")
+    os.mkdir(new)
+    write(os.path.join(new, "cpu.stat"), "usage_usec 5000000\n")
+    write(os.path.join(new, "memory.current"), "4096\n")
+    replayer.step()
+    cgroups = collector.collect()
+    row = cgroups["names"].index("machine.slice/container-99.scope")
+    # A cgroup seen for the first time has no earlier sample to take a rate from
+    assert cgroups["cpu_percent"][row] == 0.0 and collector.counters[row, MEMORY_CURRENT] == 4096
+    assert cgroups["rescans"] == 2
+    collector.close()
+
+
+def test_close_releases_inotify(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    collector = CgroupCollector(backend, rescan_interval=60.0)
+    if collector.inotify is None:
+        pytest.skip("inotify is not available")
+    fd = collector.inotify.fd
+    collector.close()
+    collector.close()
+    assert collector.inotify is None
+    with pytest.raises(OSError):
+        os.fstat(fd)
+    # Without inotify the tree is rescanned on the timer instead
+    replayer.step()
+    assert collector.collect()["rescans"] == 1
+
+
+def test_without_cgroup2(tmp_path):
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    os.remove(os.path.join(backend.sys_root, "fs", "cgroup", "cgroup.controllers"))
+    collector = CgroupCollector(backend)
+    assert not collector.available and collector.collect() is None
+    collector.close()
@@ -0,0 +1,18 @@
+import numpy as np
+
+from deadband import DeadbandFilter, hold
+
+
+def test_deadband_reconstruction_within_tolerance():
+    rng = np.random.default_rng(2)
+    times = np.arange(5000.0)
+    values = np.cumsum(rng.normal(0, 0.02, len(times)))
+    deadband = DeadbandFilter(tolerances={"memory": 0.05}, heartbeat=60.0)
+    keep = deadband.mask("memory", times, values)
+    assert keep.sum() < len(times) / 4 and deadband.ratio() == keep.sum() / len(times)
+    assert np.abs(hold(times[keep], values[keep], times) - values).max() <= 0.05
+    # The heartbeat keeps one point a minute however flat the series
+    flat = deadband.mask("other", times, np.zeros(len(times)))
+    assert np.diff(times[flat]).max() <= 60.0
+    deadband.forget("memory")
+    assert deadband.keep("memory", 1e9, values[-1])
@@ -0,0 +1,133 @@
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+from collector import MetricsCollector
+from deadband import DeadbandFilter, hold
+from export import export_history, import_history, read_chunks
+from fakeproc import synthetic_backend
+from history import HistoryStore
+
+FORMATS = ["csv", "ndjson", "binary"]
+
+
+def by_name(chunks):
+    series = {}
+    for name, times, values in chunks:
+        old = series.get(name, (np.zeros(0), np.zeros(0)))
+        series[name] = (np.concatenate([old[0], times]), np.concatenate([old[1], values]))
+    return series
+
+
+def assert_same(expected, actual):
+    assert sorted(expected) == sorted(actual)
+    for name, (times, values) in expected.items():
+        assert np.array_equal(actual[name][0], times), name
+        assert np.array_equal(actual[name][1], values, equal_nan=True), name
+
+
+@pytest.fixture(scope="module")
+def collected(tmp_path_factory):
+    """History of a minute of the small synthetic host, sealed into a few blocks"""
+    backend, replayer = synthetic_backend(str(tmp_path_factory.mktemp("fixture")), "small")
+    collector = MetricsCollector(history=HistoryStore(block_size=16), backend=backend)
+    for _ in range(60):
+        replayer.step()
+        collector.collect()
+    return collector.history
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_collected_history_roundtrip(collected, tmp_path, format):
+    path = str(tmp_path / f"history.{format}")
+    written = export_history(collected, path, format=format)
+    expected = by_name(collected.chunks())
+    assert written == sum(len(times) for times, _ in expected.values())
+    assert_same(expected, by_name(read_chunks(path, format)))
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_exact_floats_roundtrip(tmp_path, format):
+    history = HistoryStore(block_size=8)
+    values = [0.1, 1 / 3, -0.0, np.nan, 1e300, 5e-324, 123456789.123456789, np.nan, 2.0, 7.25]
+    for i, value in enumerate(values):
+        history.append("x", 1.7e9 + i + 0.125, value)
+        history.append("other:/mnt/a b", 1.7e9 + i, float(i))
+    path = str(tmp_path / f"history.{format}")
+    export_history(history, path, format=format)
+    assert_same(by_name(history.chunks()), by_name(read_chunks(path, format)))
+
+
+@pytest.mark.parametrize("format", FORMATS)
+def test_import_rebuilds_the_store(collected, tmp_path, format):
+    path = str(tmp_path / f"history.{format}")
+    export_history(collected, path, format=format)
+    imported = HistoryStore()
+    import_history(imported, path, format)
+    assert_same(by_name(collected.chunks()), by_name(imported.chunks()))
+
+
+def test_range_and_names(collected, tmp_path):
+    path = str(tmp_path / "cpu.smh")
+    times, values = collected.get("cpu")
+    start, end = times[10], times[-10]
+    export_history(collected, path, names=["cpu", "missing"], start=start, end=end)
+    inside = (times >= start) & (times <= end)
+    assert_same({"cpu": (times[inside], values[inside])}, by_name(read_chunks(path)))
+
+
+def test_deadband_export_holds_within_tolerance(tmp_path):
+    rng = np.random.default_rng(0)
+    history = HistoryStore(deadband=DeadbandFilter(default=0.0))
+    times = 1.7e9 + np.arange(2000.0)
+    values = np.round(np.cumsum(rng.normal(0, 0.05, len(times))), 3)
+    for t, v in zip(times.tolist(), values.tolist()):
+        history.append("x", t, v)
+    path = str(tmp_path / "history.csv")
+    written = export_history(history, path, deadband=DeadbandFilter(default=0.1, heartbeat=np.inf))
+    assert written < len(times) / 2
+    kept_times, kept_values = by_name(read_chunks(path))["x"]
+    assert np.abs(hold(kept_times, kept_values, times) - values).max() <= 0.1 + 1e-9
+
+
+def test_rejects_unknown_and_truncated_files(tmp_path):
+    with pytest.raises(ValueError):
+        list(read_chunks(str(tmp_path / "history.xyz")))
+    history = HistoryStore()
+    for i in range(10):
+        history.append("x", 1.7e9 + i, float(i))
+    path = str(tmp_path / "history.smh")
+    export_history(history, path)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-5])
+    with pytest.raises(ValueError, match="truncated"):
+        list(read_chunks(path))
+
+
+def test_chunks_taken_while_appending_have_every_point_once():
+    history = HistoryStore(block_size=4)
+    done = threading.Event()
+
+    def collect():
+        for i in range(20_000):
+            history.append("cpu", float(i), float(i))
+        done.set()
+
+    interval = sys.getswitchinterval()
+    # Switch threads often enough that a snapshot lands inside seal()
+    sys.setswitchinterval(1e-6)
+    thread = threading.Thread(target=collect)
+    try:
+        thread.start()
+        while not done.is_set():
+            # Each snapshot is a prefix of the series: no point twice from a block sealed mid-read, none missing
+            times, _ = by_name(history.chunks()).get("cpu", (np.zeros(0), None))
+            assert np.array_equal(times, np.arange(len(times), dtype=np.float64))
+    finally:
+        done.set()
+        thread.join()
+        sys.setswitchinterval(interval)
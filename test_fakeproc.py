@@ -0,0 +1,72 @@
+import os
+import shutil
+
+import pytest
+
+from fakeproc import SCENARIOS, FixtureBackend, LoadReplayer, RecordedScenario, synthetic_backend
+
+
+def read(root, relative):
+    with open(os.path.join(root, relative)) as f:
+        return f.read()
+
+
+def test_backend_parses_the_fixture_files(tmp_path):
+    root = str(tmp_path)
+    backend, replayer = synthetic_backend(root, "small")
+    meminfo = dict(line.split(":") for line in read(root, "proc/meminfo").splitlines())
+    assert backend.meminfo()["MemTotal"] == int(meminfo["MemTotal"].split()[0]) * 1024
+    assert backend.virtual_memory().total == SCENARIOS["small"].get("mem_total_gb", 64) * 1024**3
+    assert backend.swap_memory().total == int(meminfo["SwapTotal"].split()[0]) * 1024
+    assert backend.cpu_count(logical=True) == SCENARIOS["small"]["cores"]
+    assert backend.cpu_freq() == 2400.0
+    usage = backend.disk_usage("/data0")
+    assert usage.total == 2 * 1024**4 and usage.percent == pytest.approx(40.0, abs=0.1)
+
+
+def test_cpu_percent_follows_proc_stat(tmp_path):
+    root = str(tmp_path)
+    backend, replayer = synthetic_backend(root, "small")
+    assert backend.cpu_percent() == 0.0
+    before = [int(field) for field in read(root, "proc/stat").split("\n", 1)[0].split()[1:9]]
+    replayer.step()
+    after = [int(field) for field in read(root, "proc/stat").split("\n", 1)[0].split()[1:9]]
+    total = sum(after) - sum(before)
+    idle = after[3] + after[4] - before[3] - before[4]
+    assert backend.cpu_percent() == round(100.0 * (1 - idle / total), 1)
+
+
+def test_virtual_clock_moves_only_with_the_replayer(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small", interval=2.0)
+    start = backend.clock.time()
+    replayer.step()
+    replayer.step()
+    assert backend.clock.time() == start + 4.0 and backend.clock.monotonic() == 4.0
+
+
+def test_scenarios_are_deterministic(tmp_path):
+    roots = [str(tmp_path / "a"), str(tmp_path / "b")]
+    for root in roots:
+        _, replayer = synthetic_backend(root, "small")
+        for _ in range(5):
+            replayer.step()
+    for relative in ("proc/stat", "proc/meminfo", "proc/net/dev", "proc/1000/statm", "statvfs.json"):
+        assert read(roots[0], relative) == read(roots[1], relative)
+
+
+def test_recorded_frames_replay_in_order(tmp_path):
+    synthetic = str(tmp_path / "synthetic")
+    _, replayer = synthetic_backend(synthetic, "small")
+    for frame in range(2):
+        shutil.copytree(synthetic, str(tmp_path / "recording" / "frames" / f"{frame:06d}"))
+        replayer.step()
+    backend = FixtureBackend(str(tmp_path / "recording" / "frames" / "000000"))
+    recorded = LoadReplayer(backend, RecordedScenario(str(tmp_path / "recording")))
+    recorded.step()
+    first = backend.read("proc/stat")
+    recorded.step()
+    assert backend.read("proc/stat") != first and backend.root.endswith("000001")
+    with pytest.raises(IndexError):
+        recorded.step()
+    with pytest.raises(ValueError):
+        RecordedScenario(str(tmp_path / "missing"))
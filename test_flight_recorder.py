@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from fakeproc import synthetic_backend
+from flight_recorder import FlightRecorder, load_recording, main
+from history import HistoryStore
+
+
+def sample(recorder, replayer, ticks):
+    for _ in range(ticks):
+        replayer.step()
+        recorder.sample(recorder.backend.clock.monotonic())
+
+
+def test_ring_wraps_and_keeps_the_newest_rows(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path / "fixture"), "small")
+    recorder = FlightRecorder(backend, rate_hz=1.0, seconds_before=3.0, seconds_after=2.0)
+    assert recorder.capacity == 5
+    sample(recorder, replayer, 12)
+    times, values = recorder.window(0)
+    # Twelve samples into five slots: the last five, oldest first
+    assert recorder.count == 12 and len(times) == 5
+    assert np.array_equal(times, backend.clock.time() - np.arange(4.0, -1.0, -1.0))
+    cpu = recorder.metrics.index("cpu")
+    assert 0.0 < values[-1, cpu] <= 100.0 and np.isfinite(values[:, cpu]).all()
+
+
+def test_dump_holds_the_window_around_the_trigger(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path / "fixture"), "small")
+    history = HistoryStore()
+    recorder = FlightRecorder(backend, history, rate_hz=1.0, seconds_before=3.0, seconds_after=2.0,
+                              output_dir=str(tmp_path / "recordings"))
+    assert not recorder.trigger("off")
+    recorder.enabled.set()
+    sample(recorder, replayer, 6)
+    history.contributors.record(backend.clock.time(), np.array([42, 7], dtype=np.int32),
+                                {"cpu": np.array([3.0, 1.0]), "rss": np.zeros(2), "io": np.zeros(2)},
+                                {42: "postgres", 7: "cron"})
+    trigger_time = backend.clock.time()
+    assert recorder.trigger("cpu > 90%") and not recorder.trigger("again")
+    sample(recorder, replayer, 2)
+    path = recorder.dump()
+    assert recorder.dump() is None and recorder.last_dumps == [path]
+    recording = load_recording(path)
+    # Three seconds before the trigger and the two after it, although the ring held six earlier rows
+    assert recording["times"].tolist() == [trigger_time + offset for offset in (-2.0, -1.0, 0.0, 1.0, 2.0)]
+    assert recording["trigger_time"] == trigger_time and recording["reason"] == "cpu > 90%"
+    assert recording["metrics"] == list(recorder.metrics) and recording["values"].shape == (5, len(recorder.metrics))
+    assert recording["top"]["cpu"] == [(42, "postgres", 3.0), (7, "cron", 1.0)]
+    assert main([path]) == 0
+    recorder.set_enabled(False)
+    assert recorder.count == 0 and recorder.status() == "Off"
+
+
+def test_unknown_metrics_and_missing_psi(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    with pytest.raises(ValueError):
+        FlightRecorder(backend, metrics=("cpu", "gpu"))
+    for resource in ("cpu", "memory", "io"):
+        (tmp_path / "proc" / "pressure" / resource).unlink()
+    recorder = FlightRecorder(backend, metrics=("psi_cpu", "mem_available"), rate_hz=1.0, seconds_before=2.0,
+                              seconds_after=1.0)
+    sample(recorder, replayer, 2)
+    _, values = recorder.window(0)
+    assert np.isnan(values[:, 0]).all() and (values[:, 1] > 0).all()
@@ -0,0 +1,58 @@
+import pytest
+
+from forecast import DiskForecaster, IncrementalTrend, format_eta
+
+
+def test_linear_fill_is_fitted_exactly():
+    trend = IncrementalTrend(halflife=3600.0)
+    for t in range(0, 600, 10):
+        trend.update(1.7e9 + t, 40.0 + 0.01 * t)
+    assert trend.slope() == pytest.approx(0.01)
+    assert trend.fitted() == pytest.approx(45.9)
+    assert trend.seconds_until(100.0) == pytest.approx((100.0 - 45.9) / 0.01)
+
+
+def test_needs_samples_and_span():
+    trend = IncrementalTrend(min_samples=6, min_span=60.0)
+    for t in range(5):
+        trend.update(float(t), float(t))
+    assert trend.slope() is None and trend.seconds_until(100.0) is None
+    trend.update(10.0, 10.0)
+    # Six samples, but only ten seconds apart end to end
+    assert trend.slope() is None
+    trend.update(60.0, 60.0)
+    assert trend.slope() == pytest.approx(1.0)
+    # Samples that do not move time forward are ignored
+    trend.update(60.0, 61.0)
+    assert trend.last_value == 60.0 and trend.count == 7
+
+
+def test_cleanup_keeps_the_prior_slope_until_the_new_segment_fits():
+    trend = IncrementalTrend()
+    for t in range(0, 120, 10):
+        trend.update(float(t), 50.0 + 0.05 * t)
+    # Logs rotated: usage falls back to 30% and a new segment starts
+    trend.update(120.0, 30.0)
+    assert trend.count == 1 and trend.slope() is None
+    assert trend.current_slope() == pytest.approx(0.05)
+    assert trend.seconds_until(100.0) == pytest.approx(70.0 / 0.05)
+    for t in range(130, 250, 10):
+        trend.update(float(t), 30.0)
+    assert trend.current_slope() == pytest.approx(0.0) and trend.seconds_until(100.0) is None
+
+
+def test_forecaster_alerts_once_per_episode():
+    events = []
+    forecaster = DiskForecaster(alert_hours=24.0, on_alert=lambda mount, hours: events.append((mount, hours)))
+    for t in range(0, 3600, 60):
+        # /data fills 1 point an hour from 90%, / stays put
+        forecaster.update("/data", float(t), 90.0 + t / 3600)
+        forecaster.update("/", float(t), 50.0)
+    rows = forecaster.annotate([{"mount": "/"}, {"mount": "/data"}])
+    assert rows[0]["fill_rate_h"] == pytest.approx(0.0, abs=1e-9) and rows[0]["full_in_h"] is None
+    assert rows[1]["fill_rate_h"] == pytest.approx(1.0) and rows[1]["full_in_h"] == pytest.approx(9.0, abs=0.1)
+    forecaster.annotate([{"mount": "/data"}])
+    assert [mount for mount, _ in events] == ["/data"] and format_eta(events[0][1]).startswith("full in 9.")
+    # An unmounted volume is forgotten, and alerts again when it comes back filling
+    forecaster.annotate([{"mount": "/"}])
+    assert "/data" not in forecaster.trends and "/data" not in forecaster.alerting
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from gorilla import Block, decode, encode
+
+
+def roundtrip(times, values):
+    times, values = np.asarray(times, dtype=np.float64), np.asarray(values, dtype=np.float64)
+    decoded_times, decoded_values = decode(encode(times, values), len(times))
+    return times, values, decoded_times, decoded_values
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_points_roundtrip(seed):
+    rng = np.random.default_rng(seed)
+    n = 2000
+    # Millisecond timestamps with regular, jittered and very long gaps
+    gaps = rng.choice([1.0, 1.0, 0.25, 10.0, 3600.0, 86400.0 * 30], n) + rng.integers(-3, 4, n) / 1000
+    times = np.round(1.7e9 + np.cumsum(np.abs(gaps)), 3)
+    values = np.where(rng.random(n) < 0.5, np.round(rng.normal(50, 20, n), 1), rng.normal(0, 1e12, n))
+    times, values, decoded_times, decoded_values = roundtrip(times, values)
+    assert np.array_equal(decoded_times, times)
+    # Bit-exact, not just close
+    assert decoded_values.view(np.uint64).tolist() == values.view(np.uint64).tolist()
+
+
+def test_special_values_roundtrip():
+    values = [0.0, -0.0, np.nan, np.inf, -np.inf, 5e-324, 1.7976931348623157e308, 42.0, 42.0, 42.0, np.nan]
+    times = 1.7e9 + np.arange(len(values))
+    _, values, _, decoded_values = roundtrip(times, values)
+    assert decoded_values.view(np.uint64).tolist() == values.view(np.uint64).tolist()
+
+
+def test_single_and_constant_points():
+    _, _, decoded_times, decoded_values = roundtrip([1.7e9], [3.5])
+    assert decoded_times.tolist() == [1.7e9] and decoded_values.tolist() == [3.5]
+    times, values, decoded_times, decoded_values = roundtrip(1.7e9 + np.arange(1024), np.full(1024, 7.0))
+    assert np.array_equal(decoded_times, times) and np.array_equal(decoded_values, values)
+    # One bit per timestamp and per value once the spacing and value repeat
+    assert len(encode(times, values)) < 300
+
+
+def test_timestamps_kept_to_the_millisecond():
+    times = np.array([1.7e9, 1.7e9 + 1.0004, 1.7e9 + 2.0006])
+    _, _, decoded_times, _ = roundtrip(times, [1.0, 2.0, 3.0])
+    assert np.allclose(decoded_times, np.round(times, 3), rtol=0, atol=1e-6)
+
+
+def test_block_index():
+    times = 1.7e9 + np.arange(10.0)
+    values = np.array([3.0, np.nan, -1.0, 8.0, 2.0, 2.0, 2.0, 2.0, 2.0, 5.0])
+    block = Block(times, values)
+    assert (len(block), block.start, block.end, block.last) == (10, times[0], times[-1], 5.0)
+    # NaN is stored but left out of the extremes
+    assert (block.min, block.max) == (-1.0, 8.0)
+    decoded_times, decoded_values = block.points()
+    assert np.array_equal(decoded_times, times) and np.array_equal(decoded_values, values, equal_nan=True)
@@ -0,0 +1,166 @@
+import numpy as np
+import pytest
+
+from history import FAMILY_LIMIT, HistoryStore
+
+# Sample times are multiples of RESOLUTION, so a grid this fine sees every change exactly
+RESOLUTION = 0.25
+
+
+def random_samples(seed=0, n=20000):
+    rng = np.random.default_rng(seed)
+    times = 1.7e9 + np.cumsum(rng.choice([0.25, 1.0, 2.0, 5.0, 37.0], n, p=[0.3, 0.3, 0.2, 0.19, 0.01]))
+    values = np.round(np.cumsum(rng.normal(0, 1, n)))
+    values[rng.random(n) < 0.01] = np.nan
+    return times, values
+
+
+def fill(history, name, times, values):
+    for t, v in zip(times.tolist(), values.tolist()):
+        history.append(name, t, v)
+
+
+def brute_force(times, values, start, end, step, agg):
+    """select(name, start, end, step, agg) from the raw samples, on a grid fine enough to be exact"""
+    count = int(np.ceil((end - start) / step - 1e-9))
+    edges = start + step * np.arange(count + 1)
+    newest = times[-1]
+    result = np.full(count, np.nan)
+    for i in range(count):
+        if edges[i] > newest:
+            continue
+        if agg == "last":
+            index = np.searchsorted(times, edges[i + 1], side="right") - 1
+            result[i] = values[index] if index >= 0 else np.nan
+            continue
+        # Time after the newest sample is unknown to the mean; min and max take the newest value as held
+        stop = min(edges[i + 1], newest) if agg == "mean" else edges[i + 1]
+        grid = np.arange(edges[i], stop, RESOLUTION)
+        index = np.searchsorted(times, grid, side="right") - 1
+        held = np.where(index >= 0, values[np.maximum(index, 0)], np.nan)
+        held = held[~np.isnan(held)]
+        if len(held):
+            result[i] = {"mean": np.mean, "min": np.min, "max": np.max}[agg](held)
+    return result
+
+
+@pytest.fixture(scope="module")
+def store():
+    times, values = random_samples()
+    history = HistoryStore(block_size=256)
+    fill(history, "x", times, values)
+    return history, times, values
+
+
+@pytest.mark.parametrize("agg", ["last", "mean", "min", "max"])
+@pytest.mark.parametrize("step", [10.0, 60.0, 600.0])
+def test_aligned_select_matches_brute_force(store, step, agg):
+    # Aligned steps are answered from the rollup tiers, including the buckets still open at the end
+    history, times, values = store
+    start = (times[-1] // 600) * 600 - 600 * (8 if step < 600 else 30)
+    end = (times[-1] // step) * step + 2 * step
+    grid, selected = history.select("x", start, end, step, agg)
+    assert np.array_equal(grid, start + step * np.arange(len(grid)))
+    assert np.allclose(selected, brute_force(times, values, start, end, step, agg), equal_nan=True)
+
+
+@pytest.mark.parametrize("agg", ["last", "mean", "min", "max"])
+@pytest.mark.parametrize("step", [1.0, 7.0, 60.0])
+def test_unaligned_select_matches_brute_force(store, step, agg):
+    history, times, values = store
+    for start in (times[5000] + 0.25, times[-300] - 1.75):
+        end = start + step * 97
+        _, selected = history.select("x", start, end, step, agg)
+        assert np.allclose(selected, brute_force(times, values, start, end, step, agg), equal_nan=True)
+
+
+def test_tiers_agree_with_points(store):
+    history, times, _ = store
+    start = (times[-1] // 600) * 600 - 7200
+    end = start + 3600
+    tiers = {(step, agg): history.select("x", start, end, step, agg)[1]
+             for step in (10.0, 60.0, 600.0) for agg in ("mean", "min", "max")}
+    # As-of reads never use the tiers; one past the newest sample sees the same points
+    history.until = times[-1] + 86400
+    try:
+        for (step, agg), expected in tiers.items():
+            assert np.allclose(history.select("x", start, end, step, agg)[1], expected, equal_nan=True)
+    finally:
+        history.until = None
+
+
+def test_raw_select_carries_the_held_value_to_start(store):
+    history, times, values = store
+    start = times[4000] + 0.1
+    selected_times, selected_values = history.select("x", start, times[4100])
+    assert selected_times[0] == start
+    assert np.all(selected_times[1:] > start) and selected_times[-1] <= times[4100]
+    # Every stored point is a raw sample, and the first carries the sample in effect at start
+    index = np.searchsorted(times, selected_times, side="right") - 1
+    assert np.array_equal(selected_values, values[index], equal_nan=True)
+
+
+def test_list_of_names_stacks_rows(store):
+    history, times, _ = store
+    start = times[-1] - 120
+    grid, selected = history.select(["x", "missing"], start, times[-1], 10.0)
+    assert selected.shape == (2, len(grid))
+    assert np.isnan(selected[1]).all()
+    assert sorted(history.select(["x", "missing"], start, times[-1])) == ["missing", "x"]
+    with pytest.raises(ValueError):
+        history.select("x", start, times[-1], 10.0, "median")
+
+
+def test_until_reads_the_store_as_it_was(store):
+    history, times, values = store
+    cut = times[12000]
+    earlier = HistoryStore(block_size=256)
+    fill(earlier, "x", times[:12001], values[:12001])
+    history.until = cut
+    try:
+        for step, agg in ((10.0, "mean"), (60.0, "max"), (1.0, "last")):
+            start = (cut // 600) * 600 - 1800
+            expected = earlier.select("x", start, cut, step, agg)[1]
+            assert np.allclose(history.select("x", start, cut + 600, step, agg)[1], expected, equal_nan=True)
+        assert history.latest("x") == earlier.latest("x") or np.isnan(values[12000])
+    finally:
+        history.until = None
+
+
+def test_expired_series_are_dropped():
+    history = HistoryStore(retention=3600.0)
+    for t in range(0, 7200, 10):
+        history.append("steady", 1.7e9 + t, float(t % 7))
+        if t < 600:
+            history.append("gone", 1.7e9 + t, 1.0)
+    assert "gone" not in history.series and "steady" in history.series
+    assert "gone" not in history.stats.metrics and "gone" not in history.deadband.last
+
+
+def test_dynamic_families_are_capped():
+    history = HistoryStore()
+    for i in range(FAMILY_LIMIT + 50):
+        history.append(f"cgroup_cpu:/group{i}", 1.7e9 + i, 1.0)
+    family = [name for name in history.series if name.startswith("cgroup_cpu:")]
+    assert len(family) == FAMILY_LIMIT
+    # The stalest members make way for new ones
+    assert f"cgroup_cpu:/group{FAMILY_LIMIT + 49}" in history.series and "cgroup_cpu:/group0" not in history.series
+
+
+def test_select_before_a_series_starts():
+    # A replay position before the first point of one series (cpu starts 5 s after memory)
+    history = HistoryStore()
+    for t in range(100):
+        history.append("memory", 1.7e9 + t, 50.0)
+        if t >= 5:
+            history.append("cpu", 1.7e9 + t, 10.0)
+    history.until = 1.7e9 + 2
+    end = history.until
+    times, values = history.select("cpu", end - 3600, end)
+    assert len(times) == len(values) == 0
+    for agg in ("last", "mean", "max"):
+        grid, selected = history.select("cpu", end - 3600, end, 10.0, agg)
+        assert len(grid) == 360 and np.isnan(selected).all()
+    assert history.select("memory", end - 3600, end)[1].tolist() == [50.0]
+    assert np.isnan(history.select(["cpu", "memory"], end - 60, end, 10.0, "mean")[1][0]).all()
+    assert history.latest("cpu") is None and len(history.window("cpu", 60)[0]) == 0
@@ -0,0 +1,63 @@
+import json
+import time
+
+import pytest
+
+from instrumentation import NullTimer, StageTimer
+
+
+def test_stages_are_recorded_per_tick():
+    timer = StageTimer()
+    assert timer.status_text() == "Monitor: --"
+    for _ in range(3):
+        timer.begin_tick()
+        with timer.stage("collect.cpu"):
+            pass
+        with timer.stage("collect.disk"):
+            time.sleep(0.005)
+        timer.end_tick()
+    summary = timer.summary()
+    assert {name: stats["count"] for name, stats in summary.items()} == {"collect.cpu": 3, "collect.disk": 3, "tick": 3}
+    assert summary["collect.disk"]["p50"] >= 5.0 and summary["tick"]["max"] >= summary["collect.disk"]["max"]
+    assert [name for name, _ in timer.trace[-1]["stages"]] == ["collect.cpu", "collect.disk"]
+    assert timer.status_text().endswith(f"slowest collect.disk p95 {summary['collect.disk']['p95']:.1f} ms")
+
+
+def test_stage_is_timed_when_it_raises():
+    timer = StageTimer()
+    with pytest.raises(ValueError):
+        with timer.stage("parse"):
+            raise ValueError("bad line")
+    # Outside a tick the stage still counts towards the percentiles
+    assert timer.summary()["parse"]["count"] == 1 and len(timer.trace) == 0
+    timer.end_tick()
+    assert timer.tick_count == 0
+
+
+def test_windows_are_bounded():
+    timer = StageTimer(window=5, trace_ticks=2)
+    for _ in range(10):
+        timer.begin_tick()
+        timer.end_tick()
+    assert timer.summary()["tick"]["count"] == 5 and [tick["tick"] for tick in timer.trace] == [8, 9]
+
+
+def test_dump_trace(tmp_path):
+    timer = StageTimer()
+    timer.begin_tick()
+    with timer.stage("draw"):
+        pass
+    timer.end_tick()
+    path = timer.dump_trace(str(tmp_path / "trace.jsonl"))
+    with open(path) as f:
+        lines = [json.loads(line) for line in f]
+    assert lines[0]["tick"] == 0 and lines[0]["stages"][0][0] == "draw"
+    assert set(lines[-1]["summary"]) == {"draw", "tick"}
+
+
+def test_null_timer_does_nothing():
+    timer = NullTimer()
+    timer.begin_tick()
+    with timer.stage("anything"):
+        pass
+    timer.end_tick()
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from leaks import LeakDetector
+
+MB = 1024**2
+
+
+def ramp(detector, seconds, pids, start, rate, step=10.0):
+    for t in np.arange(0.0, seconds, step):
+        detector.update(1.7e9 + t, np.asarray(pids), start + rate * t)
+
+
+def test_linear_ramp_is_flagged():
+    detector = LeakDetector()
+    # pid 1 leaks 10 MB a minute, pid 2 sits still and pid 3 grows too slowly to matter
+    ramp(detector, 900, [1, 2, 3], np.array([100 * MB, 500 * MB, 50 * MB]),
+         np.array([10 * MB / 60, 0.0, 1024 / 60]))
+    rows = detector.growing(available=2048 * MB)
+    assert [row[0] for row in rows] == [1]
+    pid, rss, pss, per_hour, hours = rows[0]
+    assert per_hour == pytest.approx(600 * MB, rel=1e-3) and pss is None
+    assert rss == pytest.approx(100 * MB + 10 * MB / 60 * 890)
+    assert hours == pytest.approx(2048 / 600, rel=1e-3)
+
+
+def test_short_history_is_not_flagged():
+    detector = LeakDetector(min_span=300.0)
+    ramp(detector, 200, [1], np.array([100 * MB]), np.array([MB]))
+    assert detector.growing(available=MB) == []
+
+
+def test_restart_keeps_the_previous_slope_until_the_new_fit():
+    detector = LeakDetector()
+    ramp(detector, 600, [1], np.array([100 * MB]), np.array([MB / 60]))
+    # A cache flush drops RSS by half; the leak is still reported from the earlier fit
+    detector.update(1.7e9 + 600, np.array([1]), np.array([50 * MB]))
+    assert detector.samples[detector.slots[1]] == 1
+    assert detector.growing(available=MB)[0][3] == pytest.approx(60 * MB, rel=1e-3)
+
+
+def test_series_is_bounded_and_keeps_recent_points():
+    detector = LeakDetector(points=16)
+    ramp(detector, 1000, [1], np.array([100 * MB]), np.array([MB]))
+    times, rss = detector.series(1)
+    assert len(times) <= 16 and times[-1] == 1.7e9 + 990.0
+    assert np.all(np.diff(times) > 0) and np.all(np.diff(rss) > 0)
+    # Recent points are at full resolution, older ones averaged pairwise
+    assert times[-1] - times[-2] == 10.0 and times[1] - times[0] > 10.0
+
+
+def test_slots_are_reused_and_the_smallest_give_way():
+    detector = LeakDetector(budget_bytes=1, points=8)
+    assert detector.capacity == 1
+    detector.update(1.7e9, np.array([1]), np.array([100 * MB]))
+    # A bigger newcomer takes the only slot; a smaller one does not
+    detector.update(1.7e9 + 1, np.array([2]), np.array([200 * MB]))
+    detector.update(1.7e9 + 2, np.array([3]), np.array([10 * MB]))
+    assert list(detector.slots) == [2] and len(detector.series(1)[0]) == 0
+    detector.forget([2])
+    detector.update(1.7e9 + 3, np.array([3]), np.array([10 * MB]))
+    assert list(detector.slots) == [3] and len(detector.series(3)[0]) == 1
+
+
+def test_arrays_grow_with_the_process_count():
+    detector = LeakDetector(budget_bytes=MB, points=64)
+    detector.update(1.7e9, np.arange(10), np.full(10, float(MB)))
+    small = detector.nbytes()
+    detector.update(1.7e9 + 1, np.arange(500), np.full(500, float(MB)))
+    assert len(detector.slots) == 500 and detector.nbytes() > small
+    # More processes than the budget holds: the arrays stop at capacity
+    detector.update(1.7e9 + 2, np.arange(5000), np.full(5000, float(MB)))
+    assert len(detector.slots) == detector.capacity and detector.nbytes() <= MB
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from fakeproc import synthetic_backend
+from meminfo import MemoryCollector, parse_meminfo, parse_vmstat
+
+
+def test_parse_meminfo_units():
+    values = parse_meminfo("MemTotal:       16384 kB\nHugePages_Total:       4\nHugepagesize:       2048 kB\n"
+                           "DirectMap4k:\n")
+    assert values == {"MemTotal": 16384 * 1024, "HugePages_Total": 4, "Hugepagesize": 2048 * 1024}
+
+
+def test_parse_vmstat_sums_reclaimers():
+    counters = parse_vmstat("pgfault 100\npgmajfault 7\npswpin 1\npswpout 2\n"
+                            "pgscan_kswapd 30\npgscan_direct 10\npgscan_khugepaged 1\n"
+                            "pgscan_anon 35\npgscan_file 6\npgscan_direct_throttle 9\n"
+                            "pgsteal_kswapd 20\npgsteal_direct 5\npgsteal_file 25\nnr_free_pages 12\n")
+    # The anon/file split and the throttle count would count the same pages twice
+    assert counters == {"pgfault": 100, "pgmajfault": 7, "pswpin": 1, "pswpout": 2, "pgscan": 41, "pgsteal": 25}
+
+
+def test_collect_matches_the_fixture(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    collector = MemoryCollector(backend)
+    first = collector.collect()
+    info = parse_meminfo(backend.read("proc/meminfo"))
+    assert first["total"] == info["MemTotal"] and first["available"] == info["MemAvailable"]
+    assert first["percent"] == round(first["used"] / first["total"] * 100, 1)
+    assert first["major_faults_s"] == 0.0 and first["reclaim_efficiency"] is None
+    before = parse_vmstat(backend.read("proc/vmstat"))
+    replayer.step()
+    memory = collector.collect()
+    after = parse_vmstat(backend.read("proc/vmstat"))
+    assert memory["major_faults_s"] == after["pgmajfault"] - before["pgmajfault"]
+    assert memory["minor_faults_s"] == pytest.approx(
+        after["pgfault"] - before["pgfault"] - memory["major_faults_s"])
+    assert memory["swap_in_s"] == after["pswpin"] - before["pswpin"]
+
+
+def test_missing_vmstat_and_meminfo_fields(tmp_path):
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    with open(os.path.join(backend.proc_root, "meminfo"), "w") as f:
+        # Kernels before 3.14 have no MemAvailable
+        f.write("MemTotal: 1000 kB\nMemFree: 100 kB\nBuffers: 50 kB\nCached: 200 kB\nSReclaimable: 50 kB\n")
+    os.remove(os.path.join(backend.proc_root, "vmstat"))
+    memory = MemoryCollector(backend).collect()
+    assert memory["available"] == 400 * 1024 and memory["percent"] == 60.0
+    assert memory["swap_percent"] == 0.0 and memory["pgscan_s"] == 0.0
+
+
+def test_unavailable_without_proc(tmp_path):
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    os.remove(os.path.join(backend.proc_root, "meminfo"))
+    assert MemoryCollector(backend).collect() is None
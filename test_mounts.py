@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from fakeproc import synthetic_backend
+from mounts import SKIPPED_FILESYSTEMS, MountCollector, parse_mountinfo, real_mounts, unescape, usage_row
+
+
+def test_parse_mountinfo_unescapes_octal():
+    text = ("36 25 8:1 / /mnt/My\\040Drive rw - ext4 /dev/sd\\134a rw\n"
+            "37 25 8:2 / /mnt/tab\\011and\\012newline rw,relatime shared:5 - xfs /dev/sdb rw\n"
+            "malformed line without a separator\n")
+    assert parse_mountinfo(text) == [("/mnt/My Drive", "ext4", "/dev/sd\\a", "8:1"),
+                                     ("/mnt/tab\tand\nnewline", "xfs", "/dev/sdb", "8:2")]
+    # An escaped backslash followed by digits is not read as a second escape
+    assert unescape("/a\\134040") == "/a\\040"
+
+
+def test_real_mounts_keeps_tmpfs_and_overlay():
+    mounts = [("/", "ext4", "/dev/root", "8:1"), ("/proc", "proc", "proc", "0:5"),
+              ("/dev/shm", "tmpfs", "tmpfs", "0:24"), ("/var/lib/docker/overlay2/x/merged", "overlay", "overlay", "0:50"),
+              ("/snap/core/1", "squashfs", "/dev/loop0", "7:0"), ("/sys/fs/cgroup", "cgroup2", "cgroup2", "0:27"),
+              ("/srv/bind", "ext4", "/dev/root", "8:1")]
+    # The bind mount of /dev/root keeps the shortest mount point
+    assert [mount[0] for mount in real_mounts(mounts)] == ["/", "/dev/shm", "/var/lib/docker/overlay2/x/merged"]
+    skip = SKIPPED_FILESYSTEMS | {"tmpfs", "overlay"}
+    assert [mount[0] for mount in real_mounts(mounts, skip)] == ["/"]
+
+
+def test_remote_mounts_are_keyed_by_source():
+    mounts = [("/mnt/a", "nfs4", "server:/export", "0:60"), ("/mnt/b", "nfs4", "server:/export", "0:61"),
+              ("/mnt/c", "nfs4", "server:/other", "0:60")]
+    assert [mount[0] for mount in real_mounts(mounts)] == ["/mnt/a", "/mnt/c"]
+
+
+def test_usage_row_matches_df():
+    row = usage_row("/", "ext4", "/dev/root", {"total": 100, "free": 20, "avail": 15, "files": 10, "files_free": 4})
+    # df leaves the reserved blocks out of the percentage
+    assert row["used"] == 80 and row["percent"] == pytest.approx(80 / 95 * 100)
+    assert row["inode_percent"] == pytest.approx(60.0)
+
+
+def test_collector_reads_the_fixture(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    rows = MountCollector(backend).collect()
+    assert [(row["mount"], row["fstype"]) for row in rows] == [("/", "ext4"), ("/data0", "xfs"), ("/run", "tmpfs")]
+    assert all(row["state"] == "ok" for row in rows)
+    assert [row["mount"] for row in MountCollector(backend, skip=SKIPPED_FILESYSTEMS | {"tmpfs"}).collect()] == [
+        "/", "/data0"]
+
+
+def test_collector_refreshes_on_its_interval(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    collector = MountCollector(backend, interval=10.0)
+    used = collector.collect()[1]["used"]
+    for _ in range(5):
+        replayer.step()
+    assert collector.collect()[1]["used"] == used
+    for _ in range(5):
+        replayer.step()
+    assert collector.collect()[1]["used"] > used
+
+
+def test_mounts_without_statvfs_are_left_out(tmp_path):
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    with open(os.path.join(backend.proc_root, "self", "mountinfo"), "a") as f:
+        f.write("40 25 8:64 / /mnt/gone rw - ext4 /dev/sde rw\n")
+    assert "/mnt/gone" not in [row["mount"] for row in MountCollector(backend).collect()]
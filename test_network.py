@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+from fakeproc import synthetic_backend
+from network import RX_BYTES, TX_BYTES, NetworkCollector, parse_net_dev, parse_snmp
+
+
+def read(backend, relative):
+    with open(os.path.join(backend.root, relative)) as f:
+        return f.read()
+
+
+def test_parse_net_dev_matches_the_fixture(tmp_path):
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    text = read(backend, "proc/net/dev")
+    names, counters = parse_net_dev(text)
+    assert names == ["lo", "eth0", "veth00000", "veth00001"] and counters.shape == (4, 16)
+    eth0 = text.splitlines()[3].split(":")[1].split()
+    assert counters[1, RX_BYTES] == int(eth0[0]) and counters[1, TX_BYTES] == int(eth0[8])
+
+
+def test_parse_net_dev_edge_cases():
+    header = "Inter-|   Receive\n face |bytes\n"
+    # Long names run into the counters without a space after the colon
+    names, counters = parse_net_dev(header + "enp0s31f6:123 4" + " 0" * 14 + "\n")
+    assert names == ["enp0s31f6"] and counters[0, :2].tolist() == [123, 4]
+    names, counters = parse_net_dev(header)
+    assert names == [] and counters.shape == (0, 16)
+
+
+def test_parse_snmp(tmp_path):
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    tcp = parse_snmp(read(backend, "proc/net/snmp"))
+    assert tcp["RtoMax"] == 120000 and tcp["MaxConn"] == -1 and "RetransSegs" in tcp
+    assert parse_snmp("Udp: InDatagrams\nUdp: 5\n") == {}
+    assert parse_snmp("Udp: InDatagrams\nUdp: 5\n", "Udp") == {"InDatagrams": 5}
+
+
+def test_rates_skip_virtual_interfaces(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    collector = NetworkCollector(backend)
+    first = collector.collect()
+    assert first["rx_bytes_s"] == 0.0
+    _, before = parse_net_dev(read(backend, "proc/net/dev"))
+    replayer.step()
+    network = collector.collect()
+    _, after = parse_net_dev(read(backend, "proc/net/dev"))
+    # Only eth0 is physical; loopback and veth ends would double count
+    assert network["rx_bytes_s"] == after[1, RX_BYTES] - before[1, RX_BYTES]
+    assert network["rates"][0, 0] == after[0, RX_BYTES] - before[0, RX_BYTES]
+    assert network["tracked_rows"] == [1]
+    assert list(NetworkCollector.top_interfaces(network, 2)) == list(np.argsort(-network["rates"][:, :2].sum(axis=1))[:2])
+
+
+def test_counter_resets_and_new_interfaces(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    collector = NetworkCollector(backend)
+    collector.collect()
+    replayer.step()
+    path = os.path.join(backend.root, "proc/net/dev")
+    lines = read(backend, "proc/net/dev").splitlines()
+    # eth0 wraps to zero and a new NIC appears between ticks
+    lines[3] = "  eth0: " + " ".join(["0"] * 16)
+    lines.append("  eth1: " + " ".join(["1000"] * 16))
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    network = collector.collect()
+    assert network["names"][-1] == "eth1"
+    assert network["rates"][1].tolist() == [0.0] * 8 and network["rates"][-1].tolist() == [0.0] * 8
+    assert network["rx_bytes_s"] == pytest.approx(0.0)
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pytest
+
+from fakeproc import synthetic_backend
+from numa import NumaCollector, format_cpulist, parse_cpulist, parse_node_meminfo, parse_per_cpu_stat
+
+
+@pytest.mark.parametrize("text, cpus", [("0-3,8-11\n", [0, 1, 2, 3, 8, 9, 10, 11]), ("5\n", [5]),
+                                        ("0,2-3", [0, 2, 3]), ("\n", []), ("", [])])
+def test_parse_cpulist(text, cpus):
+    assert parse_cpulist(text) == cpus
+    assert format_cpulist(cpus) == (text.strip() if cpus else "-")
+
+
+def test_parse_node_meminfo():
+    values = parse_node_meminfo("Node 1 MemTotal:       1024 kB\nNode 1 HugePages_Total:     2\n")
+    assert values == {"MemTotal": 1024 * 1024, "HugePages_Total": 2}
+
+
+def test_parse_per_cpu_stat():
+    text = ("cpu  10 0 10 80 0 0 0 0 0 0\ncpu0 5 0 5 40 0 0 0 0 0 0\n"
+            "cpu2 5 0 5 40 1 0 0 0 0 0\nintr 123\n")
+    ids, counters = parse_per_cpu_stat(text)
+    # Offline CPUs leave gaps in the ids
+    assert ids.tolist() == [0, 2] and counters.shape == (2, 8) and counters[1, 4] == 1
+    ids, counters = parse_per_cpu_stat("cpu  1 2 3 4 5 6 7 8\n")
+    assert len(ids) == 0 and counters.shape == (0, 8)
+
+
+def test_collect_folds_cpus_to_nodes(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small", numa_nodes=2)
+    collector = NumaCollector(backend)
+    assert collector.nodes == [0, 1] and collector.node_cpus == {0: [0, 1], 1: [2, 3]}
+    first = collector.collect()
+    assert not first["cpu_percent"].any() and np.isnan(first["local_percent"]).all()
+    _, before = parse_per_cpu_stat(backend.read("proc/stat"))
+    replayer.step()
+    numa = collector.collect()
+    _, after = parse_per_cpu_stat(backend.read("proc/stat"))
+    delta = after - before
+    busy = delta.sum(axis=1) - delta[:, 3] - delta[:, 4]
+    assert numa["cpu_percent"][1] == pytest.approx(100.0 * busy[2:].sum() / delta[2:].sum())
+    # The fixture's node 0 is fuller and allocates remotely more often
+    assert numa["free_percent"][0] < numa["free_percent"][1] and numa["imbalance"] > 0
+    assert numa["local_percent"][0] < numa["local_percent"][1] < 100.0
+
+
+def test_memory_only_node(tmp_path):
+    # CXL and HBM expanders show up as nodes with memory but an empty cpulist
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    node = os.path.join(backend.sys_root, "devices", "system", "node", "node2")
+    os.makedirs(node)
+    with open(os.path.join(node, "cpulist"), "w") as f:
+        f.write("\n")
+    with open(os.path.join(node, "meminfo"), "w") as f:
+        f.write("Node 2 MemTotal: 1048576 kB\nNode 2 MemFree: 1048576 kB\n")
+    collector = NumaCollector(backend)
+    collector.collect()
+    replayer.step()
+    numa = collector.collect()
+    assert numa["nodes"] == [0, 2] and numa["cpus"][1] == []
+    assert numa["cpu_percent"][1] == 0.0 and numa["cpu_percent"][0] > 0.0
+    assert numa["free_percent"][1] == 100.0 and numa["hit_s"][1] == 0.0
+
+
+def test_unavailable_without_nodes(tmp_path):
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    os.rename(os.path.join(backend.sys_root, "devices", "system", "node"), str(tmp_path / "moved"))
+    assert NumaCollector(backend).collect() is None
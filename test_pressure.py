@@ -0,0 +1,58 @@
+import os
+
+import pytest
+
+from fakeproc import synthetic_backend
+from pressure import PressureCollector, format_pressure, parse_pressure
+
+
+def test_parse_pressure():
+    parsed = parse_pressure("some avg10=1.50 avg60=0.75 avg300=0.10 total=123456\n"
+                            "full avg10=0.25 avg60=0.00 avg300=0.00 total=789\n")
+    assert parsed["some"] == {"avg10": 1.5, "avg60": 0.75, "avg300": 0.1, "total": 123456}
+    assert parsed["full"]["total"] == 789 and isinstance(parsed["full"]["total"], int)
+
+
+def test_missing_full_line_reads_as_zero(tmp_path):
+    # System-wide cpu PSI has no 'full' line before Linux 5.13
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    with open(os.path.join(backend.proc_root, "pressure", "cpu"), "w") as f:
+        f.write("some avg10=2.00 avg60=1.00 avg300=0.50 total=1000\n")
+    assert "full" not in parse_pressure(backend.read("proc/pressure/cpu"))
+    cpu = PressureCollector(backend).collect()["cpu"]
+    assert cpu["some_avg10"] == 2.0 and cpu["some_total"] == 1000
+    assert cpu["full_avg10"] == cpu["full_total"] == cpu["full_rate"] == 0.0
+    assert format_pressure(cpu) == "2.0% / 0.0%"
+
+
+def test_stall_rate_follows_the_totals(tmp_path):
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    collector = PressureCollector(backend)
+    first = collector.collect()
+    assert set(first) == {"cpu", "memory", "io", "cgroups"} and first["cpu"]["some_rate"] == 0.0
+    replayer.step()
+    second = collector.collect()
+    for resource in ("cpu", "memory", "io"):
+        stalled = second[resource]["some_total"] - first[resource]["some_total"]
+        assert second[resource]["some_rate"] == pytest.approx(min(100.0, stalled / 1e6 * 100))
+
+
+def test_cgroup_pressure_files(tmp_path):
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    group = os.path.join(backend.sys_root, "fs", "cgroup", "system.slice")
+    with open(os.path.join(group, "memory.pressure"), "w") as f:
+        f.write("some avg10=4.00 avg60=0.00 avg300=0.00 total=5\nfull avg10=1.00 avg60=0.00 avg300=0.00 total=2\n")
+    missing = os.path.join(backend.sys_root, "fs", "cgroup", "gone.slice")
+    cgroups = PressureCollector(backend).collect([group, missing])["cgroups"]
+    # Only the files that exist are reported, and a vanished cgroup drops out
+    assert list(cgroups) == [group] and list(cgroups[group]) == ["memory"]
+    assert cgroups[group]["memory"]["full_avg10"] == 1.0
+
+
+def test_unavailable_without_psi(tmp_path):
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    for resource in ("cpu", "memory", "io"):
+        os.remove(os.path.join(backend.proc_root, "pressure", resource))
+    os.rmdir(os.path.join(backend.proc_root, "pressure"))
+    assert PressureCollector(backend).collect() is None
+    assert format_pressure(None) == "--"
@@ -0,0 +1,60 @@
+import os
+import shutil
+
+from fakeproc import synthetic_backend
+import procmem
+from procmem import DeepMemoryScanner, parse_smaps_rollup
+
+
+def test_parse_smaps_rollup():
+    data = (b"00400000-7fff00000000 ---p 00000000 00:00 0                          [rollup]\n"
+            b"Rss:                1000 kB\nPss:                 800 kB\nShared_Clean:        200 kB\n"
+            b"Private_Clean:       100 kB\nPrivate_Dirty:       700 kB\nSwap:                 50 kB\n"
+            b"SwapPss:              50 kB\n")
+    assert parse_smaps_rollup(data) == [1000 * 1024, 800 * 1024, 100 * 1024, 700 * 1024, 50 * 1024]
+    # Kernel threads have an empty rollup
+    assert parse_smaps_rollup(b"") == [0, 0, 0, 0, 0]
+
+
+def full_pass(scanner):
+    scanner.collect()
+    for future in scanner.futures:
+        future.result()
+    return scanner.collect()
+
+
+def test_pass_covers_every_process(tmp_path):
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    scanner = DeepMemoryScanner(backend, top=5)
+    assert scanner.collect() is None
+    scanner.set_enabled(True)
+    summary = full_pass(scanner)
+    assert summary["scanned"] == summary["tracked"] == 200 and summary["denied"] == 0
+    pid, comm, rss, pss, uss, swap = summary["processes"][0]
+    expected = parse_smaps_rollup(backend.read(f"proc/{pid}/smaps_rollup").encode())
+    assert (rss, pss, uss, swap) == (expected[0], expected[1], expected[2] + expected[3], expected[4])
+    assert comm == backend.read(f"proc/{pid}/comm").strip()
+    assert [row[3] for row in summary["processes"]] == sorted((row[3] for row in summary["processes"]), reverse=True)
+    assert sum(row[1] for row in summary["commands"]) <= 200
+    # Nothing is due again until its interval has passed
+    assert scanner.collect() is summary and scanner.futures == []
+    scanner.set_enabled(False)
+    assert scanner.collect() is None
+
+
+def test_process_that_exits_mid_scan(tmp_path, monkeypatch):
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    scanner = DeepMemoryScanner(backend)
+    scanner.set_enabled(True)
+    full_pass(scanner)
+    gone = sorted(scanner.samples)[0]
+    # Listed when the pass starts, then exits before its chunk reads it
+    listed = procmem.list_pids(backend.proc_root)
+    monkeypatch.setattr(procmem, "list_pids", lambda proc_root: listed)
+    shutil.rmtree(os.path.join(backend.proc_root, str(gone)))
+    assert scanner.scan_chunk([gone])[1] == [(gone, None)]
+    scanner.due.clear()
+    summary = full_pass(scanner)
+    assert summary["scanned"] == 200 and summary["tracked"] == 199
+    assert gone not in scanner.samples and gone not in scanner.comms
+    scanner.set_enabled(False)
@@ -0,0 +1,62 @@
+import os
+import signal
+import tracemalloc
+
+import pytest
+
+from profiling import ProfileSession, install_signal_handler
+
+
+def busy_work():
+    return sum(i * i for i in range(20_000))
+
+
+def test_session_writes_cpu_and_memory_reports(tmp_path):
+    session = ProfileSession(output_dir=str(tmp_path))
+    assert session.stop() == [] and session.remaining() == 0.0
+    assert session.start(duration=60) and not session.start()
+    assert 0 < session.remaining() <= 60
+    with session.tick():
+        busy_work()
+    reports = session.stop()
+    assert not session.active and [os.path.basename(path).split("_", 2)[-1] for path in reports] == [
+        "cpu.txt", "cpu.prof", "memory.txt", "memory.snapshot"]
+    with open(reports[0]) as f:
+        text = f.read()
+    # Only the tick was profiled, not the test around it
+    assert "busy_work" in text and "test_session_writes" not in text
+    assert not tracemalloc.is_tracing()
+
+
+def test_stop_during_a_tick_waits_for_its_end(tmp_path):
+    session = ProfileSession(output_dir=str(tmp_path))
+    session.start()
+    with session.tick():
+        assert session.stop() == [] and session.active
+    assert not session.active and len(session.last_reports) == 4
+
+
+def test_duration_is_capped_and_ends_the_session(tmp_path):
+    session = ProfileSession(output_dir=str(tmp_path), max_duration=0)
+    session.start(duration=60)
+    with session.tick():
+        busy_work()
+    assert not session.active and os.path.exists(session.last_reports[1])
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR1"), reason="POSIX only")
+def test_signal_toggles_on_the_next_tick(tmp_path):
+    session = ProfileSession(output_dir=str(tmp_path))
+    previous = signal.getsignal(signal.SIGUSR1)
+    try:
+        assert install_signal_handler(session, duration=30)
+        os.kill(os.getpid(), signal.SIGUSR1)
+        assert not session.active and session.pending_toggle == 30
+        with session.tick():
+            assert session.active
+        os.kill(os.getpid(), signal.SIGUSR1)
+        with session.tick():
+            pass
+        assert not session.active and len(session.last_reports) == 4
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
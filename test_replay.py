@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from collector import MetricsCollector
+from export import export_history, write_chunks
+from fakeproc import synthetic_backend
+from replay import SPEEDS, ReplayCollector, ReplaySession
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def recording(tmp_path_factory):
+    """Two minutes of the small synthetic host, exported as binary"""
+    root = tmp_path_factory.mktemp("replay")
+    backend, replayer = synthetic_backend(str(root / "fixture"), "small")
+    collector = MetricsCollector(backend=backend)
+    for _ in range(120):
+        replayer.step()
+        collector.collect()
+    path = str(root / "history.smh")
+    export_history(collector.history, path)
+    return collector.history, path
+
+
+def test_session_plays_pauses_and_clamps():
+    clock = FakeClock()
+    session = ReplaySession(100.0, 200.0, speed=2.0, clock=clock)
+    clock.now = 10.0
+    assert session.advance() == 120.0
+    session.pause()
+    clock.now = 50.0
+    assert session.advance() == 120.0
+    assert session.toggle() is True
+    clock.now = 100.0
+    # Playback stops at the end and starts over on the next play
+    assert session.advance() == 200.0 and not session.playing
+    session.play()
+    assert session.position == 100.0 and session.playing
+    session.set_speed(1000)
+    assert session.speed == SPEEDS[-1]
+    session.faster(-1)
+    assert session.speed == SPEEDS[-2]
+    session.seek(-5.0)
+    assert session.position == 100.0 and session.seeked
+
+
+def held(history, name, position):
+    times, values = history.get(name)
+    return values[np.searchsorted(times, position, side="right") - 1]
+
+
+def test_snapshot_follows_the_recording(recording):
+    history, path = recording
+    collector = ReplayCollector(path)
+    times, _ = history.get("cpu")
+    for position in (times[1] + 0.5, times[len(times) // 2], times[-1]):
+        collector.session.pause()
+        collector.session.seek(position)
+        snapshot = collector.collect()
+        assert snapshot["replay"]["position"] == position and snapshot["replay"]["seeked"]
+        assert snapshot["cpu_percent"] == held(history, "cpu", position)
+        assert snapshot["mem_percent"] == held(history, "memory", position)
+        assert [mount["mount"] for mount in snapshot["mounts"]]
+
+
+def test_reads_end_at_the_position(recording):
+    history, path = recording
+    collector = ReplayCollector(path)
+    times, _ = history.get("cpu")
+    collector.session.pause()
+    collector.session.seek(times[len(times) // 2])
+    collector.collect()
+    replayed_times, _ = collector.history.window("cpu", 3600)
+    assert replayed_times[-1] == times[len(times) // 2]
+    assert collector.history.stats.summary("cpu")["count"] > 0
+
+
+def test_every_series_reads_at_the_recording_start(tmp_path):
+    # cpu starts 5 s after memory, so the recording starts before cpu's first point
+    times = 1.7e9 + np.arange(120.0)
+    path = str(tmp_path / "staggered.smh")
+    write_chunks([("memory", times, np.full(120, 50.0)), ("cpu", times[5:], np.full(115, 10.0))], path)
+    collector = ReplayCollector(path)
+    collector.session.pause()
+    collector.session.seek(collector.session.start)
+    snapshot = collector.collect()
+    assert np.isnan(snapshot["cpu_percent"]) and snapshot["mem_percent"] == 50.0
+    history, end = collector.history, collector.session.start
+    for name in history.names():
+        # What the GUI's 1h graph asks for: 10 s means up to the next whole step
+        step_end = end - end % 10.0 + 10.0
+        grid, values = history.select(name, step_end - 3600, step_end, 10.0, "mean")
+        assert len(grid) == len(values)
+        assert len(history.select(name, end - 3600, end)[0]) == (name == "memory")
+        assert len(history.window(name, 60)[0]) == (name == "memory")
+
+
+def test_empty_recording_is_rejected(tmp_path):
+    path = str(tmp_path / "empty.csv")
+    with open(path, "w") as f:
+        f.write("metric,time,value\n")
+    with pytest.raises(ValueError):
+        ReplayCollector(path)
@@ -0,0 +1,78 @@
+import pytest
+
+from scheduler import GROUPS, AdaptiveScheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+def snapshot(cpu):
+    return {"cpu_percent": cpu}
+
+
+def tick(scheduler, clock, cpu):
+    """Advance to the next due group and sample whatever is due"""
+    clock.now += scheduler.delay()
+    due = scheduler.due()
+    scheduler.observe(snapshot(cpu), due)
+    return due
+
+
+def test_idle_backs_off_and_load_speeds_up():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(clock, groups={"cpu": GROUPS["cpu"]})
+    intervals = []
+    for _ in range(20):
+        tick(scheduler, clock, 5.0)
+        intervals.append(scheduler.intervals["cpu"])
+    # Three quiet samples, then a 1.25x back-off per sample up to the cap
+    assert intervals[:3] == [1.0, 1.0, 1.0] and intervals[3] == pytest.approx(1.25)
+    assert intervals == sorted(intervals) and intervals[-1] == 5.0
+    # Above the high mark the interval halves every sample down to the floor
+    loaded = []
+    for _ in range(6):
+        tick(scheduler, clock, 95.0)
+        loaded.append(scheduler.intervals["cpu"])
+    assert loaded == [2.5, 1.25, 0.625, 0.3125, 0.25, 0.25]
+    # The fall back to idle is a jump too; backing off starts over after that
+    tick(scheduler, clock, 5.0)
+    assert scheduler.intervals["cpu"] == 0.25 and scheduler.quiet["cpu"] == 0
+
+
+def test_a_jump_counts_as_activity():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(clock, groups={"cpu": GROUPS["cpu"]})
+    for cpu in (10.0, 12.0, 14.0):
+        tick(scheduler, clock, cpu)
+    assert scheduler.intervals["cpu"] == 1.0
+    tick(scheduler, clock, 40.0)
+    assert scheduler.intervals["cpu"] == 0.5
+
+
+def test_groups_are_due_on_their_own_intervals():
+    clock = FakeClock()
+    groups = {"cpu": GROUPS["cpu"], "disk": GROUPS["disk"]}
+    scheduler = AdaptiveScheduler(clock, groups=groups)
+    assert scheduler.due() == {"cpu", "disk"}
+    scheduler.observe({"cpu_percent": 5.0, "disk_percent": 50.0}, {"cpu", "disk"})
+    scheduler.intervals["disk"] = 4.0
+    scheduler.next_due["disk"] = 4.0
+    clock.now = 1.0
+    assert scheduler.due() == {"cpu"} and scheduler.delay() == 0.0
+    # Due within a quarter of min_interval counts as due now
+    clock.now = 3.95
+    assert scheduler.due() == {"cpu", "disk"}
+    assert scheduler.status() == "1-4s"
+
+
+def test_fixed_interval_samples_everything():
+    clock = FakeClock()
+    scheduler = AdaptiveScheduler(clock, base_interval=2.0, adaptive=False)
+    scheduler.observe(snapshot(95.0), {"cpu"})
+    assert scheduler.due() == set(GROUPS) and scheduler.delay() == 2.0
+    assert scheduler.intervals["cpu"] == 2.0 and scheduler.status() == "fixed 2s"
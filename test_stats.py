@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from stats import RELATIVE_ACCURACY, LogSketch, MetricStats, StreamingStats
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.lognormal(3, 1, 5000), -rng.lognormal(1, 1, 1000), np.zeros(100)])
+    sketch = LogSketch()
+    for value in values.tolist():
+        sketch.add(value)
+    for q, estimate in zip((0.01, 0.5, 0.95, 0.99), sketch.quantiles((0.01, 0.5, 0.95, 0.99))):
+        exact = np.sort(values)[int(q * (len(values) - 1))]
+        assert abs(estimate - exact) <= RELATIVE_ACCURACY * abs(exact) + 1e-12
+
+
+def test_sketch_merge_and_subtract():
+    rng = np.random.default_rng(1)
+    first, second, both = LogSketch(), LogSketch(), LogSketch()
+    for value in rng.normal(50, 10, 500).tolist():
+        first.add(value)
+        both.add(value)
+    for value in rng.normal(80, 5, 300).tolist():
+        second.add(value)
+        both.add(value)
+    first.merge(second)
+    assert first.counts == both.counts and first.count == both.count
+    first.subtract(second)
+    assert first.count == 500 and all(count > 0 for count in first.counts.values())
+
+
+def test_windows_expire_whole_buckets():
+    metric = MetricStats(bucket_seconds=10.0, windows={"1m": 60})
+    for t in range(0, 300):
+        metric.add(1.7e9 + t, 100.0 if t < 200 else 1.0)
+    summary = metric.summary("1m")
+    assert summary["max"] == 1.0 and summary["count"] <= 70
+    assert summary["p50"] == summary["p99"] == 1.0 and summary["mean"] < 100.0
+
+
+def test_quantiles_are_clamped_to_the_window():
+    metric = MetricStats()
+    for t in range(100):
+        metric.add(1.7e9 + t, 50.0)
+    summary = metric.summary("1m")
+    assert summary["p50"] == summary["p99"] == summary["max"] == 50.0
+
+
+def test_ewma_is_not_pulled_towards_the_first_sample():
+    metric = MetricStats()
+    # The first CPU reading is always 0.0
+    metric.add(1.7e9, 0.0)
+    for t in range(1, 10):
+        metric.add(1.7e9 + t, 40.0)
+    assert metric.summary("1h")["ewma"] == pytest.approx(40.0)
+    assert metric.summary("1m")["mean"] == pytest.approx(36.0)
+
+
+def test_windows_expire_without_new_samples():
+    metric = MetricStats(bucket_seconds=10.0, windows={"1m": 60, "5m": 300})
+    for t in range(30):
+        metric.add(1.7e9 + t, 20.0)
+    assert metric.summary("1m", now=1.7e9 + 60)["count"] == 30
+    # A series that stopped reporting two minutes ago has nothing left in its last minute
+    assert metric.summary("1m", now=1.7e9 + 150) is None
+    assert metric.summary("5m", now=1.7e9 + 150)["max"] == 20.0
+
+
+def test_streaming_windows_end_at_the_newest_sample():
+    stats = StreamingStats()
+    for t in range(200):
+        stats.add("cpu", 1.7e9 + t, 10.0)
+        if t < 50:
+            stats.add("cgroup_cpu:gone.scope", 1.7e9 + t, 90.0)
+    # Whole 10 s buckets: the one the window starts inside stays
+    assert stats.summary("cpu")["count"] == 70
+    assert stats.summary("cgroup_cpu:gone.scope") is None
+    assert stats.summary("cgroup_cpu:gone.scope", "5m")["count"] == 50
@@ -0,0 +1,67 @@
+import pytest
+
+from collector import MetricsCollector
+from fakeproc import synthetic_backend
+from terminal_ui import SECTIONS, SPARK_CHARS, TerminalMonitor, changed_spans, sparkline
+
+
+class FakeScreen:
+    def __init__(self, height=40, width=120):
+        self.size = (height, width)
+        self.writes = []
+
+    def getmaxyx(self):
+        return self.size
+
+    def addstr(self, y, x, text):
+        self.writes.append((y, x, text))
+
+
+def test_sparkline():
+    assert sparkline([], 10) == ""
+    assert sparkline([0.0, 50.0, 100.0], 10) == SPARK_CHARS[0] + SPARK_CHARS[4] + SPARK_CHARS[-1]
+    # Out-of-range values are clipped and only the newest width values are drawn
+    assert sparkline([-5.0, 150.0, 30.0, 60.0], 2, high=60.0) == SPARK_CHARS[4] + SPARK_CHARS[-1]
+    assert sparkline([3.0, 3.0], 5, low=3.0, high=3.0) == SPARK_CHARS[0] * 2
+
+
+@pytest.mark.parametrize("old, new, spans", [
+    ("CPU 10.0%", "CPU 10.0%", []),
+    # Cells that happen to match split a run
+    ("CPU 10.0%", "CPU 12.5%", [(5, "2"), (7, "5")]),
+    ("a b c", "x b z", [(0, "x"), (4, "z")]),
+    ("", "new", [(0, "new")]),
+    # A shorter line blanks what is left of the old one
+    ("Memory 60.1%", "Mem", [(3, "   "), (7, "     ")]),
+])
+def test_changed_spans(old, new, spans):
+    assert list(changed_spans(old, new)) == spans
+
+
+def test_only_changed_cells_are_written(tmp_path):
+    screen = FakeScreen()
+    backend, _ = synthetic_backend(str(tmp_path), "small")
+    monitor = TerminalMonitor(screen, MetricsCollector(backend=backend))
+    monitor.write(3, "CPU 10.0%")
+    monitor.write(3, "CPU 12.0%")
+    monitor.write(3, "CPU 12.0%")
+    # On a blank row the space between the words is already on screen
+    assert screen.writes == [(3, 0, "CPU"), (3, 4, "10.0%"), (3, 5, "2")]
+    monitor.collector.close()
+
+
+def test_every_section_fits_the_screen(tmp_path):
+    screen = FakeScreen(height=30, width=132)
+    backend, replayer = synthetic_backend(str(tmp_path), "small")
+    monitor = TerminalMonitor(screen, MetricsCollector(backend=backend))
+    for _ in range(3):
+        replayer.step()
+        monitor.snapshot = monitor.collector.collect()
+    for section in SECTIONS:
+        monitor.section = section
+        lines = monitor.frame(30, 132)
+        assert len(lines) == 30 and all(len(line) < 132 for line in lines)
+        assert f"[{SECTIONS.index(section) + 1} {section}]" in lines[1]
+    monitor.notice = "Anomaly (spike) in cpu"
+    assert "Anomaly (spike) in cpu" in monitor.frame(30, 132)[-1]
+    monitor.collector.close()